@@ -68,6 +68,7 @@ parser.add_argument("--basic",   action='store_true', help="Perform basic alignm
 parser.add_argument("--noclean", action='store_true', help="Do not remove working directory" )
 parser.add_argument("--noactivity", action='store_true', help="Do not generate Activity tier" )
 parser.add_argument("--nophntok",  action='store_true',  help="Do not generate PhnTokAlign tier" )
+parser.add_argument("--jobs", metavar="N", type=int, default=1, help="Number of tracks aligned at the same time, 0 for the number of CPUs (default: 1)" )
 
 parser.add_argument("--quiet",  action='store_true',  help="Disable verbose." )
 
@@ -109,6 +110,7 @@ if args.nophntok:
     a.set_phntokalign_tier( False )
 
 a.set_aligner( args.a )
+a.set_jobs( args.jobs )
 
 # Run speech segmentation
 a.run( args.i, args.I, args.w, args.o )
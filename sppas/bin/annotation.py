@@ -87,6 +87,8 @@ parser.add_argument("--repet",   action='store_true', help="Activate Self-Repeti
 parser.add_argument("--all",     action='store_true', help="Activate ALL automatic annotations" )
 parser.add_argument("--merge",   action='store_true', help="Create a merged TextGrid file, if more than two automatic annotations. (this is the default)" )
 parser.add_argument("--nomerge", action='store_true', help="Do not create a merged TextGrid file." )
+parser.add_argument("--pipeline", action='store_true', help="Chain annotations in memory, file by file; files are written when all annotations of a file are done." )
+parser.add_argument("--jobs",    type=int, default=1, metavar="N", help="Number of processes to annotate files, 0 for the number of CPUs. (default: 1)" )
 
 if len(sys.argv) <= 1:
     sys.argv.append('-h')
@@ -150,6 +152,8 @@ if args.nomerge:
     process.set_domerge( False )
 if args.merge:
     process.set_domerge( True )
+process.set_jobs( args.jobs )
+process.set_pipeline( args.pipeline )
 process.run_annotations( p )
 
 try:
@@ -65,7 +65,7 @@ from annotations.Intsint.sppasintsint import sppasIntsint
 
 parser = ArgumentParser(usage="%s -i file [options]" % os.path.basename(PROGRAM), description="Momel-INTSINT command line interface.")
 
-parser.add_argument("-i", required=True, metavar="file", help='Input file name (extension: .hz or .PitchTier)')
+parser.add_argument("-i", required=True, metavar="file", help='Input file name (extension: .hz, .PitchTier or an audio file)')
 
 parser.add_argument("-o", metavar="file", help="Momel output file name (default: stdout)")
 parser.add_argument("-O", metavar="file", help="Intsint output file name")
@@ -96,6 +96,7 @@ if args.i:
     p.set_unk( unkopt )
     p.set_usestdtokens( False )
     p.run( args.i,args.o )
+    p.save_cache()
 else:
     pdict    = DictPron( args.dict, unkstamp=UNKSTAMP, nodump=False )
     maptable = Mapping()
@@ -74,12 +74,15 @@ args = parser.parse_args()
 
 # ----------------------------------------------------------------------------
 
-trs = annotationdata.aio.read(args.i)
-
-if args.t <= 0 or args.t > trs.GetSize():
+# Only the requested tier is loaded.
+if args.t <= 0:
+    print 'Error: Bad tier number.\n'
+    sys.exit(1)
+try:
+    tier = annotationdata.aio.read_tier(args.i, args.t-1)
+except IndexError:
     print 'Error: Bad tier number.\n'
     sys.exit(1)
-tier = trs[args.t-1]
 
 if tier.IsPoint() is True:
     tier_type = "Point"
@@ -401,42 +401,15 @@ if verbose > 0:
 if verbose > 1:
     print "\nEnd preparing L/R channels at %s"%time.strftime('%d/%m/%y %H:%M:%S',time.localtime())
 
-#========================VERIFY CLIPPING============================#
-
-p = None
-if verbose > 0:
-    p = TextProgress()
-    p.set_new()
-    p.set_header("Getting the factor to avoid clipping")
-
-if verbose > 1:
-    print "\nBegin getting factor at %s"%time.strftime('%d/%m/%y %H:%M:%S',time.localtime())
-
-if p: p.update(0.1, "Left")
-maxleft  = mixerleft.get_max()
-if p: p.update(0.5, "Right")
-maxright = mixerright.get_max()
-
-if p: p.update(0.9, "Attenuator estimation")
-maxval   = max(maxleft, maxright)
-maxvalth = audioutils.get_maxval( sampleswidth )
+#========================MIX============================#
 
-if maxval > maxvalth:
-    attenuator = float(maxvalth)/maxval*0.95
-else:
-    attenuator = 1
+# The channels are mixed without attenuator first: the maximum values are
+# estimated while mixing, so that the channels are mixed again only if
+# clipping occurred.
 
-if verbose > 0:
-    p.update(1, "")
-    del p
+p = None
 if verbose > 1:
-    print "\nEnd getting factor at %s"%time.strftime('%d/%m/%y %H:%M:%S',time.localtime())
-
-# what's for????
-#attenuator = 1
-
-
-#========================MIX============================#
+    print "\nBegin mixing channels at %s"%time.strftime('%d/%m/%y %H:%M:%S',time.localtime())
 
 if verbose > 0:
     p = TextProgress()
@@ -446,14 +419,26 @@ if verbose > 0:
     p.update(0,"")
 
 if p: p.set_text("Left")
-newchannelleft = mixerleft.mix(attenuator)
+newchannelleft = mixerleft.mix()
 if p: p.set_fraction(0.5)
-del mixerleft
 
 if p: p.set_text("Right")
-newchannelright = mixerright.mix(attenuator)
-del mixerright
+newchannelright = mixerright.mix()
+
+#========================VERIFY CLIPPING============================#
+
+maxval   = max(mixerleft.get_max(), mixerright.get_max())
+maxvalth = audioutils.get_maxval( sampleswidth )
+
+if maxval > maxvalth:
+    attenuator = float(maxvalth)/maxval*0.95
+    if p: p.set_text("Left, with attenuator %f"%attenuator)
+    newchannelleft = mixerleft.mix(attenuator)
+    if p: p.set_text("Right, with attenuator %f"%attenuator)
+    newchannelright = mixerright.mix(attenuator)
 
+del mixerleft
+del mixerright
 del settings
 
 if verbose > 0:
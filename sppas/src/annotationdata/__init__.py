@@ -98,6 +98,7 @@ To get the list of extensions currently supported for reading and writing:
 
 from annotationdata.transcription  import Transcription
 from annotationdata.tier           import Tier
+from annotationdata.compacttier    import CompactTier
 from annotationdata.media          import Media
 from annotationdata.hierarchy      import Hierarchy
 from annotationdata.ctrlvocab      import CtrlVocab
@@ -120,6 +121,7 @@ from annotationdata.filter.filters   import RelationFilter
 __all__ = [
     'Transcription',
     'Tier',
+    'CompactTier',
     'Media',
     'Hierarchy',
     'CtrlVocab',
@@ -53,6 +53,9 @@ from os.path import splitext
 
 from trsfactory  import TrsFactory
 from heuristic   import HeuristicFactory
+from praat       import TextGridReader
+from xra         import XRA
+import dump
 
 
 # ----------------------------------------------------------------------------
@@ -89,11 +92,19 @@ def get_extension(filename):
 # Functions for reading and writing annotated files.
 # ----------------------------------------------------------------------------
 
-def read( filename ):
+def read( filename, use_dump=False, save_dump=False ):
     """
     Read a transcription file.
 
+    If use_dump is True and an up-to-date binary dump of the file exists,
+    it is loaded instead of the file itself. The dump is created or updated
+    if save_dump is True.
+    A dump is a pickle: it must be used only for files of a trusted directory
+    (loading a pickle can execute any code).
+
     @param filename (string) the file name (including path)
+    @param use_dump (bool) load the binary dump of the file, if any
+    @param save_dump (bool) save a binary dump of the file, to speed-up the next readings (implies use_dump)
     @raise IOError, UnicodeError, Exception
     @return Transcription
 
@@ -126,11 +137,13 @@ def read( filename ):
     to the right encoding for you!
 
     """
-    ext = get_extension(filename).lower()
-    try:
-        transcription = TrsFactory.NewTrs(ext)
-    except KeyError:
-        transcription = HeuristicFactory.NewTrs(filename)
+    if use_dump is True or save_dump is True:
+        transcription = _new_transcription(filename)
+        if dump.load_from_dump(filename, transcription) is True:
+            return transcription
+
+    # (the transcription can be partially filled by an invalid dump)
+    transcription = _new_transcription(filename)
 
     try:
         transcription.read( unicode(filename) )
@@ -146,6 +159,9 @@ def read( filename ):
     if transcription.GetMaxTime() is None:
         transcription.SetMaxTime( transcription.GetEnd() )
 
+    if save_dump is True:
+        dump.save_as_dump(transcription, filename)
+
     return transcription
 
 
@@ -168,3 +184,78 @@ def write(filename, transcription):
     output.SetMaxTime( transcription.GetMaxTime() )
 
     output.write( unicode(filename) )
+
+# ----------------------------------------------------------------------------
+# Functions for reading only one tier of annotated files.
+# ----------------------------------------------------------------------------
+
+def read_tier(filename, tier=0):
+    """
+    Read only one tier of a transcription file.
+
+    With TextGrid files, the other tiers are skipped without being parsed.
+    With XRA files, the annotations of the other tiers are not created if
+    the tier is given by its name.
+    Other formats are fully read, then the expected tier is returned.
+
+    @param filename (string) the file name (including path)
+    @param tier (int or string) the index or the name of the tier
+    @raise IOError, UnicodeError, IndexError, KeyError, Exception
+    @return Tier
+
+    """
+    if get_extension(filename).lower() == "textgrid":
+        return TextGridReader(unicode(filename)).GetTier(tier)
+
+    if get_extension(filename).lower() == "xra" and not isinstance(tier, int):
+        transcription = XRA()
+        transcription.read(unicode(filename), [tier])
+        return _find_tier(transcription, tier)
+
+    return _find_tier(read(filename), tier)
+
+
+def iter_annotations(filename, tier=0):
+    """
+    Generate the annotations of one tier of a transcription file.
+
+    With TextGrid files, annotations are read one at a time. Other formats
+    are fully read, then the annotations of the expected tier are generated.
+
+    @param filename (string) the file name (including path)
+    @param tier (int or string) the index or the name of the tier
+    @raise IOError, UnicodeError, IndexError, KeyError, Exception
+
+    >>> for annotation in annotationdata.aio.iter_annotations('filename', 'Tokens'):
+    >>>     print annotation.GetLabel().GetValue()
+
+    """
+    if get_extension(filename).lower() == "textgrid":
+        return TextGridReader(unicode(filename)).IterAnnotations(tier)
+
+    return iter(_find_tier(read(filename), tier))
+
+
+def _new_transcription(filename):
+    """
+    Return an empty transcription of the format of a file.
+
+    """
+    ext = get_extension(filename).lower()
+    try:
+        return TrsFactory.NewTrs(ext)
+    except KeyError:
+        return HeuristicFactory.NewTrs(filename)
+
+
+def _find_tier(transcription, tier):
+    """
+    Return a tier of a transcription from its index or its name.
+    """
+    if isinstance(tier, int):
+        return transcription[tier]
+
+    found = transcription.Find(tier)
+    if found is None:
+        raise KeyError('No tier %s in file.' % tier)
+    return found
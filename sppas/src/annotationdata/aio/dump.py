@@ -0,0 +1,308 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+# ---------------------------------------------------------------------------
+#            ___   __    __    __    ___
+#           /     |  \  |  \  |  \  /              Automatic
+#           \__   |__/  |__/  |___| \__             Annotation
+#              \  |     |     |   |    \             of
+#           ___/  |     |     |   | ___/              Speech
+#
+#
+#                           http://www.sppas.org/
+#
+# ---------------------------------------------------------------------------
+#            Laboratoire Parole et Langage, Aix-en-Provence, France
+#                   Copyright (C) 2011-2016  Brigitte Bigi
+#
+#                   This banner notice must not be removed
+# ---------------------------------------------------------------------------
+# Use of this software is governed by the GNU Public License, version 3.
+#
+# SPPAS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SPPAS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+# File: dump.py
+# ---------------------------------------------------------------------------
+
+# utils is the package of SPPAS, not annotationdata.aio.utils
+from __future__ import absolute_import
+
+__docformat__ = """epytext"""
+__authors__   = """Brigitte Bigi (brigitte.bigi@gmail.com)"""
+__copyright__ = """Copyright (C) 2011-2017  Brigitte Bigi"""
+
+# ----------------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------------
+
+import cPickle as pickle
+import gc
+import logging
+import os
+import os.path
+
+from utils.fileutils            import atomic_write
+from annotationdata.tier        import Tier
+from annotationdata.compacttier import CompactTier
+
+# ----------------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------------
+
+DUMP_FILENAME_EXT = ".dump"
+DUMP_VERSION = 1
+
+# ----------------------------------------------------------------------------
+# A binary dump of a transcription.
+#
+# A dump is a pickled tuple (DUMP_VERSION, content). Tiers of time points
+# or time intervals with simple labels are stored as CompactTier instances,
+# which are 2 orders of magnitude smaller than Tier instances. Other tiers
+# are stored as a list of annotations.
+# ----------------------------------------------------------------------------
+
+
+def get_dump_filename(filename):
+    """
+    Return the file name of the dump version of an annotated file.
+
+    The extension of the annotated file is kept, so that 2 annotated
+    files with the same name but different formats have different dumps.
+
+    @param filename: (str)
+    @return: dump filename
+
+    """
+    return filename + DUMP_FILENAME_EXT
+
+# ----------------------------------------------------------------------------
+
+
+def has_dump(filename):
+    """
+    Test if a dump file exists for filename and if it is up-to-date.
+
+    @param filename: (str)
+    @return: (bool)
+
+    """
+    dump_filename = get_dump_filename(filename)
+    if os.path.isfile(dump_filename) and os.path.isfile(filename):
+        tascii = os.path.getmtime(filename)
+        tdump = os.path.getmtime(dump_filename)
+        if tascii < tdump:
+            return True
+
+    return False
+
+# ----------------------------------------------------------------------------
+
+
+def load_from_dump(filename, transcription):
+    """
+    Fill a transcription from the dump of an annotated file.
+
+    @param filename: (str) the annotated file name
+    @param transcription: (Transcription) an empty transcription
+    @return: (bool) True if the transcription was filled (if False, the
+    transcription can be partially filled)
+
+    """
+    if has_dump(filename) is False:
+        return False
+
+    dump_filename = get_dump_filename(filename)
+
+    # the garbage collector is useless while creating a lot of objects
+    # which are all kept: it would only slow down the loading.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        try:
+            with open(dump_filename, 'rb') as f:
+                version, content = pickle.load(f)
+        except Exception as e:
+            logging.info('Load dumped transcription failed: %s' % str(e))
+            try:
+                os.remove(dump_filename)
+            except OSError:
+                pass
+            return False
+
+        if version != DUMP_VERSION:
+            logging.info('Dumped transcription ignored: version %s instead of %s.'
+                         % (version, DUMP_VERSION))
+            return False
+
+        try:
+            _fill_transcription(transcription, content)
+        except Exception as e:
+            logging.info('Load dumped transcription failed: %s' % str(e))
+            return False
+
+    finally:
+        if gc_enabled is True:
+            gc.enable()
+
+    return True
+
+# ----------------------------------------------------------------------------
+
+
+def save_as_dump(transcription, filename):
+    """
+    Save a transcription as the dump of an annotated file.
+
+    @param transcription: (Transcription) the transcription to save
+    @param filename: (str) the annotated file name
+    @return: (bool)
+
+    """
+    dump_filename = get_dump_filename(filename)
+
+    try:
+        content = _get_content(transcription)
+        with atomic_write(dump_filename) as f:
+            pickle.dump((DUMP_VERSION, content), f, pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        logging.info('Save a dumped transcription failed: %s' % str(e))
+        return False
+
+    return True
+
+# ----------------------------------------------------------------------------
+# Private
+# ----------------------------------------------------------------------------
+
+
+def _get_content(transcription):
+    """
+    Return the content of a transcription, with only built-in types,
+    compact tiers, annotations, media and controlled vocabularies.
+
+    """
+    tiers = list(transcription)
+    indexes = dict((id(tier), i) for i, tier in enumerate(tiers))
+
+    hierarchy = transcription.GetHierarchy()
+    links = []
+    for tier in tiers:
+        parent = hierarchy.get_parent(tier)
+        if parent is not None:
+            links.append((hierarchy.get_hierarchy_type(tier),
+                          indexes[id(parent)],
+                          indexes[id(tier)]))
+
+    return {
+        'name': transcription.GetName(),
+        'mintime': transcription.GetMinTime(),
+        'maxtime': transcription.GetMaxTime(),
+        'metadata': dict(transcription.metadata),
+        'media': [m for m in transcription.GetMedia() if m],
+        'ctrlvocab': [c for c in transcription.GetCtrlVocab() if c],
+        'tiers': [_get_tier_content(tier) for tier in tiers],
+        'hierarchy': links,
+    }
+
+# ----------------------------------------------------------------------------
+
+
+def _get_tier_content(tier):
+    """
+    Return a CompactTier if it stores all the information of the tier,
+    or a tuple with the properties and the annotations of the tier.
+
+    """
+    if _is_compact(tier):
+        try:
+            return CompactTier.FromTier(tier)
+        except (TypeError, ValueError):
+            pass
+
+    return (tier.GetName(),
+            tier.GetDataType(),
+            tier.GetMedia(),
+            tier.GetCtrlVocab(),
+            dict(tier.metadata),
+            list(tier))
+
+# ----------------------------------------------------------------------------
+
+
+def _is_compact(tier):
+    """
+    Return True if a CompactTier can store the tier without loss.
+
+    It requires time points or time intervals with only one localization
+    and labels with the default score function and string values.
+
+    """
+    if tier.GetDataType() != "str":
+        return False
+
+    for annotation in tier:
+        if len(annotation.metadata) > 0:
+            return False
+
+        location = annotation.GetLocation()
+        localizations = location.GetLocalizations()
+        if len(localizations) != 1 or localizations[0].GetScore() != 1.:
+            return False
+        if location.GetFunctionScore() is not max:
+            return False
+
+        label = annotation.GetLabel()
+        if label.GetFunctionScore() is not max:
+            return False
+        for text in label.GetLabels():
+            if isinstance(text.GetTypedValue(), unicode) is False:
+                return False
+
+    return True
+
+# ----------------------------------------------------------------------------
+
+
+def _fill_transcription(transcription, content):
+    """
+    Fill an empty transcription with a content returned by _get_content().
+
+    """
+    transcription.SetName(content['name'])
+    transcription.metadata = content['metadata']
+    for media in content['media']:
+        transcription.AddMedia(media)
+    for ctrlvocab in content['ctrlvocab']:
+        transcription.AddCtrlVocab(ctrlvocab)
+
+    tiers = []
+    for tier_content in content['tiers']:
+        if isinstance(tier_content, CompactTier):
+            tier = tier_content.ToTier()
+        else:
+            name, data_type, media, ctrlvocab, metadata, annotations = tier_content
+            tier = Tier(name, data_type)
+            tier.metadata = metadata
+            tier.SetMedia(media)
+            tier.Extend(annotations, presorted=True)
+            tier.SetCtrlVocab(ctrlvocab)
+        transcription.Append(tier)
+        tiers.append(tier)
+
+    hierarchy = transcription.GetHierarchy()
+    for link_type, parent, child in content['hierarchy']:
+        hierarchy.add_link(link_type, tiers[parent], tiers[child])
+
+    transcription.SetMinTime(content['mintime'])
+    transcription.SetMaxTime(content['maxtime'])
@@ -250,10 +250,11 @@ class Elan( Transcription ):
         self.hierarchyLinks[parentTierRef].append(tier)
 
         # group annotations in batches
+        annotations = []
         batches = {}
         for annotationRoot in tierRoot.findall('ANNOTATION'):
             if annotationRoot[0].tag == 'ALIGNABLE_ANNOTATION':
-                tier.Add( self.__parse_alignable_annotation(annotationRoot[0]) )
+                annotations.append( self.__parse_alignable_annotation(annotationRoot[0]) )
             else:
                 ref = annotationRoot[0].attrib['ANNOTATION_REF']
                 if ref not in batches:
@@ -283,11 +284,13 @@ class Elan( Transcription ):
             x2 = begin + increment
             for annotationRoot in batches[ref]:
                 label = annotationRoot[0].find('ANNOTATION_VALUE').text
-                tier.Add(Annotation(TimeInterval(TimePoint(x1),TimePoint(x2)),
-                                    Label(label)))
+                annotations.append(Annotation(TimeInterval(TimePoint(x1),TimePoint(x2)),
+                                              Label(label)))
                 x1 += increment
                 x2 += increment
 
+        tier.Extend(annotations)
+
     # -----------------------------------------------------------------
 
     def __quickbuild_annot_index(self, tierRoot):
@@ -324,9 +327,11 @@ class Elan( Transcription ):
     # -----------------------------------------------------------------
 
     def __read_alignable_tier(self, tier, tierRoot):
+        annotations = []
         for annotationRoot in tierRoot.findall('ANNOTATION'):
             new_a = self.__parse_alignable_annotation(annotationRoot.find('ALIGNABLE_ANNOTATION'))
-            tier.Add( new_a )
+            annotations.append( new_a )
+        tier.Extend(annotations)
 
     # -----------------------------------------------------------------
 
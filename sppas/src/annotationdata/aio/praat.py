@@ -227,52 +227,54 @@ class TextGrid(Transcription):
         item_count = parse_int(it.next())
 
         if tier_type == "IntervalTier":
-            read_annotation = TextGrid.__read_interval_annotation
+            read_annotation = TextGrid._read_interval_annotation
         elif tier_type == "TextTier":
-            read_annotation = TextGrid.__read_point_annotation
+            read_annotation = TextGrid._read_point_annotation
         else:
             raise Exception("Tier type "+tier_type+" cannot be parsed.")
 
+        annotations = []
         for i in range(item_count):
             if is_long:
                 it.next()
-            read_annotation(it, tier)
+            annotations.append(read_annotation(it))
+        tier.Extend(annotations)
 
     # ------------------------------------------------------------------------
 
     @staticmethod
-    def __read_point_annotation(it, tier):
+    def _read_point_annotation(it):
         """
-        Read an annotation from an IntervalTier in the contents of a TextGrid file.
+        Read an annotation from a TextTier in the contents of a TextGrid file.
         Beware, this function will advance the iterator passed.
 
         @param it: an iterator to the contents of the file
              pointing where the annotation starts
-        @param tier: the tier where we will add the read annotation
+        @return: the read annotation
         """
         loc_s = parse_float(it.next())
         label = parse_string(it)
 
-        tier.Add(Annotation(TimePoint(loc_s), Label(label)))
+        return Annotation(TimePoint(loc_s), Label(label))
 
     # ------------------------------------------------------------------------
 
     @staticmethod
-    def __read_interval_annotation(it, tier):
+    def _read_interval_annotation(it):
         """
         Read an annotation from an IntervalTier in the contents of a TextGrid file
         Beware, this function will advance the iterator passed.
 
         @param it an iterator to the contents of the file
              pointing where the annotation starts
-        @param tier  the tier where we will add the read annotation
+        @return the read annotation
         """
         beg = TimePoint(parse_float(it.next()))
         end = TimePoint(parse_float(it.next()))
         label = parse_string(it)
         label = label.replace('""', '"') # praat double quotes.
         interval = TimeInterval(beg, end)
-        tier.Add(Annotation(interval, Label(label)))
+        return Annotation(interval, Label(label))
 
     # ------------------------------------------------------------------------
     # Writer
@@ -305,14 +307,16 @@ class TextGrid(Transcription):
                     self.GetSize()))
 
             for i, tier in enumerate(self, 1):
-                fp.write(self.__format_tier(tier, i))
+                self.__write_tier(fp, tier, i)
 
     # End write
     # ------------------------------------------------------------------------
 
-    def __format_tier(self, tier, number):
+    def __write_tier(self, fp, tier, number):
         """
-        Format a tier from a transcription to the TextGrid format.
+        Write a tier from a transcription in the TextGrid format.
+        Annotations are written one by one: the tier is not formatted in memory.
+        @param fp: The output stream.
         @param number: The position of the tier in the list of all tiers.
         """
         # Fill empty tiers because TextGrid does not support empty tiers.
@@ -330,7 +334,7 @@ class TextGrid(Transcription):
             tier = fill_gaps(tier, self.GetMinTime(), self.GetMaxTime())
             tier = merge_overlapping_annotations(tier)
 
-        result = (
+        fp.write((
             '    item [%d]:\n'
             '        class = "%s"\n'
             '        name = "%s"\n'
@@ -342,7 +346,7 @@ class TextGrid(Transcription):
                 tier.GetName(),
                 tier.GetBeginValue(),
                 tier.GetEndValue(),
-                tier.GetSize())
+                tier.GetSize()))
 
         if tier.IsTimeInterval():
             format_annotation = TextGrid.__format_interval_annotation
@@ -350,8 +354,7 @@ class TextGrid(Transcription):
             format_annotation = TextGrid.__format_point_annotation
 
         for j, an in enumerate(tier, 1):
-            result += format_annotation(an, j)
-        return result
+            fp.write(format_annotation(an, j))
 
     # ------------------------------------------------------------------------
 
@@ -398,6 +401,224 @@ class TextGrid(Transcription):
 
 # ----------------------------------------------------------------------------
 
+def _iter_lines(fp):
+    """
+    Iterate over the lines of a file opened in binary mode.
+    Lines are read one by one, so that the position of the file remains
+    available with fp.tell() between two lines.
+
+    @param fp: a file opened in binary mode.
+    """
+    while True:
+        line = fp.readline()
+        if not line:
+            return
+        yield line.decode('utf-8')
+
+# ----------------------------------------------------------------------------
+
+class TextGridReader(object):
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL, v3
+    @summary: Lazy reader of a TextGrid file.
+
+    The file is scanned once to find where each tier starts, but annotations
+    are not created. Then, annotations of a given tier are loaded only on
+    demand: either one by one with IterAnnotations() or as a whole tier
+    with GetTier().
+
+    >>> reader = TextGridReader('filename.TextGrid')
+    >>> print reader.GetTierNames()
+    >>> for annotation in reader.IterAnnotations("TokensAlign"):
+    >>>     print annotation
+
+    """
+    def __init__(self, filename):
+        """
+        Create a new TextGridReader and index the tiers of a file.
+
+        @param filename: is the input file name, ending by ".TextGrid"
+        @raise IOError:
+        @raise Exception:
+
+        """
+        self.__filename = filename
+        self.__is_long = True
+        self.__mintime = 0.
+        self.__maxtime = 0.
+        self.__tiers = []   # list of (offset, type, name, size)
+        self.__cache = {}
+
+        self.__index()
+
+    # ------------------------------------------------------------------------
+    # Getters
+    # ------------------------------------------------------------------------
+
+    def GetFilename(self):
+        return self.__filename
+
+    def GetMinTime(self):
+        return self.__mintime
+
+    def GetMaxTime(self):
+        return self.__maxtime
+
+    def GetSize(self):
+        """
+        Return the number of tiers of the file.
+        """
+        return len(self.__tiers)
+
+    def GetTierNames(self):
+        """
+        Return the list of tier names, in the order of the file.
+        """
+        return [t[2] for t in self.__tiers]
+
+    def GetTierSize(self, key):
+        """
+        Return the number of annotations of a tier, without reading them.
+
+        @param key: (int or str) the index or the name of the tier.
+        """
+        return self.__tiers[self.__find(key)][3]
+
+    # ------------------------------------------------------------------------
+
+    def IterAnnotations(self, key):
+        """
+        Generate the annotations of a tier, one at a time.
+
+        @param key: (int or str) the index or the name of the tier.
+        @raise IndexError: if the index is out of range
+        @raise KeyError: if there is no tier with such a name
+
+        """
+        offset, tier_type, name, size = self.__tiers[self.__find(key)]
+
+        if tier_type == "IntervalTier":
+            read_annotation = TextGrid._read_interval_annotation
+        elif tier_type == "TextTier":
+            read_annotation = TextGrid._read_point_annotation
+        else:
+            raise Exception("Tier type "+tier_type+" cannot be parsed.")
+
+        with open(self.__filename, 'rb') as fp:
+            fp.seek(offset)
+            it = _iter_lines(fp)
+            try:
+                self.__read_tier_header(it)
+                for i in range(size):
+                    if self.__is_long:
+                        it.next()
+                    yield read_annotation(it)
+            except StopIteration:
+                pass
+
+    # ------------------------------------------------------------------------
+
+    def GetTier(self, key):
+        """
+        Return a tier of the file.
+        The tier is loaded at the first call, then it is cached.
+
+        @param key: (int or str) the index or the name of the tier.
+        @raise IndexError: if the index is out of range
+        @raise KeyError: if there is no tier with such a name
+        @return: Tier
+
+        """
+        idx = self.__find(key)
+        if idx not in self.__cache:
+            tier = Tier(self.__tiers[idx][2])
+            tier.Extend(list(self.IterAnnotations(idx)))
+            self.__cache[idx] = tier
+
+        return self.__cache[idx]
+
+    # ------------------------------------------------------------------------
+    # Private
+    # ------------------------------------------------------------------------
+
+    def __find(self, key):
+        """
+        Return the index of a tier from its index or its name.
+        """
+        if isinstance(key, int):
+            if key < 0 or key >= len(self.__tiers):
+                raise IndexError('Tier index %d out of range.' % key)
+            return key
+
+        for i, t in enumerate(self.__tiers):
+            if t[2] == key:
+                return i
+        raise KeyError('No tier %s in file %s.' % (key, self.__filename))
+
+    # ------------------------------------------------------------------------
+
+    def __read_tier_header(self, it):
+        """
+        Read the header of a tier.
+
+        @return: a tuple (type, name, size)
+
+        """
+        if self.__is_long:
+            it.next()
+
+        tier_type = parse_string(it)
+        tier_name = parse_string(it)
+        it.next()
+        it.next()
+        item_count = parse_int(it.next())
+
+        return tier_type, tier_name, item_count
+
+    # ------------------------------------------------------------------------
+
+    def __index(self):
+        """
+        Scan the file to fill the list of tiers.
+        Annotations are skipped without being parsed.
+
+        """
+        with open(self.__filename, 'rb') as fp:
+            it = _iter_lines(fp)
+            try:
+                for i in range(3):
+                    it.next()
+                self.__mintime = parse_float(it.next())
+                self.__maxtime = parse_float(it.next())
+                it.next()
+
+                tier_count_line = it.next().strip()
+                self.__is_long = not tier_count_line.isdigit()
+                tier_count = parse_int(tier_count_line)
+
+                if self.__is_long:
+                    it.next()
+
+                for i in range(tier_count):
+                    offset = fp.tell()
+                    tier_type, name, size = self.__read_tier_header(it)
+                    self.__tiers.append((offset, tier_type, name, size))
+
+                    nblines = 2 if tier_type == "IntervalTier" else 1
+                    if self.__is_long:
+                        nblines += 1
+                    for j in range(size):
+                        for k in range(nblines):
+                            it.next()
+                        parse_string(it)
+
+            except StopIteration:
+                pass
+
+# ----------------------------------------------------------------------------
+
 class PitchTier(Pitch):
     """
     @authors: Jibril Saffi, Brigitte Bigi
@@ -428,6 +649,7 @@ class PitchTier(Pitch):
         Read a PitchTier file (from Praat).
         """
         self.__delta = 0.
+        annotations = []
         with codecs.open(filename, 'r', 'utf-8') as it:
             try:
                 for i in range(5):
@@ -448,13 +670,15 @@ class PitchTier(Pitch):
                     number = parse_float(it.next())
                     value = parse_float(it.next())
 
-                    self._tier.Append(
+                    annotations.append(
                         Annotation(TimePoint(number), Label(value, 'float')))
             except StopIteration:
                 pass
                 # FIXME: we should probably warn the user
                 #       that his file has invalid size values
             finally:
+                if len(annotations) > 0:
+                    self._tier.Extend(annotations)
                 self.SetMinTime(0.)
                 self.SetMaxTime(self.GetEnd())
 
@@ -561,6 +785,7 @@ class IntensityTier(Transcription):
         Read an IntensityTier file (from Praat).
         """
         self.__delta = 0.
+        annotations = []
         with codecs.open(filename, 'r', 'utf-8') as it:
             try:
                 for i in range(5):
@@ -581,13 +806,15 @@ class IntensityTier(Transcription):
                     number = parse_float(it.next())
                     value = parse_float(it.next())
 
-                    self._tier.Append(
+                    annotations.append(
                         Annotation(TimePoint(number), Label(value, 'float')))
             except StopIteration:
                 pass
                 # FIXME: we should probably warn the user
                 #       that his file has invalid size values
             finally:
+                if len(annotations) > 0:
+                    self._tier.Extend(annotations)
                 self.SetMinTime(0)
                 self.SetMaxTime(self.GetEnd())
 
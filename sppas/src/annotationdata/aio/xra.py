@@ -35,6 +35,7 @@
 
 import logging
 from datetime import datetime
+from cStringIO import StringIO
 import xml.etree.cElementTree as ET
 
 from annotationdata.transcription       import Transcription
@@ -66,9 +67,16 @@ class XRA(Transcription):
     """
     @staticmethod
     def detect(filename):
-        tree = ET.parse(filename)
-        root = tree.getroot()
-        return root.find('Tier') is not None
+        # the file is parsed only until the first tier
+        depth = 0
+        for event, elem in ET.iterparse(filename, events=('start', 'end')):
+            if event == 'start':
+                if depth == 1 and elem.tag == 'Tier':
+                    return True
+                depth += 1
+            else:
+                depth -= 1
+        return False
 
     # -----------------------------------------------------------------
     __format = '1.2'
@@ -88,34 +96,65 @@ class XRA(Transcription):
     # Read XRA 1.1 and 1.2
     # -----------------------------------------------------------------
 
-    def read(self, filename):
+    def read(self, filename, tiernames=None):
         """
         Read an XRA file and fill the Transcription.
 
+        The file is parsed incrementally: each annotation is removed from
+        the XML tree as soon as it is read, so that the whole tree is
+        never in memory.
+
         @type filename: str
         @param filename: filename
+        @param tiernames: (list) names of the tiers to read. Default is all tiers.
 
         """
-        tree = ET.parse(filename)
-        root = tree.getroot()
-
         self.__id_tier_map = {}
-
-        metadataRoot = root.find('Metadata')
-        if metadataRoot is not None:
-            XRA.__read_metadata(self, metadataRoot)
-
-        for tierRoot in root.findall('Tier'):
-            self.__read_tier(tierRoot)
-
-        for mediaRoot in root.findall('Media'):
+        deferred = []
+        stack = []
+        tier = None
+        annotations = []
+
+        for event, elem in ET.iterparse(filename, events=('start', 'end')):
+            if event == 'start':
+                stack.append(elem)
+                if elem.tag == 'Tier' and len(stack) == 2:
+                    tier = self.__new_tier(elem, tiernames)
+                    annotations = []
+                continue
+
+            stack.pop()
+            depth = len(stack)
+
+            if depth == 2 and stack[1].tag == 'Tier':
+                if elem.tag == 'Annotation':
+                    if tier is not None:
+                        annotations.append(XRA.__read_annotation(elem))
+                    stack[1].remove(elem)
+                elif elem.tag == 'Metadata' and tier is not None:
+                    XRA.__read_metadata(tier, elem)
+
+            elif depth == 1:
+                if elem.tag == 'Tier':
+                    if tier is not None:
+                        tier.Extend(annotations)
+                    tier = None
+                    annotations = []
+                    stack[0].remove(elem)
+                elif elem.tag == 'Metadata':
+                    XRA.__read_metadata(self, elem)
+                elif elem.tag in ('Media', 'Hierarchy', 'Vocabulary'):
+                    # they refer to tiers: wait for all tiers to be read
+                    deferred.append(elem)
+
+        for mediaRoot in [e for e in deferred if e.tag == 'Media']:
             self.__read_media(mediaRoot)
 
-        hierarchyRoot = root.find('Hierarchy')
-        if hierarchyRoot is not None:
-            self.__read_hierarchy(hierarchyRoot)
+        hierarchies = [e for e in deferred if e.tag == 'Hierarchy']
+        if len(hierarchies) > 0:
+            self.__read_hierarchy(hierarchies[0])
 
-        for vocabularyRoot in root.findall('Vocabulary'):
+        for vocabularyRoot in [e for e in deferred if e.tag == 'Vocabulary']:
             self.__read_vocabulary(vocabularyRoot)
 
     # -----------------------------------------------------------------
@@ -137,7 +176,8 @@ class XRA(Transcription):
         # link to tiers
         for tierNode in mediaRoot.findall('Tier'):
             tier = self.__id_tier_map[tierNode.attrib['id']]
-            tier.SetMedia( media )
+            if tier is not None:
+                tier.SetMedia( media )
 
     # -----------------------------------------------------------------
 
@@ -156,6 +196,8 @@ class XRA(Transcription):
 
             former = self.__id_tier_map[formerID]
             latter = self.__id_tier_map[latterID]
+            if former is None or latter is None:
+                continue
 
             try:
                 self._hierarchy.add_link(htype, former, latter)
@@ -195,34 +237,43 @@ class XRA(Transcription):
                 # XRA < 1.2
                 idtier = tierNode.attrib['ID']
             tier = self.__id_tier_map[idtier]
-            tier.SetCtrlVocab( ctrlvocab )
+            if tier is not None:
+                tier.SetCtrlVocab( ctrlvocab )
 
     # -----------------------------------------------------------------
 
-    def __read_tier(self, tierRoot):
+    def __new_tier(self, tierRoot, tiernames=None):
+        """
+        Create a new tier from the attributes of a Tier element.
+
+        @param tiernames: (list) names of the tiers to read
+        @return: the new tier, or None if the tier is not selected
+
+        """
         name = tierRoot.attrib['tiername']
-        tier = self.NewTier(name)
 
         try:
             tid = tierRoot.attrib['id']
         except Exception:
             # XRA < 1.2
             tid = tierRoot.attrib['ID']
-        self.__id_tier_map[tid] = tier
 
-        metadataRoot = tierRoot.find('Metadata')
-        if metadataRoot is not None:
-            XRA.__read_metadata(tier, metadataRoot)
+        if tiernames is not None and name not in tiernames:
+            # links to this tier will be ignored
+            self.__id_tier_map[tid] = None
+            return None
+
+        tier = self.NewTier(name)
+        self.__id_tier_map[tid] = tier
 
         # TODO: read medias somehow
 
-        for annotationRoot in tierRoot.findall('Annotation'):
-            XRA.__read_annotation(tier, annotationRoot)
+        return tier
 
     # -----------------------------------------------------------------
 
     @staticmethod
-    def __read_annotation(tier, annotationRoot):
+    def __read_annotation(annotationRoot):
 
         locationRoot = annotationRoot.find('Location')
         location = XRA.__parse_location(locationRoot)
@@ -230,8 +281,7 @@ class XRA(Transcription):
         labelRoot = annotationRoot.find('Label')
         label = XRA.__parse_label(labelRoot)
 
-        annotation = Annotation(location, label)
-        tier.Add(annotation)
+        return Annotation(location, label)
 
     # -----------------------------------------------------------------
 
@@ -387,6 +437,10 @@ class XRA(Transcription):
         """
         Write an XRA file.
 
+        Elements are written one at a time: the tree of the whole document
+        is never created. The result is the same as indenting the tree and
+        writing it with ElementTree.
+
         """
         root = ET.Element('Document')
         root.set('Author', 'SPPAS')
@@ -396,32 +450,85 @@ class XRA(Transcription):
         self.__tier_id_map = {}
         self.__tier_counter = 0
 
-        metadataRoot = ET.SubElement(root, 'Metadata')
+        with open(filename, 'wb') as fp:
+            if encoding not in ("utf-8", "us-ascii"):
+                fp.write("<?xml version='1.0' encoding='%s'?>\n" % encoding)
+            XRA.__write_element(fp, root, self.__iter_document(), 0, encoding)
+            fp.write("\n")
+
+    # -----------------------------------------------------------------
+
+    def __iter_document(self):
+        """
+        Generate the children of the Document element.
+        Each child is a tuple (element, children), children being None if
+        the element is already complete.
+
+        """
+        metadataRoot = ET.Element('Metadata')
         XRA.__format_metadata(metadataRoot, self)
-        if len(metadataRoot.findall('Entry')) == 0:
-            root.remove(metadataRoot)
+        if len(metadataRoot.findall('Entry')) > 0:
+            yield metadataRoot, None
 
         for tier in self:
-            tierRoot = ET.SubElement(root, 'Tier')
-            self.__format_tier(tierRoot, tier)
+            tierRoot = ET.Element('Tier')
+            yield tierRoot, self.__iter_tier(tierRoot, tier)
 
         for media in self.GetMedia():
             if media:
-                mediaRoot = ET.SubElement(root, 'Media')
+                mediaRoot = ET.Element('Media')
                 self.__format_media(mediaRoot, media)
+                yield mediaRoot, None
 
-        hierarchyRoot = ET.SubElement(root, 'Hierarchy')
+        hierarchyRoot = ET.Element('Hierarchy')
         self.__format_hierarchy(hierarchyRoot, self._hierarchy)
+        yield hierarchyRoot, None
 
         for vocabulary in self.GetCtrlVocab():
             if vocabulary:
-                vocabularyRoot = ET.SubElement(root, 'Vocabulary')
+                vocabularyRoot = ET.Element('Vocabulary')
                 self.__format_vocabulary(vocabularyRoot, vocabulary)
+                yield vocabularyRoot, None
 
-        indent(root)
+    # -----------------------------------------------------------------
+
+    @staticmethod
+    def __write_element(fp, elem, children, level, encoding):
+        """
+        Write an element, with the same indentation as the indent() function.
 
-        tree = ET.ElementTree(root)
-        tree.write(filename, encoding=encoding, method="xml")
+        @param fp: the output stream, opened in binary mode
+        @param elem: an element, without children if children is not None
+        @param children: an iterator on tuples (child element, its children),
+        or None if elem is complete
+        @param level: the depth of elem in the tree
+
+        """
+        if children is None:
+            indent(elem, level)
+            elem.tail = None
+            ET.ElementTree(elem).write(fp, encoding=encoding, xml_declaration=False, method="xml")
+            return
+
+        i = "\n" + level*"  "
+        started = False
+        for child, grandchildren in children:
+            if started is False:
+                # the start tag followed by the indented text
+                elem.text = i + "  "
+                closing = "</%s>" % elem.tag
+                buf = StringIO()
+                ET.ElementTree(elem).write(buf, encoding=encoding, xml_declaration=False, method="xml")
+                fp.write(buf.getvalue()[:-len(closing)])
+                started = True
+            else:
+                fp.write(i + "  ")
+            XRA.__write_element(fp, child, grandchildren, level+1, encoding)
+
+        if started is True:
+            fp.write(i + closing)
+        else:
+            XRA.__write_element(fp, elem, None, level, encoding)
 
     # -----------------------------------------------------------------
 
@@ -491,7 +598,11 @@ class XRA(Transcription):
 
     # -----------------------------------------------------------------
 
-    def __format_tier(self, tierRoot, tier):
+    def __iter_tier(self, tierRoot, tier):
+        """
+        Set the attributes of a Tier element and generate its children.
+
+        """
         tid = gen_id() #'t%d' % self.__tier_counter
         tierRoot.set("id", tid)
         tier.metadata [ 'id' ] = tid
@@ -499,14 +610,15 @@ class XRA(Transcription):
         self.__tier_counter += 1
         tierRoot.set("tiername", tier.GetName())
 
-        metadataRoot = ET.SubElement(tierRoot, 'Metadata')
+        metadataRoot = ET.Element('Metadata')
         XRA.__format_metadata(metadataRoot, tier)
-        if len(metadataRoot.findall('Entry')) == 0:
-            tierRoot.remove(metadataRoot)
+        if len(metadataRoot.findall('Entry')) > 0:
+            yield metadataRoot, None
 
         for annotation in tier:
-            annotationRoot = ET.SubElement(tierRoot, 'Annotation')
+            annotationRoot = ET.Element('Annotation')
             XRA.__format_annotation(annotationRoot, annotation)
+            yield annotationRoot, None
 
     # -----------------------------------------------------------------
 
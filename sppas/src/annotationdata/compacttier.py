@@ -0,0 +1,715 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+# ---------------------------------------------------------------------------
+#            ___   __    __    __    ___
+#           /     |  \  |  \  |  \  /              Automatic
+#           \__   |__/  |__/  |___| \__             Annotation
+#              \  |     |     |   |    \             of
+#           ___/  |     |     |   | ___/              Speech
+#
+#
+#                           http://www.sppas.org/
+#
+# ---------------------------------------------------------------------------
+#            Laboratoire Parole et Langage, Aix-en-Provence, France
+#                   Copyright (C) 2011-2016  Brigitte Bigi
+#
+#                   This banner notice must not be removed
+# ---------------------------------------------------------------------------
+# Use of this software is governed by the GNU Public License, version 3.
+#
+# SPPAS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SPPAS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+# File: compacttier.py
+
+__docformat__ = """epytext"""
+__authors__   = """Brigitte Bigi (brigitte.bigi@gmail.com)"""
+__copyright__ = """Copyright (C) 2011-2016  Brigitte Bigi"""
+
+# ---------------------------------------------------------------------------
+
+import array
+import bisect
+
+from tier              import Tier
+from meta              import MetaObject
+from annotation        import Annotation
+from label.label       import Label
+from label.text        import Text
+from ptime.point       import TimePoint
+from ptime.interval    import TimeInterval
+
+# ---------------------------------------------------------------------------
+
+class CompactTier( MetaObject ):
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL, v3
+    @summary: A read-only tier of time points or time intervals, stored in arrays.
+
+    A Tier stores a list of Annotation instances, each one made of a
+    Location, a Localization, a TimeInterval with 2 TimePoint instances and a
+    Label with a list of Text instances: it's more than 3kb by annotation.
+    A CompactTier stores the same information in parallel arrays of floats
+    (begin and end values, and their radius) and an array of indexes in a
+    table of the distinct labels: it's less than 50 bytes by annotation.
+
+    Only the localization with the best score of each annotation is stored.
+    Annotations are created on the fly when iterating or getting an item:
+    use Values() to get quickly the times and the labels.
+
+    >>> compact = CompactTier.FromTier(tier)
+    >>> for begin, end, label in compact.Values():
+    >>>     print begin, end, label
+    >>> tier = compact.ToTier()
+
+    """
+    def __init__(self, name="NoName", data_type="str"):
+        """
+        Create a new CompactTier instance.
+
+        @param name (str) is the tier name.
+        @param data_type (str) is the type of the labels (see Tier.DATA_TYPES)
+
+        """
+        super(CompactTier, self).__init__()
+
+        if data_type not in Tier.DATA_TYPES:
+            raise TypeError("Unknown data type error: %r" % data_type)
+
+        self.__name      = name
+        self.__data_type = data_type
+        self.__ctrlvocab = None
+        self.__media     = None
+
+        self.__ispoint  = None
+        self.__begins   = array.array('d')
+        self.__bradius  = array.array('d')
+        self.__ends     = array.array('d')
+        self.__eradius  = array.array('d')
+        self.__maxends  = array.array('d')  # max of the ends so far
+        self.__labels   = array.array('i')  # index in the table of labels
+        self.__radius   = 0.
+
+        self.__table    = []   # distinct labels: tuples of (text,score)
+        self.__values   = []   # the best text of each distinct label
+        self.__tableidx = {}   # index of each label in the table
+
+    # -----------------------------------------------------------------------
+    # Conversions
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def FromTier(tier):
+        """
+        Create a CompactTier from a Tier of time points or time intervals.
+
+        @param tier (Tier)
+        @return CompactTier
+
+        """
+        compact = CompactTier(tier.GetName(), tier.GetDataType())
+        compact.SetMedia( tier.GetMedia() )
+        compact.SetCtrlVocab( tier.GetCtrlVocab() )
+        compact.metadata = dict(tier.metadata)
+        for annotation in tier:
+            compact.Append( annotation )
+
+        return compact
+
+    # -----------------------------------------------------------------------
+
+    def ToTier(self):
+        """
+        Return a Tier with the annotations of the CompactTier.
+
+        """
+        tier = Tier(self.__name, self.__data_type)
+        tier.SetMedia( self.__media )
+        tier.SetCtrlVocab( self.__ctrlvocab )
+        tier.metadata = dict(self.metadata)
+        tier.Extend( list(self) )
+
+        return tier
+
+    # -----------------------------------------------------------------------
+    # Getters and Setters
+    # -----------------------------------------------------------------------
+
+    def GetName(self):
+        """
+        Return the name of the tier (str).
+
+        """
+        return self.__name
+
+    # -----------------------------------------------------------------------
+
+    def SetName(self, name):
+        """
+        Set a new name.
+
+        @param name (str)
+
+        """
+        self.__name = name
+
+    # -----------------------------------------------------------------------
+
+    def GetDataType(self):
+        """
+        Return the data type of the tier (str).
+
+        """
+        return self.__data_type
+
+    # -----------------------------------------------------------------------
+
+    def GetCtrlVocab(self):
+        """
+        Return the controlled vocabulary (CtrlVocab) or None.
+
+        """
+        return self.__ctrlvocab
+
+    # -----------------------------------------------------------------------
+
+    def SetCtrlVocab(self, ctrlvocab):
+        """
+        Set a controlled vocabulary.
+        The labels are not verified: this tier is read-only.
+
+        @param ctrlvocab (CtrlVocab)
+
+        """
+        self.__ctrlvocab = ctrlvocab
+
+    # -----------------------------------------------------------------------
+
+    def GetMedia(self):
+        """
+        Return the Media or None.
+
+        """
+        return self.__media
+
+    # -----------------------------------------------------------------------
+
+    def SetMedia(self, media):
+        """
+        Set a Media.
+
+        @param media (Media)
+
+        """
+        self.__media = media
+
+    # -----------------------------------------------------------------------
+
+    def GetSize(self):
+        """
+        Return the number of annotations (int).
+
+        """
+        return len(self.__begins)
+
+    # -----------------------------------------------------------------------
+
+    def GetBegin(self):
+        """
+        Return the begin of the first annotation (TimePoint).
+
+        """
+        if self.IsEmpty():
+            return TimePoint(0)
+
+        return TimePoint(self.__begins[0], self.__bradius[0])
+
+    # -----------------------------------------------------------------------
+
+    def GetEnd(self):
+        """
+        Return the end of the last annotation (TimePoint).
+
+        """
+        if self.IsEmpty():
+            return TimePoint(0)
+
+        return TimePoint(self.__ends[-1], self.__eradius[-1])
+
+    # -----------------------------------------------------------------------
+
+    def GetBeginValue(self):
+        """
+        Return the begin value of the first annotation (float).
+
+        """
+        return self.GetBegin().GetMidpoint()
+
+    # -----------------------------------------------------------------------
+
+    def GetEndValue(self):
+        """
+        Return the end value of the last annotation (float).
+
+        """
+        return self.GetEnd().GetMidpoint()
+
+    # -----------------------------------------------------------------------
+
+    def IsEmpty(self):
+        """
+        Return True if the tier does not contain annotations.
+
+        """
+        return len(self.__begins) == 0
+
+    # -----------------------------------------------------------------------
+
+    def IsPoint(self):
+        """
+        Return True if the annotations are time points.
+
+        """
+        return self.__ispoint is True
+
+    # -----------------------------------------------------------------------
+
+    def IsInterval(self):
+        """
+        Return True if the annotations are time intervals.
+
+        """
+        return self.__ispoint is False
+
+    # -----------------------------------------------------------------------
+
+    def IsDisjoint(self):
+        """
+        Return False: a CompactTier does not support disjoint intervals.
+
+        """
+        return False
+
+    # -----------------------------------------------------------------------
+
+    def IsTimePoint(self):
+        """
+        Return True if the annotations are time points.
+
+        """
+        return self.IsPoint()
+
+    # -----------------------------------------------------------------------
+
+    def IsTimeInterval(self):
+        """
+        Return True if the annotations are time intervals.
+
+        """
+        return self.IsInterval()
+
+    # -----------------------------------------------------------------------
+    # Methods
+    # -----------------------------------------------------------------------
+
+    def Append(self, annotation):
+        """
+        Add an annotation to the end of the tier.
+        Only the localization with the best score is stored.
+
+        @param annotation (Annotation)
+        @raise TypeError, ValueError
+
+        """
+        if isinstance(annotation, Annotation) is False:
+            raise TypeError("Annotation argument required, not %r." % annotation)
+
+        location = annotation.GetLocation()
+        if location.IsTimePoint():
+            ispoint = True
+            begin = end = location.GetPoint()
+        elif location.IsTimeInterval():
+            ispoint = False
+            begin = location.GetBegin()
+            end   = location.GetEnd()
+        else:
+            raise TypeError("A compact tier supports only time points or time intervals.")
+
+        if self.__ispoint is None:
+            self.__ispoint = ispoint
+        elif self.__ispoint != ispoint:
+            raise TypeError("A compact tier can not mix time points and time intervals.")
+
+        bvalue = begin.GetMidpoint()
+        evalue = end.GetMidpoint()
+        if self.IsEmpty() is False:
+            if bvalue < self.__begins[-1]:
+                raise ValueError("Annotations of a compact tier must be sorted. Got %s after %s."
+                                 % (bvalue, self.__begins[-1]))
+            maxend = max(self.__maxends[-1], evalue)
+        else:
+            maxend = evalue
+
+        self.__begins.append( bvalue )
+        self.__bradius.append( begin.GetRadius() )
+        self.__ends.append( evalue )
+        self.__eradius.append( end.GetRadius() )
+        self.__maxends.append( maxend )
+        self.__labels.append( self.__intern(annotation.GetLabel()) )
+        self.__radius = max(self.__radius, begin.GetRadius(), end.GetRadius())
+
+    # -----------------------------------------------------------------------
+
+    def Values(self):
+        """
+        Iterate over the annotations, without creating them.
+
+        @return a tuple (begin, end, label) with the midpoint values of the
+        begin and the end (the same value for a point) and the best text
+        of the label.
+
+        """
+        values = self.__values
+        for b, e, l in zip(self.__begins, self.__ends, self.__labels):
+            yield b, e, values[l]
+
+    # -----------------------------------------------------------------------
+
+    def Find(self, begin, end, overlaps=True):
+        """
+        Return a list of annotations between begin and end.
+
+        @param begin: (TimePoint) or None to start from the beginning of the tier
+        @param end: (TimePoint) or None to end at the end off the tier
+        @param overlaps: (bool) Return also the intervals which are partially
+        between begin and end, instead of only the ones starting at begin and
+        ending at end.
+
+        """
+        if self.IsEmpty():
+            return []
+
+        if begin is None:
+            begin = self.GetBegin()
+        if end is None:
+            end = self.GetEnd()
+
+        if overlaps is False:
+            lo = self.Lindex(begin)
+            hi = self.__last(self.__ends, self.__eradius, self.Rindex(end), end)
+            if -1 in (lo, hi):
+                return []
+            return [self[i] for i in range(lo, hi+1)]
+
+        bvalue, bradius = _point(begin)
+        evalue, eradius = _point(end)
+        annotations = []
+        for i in self.__window(bvalue - bradius, evalue + eradius):
+            if self.__ispoint is True:
+                # begin <= point <= end
+                if _lt(self.__begins[i], self.__bradius[i], bvalue, bradius) or \
+                        _lt(evalue, eradius, self.__begins[i], self.__bradius[i]):
+                    continue
+            else:
+                # end of the interval > begin and begin of the interval < end
+                if not _lt(bvalue, bradius, self.__ends[i], self.__eradius[i]) or \
+                        not _lt(self.__begins[i], self.__bradius[i], evalue, eradius):
+                    continue
+            annotations.append(self[i])
+
+        return annotations
+
+    # -----------------------------------------------------------------------
+
+    def GetAnnotationsStartAt(self, time):
+        """
+        Return a list of annotations, starting at the specified time.
+
+        @param time: (TimePoint)
+
+        """
+        lo = self.Lindex(time)
+        if lo == -1:
+            return []
+        hi = self.__last(self.__begins, self.__bradius, lo, time)
+
+        return [self[i] for i in range(lo, hi+1)]
+
+    # -----------------------------------------------------------------------
+
+    def GetAnnotationsEndAt(self, time):
+        """
+        Return a list of annotations, ending at the specified time.
+
+        @param time: (TimePoint)
+
+        """
+        lo = self.Rindex(time)
+        if lo == -1:
+            return []
+        hi = self.__last(self.__ends, self.__eradius, lo, time)
+
+        return [self[i] for i in range(lo, hi+1)]
+
+    # -----------------------------------------------------------------------
+
+    def Index(self, time):
+        """
+        Return the index of the first time point at time, or -1.
+
+        @param time: (TimePoint)
+
+        """
+        if self.__ispoint is not True:
+            return -1
+        return self.Lindex(time)
+
+    # -----------------------------------------------------------------------
+
+    def Lindex(self, time):
+        """
+        Return the index of the first annotation starting at time, or -1.
+
+        @param time: (TimePoint)
+
+        """
+        value, radius = _point(time)
+        lo = bisect.bisect_left(self.__begins, value - radius - self.__radius - 1e-9)
+        hi = bisect.bisect_right(self.__begins, value + radius + self.__radius + 1e-9)
+        for i in range(lo, hi):
+            if _eq(self.__begins[i], self.__bradius[i], value, radius):
+                return i
+        return -1
+
+    # -----------------------------------------------------------------------
+
+    def Mindex(self, time, direction):
+        """
+        Return the index of the first interval containing time, or -1.
+
+        @param time: (TimePoint)
+        @param direction: (int)
+                - -1: the interval can start at time
+                - 1: the interval can end at time
+                - 0: time is strictly inside the interval
+
+        """
+        if self.__ispoint is not False:
+            return -1
+
+        value, radius = _point(time)
+        for i in self.__window(value - radius, value + radius):
+            after  = _lt(self.__begins[i], self.__bradius[i], value, radius)
+            before = _lt(value, radius, self.__ends[i], self.__eradius[i])
+            if direction == -1:
+                after = after or _eq(self.__begins[i], self.__bradius[i], value, radius)
+            elif direction == 1:
+                before = before or _eq(self.__ends[i], self.__eradius[i], value, radius)
+            if after and before:
+                return i
+        return -1
+
+    # -----------------------------------------------------------------------
+
+    def Rindex(self, time):
+        """
+        Return the index of the first annotation ending at time, or -1.
+
+        @param time: (TimePoint)
+
+        """
+        value, radius = _point(time)
+        for i in self.__window(value - radius, value + radius):
+            if _eq(self.__ends[i], self.__eradius[i], value, radius):
+                return i
+        return -1
+
+    # -----------------------------------------------------------------------
+
+    def Near(self, time, direction=1):
+        """
+        Return the index of the annotation whose time value is
+        closest to the given time, or -1.
+
+        @param time: (TimePoint)
+        @param direction: (int)
+                - near 0
+                - forward 1
+                - backward -1
+
+        """
+        if len(self) == 0:
+            return -1
+        if len(self) == 1:
+            return 0
+
+        value, radius = _point(time)
+        index = self.__find(value, radius, direction)
+        if self.__ispoint is True:
+            return index
+
+        # forward: the interval starting at or after time
+        if direction == 1:
+            if not _lt(self.__begins[index], self.__bradius[index], value, radius):
+                return index
+            if index+1 < len(self):
+                return index+1
+            return -1
+
+        # backward: the interval ending at or before time
+        if direction == -1:
+            if not _lt(value, radius, self.__ends[index], self.__eradius[index]):
+                return index
+            if index-1 >= 0:
+                return index-1
+            return -1
+
+        # nearest: the interval containing time, or the closest of this one
+        # and the next one
+        if not _lt(value, radius, self.__begins[index], self.__bradius[index]) and \
+                not _lt(self.__ends[index], self.__eradius[index], value, radius):
+            return index
+        if index+1 >= len(self):
+            return index
+        if abs(value - self.__ends[index]) > abs(self.__begins[index+1] - value):
+            return index+1
+        return index
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    def __intern(self, label):
+        """
+        Return the index of the label in the table of labels.
+
+        """
+        key = tuple((text.GetValue(), text.GetScore()) for text in label.GetLabels())
+        index = self.__tableidx.get(key, None)
+        if index is None:
+            index = len(self.__table)
+            self.__table.append(key)
+            self.__values.append(label.GetValue() if len(key) > 0 else u"")
+            self.__tableidx[key] = index
+
+        return index
+
+    # -----------------------------------------------------------------------
+
+    def __window(self, start, stop):
+        """
+        Return the indexes of the annotations ending after start and
+        starting before stop, taking the radius into account.
+
+        """
+        delta = self.__radius + 1e-9
+        lo = bisect.bisect_left(self.__maxends, start - delta)
+        hi = bisect.bisect_right(self.__begins, stop + delta)
+
+        return range(lo, hi)
+
+    # -----------------------------------------------------------------------
+
+    def __find(self, value, radius, direction):
+        """
+        Return the index of the annotation containing the value, or the
+        closest one (see TierIndex.find()).
+
+        """
+        lo = 0
+        hi = len(self) - 1
+        mid = 0
+        while lo < hi:
+            mid = (lo + hi) // 2
+            b, br = self.__begins[mid], self.__bradius[mid]
+            e, er = self.__ends[mid], self.__eradius[mid]
+            if _eq(b, br, value, radius):
+                return mid
+            if self.__ispoint is False and _lt(b, br, value, radius) and _lt(value, radius, e, er):
+                return mid
+            if _lt(value, radius, e, er):
+                hi = mid
+            else:
+                lo = mid + 1
+
+        if direction == 1:
+            return hi
+        return mid
+
+    # -----------------------------------------------------------------------
+
+    def __last(self, values, radius, index, time):
+        """
+        Return the last index of the consecutive values equal to time.
+
+        """
+        if index == -1:
+            return -1
+
+        value, r = _point(time)
+        while index+1 < len(values) and _eq(values[index+1], radius[index+1], value, r):
+            index += 1
+
+        return index
+
+    # -----------------------------------------------------------------------
+    # Overloads
+    # -----------------------------------------------------------------------
+
+    def __getitem__(self, i):
+        begin = TimePoint(self.__begins[i], self.__bradius[i])
+        if self.__ispoint is True:
+            place = begin
+        else:
+            place = TimeInterval(begin, TimePoint(self.__ends[i], self.__eradius[i]))
+
+        label = Label()
+        for value, score in self.__table[self.__labels[i]]:
+            label.AddValue( Text(value, score, self.__data_type) )
+
+        return Annotation(place, label)
+
+    def __iter__(self):
+        for i in range(len(self.__begins)):
+            yield self[i]
+
+    def __len__(self):
+        return len(self.__begins)
+
+# ---------------------------------------------------------------------------
+
+def _point(time):
+    """
+    Return the midpoint value and the radius of a time (TimePoint or float).
+
+    """
+    try:
+        return time.GetMidpoint(), time.GetRadius()
+    except AttributeError:
+        return float(time), 0.
+
+
+def _eq(v1, r1, v2, r2):
+    """ Return True if the 2 values are equal, as TimePoint does. """
+    return abs(v1 - v2) <= r1 + r2
+
+
+def _lt(v1, r1, v2, r2):
+    """ Return True if the 1st value is lower than the 2nd, as TimePoint does. """
+    return abs(v1 - v2) > r1 + r2 and v1 < v2
+
+# ---------------------------------------------------------------------------
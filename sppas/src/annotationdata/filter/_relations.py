@@ -445,6 +445,36 @@ def create(name, *args):
 
     wrap.__name__ = allen.__name__
     wrap.__doc__  = allen.__doc__
+    wrap.window   = window(allen.__name__, *args)
     return wrap
 
 #---------------------------------------------------------------
+
+
+def window(name, *args):
+    """
+    Return the time window of a relation, or None.
+
+    If the relation between X and Y is true, Y starts before X.end+after
+    and Y ends after X.begin-before. The window is the tuple (before,after).
+    It is None if the relation can be true whatever the delay between X and
+    Y, like before and after without a max delay.
+
+    @param name: (str) Name of an Allen's relation
+    @param args: the max delay of before/after
+
+    """
+    if name in ("meets", "metby", "overlaps", "overlappedby",
+                "starts", "startedby", "finishes", "finishedby",
+                "during", "contains", "equals", "convergent"):
+        return (0., 0.)
+
+    if args:
+        if name == "before":
+            return (0., float(args[0]))
+        if name == "after":
+            return (float(args[0]), 0.)
+
+    return None
+
+#---------------------------------------------------------------
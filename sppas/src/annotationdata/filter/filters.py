@@ -42,6 +42,7 @@ __copyright__ = """Copyright (C) 2011-2015  Brigitte Bigi"""
 # ----------------------------------------------------------------------------
 
 from annotationdata.tier import Tier
+from annotationdata.tierindex import TierIndex
 
 from predicate import Predicate,RelationPredicate,Sel,Rel
 
@@ -226,8 +227,29 @@ class RelationFilter(Filter):
         else: # as RelationFilter iterator return a tuple (x, rel, y), we get the 1st value
             f2 = [x[0] for x in self.filter2]
 
+        window = getattr(self.pred, 'window', None)
+        if window is None:
+            # the relation can be true whatever the delay between x and y
+            for x in f1:
+                for y in f2:
+                    ret = self.pred(x, y)
+                    if ret:
+                        yield x, ret, y
+            return
+
+        # only the annotations of f2 close to x can be related to x:
+        # search for them in the index of their time values.
+        before, after = window
+        index = TierIndex(f2)
         for x in f1:
-            for y in f2:
+            location = x.GetLocation()
+            if location.IsPoint():
+                begin = end = location.GetPoint()
+            else:
+                begin = location.GetBegin()
+                end = location.GetEnd()
+            for i in index.window(begin, end, before, after):
+                y = f2[i]
                 ret = self.pred(x, y)
                 if ret:
                     yield x, ret, y
@@ -69,6 +69,10 @@ class Predicate(object):
         """
         self.pred = pred
 
+        # Time window (before,after) of a relation between 2 annotations,
+        # or None if unknown (see _relations.window()).
+        self.window = getattr(pred, 'window', None)
+
     def __call__(self, *args, **kwargs):
         return self.pred(*args, **kwargs)
 
@@ -76,12 +80,22 @@ class Predicate(object):
         def func(*args, **kwargs):
             return self(*args, **kwargs) or other(*args, **kwargs)
         func.__name__ = "%s OR %s" % (str(self), str(other))
+        w1 = self.window
+        w2 = getattr(other, 'window', None)
+        if w1 is not None and w2 is not None:
+            func.window = (max(w1[0], w2[0]), max(w1[1], w2[1]))
         return Predicate(func)
 
     def __and__(self, other):
         def func(*args, **kwargs):
             return self(*args, **kwargs) and other(*args, **kwargs)
         func.__name__ = "%s AND %s" % (str(self), str(other))
+        w1 = self.window
+        w2 = getattr(other, 'window', None)
+        if w1 is not None and w2 is not None:
+            func.window = (min(w1[0], w2[0]), min(w1[1], w2[1]))
+        elif w1 is not None or w2 is not None:
+            func.window = w1 or w2
         return Predicate(func)
 
     def __invert__(self):
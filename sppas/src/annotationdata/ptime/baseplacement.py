@@ -41,6 +41,88 @@ __copyright__ = """Copyright (C) 2011-2015  Brigitte Bigi"""
 
 # ----------------------------------------------------------------------------
 
+import collections
+
+# ----------------------------------------------------------------------------
+
+# Number of modifications of the existing placements, and the time span of
+# the last modified ones, before their modification: the index of a tier
+# updates the entries of the annotations of these spans (see TierIndex).
+MAX_CHANGES = 1024
+_modifications = [0]
+_changes = collections.deque(maxlen=MAX_CHANGES)
+
+
+def modified(obj):
+    """
+    Declare that an existing placement (or location) will be modified.
+    Must be called before the modification.
+
+    @param obj (BasePlacement, Localization, Location) or None if the
+    modified annotations can not be found from the time span of obj.
+
+    """
+    _changes.append(None if obj is None else _span(obj))
+    _modifications[0] += 1
+
+
+def get_modifications():
+    """
+    Return the number of modifications of the existing placements.
+
+    """
+    return _modifications[0]
+
+
+def get_changes(since):
+    """
+    Return the time spans of the objects modified since a given number of
+    modifications: a list of (min, max) midpoint values, () for an empty
+    object or None if the span is unknown.
+
+    @param since (int) a number of modifications (see get_modifications())
+    @return list, or None if the changes were not all kept
+
+    """
+    count = _modifications[0] - since
+    if count == 0:
+        return []
+    if count > len(_changes):
+        return None
+    return list(_changes)[-count:]
+
+
+def _span(obj):
+    """
+    Return the min and max midpoint values of a placement, a localization
+    or a location (all its localizations).
+
+    """
+    if hasattr(obj, "GetLocalizations"):
+        places = [l.GetPlace() for l in obj.GetLocalizations()]
+    elif hasattr(obj, "GetPlace"):
+        places = [obj.GetPlace()]
+    else:
+        places = [obj]
+
+    values = []
+    for place in places:
+        if place.IsTimePoint() or place.IsFramePoint():
+            values.append(place.GetMidpoint())
+        else:
+            try:
+                values.append(place.GetBegin().GetMidpoint())
+                values.append(place.GetEnd().GetMidpoint())
+            except ValueError:
+                # a disjoint without intervals
+                pass
+
+    if len(values) == 0:
+        return ()
+    return (min(values), max(values))
+
+# ----------------------------------------------------------------------------
+
 class BasePlacement(object):
     """
     @author:  Brigitte Bigi
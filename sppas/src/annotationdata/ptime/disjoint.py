@@ -181,6 +181,7 @@ class TimeDisjoint(baseplacement.BasePlacement):
     # -----------------------------------------------------------------------
 
     def Append(self, interval):
+        baseplacement.modified(self)
         self.__intervals.append(interval)
 
     # -----------------------------------------------------------------------
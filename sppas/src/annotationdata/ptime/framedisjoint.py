@@ -182,6 +182,7 @@ class FrameDisjoint(baseplacement.BasePlacement):
     # -----------------------------------------------------------------------
 
     def Append(self, interval):
+        baseplacement.modified(self)
         self.__intervals.append(interval)
 
     # -----------------------------------------------------------------------
@@ -104,6 +104,7 @@ class FrameInterval(baseplacement.BasePlacement):
             raise TypeError("FrameInterval argument required, not %r" % other)
 
         other = other.Copy()
+        baseplacement.modified(self)
         self.__begin = other.__begin
         self.__end = other.__end
 
@@ -142,6 +143,7 @@ class FrameInterval(baseplacement.BasePlacement):
                              "Begin FramePoint (see FramePoint definition). "
                              "(%s, %s)" % (fp, self.__end))
 
+        baseplacement.modified(self)
         self.__begin = fp  # assign the reference
 
     # -----------------------------------------------------------------------
@@ -174,6 +176,7 @@ class FrameInterval(baseplacement.BasePlacement):
                              " Begin FramePoint (see FramePoint definition)."
                              " (%s, %s)" % (self.__begin, fp))
 
+        baseplacement.modified(self)
         self.__end = fp  # assign the reference
 
     # -----------------------------------------------------------------------
@@ -99,8 +99,8 @@ class FramePoint(baseplacement.BasePlacement):
         self.__frame = 0
         self.__radius = 0
 
-        self.SetMidpoint(frame)
-        self.SetRadius(radius)
+        self.__set_midpoint(frame)
+        self.__set_radius(radius)
 
     # -----------------------------------------------------------------------
 
@@ -117,6 +117,7 @@ class FramePoint(baseplacement.BasePlacement):
             raise TypeError("FramePoint argument required, not %r" % other)
 
         other = other.Copy()
+        baseplacement.modified(self)
         self.__frame = other.__frame
         self.__radius = other.__radius
 
@@ -152,6 +153,10 @@ class FramePoint(baseplacement.BasePlacement):
         @raise TypeError (if frame is not int)
 
         """
+        baseplacement.modified(self)
+        self.__set_midpoint(frame)
+
+    def __set_midpoint(self, frame):
         if not isinstance(frame, int):
             raise TypeError("Integer argument required, not %r" % frame)
 
@@ -179,6 +184,10 @@ class FramePoint(baseplacement.BasePlacement):
         @raise TypeError (if radius is not int)
 
         """
+        baseplacement.modified(self)
+        self.__set_radius(radius)
+
+    def __set_radius(self, radius):
         if not isinstance(radius, int):
             raise TypeError("Integer argument required, not %r" % radius)
 
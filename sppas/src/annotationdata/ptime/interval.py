@@ -106,6 +106,7 @@ class TimeInterval(baseplacement.BasePlacement):
             raise TypeError("TimeInterval argument required, not %r" % other)
 
         other = other.Copy()
+        baseplacement.modified(self)
         self.__begin = other.__begin
         self.__end = other.__end
 
@@ -145,6 +146,7 @@ class TimeInterval(baseplacement.BasePlacement):
                 "Begin must be strictly lesser than End in TimeInterval. "
                 "(%s, %s)" % (tp, self.__end))
 
+        baseplacement.modified(self)
         self.__begin = tp  # assign the reference
 
     # -----------------------------------------------------------------------
@@ -183,6 +185,7 @@ class TimeInterval(baseplacement.BasePlacement):
                 " (%s, %s)" % (self.__begin, tp))
 
         # assign the reference
+        baseplacement.modified(self)
         self.__end = tp
 
     # -----------------------------------------------------------------------
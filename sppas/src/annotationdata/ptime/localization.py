@@ -54,8 +54,8 @@ class Localization(object):
         """
         Create a Localization instance.
         """
-        self.SetPlace(placement)
-        self.SetScore(score)
+        self.__set_place(placement)
+        self.__set_score(score)
 
     # ------------------------------------------------------------------------------------
 
@@ -82,6 +82,10 @@ class Localization(object):
         Set a new placement.
 
         """
+        baseplacement.modified(self)
+        self.__set_place(placement)
+
+    def __set_place(self, placement):
         if not isinstance(placement, baseplacement.BasePlacement):
             raise TypeError("Localization: Placement argument required, not %r"
                             % placement)
@@ -95,6 +99,12 @@ class Localization(object):
         Set a new score.
 
         """
+        # the best localization of a location can change: the annotation
+        # can't be found from the time values of this localization
+        baseplacement.modified(None)
+        self.__set_score(score)
+
+    def __set_score(self, score):
         try:
             self.__score = float(score)
         except Exception:
@@ -35,6 +35,7 @@
 # File: location.py
 # ----------------------------------------------------------------------------
 
+import baseplacement
 from baseplacement import BasePlacement
 from localization import Localization
 import copy
@@ -62,7 +63,7 @@ class Location(object):
         self.__fct = max
 
         if entry is not None:
-            self.AddValue(entry)
+            self.__add_value(entry)
 
     # -----------------------------------------------------------------------
 
@@ -94,6 +95,10 @@ class Location(object):
         @param place is the new placement/localization
 
         """
+        baseplacement.modified(self)
+        self.__add_value(place)
+
+    def __add_value(self, place):
         if isinstance(place, (BasePlacement, Localization)) is False:
             raise TypeError("One placement argument required, not %r" % place)
 
@@ -122,6 +127,7 @@ class Location(object):
         Remove all localizations.
 
         """
+        baseplacement.modified(self)
         self.__locs = []
 
     # -----------------------------------------------------------------------
@@ -145,6 +151,7 @@ class Location(object):
         if fctname not in (min, max):
             raise TypeError('Expected min or max not %r' % fctname)
 
+        baseplacement.modified(self)
         self.__fct = fctname
 
     # -----------------------------------------------------------------------
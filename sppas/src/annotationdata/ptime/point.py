@@ -103,8 +103,8 @@ class TimePoint(baseplacement.BasePlacement):
         self.__midpoint = 0.0
         self.__radius = 0.0
 
-        self.SetMidpoint(time)
-        self.SetRadius(radius)
+        self.__set_midpoint(time)
+        self.__set_radius(radius)
 
     # -----------------------------------------------------------------------
 
@@ -120,6 +120,7 @@ class TimePoint(baseplacement.BasePlacement):
             raise TypeError("TimePoint argument required, not %r" % other)
 
         other = other.Copy()  # FIXME: is deepcopy really necessary?
+        baseplacement.modified(self)
         self.__midpoint = other.__midpoint
         self.__radius = other.__radius
 
@@ -163,6 +164,10 @@ class TimePoint(baseplacement.BasePlacement):
         @raise ValueError
 
         """
+        baseplacement.modified(self)
+        self.__set_midpoint(time)
+
+    def __set_midpoint(self, time):
         if time < 0.:
             raise ValueError("A time point can't be negative: %r" % time)
 
@@ -187,6 +192,10 @@ class TimePoint(baseplacement.BasePlacement):
         @raise TypeError (if radius is not float)
 
         """
+        baseplacement.modified(self)
+        self.__set_radius(radius)
+
+    def __set_radius(self, radius):
         if radius < 0.:
             raise ValueError(
                 "The vagueness of a time point can't be negative: %r" % radius)
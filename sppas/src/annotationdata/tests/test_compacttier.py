@@ -0,0 +1,112 @@
+#!/usr/bin/env python2
+# -*- coding:utf-8 -*-
+
+import unittest
+
+from annotationdata.tier import Tier
+from annotationdata.compacttier import CompactTier
+from annotationdata.label.label import Label
+from annotationdata.label.text import Text
+from annotationdata.ptime.point import TimePoint
+from annotationdata.ptime.interval import TimeInterval
+from annotationdata.annotation import Annotation
+from annotationdata.media import Media
+
+# ---------------------------------------------------------------------------
+
+
+class TestCompactTier(unittest.TestCase):
+
+    def setUp(self):
+        self.tierP = Tier("PointTier")
+        self.tierI = Tier("IntervalTier")
+        for i in range(10):
+            self.tierP.Append(Annotation(TimePoint(i), Label("label"+str(i%3))))
+            self.tierI.Append(Annotation(TimeInterval(TimePoint(i, 0.005), TimePoint(i+1, 0.005)), Label("label"+str(i%3))))
+
+    def __assertSameAnnotations(self, annotations1, annotations2):
+        self.assertEqual(len(annotations1), len(annotations2))
+        for a1, a2 in zip(annotations1, annotations2):
+            self.assertEqual(a1.GetLocation().GetValue().GetPlace(), a2.GetLocation().GetValue().GetPlace())
+            self.assertEqual(a1.GetLabel().GetValue(), a2.GetLabel().GetValue())
+
+    def test_conversions(self):
+        for tier in (self.tierP, self.tierI):
+            tier.SetMedia(Media("foo", "foo.wav"))
+            compact = CompactTier.FromTier(tier)
+            self.assertEqual(len(compact), 10)
+            self.assertEqual(compact.GetName(), tier.GetName())
+            self.assertIs(compact.GetMedia(), tier.GetMedia())
+            self.assertEqual(compact.IsPoint(), tier.IsPoint())
+            self.assertEqual(compact.IsInterval(), tier.IsInterval())
+            self.assertEqual(compact.GetBegin(), tier.GetBegin())
+            self.assertEqual(compact.GetEnd(), tier.GetEnd())
+            self.__assertSameAnnotations(list(compact), list(tier))
+
+            newtier = compact.ToTier()
+            self.assertIsInstance(newtier, Tier)
+            self.assertEqual(newtier.GetName(), tier.GetName())
+            self.__assertSameAnnotations(list(newtier), list(tier))
+
+    def test_labels(self):
+        label = Label(Text("a", 0.3))
+        label.AddValue(Text("b", 0.7))
+        compact = CompactTier()
+        compact.Append(Annotation(TimeInterval(TimePoint(0), TimePoint(1)), label))
+        compact.Append(Annotation(TimeInterval(TimePoint(1), TimePoint(2))))
+        compact.Append(Annotation(TimeInterval(TimePoint(2), TimePoint(3)), Label("a")))
+
+        texts = compact[0].GetLabel().GetLabels()
+        self.assertEqual([(t.GetValue(), t.GetScore()) for t in texts], [("a", 0.3), ("b", 0.7)])
+        self.assertEqual(compact[0].GetLabel().GetValue(), "b")
+        self.assertTrue(compact[1].GetLabel().IsEmpty())
+        self.assertEqual(list(compact.Values()), [(0., 1., "b"), (1., 2., ""), (2., 3., "a")])
+
+        # labels are interned
+        compact = CompactTier.FromTier(self.tierI)
+        self.assertEqual(len(compact._CompactTier__table), 3)
+
+    def test_append(self):
+        compact = CompactTier()
+        compact.Append(Annotation(TimeInterval(TimePoint(1), TimePoint(2))))
+        with self.assertRaises(TypeError):
+            compact.Append(Annotation(TimePoint(3)))
+        with self.assertRaises(ValueError):
+            compact.Append(Annotation(TimeInterval(TimePoint(0), TimePoint(1))))
+        with self.assertRaises(TypeError):
+            compact.Append("foo")
+        self.assertEqual(len(compact), 1)
+
+    def test_find(self):
+        for tier in (self.tierP, self.tierI):
+            compact = CompactTier.FromTier(tier)
+            for b, e in ((0, 10), (2, 5), (2.5, 5.5), (1.999, 3.002), (9.5, 20), (0, 0.5)):
+                for overlaps in (True, False):
+                    self.__assertSameAnnotations(
+                        compact.Find(TimePoint(b), TimePoint(e), overlaps),
+                        tier.Find(TimePoint(b), TimePoint(e), overlaps))
+            self.assertEqual(len(compact.Find(TimePoint(10.1), TimePoint(12))), 0)
+
+            for i in range(12):
+                self.assertEqual(compact.Lindex(TimePoint(i)), tier.Lindex(TimePoint(i)))
+                self.assertEqual(compact.Rindex(TimePoint(i)), tier.Rindex(TimePoint(i)))
+                self.assertEqual(compact.Index(TimePoint(i)), tier.Index(TimePoint(i)))
+
+    def test_lookups(self):
+        for tier in (self.tierP, self.tierI):
+            compact = CompactTier.FromTier(tier)
+            for i in range(45):
+                time = TimePoint(i/4.)
+                self.__assertSameAnnotations(compact.GetAnnotationsStartAt(time), tier.GetAnnotationsStartAt(time))
+                self.__assertSameAnnotations(compact.GetAnnotationsEndAt(time), tier.GetAnnotationsEndAt(time))
+                for direction in (-1, 0, 1):
+                    self.assertEqual(compact.Mindex(time, direction), tier.Mindex(time, direction))
+                    self.assertEqual(compact.Near(time, direction), tier.Near(time, direction))
+
+        compact = CompactTier.FromTier(self.tierI)
+        self.assertEqual(compact.GetAnnotationsStartAt(TimePoint(2.5)), [])
+        self.assertEqual(compact.Near(TimePoint(0.5), -1), -1)
+        self.assertEqual(compact.Near(TimePoint(1.5), -1), 0)
+        self.assertEqual(compact.Near(TimePoint(5), -1), 4)
+        self.assertEqual(compact.Near(TimePoint(12), 1), -1)
+        self.assertEqual(CompactTier().Near(TimePoint(1)), -1)
@@ -110,3 +110,25 @@ class TestRelationFilter(unittest.TestCase):
         fY = Filter(tiery)
         relation = Rel('equals')
         new_tier = RelationFilter( relation, fX, fY ).Filter()
+        self.assertEqual(len(new_tier), 10)
+
+    def test_window(self):
+        tierx = Tier()
+        tiery = Tier()
+        for i in range(20):
+            tierx.Append(Annotation(TimeInterval(TimePoint(i*0.5), TimePoint(i*0.5+0.5)), Label("x%d" % i)))
+            tiery.Add(Annotation(TimeInterval(TimePoint(i*0.3, 0.01), TimePoint(i*0.3+0.7, 0.01)), Label("y%d" % i)))
+
+        self.assertEqual(Rel('overlaps').window, (0., 0.))
+        self.assertEqual((Rel('meets') | Rel(before=0.5)).window, (0., 0.5))
+        self.assertIsNone(Rel('before').window)
+        self.assertIsNone((Rel('meets') | Rel('after')).window)
+        self.assertIsNone((~Rel('meets')).window)
+
+        # only close annotations are compared, but the result is the same
+        for relation in (Rel('overlaps') | Rel('overlappedby'), Rel('convergent'),
+                         Rel('meets', 'metby'), Rel(before=0.4), Rel(after=1),
+                         Rel('disjoint'), ~Rel('during')):
+            expected = [(x, relation(x, y), y) for x in tierx for y in tiery if relation(x, y)]
+            found = list(RelationFilter(relation, Filter(tierx), Filter(tiery)))
+            self.assertEqual(found, expected)
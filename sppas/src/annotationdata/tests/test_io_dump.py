@@ -0,0 +1,125 @@
+#!/usr/bin/env python2
+# -*- coding: utf8 -*-
+
+import unittest
+import os
+import shutil
+import time
+import cPickle as pickle
+
+import annotationdata.aio
+from annotationdata.aio import dump
+from annotationdata.transcription import Transcription
+import utils.fileutils
+
+# ---------------------------------------------------------------------------
+
+TEMP = utils.fileutils.gen_name()
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# ---------------------------------------------------------------------------
+
+
+class TestDump(unittest.TestCase):
+    """
+    Test binary dumps of annotated files.
+    """
+    def setUp(self):
+        if os.path.exists(TEMP) is False:
+            os.mkdir(TEMP)
+
+    def tearDown(self):
+        shutil.rmtree(TEMP)
+
+    def __copy(self, name):
+        filename = os.path.join(TEMP, name)
+        shutil.copy(os.path.join(DATA, name), filename)
+        # the dump must be more recent than the file
+        old = time.time() - 10
+        os.utime(filename, (old, old))
+        return filename
+
+    def __assertSameTranscription(self, trs1, trs2):
+        self.assertEqual(trs1.GetName(), trs2.GetName())
+        self.assertEqual(trs1.GetMinTime(), trs2.GetMinTime())
+        self.assertEqual(trs1.GetMaxTime(), trs2.GetMaxTime())
+        self.assertEqual(trs1.metadata, trs2.metadata)
+        self.assertEqual(len(trs1.GetMedia()), len(trs2.GetMedia()))
+        self.assertEqual(trs1.GetSize(), trs2.GetSize())
+        for t1, t2 in zip(trs1, trs2):
+            self.assertEqual(t1.GetName(), t2.GetName())
+            self.assertEqual(t1.metadata, t2.metadata)
+            self.assertEqual(t1.GetSize(), t2.GetSize())
+            self.assertEqual(t1.GetMedia() is None, t2.GetMedia() is None)
+            self.assertEqual(t1.GetCtrlVocab() is None, t2.GetCtrlVocab() is None)
+            self.assertIs(t2.GetTranscription(), trs2)
+            for a1, a2 in zip(t1, t2):
+                self.assertEqual(a1.GetLocation().GetValue(), a2.GetLocation().GetValue())
+                self.assertEqual([(t.GetValue(), t.GetScore()) for t in a1.GetLabel().GetLabels()],
+                                 [(t.GetValue(), t.GetScore()) for t in a2.GetLabel().GetLabels()])
+            p1 = trs1.GetHierarchy().get_parent(t1)
+            p2 = trs2.GetHierarchy().get_parent(t2)
+            self.assertEqual(p1 is None, p2 is None)
+            if p1 is not None:
+                self.assertEqual(p1.GetName(), p2.GetName())
+
+    def test_dump(self):
+        for name in ("sample.TextGrid", "sample-1.2.xra", "sample.eaf"):
+            filename = self.__copy(name)
+            trs1 = annotationdata.aio.read(filename)
+            self.assertFalse(dump.has_dump(filename))
+            trs2 = annotationdata.aio.read(filename, save_dump=True)
+            self.assertTrue(dump.has_dump(filename))
+            self.__assertSameTranscription(trs1, trs2)
+
+            trs3 = annotationdata.aio.read(filename, use_dump=True)
+            self.assertIs(trs3.__class__, trs1.__class__)
+            self.__assertSameTranscription(trs1, trs3)
+
+    def test_save_failed(self):
+        filename = self.__copy("sample.TextGrid")
+        trs = annotationdata.aio.read(filename, save_dump=True)
+        dump_filename = dump.get_dump_filename(filename)
+        with open(dump_filename, 'rb') as f:
+            content = f.read()
+
+        # the previous dump is kept if the new one can't be written
+        trs.metadata["unpicklable"] = lambda x: x
+        self.assertFalse(dump.save_as_dump(trs, filename))
+        with open(dump_filename, 'rb') as f:
+            self.assertEqual(f.read(), content)
+        self.assertEqual([f for f in os.listdir(TEMP) if f.endswith(".tmp")], [])
+
+    def test_invalid_dump(self):
+        filename = self.__copy("sample.TextGrid")
+        trs1 = annotationdata.aio.read(filename, save_dump=True)
+
+        # a modified file is read again
+        with open(dump.get_dump_filename(filename), 'wb') as f:
+            pickle.dump((dump.DUMP_VERSION, {}), f)
+        os.utime(filename, None)
+        self.assertFalse(dump.has_dump(filename))
+        trs2 = annotationdata.aio.read(filename)
+        self.assertEqual(trs2.GetSize(), trs1.GetSize())
+
+        # a dump is loaded only if the caller asks for it
+        with open(dump.get_dump_filename(filename), 'wb') as f:
+            pickle.dump((dump.DUMP_VERSION, {}), f)
+        self.assertTrue(dump.has_dump(filename))
+        trs2 = annotationdata.aio.read(filename)
+        self.assertEqual(trs2.GetSize(), trs1.GetSize())
+
+        # a dump which can't fill a transcription is ignored
+        trs2 = annotationdata.aio.read(filename, use_dump=True)
+        self.assertEqual(trs2.GetSize(), trs1.GetSize())
+
+        # a dump of another version is ignored
+        with open(dump.get_dump_filename(filename), 'wb') as f:
+            pickle.dump((dump.DUMP_VERSION+1, {}), f)
+        self.assertFalse(dump.load_from_dump(filename, Transcription()))
+
+        # a corrupted dump is removed
+        with open(dump.get_dump_filename(filename), 'wb') as f:
+            f.write("foo")
+        self.assertFalse(dump.load_from_dump(filename, Transcription()))
+        self.assertFalse(os.path.exists(dump.get_dump_filename(filename)))
@@ -10,6 +10,8 @@ from annotationdata.ptime.point import TimePoint
 from annotationdata.ptime.interval import TimeInterval
 from annotationdata.annotation import Annotation
 from annotationdata.aio.praat import TextGrid
+from annotationdata.aio.praat import TextGridReader
+import annotationdata.aio
 import utils.fileutils
 
 # ---------------------------------------------------------------------------
@@ -60,6 +62,76 @@ class TestTextGrid(unittest.TestCase):
                 self.assertEqual(a1.GetLocation().GetValue(),
                                  a2.GetLocation().GetValue())
 
+    def __assertSameTier(self, t1, t2):
+        self.assertEqual(t1.GetName(), t2.GetName())
+        self.assertEqual(t1.GetSize(), t2.GetSize())
+        for a1, a2 in zip(t1, t2):
+            self.assertEqual(a1.GetLabel().GetValue(),
+                             a2.GetLabel().GetValue())
+            self.assertEqual(a1.GetLocation().GetValue(),
+                             a2.GetLocation().GetValue())
+
+    def test_Reader(self):
+        for filename in ("sample.TextGrid", "sample_points.TextGrid"):
+            filename = os.path.join(DATA, filename)
+            tg = TextGrid()
+            tg.read(filename)
+            reader = TextGridReader(filename)
+            self.assertEqual(reader.GetSize(), tg.GetSize())
+            self.assertEqual(reader.GetTierNames(), [t.GetName() for t in tg])
+            # tiers are read in any order, by index or by name
+            for i in reversed(range(tg.GetSize())):
+                self.assertEqual(reader.GetTierSize(i), tg[i].GetSize())
+                self.__assertSameTier(reader.GetTier(i), tg[i])
+                self.__assertSameTier(reader.GetTier(tg[i].GetName()), tg[i])
+                self.assertEqual(len(list(reader.IterAnnotations(i))), tg[i].GetSize())
+            self.assertIs(reader.GetTier(0), reader.GetTier(0))
+            with self.assertRaises(IndexError):
+                reader.GetTier(tg.GetSize())
+            with self.assertRaises(KeyError):
+                reader.GetTier("no such tier")
+
+            self.__assertSameTier(annotationdata.aio.read_tier(filename, tg.GetSize()-1), tg[-1])
+            self.assertEqual(len(list(annotationdata.aio.iter_annotations(filename))),
+                             tg[0].GetSize())
+
+    def test_ReaderShort(self):
+        filename = os.path.join(TEMP, "short.TextGrid")
+        with open(filename, "w") as fp:
+            fp.write('File type = "ooTextFile"\n'
+                     'Object class = "TextGrid"\n'
+                     '\n0\n3\n<exists>\n2\n'
+                     '"IntervalTier"\n"words"\n0\n3\n2\n'
+                     '0\n1\n"a ""b"""\n'
+                     '1\n3\n"multi\nline"\n'
+                     '"TextTier"\n"points"\n0\n3\n1\n'
+                     '2\n"c"\n')
+        tg = TextGrid()
+        tg.read(filename)
+        reader = TextGridReader(filename)
+        self.assertEqual(reader.GetTierNames(), ["words", "points"])
+        self.assertEqual(reader.GetMaxTime(), 3.)
+        self.__assertSameTier(reader.GetTier("points"), tg[1])
+        self.__assertSameTier(reader.GetTier("words"), tg[0])
+        self.assertEqual(reader.GetTier(0)[0].GetLabel().GetValue(), 'a "b"')
+        self.assertEqual(reader.GetTier(0)[1].GetLabel().GetValue(), 'multi\nline')
+
+    def test_ReadUnsorted(self):
+        filename = os.path.join(TEMP, "unsorted.TextGrid")
+        with open(filename, "w") as fp:
+            fp.write('File type = "ooTextFile"\n'
+                     'Object class = "TextGrid"\n'
+                     '\n0\n3\n<exists>\n1\n'
+                     '"IntervalTier"\n"words"\n0\n3\n2\n'
+                     '1\n3\n"b"\n'
+                     '0\n1\n"a"\n')
+        tg = TextGrid()
+        tg.read(filename)
+        reader = TextGridReader(filename)
+        for tier in (tg[0], reader.GetTier(0)):
+            self.assertEqual([a.GetLabel().GetValue() for a in tier], ["a", "b"])
+            self.assertEqual(tier.Lindex(TimePoint(1)), 1)
+
     def test_fill_gaps(self):
         tg = TextGrid(mintime=0.5, maxtime=10.1)
         tier = tg.NewTier()
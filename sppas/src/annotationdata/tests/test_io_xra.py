@@ -5,8 +5,11 @@ import unittest
 import os.path
 import shutil
 
+import xml.etree.cElementTree as ET
+
 import annotationdata.aio
 from annotationdata.aio.xra import XRA
+from annotationdata.aio.utils import indent
 import utils.fileutils
 
 # ---------------------------------------------------------------------------
@@ -36,6 +39,38 @@ class TestXRA(unittest.TestCase):
         tg2 = XRA()
         tg2.read(os.path.join(DATA, "sample-1.2.xra"))
 
+    def test_ReadTierNames(self):
+        tg1 = XRA()
+        tg1.read(os.path.join(DATA, "sample-1.2.xra"))
+        names = [t.GetName() for t in tg1]
+        tg2 = XRA()
+        tg2.read(os.path.join(DATA, "sample-1.2.xra"), names[1:2])
+        self.assertEqual(tg2.GetSize(), 1)
+        self.assertEqual(tg2[0].GetName(), names[1])
+        self.assertEqual(tg2[0].GetSize(), tg1[1].GetSize())
+        for a1, a2 in zip(tg1[1], tg2[0]):
+            self.assertEqual(a1.GetLabel().GetValue(), a2.GetLabel().GetValue())
+            self.assertEqual(a1.GetLocation().GetValue(), a2.GetLocation().GetValue())
+
+        tier = annotationdata.aio.read_tier(os.path.join(DATA, "sample-1.2.xra"), names[0])
+        self.assertEqual(tier.GetSize(), tg1[0].GetSize())
+        with self.assertRaises(KeyError):
+            annotationdata.aio.read_tier(os.path.join(DATA, "sample-1.2.xra"), "no such tier")
+
+    def test_WriteIndent(self):
+        # the streamed output is the one of an indented ElementTree
+        tg1 = XRA()
+        tg1.read(os.path.join(DATA, "sample-1.2.xra"))
+        filename = os.path.join(TEMP, "sample-1.2.xra")
+        tg1.write(filename)
+        root = ET.parse(filename).getroot()
+        self.assertEqual(len(root.findall('Tier')), tg1.GetSize())
+        indent(root)
+        ET.ElementTree(root).write(os.path.join(TEMP, "indent.xra"), encoding="UTF-8", method="xml")
+        with open(filename) as fp1:
+            with open(os.path.join(TEMP, "indent.xra")) as fp2:
+                self.assertEqual(fp1.read(), fp2.read())
+
     def test_ReadWrite(self):
         tg1 = XRA()
         tg1.read(os.path.join(DATA, "sample-1.2.xra"))
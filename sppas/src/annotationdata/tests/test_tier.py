@@ -7,6 +7,9 @@ from annotationdata.tier import Tier
 from annotationdata.label.label import Label
 from annotationdata.ptime.point import TimePoint
 from annotationdata.ptime.interval import TimeInterval
+from annotationdata.ptime.localization import Localization
+from annotationdata.ptime.location import Location
+from annotationdata.ptime import baseplacement
 from annotationdata.annotation import Annotation
 from annotationdata.media import Media
 from annotationdata.ctrlvocab import CtrlVocab
@@ -182,6 +185,62 @@ class TestTier(unittest.TestCase):
         for i, a in enumerate(tier, 1):
             self.assertEqual(a.GetLocation().GetEnd(), TimePoint(i))
 
+    def test_Extend(self):
+        times = [TimeInterval(TimePoint(1), TimePoint(2)),
+                 TimeInterval(TimePoint(1.5), TimePoint(2)),
+                 TimeInterval(TimePoint(1.8), TimePoint(2)),
+                 TimeInterval(TimePoint(2), TimePoint(3)),
+                 TimeInterval(TimePoint(2.5), TimePoint(3)),
+                 TimeInterval(TimePoint(2), TimePoint(2.3)),
+                 TimeInterval(TimePoint(2), TimePoint(2.5)),
+                 TimeInterval(TimePoint(1.8), TimePoint(2.5)),
+                 TimeInterval(TimePoint(2.4), TimePoint(4))]
+        added = Tier()
+        for t in times:
+            added.Add(Annotation(t))
+
+        # same result than Add() whatever the order of the annotations
+        import random
+        annotations = [Annotation(t) for t in times]
+        random.shuffle(annotations)
+        tier = Tier()
+        tier.Extend(annotations[:4])
+        tier.Extend(annotations[4:])
+        self.assertEqual(len(tier), len(added))
+        for a1, a2 in zip(tier, added):
+            self.assertEqual(a1.GetLocation().GetValue().GetPlace(), a2.GetLocation().GetValue().GetPlace())
+        self.assertEqual(tier.Rindex(TimePoint(2.5)), added.Rindex(TimePoint(2.5)))
+
+        # sorted annotations are appended
+        tier = Tier()
+        tier.Extend([Annotation(TimeInterval(TimePoint(i), TimePoint(i+1))) for i in range(5)])
+        tier.Extend([Annotation(TimeInterval(TimePoint(i), TimePoint(i+1))) for i in range(5, 10)])
+        self.assertEqual(len(tier), 10)
+        self.assertEqual(tier.Lindex(TimePoint(7)), 7)
+        presorted = Tier()
+        presorted.Extend(list(tier), presorted=True)
+        self.assertEqual(presorted.Lindex(TimePoint(7)), 7)
+        self.assertEqual(presorted.Rindex(TimePoint(10)), 9)
+
+        # unsorted annotations are sorted
+        tier.Extend([Annotation(TimeInterval(TimePoint(i), TimePoint(i+1))) for i in (11, 10)])
+        self.assertEqual(len(tier), 12)
+        self.assertEqual(tier.Lindex(TimePoint(10)), 10)
+        self.assertEqual(tier.Lindex(TimePoint(11)), 11)
+        with self.assertRaises(TypeError):
+            tier.Extend([Annotation(TimePoint(12)), "foo"])
+        self.assertEqual(len(tier), 12)
+
+        # controlled vocabulary
+        voc = CtrlVocab("Verbal Strategies")
+        voc.Append("definition")
+        tier = Tier()
+        tier.SetCtrlVocab(voc)
+        with self.assertRaises(ValueError):
+            tier.Extend([Annotation(TimeInterval(TimePoint(10), TimePoint(11)), Label("definition")),
+                         Annotation(TimeInterval(TimePoint(11), TimePoint(12)), Label("joke"))])
+        self.assertEqual(len(tier), 0)
+
     def test_Copy(self):
         tier = Tier()
         copy = tier.Copy()
@@ -388,6 +447,127 @@ class TestTier(unittest.TestCase):
             index = tier.Mindex(time, 0)
             self.assertEquals(index, i)
 
+    def test_Rindex3(self):
+        # ends are not sorted in a tier with overlapping annotations
+        tier = Tier()
+        tier.Add(Annotation(TimeInterval(TimePoint(1), TimePoint(5))))
+        tier.Add(Annotation(TimeInterval(TimePoint(2), TimePoint(3))))
+        tier.Add(Annotation(TimeInterval(TimePoint(3), TimePoint(4))))
+        self.assertEquals(tier.Rindex(TimePoint(5)), 0)
+        self.assertEquals(tier.Rindex(TimePoint(3)), 1)
+        self.assertEquals(tier.Rindex(TimePoint(4)), 2)
+        self.assertEquals(tier.Mindex(TimePoint(3.5), 0), 0)
+        self.assertEquals(len(tier.GetAnnotationsEndAt(TimePoint(4))), 1)
+
+    def test_IndexUpdate(self):
+        tier = Tier()
+        for i in range(1, 11):
+            tier.Append(Annotation(TimeInterval(TimePoint(i), TimePoint(i+1))))
+        self.assertEquals(tier.Lindex(TimePoint(5)), 4)
+
+        # placements changed in-place must be seen by the index
+        tier[9].GetLocation().SetEnd(TimePoint(12))
+        self.assertEquals(tier.Rindex(TimePoint(11)), -1)
+        self.assertEquals(tier.Rindex(TimePoint(12)), 9)
+
+        tier.Pop()
+        self.assertEquals(tier.Rindex(TimePoint(12)), -1)
+        self.assertEquals(tier.Rindex(TimePoint(10)), 8)
+
+        tier.Append(Annotation(TimeInterval(TimePoint(10), TimePoint(13))))
+        self.assertEquals(tier.Rindex(TimePoint(13)), 9)
+        self.assertEquals(tier.Mindex(TimePoint(12), 0), 9)
+        self.assertEquals(len(tier.Find(TimePoint(9.5), TimePoint(13))), 2)
+
+    def test_IndexUpdate2(self):
+        import random
+        random.seed(7)
+        tier = Tier()
+        other = Tier()
+        for i in range(200):
+            a = Annotation(TimeInterval(TimePoint(i), TimePoint(i+1)))
+            tier.Append(a)
+            other.Append(a.Copy())
+
+        # modifications of the placements of a tier only change the entries
+        # of the modified annotations in its index.
+        for k in range(300):
+            i = random.randrange(200)
+            location = tier[i].GetLocation()
+            if k % 3 == 0:
+                location.SetEnd(TimePoint(location.GetEnd().GetMidpoint() + random.random()))
+            elif k % 3 == 1:
+                location.GetBegin().SetMidpoint(max(0., location.GetBegin().GetMidpoint() - random.random()))
+            else:
+                location.GetEnd().SetRadius(random.random() / 10.)
+            time = TimePoint(random.uniform(0, 200))
+            expected = [a for a in tier
+                        if a.GetLocation().GetBegin() < time < a.GetLocation().GetEnd()]
+            index = tier.Mindex(time, 0)
+            if expected:
+                self.assertIs(tier[index], expected[0])
+            else:
+                self.assertEquals(index, -1)
+            self.assertEquals(tier.Rindex(location.GetEnd()),
+                              min(j for j, a in enumerate(tier)
+                                  if a.GetLocation().GetEnd() == location.GetEnd()))
+            self.assertEquals(tier.Lindex(location.GetBegin()),
+                              min(j for j, a in enumerate(tier)
+                                  if a.GetLocation().GetBegin() == location.GetBegin()))
+
+        # the other tier was not changed
+        self.assertEquals(other.Rindex(TimePoint(200)), 199)
+
+    def test_IndexUpdate3(self):
+        tier = Tier()
+        for i in range(10):
+            tier.Append(Annotation(TimeInterval(TimePoint(i), TimePoint(i+1))))
+        self.assertEquals(tier.Rindex(TimePoint(5)), 4)
+
+        # a point shared by two annotations
+        point = tier[4].GetLocation().GetEnd()
+        tier[5].GetLocation().SetBegin(point)
+        point.SetMidpoint(5.5)
+        self.assertEquals(tier.Rindex(TimePoint(5.5)), 4)
+        self.assertEquals(tier.Lindex(TimePoint(5.5)), 5)
+        self.assertEquals(tier.Lindex(TimePoint(5)), -1)
+
+        # the best localization changes with a score
+        localization = Localization(TimeInterval(TimePoint(20), TimePoint(21)), 0.5)
+        tier[9].GetLocation().AddValue(localization)
+        self.assertEquals(tier.Rindex(TimePoint(21)), -1)
+        localization.SetScore(2.)
+        self.assertEquals(tier.Rindex(TimePoint(21)), 9)
+        self.assertEquals(tier.Rindex(TimePoint(10)), -1)
+
+        # more modifications than the kept ones
+        for i in range(baseplacement.MAX_CHANGES + 1):
+            TimePoint(1).SetMidpoint(2)
+        tier[0].GetLocation().GetBegin().SetMidpoint(0.5)
+        self.assertEquals(tier.Lindex(TimePoint(0.5)), 0)
+        self.assertEquals(tier.Mindex(TimePoint(0.75), 0), 0)
+
+        # new placements are not declared as modified
+        count = baseplacement.get_modifications()
+        Annotation(Location(Localization(TimeInterval(TimePoint(1), TimePoint(2)), 0.5)))
+        self.assertEquals(baseplacement.get_modifications(), count)
+
+    def test_IndexUpdateTime(self):
+        import time
+        tier = Tier()
+        for i in range(5000):
+            tier.Append(Annotation(TimeInterval(TimePoint(i), TimePoint(i+1))))
+        self.assertEquals(len(tier.Find(TimePoint(0), TimePoint(1))), 1)
+
+        # mutate-then-find: the index must not be rebuilt each time
+        start = time.time()
+        for i in range(0, 4000, 4):
+            location = tier[i].GetLocation()
+            location.SetEnd(TimePoint(i+1))
+            location.GetBegin().SetMidpoint(i)
+            self.assertEquals(len(tier.Find(TimePoint(i), TimePoint(i+1))), 1)
+        self.assertLess(time.time() - start, 5.)
+
     def test_Near(self):
         # IntervalTier
         tier = Tier()
@@ -421,6 +601,9 @@ class TestTier(unittest.TestCase):
         index = tier.Near(time=2, direction=-1)
         self.assertEquals(index, 0)
 
+        index = tier.Near(time=3.5, direction=-1)
+        self.assertEquals(index, 0)
+
         index = tier.Near(time=2, direction=0)
         # same distance between both annotations, both should be ok!
         self.assertEquals(index, 0)
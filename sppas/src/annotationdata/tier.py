@@ -43,6 +43,7 @@ __copyright__ = """Copyright (C) 2011-2015  Brigitte Bigi"""
 
 from annotation  import Annotation
 from ptime.point import TimePoint
+from tierindex   import TierIndex
 from meta        import MetaObject
 
 from utils.deprecated import deprecated
@@ -74,6 +75,7 @@ class Tier( MetaObject ):
         """
         super(Tier, self).__init__()
         self.__ann = []
+        self.__index     = None
         self.__parent    = None
         self.__data_type = "str"
         self.__ctrlvocab = None
@@ -487,18 +489,21 @@ class Tier( MetaObject ):
         if begin > self.GetEnd() or end < self.GetBegin():
             return []
 
+        tierindex = self.__get_index()
+
         if overlaps is True:
-            index = self.__find(begin)
+            index = tierindex.find(begin)
             anns = list()
-            for a in self.__ann[index:]:
-                if a.GetLocation().IsPoint() and a.GetLocation().GetPoint() > end:
-                    return anns
-                if a.GetLocation().IsInterval() and a.GetLocation().GetBegin() >= end:
+            for i in range(index, len(self.__ann)):
+                if tierindex.ispoint[i] is True:
+                    if tierindex.begins[i] > end:
+                        return anns
+                elif self.__ann[i].GetLocation().IsInterval() and tierindex.begins[i] >= end:
                     return anns
-                anns.append(a)
+                anns.append(self.__ann[i])
             return anns
 
-        if self.IsPoint():
+        if tierindex.allpoints is True:
             lo = self.Index(begin)
             hi = self.Index(end)
             if -1 in (lo, hi):
@@ -531,23 +536,21 @@ class Tier( MetaObject ):
 
         """
         annotations = []
-        if self.IsPoint():
+        if self.IsEmpty():
+            return annotations
+
+        tierindex = self.__get_index()
+        if tierindex.allpoints is True:
             index = self.Index(time)
-            if index == -1:
-                return annotations
-            for i in range(index, self.GetSize()):
-                a = self._ann[i]
-                if a.GetLocation().GetPoint() == time:
-                    annotations.append(a)
-                else: break
         else:
             index = self.Lindex(time)
-            if index == -1: return []
-            for i in range(index, self.GetSize()):
-                a = self.__ann[i]
-                if a.GetLocation().GetBegin() == time:
-                    annotations.append(a)
-                else: break
+        if index == -1:
+            return annotations
+
+        for i in range(index, self.GetSize()):
+            if tierindex.begins[i] == time:
+                annotations.append(self.__ann[i])
+            else: break
         return annotations
 
     # -----------------------------------------------------------------------
@@ -558,7 +561,9 @@ class Tier( MetaObject ):
 
         """
         annotations = []
-        if self.IsPoint():
+        if self.IsEmpty():
+            return annotations
+        if self.__get_index().allpoints is True:
             return self.GetAnnotationsStartAt(time)
 
         index = self.Rindex(time)
@@ -575,40 +580,6 @@ class Tier( MetaObject ):
 
     # -----------------------------------------------------------------------
 
-    def __find(self, x, direction=1):
-        """
-        Return the index of the annotation whose time value containing x.
-
-        @param x: (TimePoint)
-
-        """
-        lo = 0
-        hi = self.GetSize() - 1
-        while lo < hi:
-            mid = (lo + hi) / 2
-            a = self.__ann[mid]
-            if a.GetLocation().IsPoint():
-                if a.GetLocation().GetPoint() == x:
-                    return mid
-                if x < a.GetLocation().GetPoint():
-                    hi = mid
-                else:
-                    lo = mid + 1
-            else:  # Interval or Disjoint
-                if a.GetLocation().GetBegin() == x or a.GetLocation().GetBegin() < x < a.GetLocation().GetEnd(): # only compare to the location with the highest score
-                    return mid
-                if x < a.GetLocation().GetEnd():
-                    hi = mid
-                else:
-                    lo = mid + 1
-
-        # We failed to find an annotation at time=x. return the closest...
-        if direction == 1:
-            return hi
-        return mid
-
-    # -----------------------------------------------------------------------
-
     def Index(self, time):
         """
         Return the index of the time point (int), or -1.
@@ -618,33 +589,12 @@ class Tier( MetaObject ):
         @param time: (TimePoint)
 
         """
-        if self.IsPoint() is False:
-            return -1
-        lo = 0
-        hi = self.GetSize()
-        found = False
-        while lo < hi:
-            mid = (lo + hi) // 2
-            a = self.__ann[mid]
-            if time < a.GetLocation().GetPoint():
-                hi = mid
-            elif time > a.GetLocation().GetPoint():
-                lo = mid + 1
-            else:
-                found = True
-                break
-        if not found:
+        if self.IsEmpty() or self.__get_index().allpoints is False:
             return -1
+
         # if the tier contains more than one annotation with the same point value,
         # the method returns the first one
-        first = mid
-        for i in range(mid, -1, -1):
-            a = self.__ann[i]
-            if a.GetLocation().GetPoint() == time:
-                first = i
-            else: break
-
-        return first
+        return self.__get_index().lindex(time)
 
     # ------------------------------------------------------------------------
 
@@ -656,39 +606,9 @@ class Tier( MetaObject ):
         @param time (TimePoint)
 
         """
-        lo = 0
-        hi = self.GetSize()
-        found = False
-        while lo < hi:
-            mid = (lo + hi) // 2
-            a = self.__ann[mid]
-            if a.GetLocation().IsPoint():
-                p = a.GetLocation().GetPoint()
-            else:
-                p = a.GetLocation().GetBegin()
-            if time < p:
-                hi = mid
-            elif time > p:
-                lo = mid + 1
-            else:
-                found = True
-                break
-
-        if not found:
-            return -1
         # if the tier contains more than one annotation with the same begin value,
         # the method returns the first one
-        first = mid
-        for i in range(mid, -1, -1):
-            a = self.__ann[i]
-            if a.GetLocation().IsPoint():
-                p = a.GetLocation().GetPoint()
-            else:
-                p = a.GetLocation().GetBegin()
-            if p == time:
-                first = i
-            else: break
-        return first
+        return self.__get_index().lindex(time)
 
     # ------------------------------------------------------------------------
 
@@ -701,18 +621,7 @@ class Tier( MetaObject ):
         @param direction: (int)
 
         """
-        for i, a in enumerate(self):
-            if a.GetLocation().IsPoint() is False:
-                if direction == -1:
-                    if a.GetLocation().GetBegin() <= time < a.GetLocation().GetEnd():
-                        return i
-                elif direction == 1:
-                    if a.GetLocation().GetBegin() < time <= a.GetLocation().GetEnd():
-                        return i
-                else:
-                    if a.GetLocation().GetBegin() < time < a.GetLocation().GetEnd():
-                        return i
-        return -1
+        return self.__get_index().mindex(time, direction)
 
     # ------------------------------------------------------------------------
 
@@ -724,43 +633,9 @@ class Tier( MetaObject ):
         @param time: (TimePoint)
 
         """
-        lo = 0
-        hi = len(self.__ann)
-        found = False
-
-        while lo < hi:
-            mid = (lo + hi) // 2
-            a = self.__ann[mid]
-            if a.GetLocation().IsPoint():
-                p = a.GetLocation().GetPoint()
-            else:
-                p = a.GetLocation().GetEnd()
-            if time < p:
-                hi = mid
-            elif time > p:
-                lo = mid + 1
-            else:
-                found = True
-                break
-
-        if not found:
-            return -1
-
         # if the tier contains more than one annotation with the same end value,
         # the method returns the first one
-        first = mid
-        for i in range(mid, -1, -1):
-            a = self.__ann[i]
-            if a.GetLocation().IsPoint():
-                p = a.GetLocation().GetPoint()
-            else:
-                p = a.GetLocation().GetEnd()
-            if p == time:
-                first = i
-            else:
-                break
-
-        return first
+        return self.__get_index().rindex(time)
 
     # ------------------------------------------------------------------------
 
@@ -781,7 +656,7 @@ class Tier( MetaObject ):
         if self.GetSize() == 1:
             return 0
 
-        index = self.__find(time, direction)
+        index = self.__get_index().find(time, direction)
         if index == -1:
             return -1
 
@@ -805,7 +680,7 @@ class Tier( MetaObject ):
         elif direction == -1:
             if self.__ann[index].GetLocation().GetEnd() <= time:
                 return index
-            if index-1 > 0:
+            if index-1 >= 0:
                 return index-1
             return -1
 
@@ -897,6 +772,7 @@ class Tier( MetaObject ):
         annotations = self.Find(begin, end, overlaps)
         for a in annotations:
             self.__ann.remove(a)
+        self.__index = None
 
         return len(annotations)
 
@@ -912,7 +788,9 @@ class Tier( MetaObject ):
 
         """
         try:
-            return self.__ann.pop(i)
+            annotation = self.__ann.pop(i)
+            self.__index = None
+            return annotation
         except IndexError:
             raise IndexError("Can not pop annotation %d. Empty tier."%i)
 
@@ -925,7 +803,7 @@ class Tier( MetaObject ):
         @param annotation: (Annotation)
 
         """
-        self.__validate_annotation(annotation)
+        self.__validate_annotations([annotation])
 
         # Check if hierarchy
         reftier = self.GetReferenceTier()
@@ -982,6 +860,12 @@ class Tier( MetaObject ):
             else:
                 self.__ann.append(annotation)
 
+        # The annotation is appended at the end: no need to rebuild the index
+        if self.__index is not None and self.__index.update() is True:
+            self.__index.append(annotation)
+        else:
+            self.__index = None
+
     # -----------------------------------------------------------------------
 
     def Add(self, annotation):
@@ -991,7 +875,7 @@ class Tier( MetaObject ):
         @param annotation: (Annotation)
 
         """
-        self.__validate_annotation(annotation)
+        self.__validate_annotations([annotation])
 
         if self.IsEmpty():
             lo = 0
@@ -1018,6 +902,7 @@ class Tier( MetaObject ):
                         lo += 1
 
             self.__ann.insert(lo, annotation)
+        self.__index = None
 
         reftier = self.GetReferenceTier()
         if reftier is None or reftier.IsSuperset(self):
@@ -1028,26 +913,94 @@ class Tier( MetaObject ):
 
     # -----------------------------------------------------------------------
 
-    def __validate_annotation(self, annotation):
+    def Extend(self, annotations, presorted=False):
+        """
+        Add a list of annotations to the tier.
+
+        The instances, the controlled vocabulary and the hierarchy are
+        checked once for the whole list, then the annotations are added in
+        a single step: it is much faster than a loop of Add() or Append()
+        when a tier is created.
+
+        @param annotations: (list of Annotation)
+        @param presorted: (bool) The caller guarantees that the annotations
+        are sorted by begin then by end: their order is not checked. If
+        False, the list is sorted, as Add() does.
+
+        """
+        annotations = list(annotations)
+        if len(annotations) == 0:
+            return
+
+        self.__validate_annotations(annotations)
+
+        # Check if hierarchy
+        reftier = self.GetReferenceTier()
+        if reftier is not None and reftier.IsSuperset(annotations) is False:
+            raise ValueError("Attempt to extend a child tier, but reference has no corresponding time points.")
+
+        # Add sorted annotations to an empty tier: the index is created when
+        # it is required
+        if presorted is True and self.IsEmpty():
+            self.__ann.extend(annotations)
+            self.__index = None
+            return
+
+        # Sort as Add() does: by begin then by end
+        newindex = TierIndex(annotations)
+        keys = zip(newindex.bvalues, newindex.evalues)
+        if presorted is False:
+            order = range(len(annotations))
+            order.sort(key=lambda i: keys[i])
+            if order != range(len(annotations)):
+                annotations = [annotations[i] for i in order]
+                keys = [keys[i] for i in order]
+                newindex = None
+
+        # Add:
+        if self.IsEmpty():
+            self.__ann.extend(annotations)
+            self.__index = newindex
+            return
+
+        index = self.__get_index()
+        if keys[0] >= (index.bvalues[-1], index.evalues[-1]):
+            # The annotations are appended at the end: the index is updated
+            self.__ann.extend(annotations)
+            for annotation in annotations:
+                index.append(annotation)
+        else:
+            allkeys = zip(index.bvalues, index.evalues) + keys
+            allann = self.__ann + annotations
+            order = range(len(allann))
+            order.sort(key=lambda i: allkeys[i])
+            self.__ann = [allann[i] for i in order]
+            self.__index = None
+
+    # -----------------------------------------------------------------------
+
+    def __validate_annotations(self, annotations):
 
-        # Check instance:
+        # Check instances:
 
-        if isinstance(annotation, Annotation) is False:
-            raise TypeError(
-                "Annotation argument required, not %r." % annotation)
+        for annotation in annotations:
+            if isinstance(annotation, Annotation) is False:
+                raise TypeError(
+                    "Annotation argument required, not %r." % annotation)
 
-        # Check Label:
+        # Check Labels:
 
         # Check if controlled vocabulary
         if self.__ctrlvocab is not None:
-            for word in annotation.GetLabel().GetLabels():
-                if self.__ctrlvocab.Contains(word.GetValue()) is False and word.GetValue() != '':
-                    # hum... praat needs empty values
-                    raise ValueError(
-                        "Attempt to append a free-annotation-label %s "
-                        "in a controlled vocabulary tier." % (word.GetValue()))
+            for annotation in annotations:
+                for word in annotation.GetLabel().GetLabels():
+                    if self.__ctrlvocab.Contains(word.GetValue()) is False and word.GetValue() != '':
+                        # hum... praat needs empty values
+                        raise ValueError(
+                            "Attempt to append a free-annotation-label %s "
+                            "in a controlled vocabulary tier." % (word.GetValue()))
 
-        # Check Location:
+        # Check Locations:
 
         # Check if hierarchy is preserved
         if self.GetTranscription() is not None:
@@ -1060,19 +1013,20 @@ class Tier( MetaObject ):
                 if link_type == "TimeAssociation":
                     raise Exception("Attempt a modification in a Tier that invalidates its hierarchy.")
                 if link_type == "TimeAlignment":
-                    # The parent must have such location...
-                    if annotation.GetLocation().IsPoint():
-                        i = parent_tier.Index(annotation.GetLocation().GetPoint())
-                        if i == -1:
-                            raise Exception("Attempt a modification in a Tier that invalidates its hierarchy.")
-                    else:
-                        l = parent_tier.Lindex(annotation.GetLocation().GetBegin())
-                        if l == -1:
-                            raise Exception("Attempt a modification in a Tier that invalidates its hierarchy.")
-
-                        r = parent_tier.Rindex(annotation.GetLocation().GetEnd())
-                        if r == -1:
-                            raise Exception("Attempt a modification in a Tier that invalidates its hierarchy.")
+                    # The parent must have such locations...
+                    for annotation in annotations:
+                        if annotation.GetLocation().IsPoint():
+                            i = parent_tier.Index(annotation.GetLocation().GetPoint())
+                            if i == -1:
+                                raise Exception("Attempt a modification in a Tier that invalidates its hierarchy.")
+                        else:
+                            l = parent_tier.Lindex(annotation.GetLocation().GetBegin())
+                            if l == -1:
+                                raise Exception("Attempt a modification in a Tier that invalidates its hierarchy.")
+
+                            r = parent_tier.Rindex(annotation.GetLocation().GetEnd())
+                            if r == -1:
+                                raise Exception("Attempt a modification in a Tier that invalidates its hierarchy.")
 
             # if current tier is a parent
             for child_tier in hierarchy.get_children(self):
@@ -1090,12 +1044,26 @@ class Tier( MetaObject ):
         import copy
         newTier = copy.copy(self)
         newTier.__ann = copy.deepcopy(self.__ann)
+        newTier.__index = None
         newTier.__data_type = copy.deepcopy(self.__data_type)
         newTier.__name = copy.deepcopy(self.__name)
         return newTier
 
     # -----------------------------------------------------------------------
 
+    def __get_index(self):
+        """
+        Return the index of the time values of the annotations.
+        It is created when required, and the entries of the annotations
+        whose placements were modified are updated.
+
+        """
+        if self.__index is None or self.__index.update() is False:
+            self.__index = TierIndex(self.__ann)
+        return self.__index
+
+    # -----------------------------------------------------------------------
+
     def GetReferenceTier(self):
         """
         Return the reference tier of self, or None.
@@ -0,0 +1,405 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+# ---------------------------------------------------------------------------
+#            ___   __    __    __    ___
+#           /     |  \  |  \  |  \  /              Automatic
+#           \__   |__/  |__/  |___| \__             Annotation
+#              \  |     |     |   |    \             of
+#           ___/  |     |     |   | ___/              Speech
+#
+#
+#                           http://www.sppas.org/
+#
+# ---------------------------------------------------------------------------
+#            Laboratoire Parole et Langage, Aix-en-Provence, France
+#                   Copyright (C) 2011-2016  Brigitte Bigi
+#
+#                   This banner notice must not be removed
+# ---------------------------------------------------------------------------
+# Use of this software is governed by the GNU Public License, version 3.
+#
+# SPPAS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SPPAS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+# File: tierindex.py
+# ----------------------------------------------------------------------------
+
+__docformat__ = """epytext"""
+__authors__   = """Brigitte Bigi (brigitte.bigi@gmail.com)"""
+__copyright__ = """Copyright (C) 2011-2016  Brigitte Bigi"""
+
+# ---------------------------------------------------------------------------
+
+import bisect
+
+from ptime import baseplacement
+
+# ---------------------------------------------------------------------------
+
+class TierIndex( object ):
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL, v3
+    @summary: An index of the time values of the annotations of a tier.
+
+    For each annotation, the index stores the begin and end points of its
+    localization with the best score (the point, for a point), their
+    midpoint values and the maximum of the end values of all the previous
+    annotations. Annotations of a tier are sorted by their begin values:
+    a binary search on the midpoint values, enlarged by the highest radius,
+    gives the few candidates which are then compared to the points.
+
+    The placements declare their modifications, with their time span before
+    the modification (see ptime.baseplacement.modified()): update() reads
+    again the annotations of these spans. A Tier re-creates its index when
+    its list of annotations is modified.
+
+    """
+    def __init__(self, annotations=None):
+        """
+        Create a new TierIndex instance.
+
+        @param annotations (list) The sorted list of annotations of a tier.
+
+        """
+        self.begins   = []    # TimePoint/FramePoint instances
+        self.ends     = []
+        self.bvalues  = []    # midpoint values of begins
+        self.evalues  = []    # midpoint values of ends
+        self.maxends  = []    # max of the midpoint values of ends so far
+        self.ispoint  = []
+        self.radius   = 0.
+        self.bsorted  = True  # bvalues are sorted
+        self.esorted  = True  # evalues are sorted
+        self.allpoints = True
+        self.annotations = []
+        self.modifications = baseplacement.get_modifications()
+        self.valid    = True
+
+        self.__bdesc = 0      # number of bvalues lesser than the previous one
+        self.__edesc = 0      # number of evalues lesser than the previous one
+        self.__nintervals = 0
+
+        if annotations is not None:
+            for annotation in annotations:
+                self.append( annotation )
+
+    # -----------------------------------------------------------------------
+
+    def update(self):
+        """
+        Update the entries of the annotations modified since the last update.
+
+        @return False if the index has to be re-created.
+
+        """
+        if self.valid is False:
+            return False
+        changes = baseplacement.get_changes(self.modifications)
+        if changes is None:
+            return False
+        self.modifications += len(changes)
+
+        for span in changes:
+            if span is None:
+                return False
+            # the entries of the modified annotations contain the span
+            if len(span) > 0:
+                for i in self.window(span[0], span[1]):
+                    self.__set(i, self.annotations[i])
+
+        return True
+
+    # -----------------------------------------------------------------------
+
+    def append(self, annotation):
+        """
+        Index an annotation appended at the end of the tier.
+
+        @param annotation (Annotation)
+
+        """
+        begin, end, ispoint = self.__read(annotation)
+        bvalue = begin.GetMidpoint()
+        evalue = end.GetMidpoint()
+        if len(self.bvalues) > 0:
+            if bvalue < self.bvalues[-1]:
+                self.__bdesc += 1
+            if evalue < self.evalues[-1]:
+                self.__edesc += 1
+            maxend = max(self.maxends[-1], evalue)
+        else:
+            maxend = evalue
+        if ispoint is False:
+            self.__nintervals += 1
+
+        self.annotations.append( annotation )
+        self.begins.append( begin )
+        self.ends.append( end )
+        self.bvalues.append( bvalue )
+        self.evalues.append( evalue )
+        self.maxends.append( maxend )
+        self.ispoint.append( ispoint )
+        self.radius = max(self.radius, begin.GetRadius(), end.GetRadius())
+        self.__set_flags()
+
+    # -----------------------------------------------------------------------
+
+    def find(self, x, direction=1):
+        """
+        Return the index of the annotation whose time value contains x,
+        or the closest one.
+
+        @param x (TimePoint)
+        @param direction (int)
+
+        """
+        lo = 0
+        hi = len(self.begins) - 1
+        mid = 0
+        while lo < hi:
+            mid = (lo + hi) / 2
+            if self.ispoint[mid] is True:
+                if self.begins[mid] == x:
+                    return mid
+                if x < self.begins[mid]:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            else:
+                if self.begins[mid] == x or self.begins[mid] < x < self.ends[mid]:
+                    return mid
+                if x < self.ends[mid]:
+                    hi = mid
+                else:
+                    lo = mid + 1
+
+        if direction == 1:
+            return hi
+        return mid
+
+    # -----------------------------------------------------------------------
+
+    def lindex(self, time):
+        """
+        Return the index of the first annotation starting at time, or -1.
+
+        @param time (TimePoint)
+
+        """
+        lo, hi = self.__window(self.bvalues, self.bsorted, time)
+        for i in range(lo, hi):
+            if self.begins[i] == time:
+                return i
+        return -1
+
+    # -----------------------------------------------------------------------
+
+    def rindex(self, time):
+        """
+        Return the index of the first annotation ending at time, or -1.
+
+        @param time (TimePoint)
+
+        """
+        lo, hi = self.__window(self.evalues, self.esorted, time)
+        for i in range(lo, hi):
+            if self.ends[i] == time:
+                return i
+        return -1
+
+    # -----------------------------------------------------------------------
+
+    def mindex(self, time, direction):
+        """
+        Return the index of the first interval containing time, or -1.
+
+        @param time (TimePoint)
+        @param direction (int)
+
+        """
+        lo = 0
+        hi = len(self.begins)
+        if self.bsorted is True:
+            # ends of the previous intervals are lesser than time,
+            # begins of the next ones are greater than time.
+            value, delta = self.__value(time)
+            lo = bisect.bisect_left(self.maxends, value - delta)
+            hi = bisect.bisect_right(self.bvalues, value + delta)
+
+        for i in range(lo, hi):
+            if self.ispoint[i] is True:
+                continue
+            b = self.begins[i]
+            e = self.ends[i]
+            if direction == -1:
+                if b <= time < e:
+                    return i
+            elif direction == 1:
+                if b < time <= e:
+                    return i
+            else:
+                if b < time < e:
+                    return i
+        return -1
+
+    def window(self, begin, end, before=0., after=0.):
+        """
+        Return the indexes of the annotations which are starting before
+        end+after and are ending after begin-before, in the order of the
+        tier.
+
+        @param begin (TimePoint)
+        @param end (TimePoint)
+        @param before (float) Delay before begin
+        @param after (float) Delay after end
+
+        """
+        value, delta = self.__value(begin)
+        start = value - before - delta
+        value, delta = self.__value(end)
+        stop = value + after + delta
+
+        # maxends are sorted, even if the ends are not.
+        lo = bisect.bisect_left(self.maxends, start)
+        hi = len(self.begins)
+        if self.bsorted is True:
+            hi = bisect.bisect_right(self.bvalues, stop)
+
+        return [i for i in range(lo, hi)
+                if self.evalues[i] >= start and self.bvalues[i] <= stop]
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    def __read(self, annotation):
+        """
+        Return the begin and end points of the annotation, and if it is a
+        point.
+
+        """
+        location = annotation.GetLocation()
+        ispoint = location.IsPoint()
+        if ispoint is True:
+            begin = end = location.GetPoint()
+        else:
+            begin = location.GetBegin()
+            end   = location.GetEnd()
+
+        return begin, end, ispoint
+
+    # -----------------------------------------------------------------------
+
+    def __set(self, i, annotation):
+        """
+        Update the entry of the i-th annotation.
+
+        """
+        begin, end, ispoint = self.__read(annotation)
+
+        self.__bdesc -= self.__count_desc(self.bvalues, i)
+        self.__edesc -= self.__count_desc(self.evalues, i)
+        if self.ispoint[i] is False:
+            self.__nintervals -= 1
+
+        self.begins[i]  = begin
+        self.ends[i]    = end
+        self.bvalues[i] = begin.GetMidpoint()
+        self.evalues[i] = end.GetMidpoint()
+        self.ispoint[i] = ispoint
+
+        self.__bdesc += self.__count_desc(self.bvalues, i)
+        self.__edesc += self.__count_desc(self.evalues, i)
+        if ispoint is False:
+            self.__nintervals += 1
+
+        # the radius can only increase: a larger one only enlarges windows
+        self.radius = max(self.radius, begin.GetRadius(), end.GetRadius())
+
+        # the max of the end values changes until it reaches the previous one
+        maxend = self.maxends[i-1] if i > 0 else self.evalues[i]
+        for j in range(i, len(self.evalues)):
+            maxend = max(maxend, self.evalues[j])
+            if self.maxends[j] == maxend:
+                break
+            self.maxends[j] = maxend
+
+        self.__set_flags()
+
+    # -----------------------------------------------------------------------
+
+    def __count_desc(self, values, i):
+        """
+        Return the number of values lesser than the previous one, among
+        the i-th and the next one.
+
+        """
+        count = 0
+        for j in (i, i+1):
+            if 0 < j < len(values) and values[j] < values[j-1]:
+                count += 1
+        return count
+
+    # -----------------------------------------------------------------------
+
+    def __set_flags(self):
+        self.bsorted   = (self.__bdesc == 0)
+        self.esorted   = (self.__edesc == 0)
+        self.allpoints = (self.__nintervals == 0)
+
+    # -----------------------------------------------------------------------
+
+    def __value(self, time):
+        """
+        Return the midpoint value of time and the delta to be used for
+        the search of candidates.
+
+        """
+        try:
+            value  = time.GetMidpoint()
+            radius = time.GetRadius()
+        except AttributeError:
+            value  = float(time)
+            radius = 0.
+        # also take care of rounding errors
+        return value, self.radius + radius + 1e-9
+
+    # -----------------------------------------------------------------------
+
+    def __window(self, values, issorted, time):
+        """
+        Return the range of indexes of the values which can be equal to time.
+
+        """
+        if issorted is False:
+            return 0, len(values)
+        value, delta = self.__value(time)
+        return bisect.bisect_left(values, value - delta), bisect.bisect_right(values, value + delta)
+
+    # -----------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.begins)
+
+    def __getstate__(self):
+        # the modifications are counted by process: it must be re-created.
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.valid = False
+
+# ---------------------------------------------------------------------------
@@ -38,10 +38,18 @@
 import os
 import random
 import shutil
+import tempfile
+import threading
 from datetime import date
 
 from resources.acm.tiedlist import TiedList
 from resources.rutils import to_strip
+from utils.fileutils import replace_file, file_lock
+
+# Tracks can be aligned concurrently, by threads or by the processes of a
+# pool: the tiedlist file of a model must be updated by only one of them at
+# a time (the lock of the file is taken by only one thread of a process).
+_tiedlist_lock = threading.Lock()
 
 # ---------------------------------------------------------------------------
 
@@ -132,6 +140,38 @@ class BaseAligner:
 
         @param entries (list) List of missing entries into the tiedlist.
 
+        """
+        tiedfile = os.path.join(self._model, "tiedlist")
+        if os.path.exists( tiedfile ) is False:
+            return []
+
+        with _tiedlist_lock, file_lock(tiedfile):
+            return self._add_tiedlist(entries)
+
+    # -----------------------------------------------------------------------
+
+    def get_tiedlist_version(self):
+        """
+        Return the version of the tiedlist of the model, or None: it changes
+        each time the tiedlist is modified, by any process. An aligner which
+        loaded the tiedlist before a modification must load it again.
+
+        """
+        try:
+            st = os.stat( os.path.join(self._model, "tiedlist") )
+        except OSError:
+            return None
+
+        # the modified tiedlist is a new file (see _add_tiedlist)
+        return (st.st_mtime, st.st_ino, st.st_size)
+
+    # -----------------------------------------------------------------------
+
+    def _add_tiedlist(self, entries):
+        """
+        Add missing entries in the tiedlist of the model (the tiedlist must
+        be locked, see add_tiedlist).
+
         """
         tiedfile = os.path.join(self._model, "tiedlist")
         if os.path.exists( tiedfile ) is False:
@@ -151,7 +191,19 @@ class BaseAligner:
             randval        = str(int(random.random()*10000))
             backuptiedfile = os.path.join(self._model, "tiedlist."+today+"."+randval)
             shutil.copy( tiedfile,backuptiedfile )
-            tie.save( tiedfile )
+
+            # the tiedlist is replaced at once: an aligner which is starting
+            # loads either the old or the new one, never a part of it.
+            fd, tmpfile = tempfile.mkstemp(prefix="tiedlist.", dir=self._model)
+            os.close(fd)
+            try:
+                tie.save( tmpfile )
+                shutil.copymode( tiedfile, tmpfile )
+                replace_file( tmpfile, tiedfile )
+            except Exception:
+                if os.path.exists( tmpfile ):
+                    os.remove( tmpfile )
+                raise
 
         return addentries
 
@@ -81,7 +81,7 @@ class BasicAligner( BaseAligner ):
 
         """
         ext = ext.lower()
-        if not ext in BasicAligner.BASIC_EXT_OUT:
+        if not ext in BASIC_EXT_OUT:
             raise ValueError("%s is not a valid file extension for BasicAligner"%ext)
 
         self._outext = ext
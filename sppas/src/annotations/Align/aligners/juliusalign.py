@@ -36,7 +36,12 @@
 # ----------------------------------------------------------------------------
 
 import os
+import re
 import codecs
+import logging
+import socket
+import tempfile
+import time
 from subprocess import Popen, PIPE, STDOUT
 
 from sp_glob import encoding
@@ -52,6 +57,13 @@ from resources.dictpron import DictPron
 # ----------------------------------------------------------------------------
 JULIUS_EXT_OUT = ["palign","walign"]
 DEFAULT_EXT_OUT = JULIUS_EXT_OUT[0]
+JULIUS_COMMAND  = "julius"
+
+# the attributes of a tag, in the messages of the module mode of julius
+JULIUS_ATTRIBUTE = re.compile(r'(\w+)="([^"]*)"')
+# a phoneme of the forced alignment (option -palign), as julius sends it
+# in the <ALIGN TYPE="phoneme"> message of the module mode
+JULIUS_ALIGN_PHONEME = re.compile(r'^<PHONEME PHONE="([^"]+)" BEGINFRAME="(\d+)" ENDFRAME="(\d+)" SCORE="([^"]+)"/>$')
 # ----------------------------------------------------------------------------
 
 class JuliusAligner( BaseAligner ):
@@ -133,6 +145,11 @@ class JuliusAligner( BaseAligner ):
         BaseAligner.__init__(self, modeldir)
         self._outext = DEFAULT_EXT_OUT
 
+        # A long-lived julius, if a session is opened (see open_session)
+        self._sessioncmd = None
+        self._session    = None
+        self._sessiontie = 0    # version of the tiedlist loaded by the session
+
     # ------------------------------------------------------------------------
 
     def set_outext(self, ext):
@@ -228,65 +245,72 @@ class JuliusAligner( BaseAligner ):
 
     # ------------------------------------------------------------------------
 
-    def run_julius(self, inputwav, basename, outputalign):
+    def get_julius_options(self, basename):
         """
-        Perform the speech segmentation.
-        System call to the command `julius`.
+        Return the list of the options of the command `julius`, to align
+        data with the dependencies of a given base name.
 
-        @param inputwav (str - IN) the audio input file name, of type PCM-WAV 16000 Hz, 16 bits
         @param basename (str - IN) the base name of the grammar file and of the dictionary file
-        @param outputalign (str - OUT) the output file name
+        @return list of str
 
         """
-        # Fix file names
         tiedlist = os.path.join(self._model, "tiedlist")
         config   = os.path.join(self._model, "config")
-        # Fix file names and protect special characters.
-        hmmdefs    = '"' + os.path.join(self._model, "hmmdefs").replace('"', '\\"') + '"'
-        output     = '"' + outputalign.replace('"', '\\"') + '"'
-        dictionary = '"' + basename.replace('"', '\\"') + ".dict" + '"'
-        grammar    = '"' + basename.replace('"', '\\"') + ".dfa"  + '"'
-        slm        = '"' + basename.replace('"', '\\"') + ".arpa" + '"'
-
-        # the command
-        command = "echo " + inputwav + " | julius "
 
         # the global decoding parameters
-        command += " -input file -gprune safe -iwcd1 max -smpFreq 16000"
-        command += ' -multipath -iwsppenalty -70.0 -spmodel "sp"'
-        command += " -b 1000 -b2 1000 -sb 1000.0 -m 10000 "
+        options = [ "-input", "file", "-gprune", "safe", "-iwcd1", "max", "-smpFreq", "16000" ]
+        options.extend([ "-multipath", "-iwsppenalty", "-70.0", "-spmodel", "sp" ])
+        options.extend([ "-b", "1000", "-b2", "1000", "-sb", "1000.0", "-m", "10000" ])
 
         # 1. the acoustic model
-        command += " -h " + hmmdefs
+        options.extend([ "-h", os.path.join(self._model, "hmmdefs") ])
         if os.path.isfile(tiedlist):
-            command += " -hlist " + '"' + tiedlist.replace('"', '\\"') + '"'
+            options.extend([ "-hlist", tiedlist ])
         if os.path.isfile(config):
             # force Julius to use configuration file of HTK, by David Yeung
-            command += " -htkconf " + '"' + config.replace('"', '\\"') + '"'
+            options.extend([ "-htkconf", config ])
 
         # 2. the pronunciation dictionary
-        command += " -v " + dictionary
+        options.extend([ "-v", basename + ".dict" ])
 
         # 3. the language model
         if self._outext == "palign":
             # grammar-based forced-alignment
-            command += " -looktrellis "
-            command += " -palign"
-            command += " -dfa " + grammar
+            options.extend([ "-looktrellis", "-palign", "-dfa", basename + ".dfa" ])
         else:
             # slm-based speech recognition
-            command += " -silhead "+ '"' + START_SENT_SYMBOL + '"'
-            command += " -siltail "+ '"' + END_SENT_SYMBOL   + '"'
-            command += " -walign "
-            command += " -nlr " + slm
+            options.extend([ "-silhead", START_SENT_SYMBOL, "-siltail", END_SENT_SYMBOL ])
+            options.extend([ "-walign", "-nlr", basename + ".arpa" ])
 
         # options
         if self._infersp is True:
             # inter-word short pause = on (append "sp" for each word tail)
-            command += ' -iwsp'
+            options.append( "-iwsp" )
+
+        return options
+
+    # ------------------------------------------------------------------------
+
+    def run_julius(self, inputwav, basename, outputalign):
+        """
+        Perform the speech segmentation.
+        System call to the command `julius`.
+
+        @param inputwav (str - IN) the audio input file name, of type PCM-WAV 16000 Hz, 16 bits
+        @param basename (str - IN) the base name of the grammar file and of the dictionary file
+        @param outputalign (str - OUT) the output file name
+
+        """
+        # the command, with protected special characters of the options
+        command = "echo " + inputwav + " | " + JULIUS_COMMAND + " "
+        for option in self.get_julius_options(basename):
+            if option.startswith("-"):
+                command += " " + option
+            else:
+                command += ' "' + option.replace('"', '\\"') + '"'
 
         # output of the command
-        command += " > " + output
+        command += ' > "' + outputalign.replace('"', '\\"') + '"'
 
         # Execute the command
         p = Popen(command, shell=True, stdout=PIPE, stderr=STDOUT)
@@ -303,7 +327,62 @@ class JuliusAligner( BaseAligner ):
 
         # Check output file
         if os.path.isfile( outputalign ) is False:
-            raise Exception( "julius did not created an alignment file." )
+            raise Exception( "julius did not create an alignment file." )
+
+    # ------------------------------------------------------------------------
+
+    def open_session(self, command=JULIUS_COMMAND):
+        """
+        Align the next units with a long-lived julius (see JuliusSession),
+        instead of starting julius for each unit.
+        Julius is started when the first unit is aligned.
+
+        @param command (str or list) the command to start julius
+
+        """
+        self.close_session()
+        self._sessioncmd = command
+
+    # ------------------------------------------------------------------------
+
+    def close_session(self):
+        """
+        Stop the long-lived julius, if any.
+
+        """
+        if self._session is not None:
+            self._session.close()
+        self._session    = None
+        self._sessioncmd = None
+
+    # ------------------------------------------------------------------------
+
+    def run_session(self, inputwav, basename, outputalign):
+        """
+        Perform the speech segmentation with the long-lived julius.
+        If the session can't be used, julius is started for this unit only,
+        and the session is closed.
+
+        @param inputwav (str - IN) the audio input file name, of type PCM-WAV 16000 Hz, 16 bits
+        @param basename (str - IN) the base name of the grammar file and of the dictionary file
+        @param outputalign (str - OUT) the output file name
+
+        """
+        # the tiedlist was modified (by this aligner or another one) since
+        # the session started: julius must load the model again.
+        if self._session is not None and self._sessiontie != self.get_tiedlist_version():
+            self._session.close()
+            self._session = None
+
+        try:
+            if self._session is None:
+                self._sessiontie = self.get_tiedlist_version()
+                self._session = JuliusSession(self._sessioncmd, self.get_julius_options(basename))
+            self._session.align(inputwav, basename, outputalign)
+        except Exception as e:
+            logging.warning('julius session closed, julius is started for each next unit: %s' % e)
+            self.close_session()
+            self.run_julius(inputwav, basename, outputalign)
 
     # ------------------------------------------------------------------------
 
@@ -330,7 +409,11 @@ class JuliusAligner( BaseAligner ):
         else:
             self.gen_slm_dependencies(basename)
 
-        self.run_julius(inputwav, basename, outputalign)
+        tiedversion = self.get_tiedlist_version()
+        if self._sessioncmd is not None and self._outext == "palign":
+            self.run_session(inputwav, basename, outputalign)
+        else:
+            self.run_julius(inputwav, basename, outputalign)
         with codecs.open(outputalign, 'r', encoding) as f:
             lines = f.readlines()
 
@@ -351,6 +434,9 @@ class JuliusAligner( BaseAligner ):
             if len(added) > 0:
                 message = "The acoustic model was modified. The following entries were successfully added into the tiedlist: "
                 message = message + " ".join(added) + "\n"
+            # the model was modified, maybe by another aligner, since julius
+            # loaded it (a session will load it again, see run_session).
+            if len(added) > 0 or tiedversion != self.get_tiedlist_version():
                 self.run_julius(inputwav, basename, outputalign)
                 with codecs.open(outputalign, 'r', encoding) as f:
                     lines = f.readlines()
@@ -368,3 +454,263 @@ class JuliusAligner( BaseAligner ):
         return message
 
     # ------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+
+class JuliusSession( object ):
+    """
+    @author:       Brigitte Bigi
+    @organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    @contact:      brigitte.bigi@gmail.com
+    @license:      GPL, v3
+    @copyright:    Copyright (C) 2011-2016  Brigitte Bigi
+    @summary:      A long-lived julius, to align a sequence of units.
+
+    Starting julius requires to load the acoustic model, which takes much
+    more time than aligning a unit. A session starts julius only once, in
+    module mode, then for each unit:
+        1. the grammar and the dictionary are sent with the module command
+        CHANGEGRAM (and GRAMINFO, to wait until julius received them);
+        2. the audio file name is sent to the standard input of julius;
+        3. the recognition result (<RECOGOUT>) and the forced alignment
+        (<ALIGN>) are read from the module port, and they are written into
+        the alignment file with the output format of julius.
+
+    >>> session = JuliusSession("julius", aligner.get_julius_options(basename))
+    >>> session.align(inputwav, basename, outputalign)
+    >>> session.close()
+
+    """
+    def __init__(self, command, options, timeout=60.):
+        """
+        Start julius and connect to its module port.
+
+        @param command (str or list) the command to start julius
+        @param options (list) the options of julius (see JuliusAligner.get_julius_options)
+        @param timeout (float) time to wait for julius, in seconds
+        @raise OSError if julius can't be started
+
+        """
+        if isinstance(command, basestring):
+            command = [ command ]
+        self._timeout = timeout
+
+        # Get a free port for the module mode
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+        s.close()
+
+        # The messages of julius are kept in a log file
+        self._log = tempfile.TemporaryFile()
+        args = command + options + [ "-module", str(port) ]
+        try:
+            self._process = Popen(args, stdin=PIPE, stdout=self._log, stderr=STDOUT)
+        except OSError:
+            self._log.close()
+            raise OSError( "julius is not properly installed. See installation instructions for details." )
+
+        # Connect to julius, when it's ready
+        self._sock = None
+        self._buffer = ""
+        start = time.time()
+        while self._sock is None:
+            if self._process.poll() is not None:
+                self.close()
+                raise OSError( "julius command failed:%s"%self.get_log() )
+            try:
+                self._sock = socket.create_connection(("127.0.0.1", port), 1.)
+            except socket.error:
+                if time.time()-start > self._timeout:
+                    self.close()
+                    raise OSError( "julius command failed: no module connection." )
+                time.sleep(0.1)
+        self._sock.settimeout(self._timeout)
+
+    # ------------------------------------------------------------------------
+
+    def is_alive(self):
+        """
+        Return True if julius is running.
+
+        """
+        return self._process is not None and self._process.poll() is None
+
+    # ------------------------------------------------------------------------
+
+    def get_log(self):
+        """
+        Return the messages julius printed.
+
+        """
+        try:
+            self._log.seek(0)
+            return self._log.read()
+        except Exception:
+            return ""
+
+    # ------------------------------------------------------------------------
+
+    def align(self, inputwav, basename, outputalign):
+        """
+        Perform the speech segmentation of a unit.
+
+        @param inputwav (str - IN) the audio input file name, of type PCM-WAV 16000 Hz, 16 bits
+        @param basename (str - IN) the base name of the grammar file and of the dictionary file
+        @param outputalign (str - OUT) the output file name
+        @raise Exception if julius failed
+
+        """
+        if self.is_alive() is False:
+            raise Exception( "julius is not running." )
+
+        # Send the grammar and the dictionary of this unit
+        with open(basename + ".dfa", "r") as fp:
+            dfa = fp.read()
+        with open(basename + ".dict", "r") as fp:
+            dictionary = fp.read()
+        self._send("CHANGEGRAM %s\n"%os.path.basename(basename))
+        self._send(dfa.rstrip("\n") + "\nDFAEND\n")
+        self._send(dictionary.rstrip("\n") + "\nDICEND\n")
+        self._send("GRAMINFO\n")
+        self._wait([ "<GRAMINFO" ])
+
+        # Send the audio file name, then wait for the result
+        self._process.stdin.write(inputwav + "\n")
+        self._process.stdin.flush()
+        messages = []
+        expected = [ "<RECOGOUT", "<ALIGN" ]
+        while len(expected) > 0:
+            message = self._wait(expected + [ "<RECOGFAIL", "<REJECTED" ])
+            if message.startswith("<RECOGFAIL") or message.startswith("<REJECTED"):
+                with open(outputalign, "w") as fp:
+                    fp.write("sentence1: <search failed>\n")
+                return
+            messages.append(message)
+            expected = [ tag for tag in expected if not tag in message ]
+
+        with open(outputalign, "w") as fp:
+            fp.write(self._format_result("\n".join(messages)))
+
+    # ------------------------------------------------------------------------
+
+    def close(self):
+        """
+        Stop julius.
+
+        """
+        if self._sock is not None:
+            try:
+                self._send("DIE\n")
+                self._sock.close()
+            except Exception:
+                pass
+            self._sock = None
+
+        if self._process is not None:
+            try:
+                self._process.stdin.close()
+            except Exception:
+                pass
+            start = time.time()
+            while self._process.poll() is None and time.time()-start < 1.:
+                time.sleep(0.05)
+            if self._process.poll() is None:
+                self._process.kill()
+                self._process.wait()
+            self._process = None
+
+        self._log.close()
+
+    # ------------------------------------------------------------------------
+    # Private
+    # ------------------------------------------------------------------------
+
+    def _send(self, data):
+        """
+        Send a command to the module port of julius.
+
+        """
+        if isinstance(data, unicode):
+            data = data.encode(encoding)
+        self._sock.sendall(data)
+
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def _format_result(message):
+        """
+        Convert the result of the module mode into the output of julius.
+
+        The words are the WHYPO of the best hypothesis (SHYPO), with their
+        pronunciation (PHONE) and confidence score (CM). The alignment is
+        the message julius sends with the option -palign:
+
+            <ALIGN TYPE="phoneme">
+              <PHONEME PHONE="b" BEGINFRAME="0" ENDFRAME="7" SCORE="-24.374146"/>
+              ...
+            </ALIGN>
+
+        @param message (str) the <RECOGOUT> and <ALIGN> messages
+        @return (str) the content of the alignment file
+        @raise Exception if the message does not contain an alignment
+
+        """
+        hypothesis = re.search(r'<SHYPO\b.*?</SHYPO>', message, re.S)
+        alignment  = re.search(r'<ALIGN TYPE="phoneme">(.*?)</ALIGN>', message, re.S)
+        if hypothesis is None or alignment is None:
+            raise Exception( "julius did not send an alignment." )
+
+        words = []
+        for tag in re.findall(r'<WHYPO\b[^>]*>', hypothesis.group(0)):
+            attributes = dict(JULIUS_ATTRIBUTE.findall(tag))
+            if not "PHONE" in attributes:
+                raise Exception( "julius did not send the pronunciations." )
+            words.append( attributes )
+
+        segments = []
+        for line in alignment.group(1).split("\n"):
+            line = line.strip()
+            if len(line) == 0:
+                continue
+            phoneme = JULIUS_ALIGN_PHONEME.match(line)
+            if phoneme is None:
+                raise Exception( "julius sent an unexpected alignment: %s" % line )
+            phone, begin, end, score = phoneme.groups()
+            segments.append("[ %s %s ] %f %s\n" % (begin, end, float(score), phone))
+        if len(segments) == 0:
+            raise Exception( "julius did not send an alignment." )
+
+        result  = "sentence1: %s\n" % " ".join(w.get("WORD", "") for w in words)
+        result += "wseq1: %s\n" % " ".join(w.get("WORD", "") for w in words)
+        result += "phseq1: %s\n" % " | ".join(w["PHONE"] for w in words)
+        result += "cmscore1: %s\n" % " ".join(w.get("CM", "1.000") for w in words)
+        result += "=== begin forced alignment ===\n"
+        result += "".join(segments)
+        result += "=== end forced alignment ===\n"
+        return result
+
+    # ------------------------------------------------------------------------
+
+    def _wait(self, tags):
+        """
+        Read messages of the module port of julius until one of them starts
+        with one of the given tags. A message ends with a line ".".
+
+        @return the message
+
+        """
+        while True:
+            end = self._buffer.find("\n.\n")
+            while end == -1:
+                data = self._sock.recv(4096)
+                if len(data) == 0:
+                    raise Exception( "julius closed the module connection." )
+                self._buffer += data
+                end = self._buffer.find("\n.\n")
+
+            message = self._buffer[:end].strip()
+            self._buffer = self._buffer[end+3:]
+            for tag in tags:
+                if message.startswith(tag):
+                    return message
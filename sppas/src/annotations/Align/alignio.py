@@ -121,7 +121,43 @@ class AlignIO:
 
     # ------------------------------------------------------------------------
 
-    def segment_track(self, track, diralign, segment=True):
+    def new_aligntrack(self):
+        """
+        Return a new AlignTrack with the same model, aligner and options
+        than the current one.
+        An aligner can't align several tracks at a time: each track aligned
+        concurrently requires its own AlignTrack.
+
+        @return AlignTrack
+
+        """
+        aligntrack = AlignTrack( self.aligntrack.get_model(), self.aligntrack.get_aligner() )
+        aligntrack.set_infersp( self.aligntrack.get_infersp() )
+        aligntrack.set_aligner_ext( self.aligntrack.get_aligner_ext() )
+        return aligntrack
+
+    # ------------------------------------------------------------------------
+
+    def open_session(self):
+        """
+        Align the next tracks with a long-lived aligner, if the aligner
+        supports it: the acoustic model is then loaded only once.
+
+        """
+        self.aligntrack.open_session()
+
+    # ------------------------------------------------------------------------
+
+    def close_session(self):
+        """
+        Stop the long-lived aligner.
+
+        """
+        self.aligntrack.close_session()
+
+    # ------------------------------------------------------------------------
+
+    def segment_track(self, track, diralign, segment=True, aligntrack=None):
         """
         Perform the speech segmentation of a track in a directory.
 
@@ -129,6 +165,8 @@ class AlignIO:
         @param diralign (str - IN)
         @param segment (bool - IN) If True, call an aligner to segment speech,
         else create a file with an empty alignment.
+        @param aligntrack (AlignTrack - IN) The system to segment the track,
+        or None to use the current one (see new_aligntrack()).
 
         @return A message of the aligner in case of any problem, or
         an empty string if success.
@@ -139,10 +177,13 @@ class AlignIO:
         tokenname     = self._tracknames.tokensfilename(diralign,track)
         alignname     = self._tracknames.alignfilename(diralign,track)
 
+        if aligntrack is None:
+            aligntrack = self.aligntrack
+
         if segment is True:
-            msg = self.aligntrack.segmenter(audiofilename, phonname, tokenname, alignname)
+            msg = aligntrack.segmenter(audiofilename, phonname, tokenname, alignname)
         else:
-            msg = self.aligntrack.segmenter(audiofilename, None, None, alignname)
+            msg = aligntrack.segmenter(audiofilename, None, None, alignname)
 
         return msg
 
@@ -195,7 +236,9 @@ class AlignIO:
         self._mapping.set_keep_miss(True)
         self._mapping.set_reverse(True)
 
-        # Map phonetizations (even the alternatives)
+        # Map phonetizations (even the alternatives), of a copy: the given
+        # tier can be the one of a phonetization kept in memory.
+        phontier = phontier.Copy()
         for ann in phontier:
             for text in ann.GetLabel().GetLabels():
                 text.SetValue( self._mapping.map( text.GetValue() ) )
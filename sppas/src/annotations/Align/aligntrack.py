@@ -84,6 +84,10 @@ class AlignTrack( object ):
         # Options, must be fixed before to instantiate the aligner
         self._infersp = False
 
+        # The instantiated aligners, and whether they are used in a session
+        self._aligners = {}
+        self._session  = False
+
         # The acoustic model directory
         self._modeldir = model
 
@@ -104,6 +108,8 @@ class AlignTrack( object ):
         @param model (str - IN) Directory that contains the Acoustic Model.
 
         """
+        self.close_session()
+        self._aligners = {}
         self._modeldir = model
         self._instantiate_aligner()
 
@@ -136,6 +142,15 @@ class AlignTrack( object ):
 
     # ----------------------------------------------------------------------
 
+    def get_infersp(self):
+        """
+        Return the automatic inference of short pauses option.
+
+        """
+        return self._infersp
+
+    # ----------------------------------------------------------------------
+
     def get_aligner(self):
         """
         Return the aligner name identifier.
@@ -170,6 +185,30 @@ class AlignTrack( object ):
         """
         return self._modeldir
 
+    # ----------------------------------------------------------------------
+
+    def open_session(self):
+        """
+        Align the next segments with a long-lived aligner, if the aligner
+        supports it (julius).
+
+        """
+        self._session = True
+        if hasattr(self._aligner, "open_session"):
+            self._aligner.open_session()
+
+    # ----------------------------------------------------------------------
+
+    def close_session(self):
+        """
+        Stop the long-lived aligners.
+
+        """
+        self._session = False
+        for aligner in self._aligners.values():
+            if hasattr(aligner, "close_session"):
+                aligner.close_session()
+
     # ------------------------------------------------------------------------
 
     def segmenter(self, audiofilename, phonname, tokenname, alignname):
@@ -222,9 +261,15 @@ class AlignTrack( object ):
     def _instantiate_aligner(self):
         """
         Instantiate self._aligner to the appropriate Aligner system.
+        An aligner is instantiated only once, so that a session (if any) is
+        kept when switching to another aligner then back to this one.
 
         """
-        self._aligner = aligners.instantiate( self._modeldir,self._alignerid )
+        if not self._alignerid in self._aligners:
+            self._aligners[self._alignerid] = aligners.instantiate( self._modeldir,self._alignerid )
+            if self._session is True and hasattr(self._aligners[self._alignerid], "open_session"):
+                self._aligners[self._alignerid].open_session()
+        self._aligner = self._aligners[self._alignerid]
         self._aligner.set_infersp( self._infersp )
 
     # ------------------------------------------------------------------------
@@ -39,6 +39,9 @@ import shutil
 import os.path
 import glob
 import logging
+import Queue
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 
 import utils.fileutils as fileutils
 
@@ -115,6 +118,7 @@ class sppasAlign( sppasBase ):
         self._options['activity'] = True
         self._options['activityduration'] = False
         self._options['phntok']   = False
+        self._options['jobs']     = 1     # Number of tracks aligned at a time
 
     # -----------------------------------------------------------------------
 
@@ -185,6 +189,9 @@ class sppasAlign( sppasBase ):
             elif "phntok" == key:
                 self.set_phntokalign_tier( opt.get_value() )
 
+            elif "jobs" == key:
+                self.set_jobs( opt.get_value() )
+
             else:
                 raise KeyError('Unknown key option: %s'%key)
 
@@ -272,6 +279,24 @@ class sppasAlign( sppasBase ):
         """
         self._options['phntok'] = bool(value)
 
+    # -----------------------------------------------------------------------
+
+    def set_jobs(self, jobs):
+        """
+        Fix the number of tracks aligned at the same time.
+        Each track is aligned by its own aligner process: the tracks of a
+        file are distributed over a bounded pool of jobs aligners.
+
+        @param jobs (int - IN) number of aligners, 0 for the number of CPUs
+
+        """
+        jobs = int(jobs)
+        if jobs < 0:
+            raise ValueError('Number of jobs must be a positive value. Got: %d'%jobs)
+        if jobs == 0:
+            jobs = multiprocessing.cpu_count()
+        self._options['jobs'] = jobs
+
     # -----------------------------------------------------------------------
     # Methods to time-align series of data
     # -----------------------------------------------------------------------
@@ -294,34 +319,86 @@ class sppasAlign( sppasBase ):
         if ntracks == 0:
             raise IOError('The directory '+diralign+' does not contain data.')
 
-        track = 1
-        while track <= ntracks:
-            self.print_message('Align interval number '+str(track), indent=3)
+        # Each job aligns its tracks with its own aligner, started only once
+        njobs = min(self._options['jobs'], ntracks)
+        aligntracks = [self.alignio.aligntrack]
+        for i in range(1, njobs):
+            aligntracks.append( self.alignio.new_aligntrack() )
 
-            try:
-                msg = self.alignio.segment_track(track,diralign)
-                if len(msg)>0:
-                    self.print_message(msg, indent=3, status=INFO_ID)
+        pool = None
+        try:
+            for aligntrack in aligntracks:
+                aligntrack.open_session()
 
-            except Exception as e:
-                self.print_message(self.alignio.get_aligner()+' failed to perform segmentation.', indent=3, status=ERROR_ID)
-                self.print_message(str(e), indent=4, status=INFO_ID)
-                #import traceback
-                #print(traceback.format_exc())
-
-                # Execute BasicAlign
-                if self._options['basic'] is True:
-                    if self.logfile:
-                        self.logfile.print_message('Execute a Basic Alignment - same duration for each phoneme:', indent=3)
-                    alignerid = self.alignio.get_aligner()
-                    self.alignio.set_aligner('basic')
-                    msg = self.alignio.segment_track(track,diralign)
-                    self.alignio.set_aligner(alignerid)
-                # or Create an empty alignment, to get an empty interval in the final tier
-                else:
-                    msg = self.alignio.segment_track(track,diralign,segment=False)
-
-            track = track + 1
+            tracks = range(1, ntracks+1)
+            if njobs == 1:
+                results = (self.__convert_track(aligntracks[0], diralign, track) for track in tracks)
+            else:
+                freetracks = Queue.Queue()
+                for aligntrack in aligntracks:
+                    freetracks.put( aligntrack )
+
+                def convert_track(track):
+                    aligntrack = freetracks.get()
+                    try:
+                        return self.__convert_track(aligntrack, diralign, track)
+                    finally:
+                        freetracks.put( aligntrack )
+
+                pool = ThreadPool(njobs)
+                results = pool.imap(convert_track, tracks)
+
+            # Messages are printed in the order of the tracks
+            for messages in results:
+                for (message, indent, status) in messages:
+                    self.print_message(message, indent=indent, status=status)
+
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            for aligntrack in aligntracks:
+                aligntrack.close_session()
+
+    # ------------------------------------------------------------------------
+
+    def __convert_track(self, aligntrack, diralign, track):
+        """
+        Call an Aligner to align a track of a directory.
+
+        @param aligntrack (AlignTrack) the system to segment the track.
+        @param diralign is the directory to get units and put alignments.
+        @param track (int) the track number.
+
+        @return the list of messages, as tuples (message, indent, status).
+
+        """
+        messages = []
+        messages.append( ('Align interval number '+str(track), 3, None) )
+
+        try:
+            msg = self.alignio.segment_track(track, diralign, aligntrack=aligntrack)
+            if len(msg)>0:
+                messages.append( (msg, 3, INFO_ID) )
+
+        except Exception as e:
+            messages.append( (aligntrack.get_aligner()+' failed to perform segmentation.', 3, ERROR_ID) )
+            messages.append( (str(e), 4, INFO_ID) )
+
+            # Execute BasicAlign
+            if self._options['basic'] is True:
+                messages.append( ('Execute a Basic Alignment - same duration for each phoneme:', 3, None) )
+                alignerid = aligntrack.get_aligner()
+                aligntrack.set_aligner('basic')
+                try:
+                    self.alignio.segment_track(track, diralign, aligntrack=aligntrack)
+                finally:
+                    aligntrack.set_aligner(alignerid)
+            # or Create an empty alignment, to get an empty interval in the final tier
+            else:
+                self.alignio.segment_track(track, diralign, segment=False, aligntrack=aligntrack)
+
+        return messages
 
     # ------------------------------------------------------------------------
 
@@ -471,6 +548,7 @@ class sppasAlign( sppasBase ):
         newtier = Tier('PhnTokAlign')
         newtier.SetMedia( tiertoken.GetMedia() )
 
+        annotations = []
         for anntoken in tiertoken:
 
             # Create the sequence of phonemes
@@ -485,18 +563,19 @@ class sppasAlign( sppasBase ):
             newann = anntoken.Copy()
             score = newann.GetLabel().GetLabel().GetScore()
             newann.GetLabel().SetValue( Text(l,score) )
-            newtier.Add( newann )
+            annotations.append( newann )
 
+        newtier.Extend( annotations )
         return newtier
 
     # ------------------------------------------------------------------------
 
-    def run(self, phonesname, tokensname, audioname, outputfilename):
+    def run(self, phonesname, tokensname, audioname, outputfilename=None):
         """
         Execute SPPAS Alignment.
 
-        @param phonesname (str - IN) file containing the phonetization
-        @param tokensname (str - IN) file containing the tokenization
+        @param phonesname (str or Transcription - IN) file containing the phonetization
+        @param tokensname (str or Transcription - IN) file containing the tokenization
         @param audioname (str - IN) Audio file name
         @param outputfilename (str - IN) the file name with the result
 
@@ -509,13 +588,13 @@ class sppasAlign( sppasBase ):
         # Get the tiers to be time-aligned
         # ---------------------------------------------------------------
 
-        trsinput = annotationdata.aio.read( phonesname )
+        trsinput = self.get_transcription( phonesname )
         phontier = self.get_phonestier( trsinput )
         if phontier is None:
             raise IOError("No tier with the phonetization was found.")
 
         try:
-            trsinputtok = annotationdata.aio.read( tokensname )
+            trsinputtok = self.get_transcription( tokensname )
             toktier = self.get_tokenstier( trsinputtok )
         except Exception:
             toktier = None
@@ -555,9 +634,10 @@ class sppasAlign( sppasBase ):
         # Save results
         # --------------------------------------------------------------
         try:
-            self.print_message("Save automatic alignment: ",indent=3)
-            # Save in a file
-            annotationdata.aio.write( outputfilename,trsoutput )
+            if outputfilename is not None:
+                self.print_message("Save automatic alignment: ",indent=3)
+                # Save in a file
+                annotationdata.aio.write( outputfilename,trsoutput )
         except Exception:
             if self._options['clean'] is True:
                 shutil.rmtree( workdir )
@@ -572,6 +652,7 @@ class sppasAlign( sppasBase ):
         if self._options['clean'] is True:
             shutil.rmtree( workdir )
 
+        return trsoutput
 
     # ------------------------------------------------------------------------
     # Private: some very bad hack...
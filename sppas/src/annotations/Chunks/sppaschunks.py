@@ -181,8 +181,8 @@ class sppasChunks( sppasBase ):
         """
         Execute SPPAS Chunks alignment.
 
-        @param phonesname (str - IN) file containing the phonetization
-        @param tokensname (str - IN) file containing the tokenization
+        @param phonesname (str or Transcription - IN) file containing the phonetization
+        @param tokensname (str or Transcription - IN) file containing the tokenization
         @param audioname (str - IN) Audio file name
         @param outputfilename (str - IN) the file name with the result
 
@@ -195,13 +195,13 @@ class sppasChunks( sppasBase ):
         # Get the tiers to be time-aligned
         # ---------------------------------------------------------------
 
-        trsinput = annotationdata.aio.read( phonesname )
+        trsinput = self.get_transcription( phonesname )
         phontier = self.get_phonestier( trsinput )
         if phontier is None:
             raise IOError("No tier with the raw phonetization was found.")
 
         try:
-            trsinputtok = annotationdata.aio.read( tokensname )
+            trsinputtok = self.get_transcription( tokensname )
             toktier = self.get_tokenstier( trsinputtok )
         except Exception:
             raise IOError("No tier with the raw tokenization was found.")
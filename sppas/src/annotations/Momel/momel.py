@@ -157,13 +157,17 @@ class Momel:
         """
         From inputs, estimates: a0, a1, a2.
 
+        The regression is estimated with the abscissae centred on the
+        middle of the window: sums of x^4 of a long track are not exact.
+
         """
+        xc = (dpx + fpx) // 2
         pn = 0.
         sx = sx2 = sx3 = sx4 = sy = sxy = sx2y = 0.
         for ix in range(dpx,fpx+1):
             p = pond[ix]
             if (p != 0.):
-                val_ix = float(ix)
+                val_ix = float(ix - xc)
                 y   = self.hzptr[ix]
                 x2  = val_ix * val_ix
                 x3  = x2 * val_ix
@@ -180,6 +184,16 @@ class Momel:
                 sxy  = sxy + (p * xy)
                 sx2y = sx2y + (p * x2y)
 
+        self.__rgp(pn, sx, sx2, sx3, sx4, sy, sxy, sx2y, xc)
+
+    # ------------------------------------------------------------------
+
+    def __rgp(self, pn, sx, sx2, sx3, sx4, sy, sxy, sx2y, xc):
+        """
+        From the weighted sums of the abscissae centred on xc,
+        estimates: a0, a1, a2.
+
+        """
         if (pn < 3.):
             raise ValueError('pn < 3')
 
@@ -193,9 +207,36 @@ class Momel:
         if (spdx2 == 0. or muet == 0.):
             raise ValueError('spdx2 == 0. or muet == 0.')
 
-        self.a2 = (spdx2y * spdx2 - spdxy * spdx3) / muet
-        self.a1 = (spdxy - self.a2 * spdx3) / spdx2
-        self.a0 = (sy - self.a1 * sx - self.a2 * sx2) / pn
+        b2 = (spdx2y * spdx2 - spdxy * spdx3) / muet
+        b1 = (spdxy - b2 * spdx3) / spdx2
+        b0 = (sy - b1 * sx - b2 * sx2) / pn
+
+        # back to the coefficients of x
+        xc = float(xc)
+        self.a2 = b2
+        self.a1 = b1 - 2. * b2 * xc
+        self.a0 = b0 - (b1 - b2 * xc) * xc
+
+    # ------------------------------------------------------------------
+
+    def __centred_sums(self, pn, sums, xc, yscale):
+        """
+        Return the arguments of __rgp from the exact sums of the
+        abscissae x: the sums of (x-xc) are computed exactly, then
+        converted to float.
+
+        """
+        (sx, sx2, sx3, sx4, sy, sxy, sx2y) = sums
+        xc2 = xc * xc
+        cx    = sx - xc * pn
+        cx2   = sx2 - 2 * xc * sx + xc2 * pn
+        cx3   = sx3 - 3 * xc * sx2 + 3 * xc2 * sx - xc2 * xc * pn
+        cx4   = sx4 - 4 * xc * sx3 + 6 * xc2 * sx2 - 4 * xc2 * xc * sx + xc2 * xc2 * pn
+        cxy   = sxy - xc * sy
+        cx2y  = sx2y - 2 * xc * sxy + xc2 * sy
+
+        return (float(pn), float(cx), float(cx2), float(cx3), float(cx4),
+                float(sy) / yscale, float(cxy) / yscale, float(cx2y) / yscale, xc)
 
     # ------------------------------------------------------------------
 
@@ -203,23 +244,54 @@ class Momel:
         """
         Find momel target points.
 
+        A quadratic regression of the pitch values is estimated on a window
+        around each pitch value. The weighted sums of the regression are
+        updated as the window slides and as values are rejected, instead
+        of being computed again for each window and each rejection.
+        The sums are exact: x values are integers and pitch values are
+        scaled to integers, so that the updates do not accumulate any
+        rounding error. They are centred on the window, as in calcrgp(),
+        before being converted to float.
+
         """
         if len(self.hzptr)==0:
             raise IOError('Momel::momel.py. IOError: empty pitch array')
         if (self.hzsup < self.hzinf):
             raise ValueError('Momel::momel.py. Options error: F0 ceiling > F0 threshold')
 
-        pond = []
-        pondloc = [] # local copy of pond
-        hzes = []
+        # Terms of the sums of each weighted pitch value: x, x2, x3, x4,
+        # y, xy, x2y. Pitch values are scaled by 2^scale.
+        scale = 0
         for ix in range(self.nval):
-            hzes.append(0.)
             if (self.hzptr[ix] > self.SEUILV):
-                pond.append(1.0)
+                d = float(self.hzptr[ix]).as_integer_ratio()[1]
+                scale = max(scale, d.bit_length() - 1)
+        terms = []
+        pondloc = []
+        for ix in range(self.nval):
+            if (self.hzptr[ix] > self.SEUILV):
+                (n, d) = float(self.hzptr[ix]).as_integer_ratio()
+                y = n * ((1 << scale) // d)
+                x2 = ix * ix
+                terms.append((ix, x2, x2 * ix, x2 * x2, y, ix * y, x2 * y))
                 pondloc.append(1.0)
             else:
-                pond.append(0.0)
+                terms.append(None)
                 pondloc.append(0.0)
+        yscale = float(1 << scale)
+
+        # Zero pitch values are always rejected: only the other ones are
+        # examined, and nonzero[nzlo:nzhi] are the ones of the window.
+        hzptr = self.hzptr
+        maxec = self.maxec
+        nonzero = [ix for ix in range(self.nval) if hzptr[ix] != 0.]
+        xvalues = [float(ix) for ix in range(self.nval)]
+        nzlo = nzhi = 0
+
+        # Sums of the weighted values of the current window: [lo,hi[
+        pn = 0
+        sums = [0] * 7
+        lo = hi = 0
 
         # Examinate each pitch value
         for ix in range(self.nval):
@@ -227,16 +299,33 @@ class Momel:
             dpx = ix - int(self.lfen1 / 2)
             fpx = dpx + self.lfen1 + 1
 
-
             # BB: do not go out of the range!
             if dpx < 0:
                 dpx = 0
             if fpx > self.nval:
                 fpx = self.nval
 
-            # copy original pond values for the current interval
-            for i in range(dpx,fpx):
-                pondloc[i] = pond[i]
+            # slide the window
+            while hi < fpx:
+                if terms[hi] is not None:
+                    pn += 1
+                    sums = [s + t for s, t in zip(sums, terms[hi])]
+                hi += 1
+            while lo < dpx:
+                if terms[lo] is not None:
+                    pn -= 1
+                    sums = [s - t for s, t in zip(sums, terms[lo])]
+                lo += 1
+            while nzhi < len(nonzero) and nonzero[nzhi] < fpx:
+                nzhi += 1
+            while nzlo < nzhi and nonzero[nzlo] < dpx:
+                nzlo += 1
+            nzero = (fpx - dpx) - (nzhi - nzlo)
+
+            # sums without the rejected values of the current interval
+            pnloc = pn
+            sumsloc = sums
+            rejected = []
 
             nsup  = 0
             nsupr = -1
@@ -247,20 +336,29 @@ class Momel:
                 nsup  = 0
                 try:
                     # Estimate values of: a0, a1, a2
-                    self.calcrgp(pondloc, dpx, fpx-1)
+                    self.__rgp(*self.__centred_sums(pnloc, sumsloc, (dpx + fpx - 1) // 2, yscale))
                 except Exception:
                     # if calcrgp failed.
-                    #print "calcrgp failed: ",e
                     ret_rgp=False
                     break
                 else:
-                    # Estimate hzes
-                    for ix2 in range(dpx,fpx):
-                        hzes[ix2] = self.a0 + (self.a1 + self.a2 * float(ix2)) * float(ix2)
-                    for x in range(dpx,fpx):
-                        if (self.hzptr[x] == 0. or (hzes[x] / self.hzptr[x]) > self.maxec):
+                    # Estimate hzes and reject values
+                    nsup = nzero
+                    (a0, a1, a2) = (self.a0, self.a1, self.a2)
+                    for x in nonzero[nzlo:nzhi]:
+                        fx = xvalues[x]
+                        hzes = a0 + (a1 + a2 * fx) * fx
+                        if (hzes / hzptr[x]) > maxec:
                             nsup = nsup + 1
-                            pondloc[x] = 0.0
+                            if pondloc[x] != 0.:
+                                pondloc[x] = 0.0
+                                rejected.append(x)
+                                pnloc -= 1
+                                sumsloc = [s - t for s, t in zip(sumsloc, terms[x])]
+
+            # restore the rejected values for the next interval
+            for x in rejected:
+                pondloc[x] = 1.0
 
             # Now estimate xc and yc for the new 'cible'
             if (ret_rgp==True and self.a2 != 0.0):
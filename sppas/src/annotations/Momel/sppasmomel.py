@@ -36,6 +36,7 @@
 # ----------------------------------------------------------------------------
 
 import sys
+import os.path
 
 from annotations.sppasbase import sppasBase
 
@@ -48,6 +49,9 @@ import annotationdata.aio
 from annotationdata.pitch import Pitch
 from annotations.Momel.momel import Momel
 
+import audiodata.aio
+from audiodata.audiopitch import WavePitch
+
 # ---------------------------------------------------------------------------
 
 class sppasMomel( sppasBase ):
@@ -124,12 +128,16 @@ class sppasMomel( sppasBase ):
     def set_pitch(self, inputfilename):
         """
         Load pitch values from a file.
+        If the file is an audio file, pitch values are estimated from it.
 
         @return A list of pitch values (one value each 10 ms).
 
         """
-        pitch = annotationdata.aio.read( inputfilename )
-        pitchlist = pitch.get_pitch_list()
+        if os.path.splitext(inputfilename)[1].lower() in audiodata.aio.extensions:
+            pitchlist = WavePitch().eval_pitch(inputfilename, delta=self.PAS_TRAME/1000.)
+        else:
+            pitch = annotationdata.aio.read( inputfilename )
+            pitchlist = pitch.get_pitch_list()
         if len(pitchlist) == 0:
             raise IOError('Error while reading '+inputfilename+'\nEmpty pitch tier.\n')
         return pitchlist
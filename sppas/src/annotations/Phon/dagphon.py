@@ -35,7 +35,7 @@
 # File: dagphon.py
 # ----------------------------------------------------------------------------
 
-import re
+import heapq
 from resources.dictpron import DictPron
 
 # ----------------------------------------------------------------------------
@@ -143,6 +143,84 @@ class DAG(object):
 
     # -----------------------------------------------------------------------
 
+    def find_best_paths(self, start, end, cost):
+        """
+        Generate the paths between two nodes, from the cheapest one.
+
+        The cost of a path is the sum of the costs of its nodes. Paths are
+        explored in a best-first order and share their prefix: a path is
+        extended only when it is the cheapest one not explored yet, and a
+        node gets its next successor only when the previous one was
+        explored. So, the n cheapest paths are found in a time and a memory
+        proportional to n, not to the number of paths of the DAG.
+
+            >>> for c, path in find_best_paths('A', 'D', lambda n: 1):
+            >>>     print c, path
+            3 ['A', 'B', 'D']
+            3 ['A', 'C', 'D']
+            4 ['A', 'B', 'C', 'D']
+
+        @param start: (node) The first node of the paths
+        @param end: (node) The last node of the paths
+        @param cost: (function) Return the cost of a node
+        @return: generator of tuples (cost, path)
+
+        """
+        # Cheapest cost from each node to the end node, included
+        remain = {end: cost(end)}
+        # Successors of each node, sorted by cheapest cost to the end
+        succ = {}
+
+        def _remaining(node):
+            if node not in remain:
+                remain[node] = None
+                nexts = []
+                for n in self.__graph.get(node, []):
+                    r = _remaining(n)
+                    if r is not None:
+                        nexts.append((r, n))
+                nexts.sort(key=lambda x: x[0])
+                succ[node] = nexts
+                if len(nexts) > 0:
+                    remain[node] = cost(node) + nexts[0][0]
+            return remain[node]
+
+        if start == end:
+            yield (cost(start), [start])
+            return
+        if _remaining(start) is None:
+            return
+
+        # Each entry is the k-th successor of the last node of a prefix,
+        # prefixes are shared tuples (previous prefix, node). Among entries
+        # of the same cost, the last pushed is the first popped so that a
+        # path is completed before the equivalent ones are explored.
+        seq = 0
+        g = cost(start)
+        heap = [(g + succ[start][0][0], seq, g, (None, start), 0)]
+        while heap:
+            f, _, g, prefix, k = heapq.heappop(heap)
+            nexts = succ[prefix[1]]
+            if k+1 < len(nexts):
+                seq -= 1
+                heapq.heappush(heap, (g + nexts[k+1][0], seq, g, prefix, k+1))
+
+            node = nexts[k][1]
+            newprefix = (prefix, node)
+            if node == end:
+                path = []
+                while newprefix is not None:
+                    path.append(newprefix[1])
+                    newprefix = newprefix[0]
+                path.reverse()
+                yield (f, path)
+            else:
+                newg = g + cost(node)
+                seq -= 1
+                heapq.heappush(heap, (newg + succ[node][0][0], seq, newg, newprefix, 0))
+
+    # -----------------------------------------------------------------------
+
     def find_shortest_path(self, start, end, path=[]):
         path += [start]
         if start == end:
@@ -254,20 +332,36 @@ class DAGPhon(object):
         Convert a DAG into a dictionary including all pronunciation variants.
 
         """
-        pathslist = graph.find_all_paths(0, len(graph)-1)
-
         pron = {}
-        for variant in pathslist:
-            p = ""
-            for i in variant[1:len(variant)-1]:  # do not include Start and End nodes
-                p = p + DictPron.PHONEMES_SEPARATOR + prongraph[i]
-            p = re.sub('^.', "", p)
-            pron[p] = len(p.split(DictPron.PHONEMES_SEPARATOR))
+        for (p, n) in self.iter_DAG2phon(graph, prongraph):
+            pron[p] = n
 
         return pron
 
     # -----------------------------------------------------------------------
 
+    def iter_DAG2phon(self, graph, prongraph):
+        """
+        Generate the pronunciation variants of a DAG, from the shorter one.
+
+        @return: generator of tuples (pronunciation, number of phonemes)
+
+        """
+        sep = DictPron.PHONEMES_SEPARATOR
+        last = len(graph)-1
+
+        def _cost(node):
+            if node == 0 or node == last:
+                return 0
+            return len(prongraph[node].split(sep))
+
+        for (n, variant) in graph.find_best_paths(0, last, _cost):
+            # do not include Start and End nodes
+            p = sep.join(prongraph[i] for i in variant[1:-1])
+            yield (p, n)
+
+    # -----------------------------------------------------------------------
+
     def decompose(self, pron1, pron2=""):
         """
         Create a decomposed phonetization from a string as follow:
@@ -276,42 +370,41 @@ class DAGPhon(object):
             p1-p2-p3|p1-p2-x3|p1-x2-p3|p1-x2-x3
 
         The input string is converted into a DAG, then output corresponds
-        to all paths.
+        to the shorter paths, or to all paths if variants is 0.
 
         """
         if len(pron1) == 0 and len(pron2) == 0:
             return ""
 
         # Complex phonetization: converted into a DAG
-        (graph1, prongraph1) = self.phon2DAG(pron1)
+        dags = [self.phon2DAG(pron1)]
         if len(pron2) > 0:
-            (graph2, prongraph2) = self.phon2DAG(pron2)
-
-        # Create all pronunciations from the DAG
-        pron1 = self.DAG2phon(graph1, prongraph1)
-        if len(pron2) > 0:
-            pron2 = self.DAG2phon(graph2, prongraph2)
-        else:
-            pron2 = {}
+            dags.append(self.phon2DAG(pron2))
 
+        # Pronunciations of each DAG, from the shorter ones.
         # Merge =======>
         # TODO: MERGE DAGs instead of merging prons
-        pron = dict(pron1.items() + pron2.items())
-
-        # Output selection
+        merged = heapq.merge(*[self.__iter_sized(i, graph, prongraph)
+                               for i, (graph, prongraph) in enumerate(dags)])
+
+        # Output selection: the shorter variants (all if variants is 0),
+        # only the selected ones are created.
+        pron = []
+        seen = set()
+        for (n, i, p) in merged:
+            if p not in seen:
+                seen.add(p)
+                pron.append(p)
+                if len(pron) == self.variants:
+                    break
+
+        return DictPron.VARIANTS_SEPARATOR.join(pron)
 
-        v = DictPron.VARIANTS_SEPARATOR
-
-        # Return all variants
-        if self.variants == 0:
-            return v.join(pron.keys())
-
-        # Choose the shorter variants
-        if self.variants == 1:
-            return min(pron.items(), key=lambda x: x[1])[0]
+    # -----------------------------------------------------------------------
 
-        # Other number of variants: choose shorters
-        l = sorted(pron.items(), key=lambda x: x[1])[:self.variants]
-        return v.join(zip(*l)[0])
+    def __iter_sized(self, index, graph, prongraph):
+        """ Generate tuples (number of phonemes, index, pronunciation). """
+        for (p, n) in self.iter_DAG2phon(graph, prongraph):
+            yield (n, index, p)
 
     # -----------------------------------------------------------------------
@@ -35,6 +35,8 @@
 # ---------------------------------------------------------------------------
 
 import re
+import pickle
+import logging
 
 from phonunk import PhonUnk
 from dagphon import DAGPhon
@@ -42,11 +44,17 @@ from dagphon import DAGPhon
 from resources.rutils import to_strip
 from resources.mapping import Mapping
 from resources.dictpron import DictPron
+from structs.lrucache import LRUCache
+from utils.fileutils import atomic_write, file_lock
 
 from sp_glob import ERROR_ID, WARNING_ID, OK_ID
 
 # ---------------------------------------------------------------------------
 
+CACHE_VERSION = 1
+
+# ---------------------------------------------------------------------------
+
 
 class DictPhon(object):
     """
@@ -83,19 +91,27 @@ class DictPhon(object):
         > 3rd Less-Resourced Languages workshop,
         > 6th Language & Technology Conference, Poznan (Poland).
 
+    The phonetizations of the tokens are memorized in a bounded cache, so
+    that a token is phonetized only once, whatever the number of its
+    occurrences. The cache can be saved into a file and loaded by the next
+    session.
+
     """
-    def __init__(self, pdict, maptable=None):
+    def __init__(self, pdict, maptable=None, cachesize=100000):
         """
         Constructor.
 
         :param pdict: (DictPron) The pronunciation dictionary.
         :param maptable: (Mapping) A mapping table for phones.
+        :param cachesize: (int) Maximum number of phonetizations to memorize.
 
         """
         self._pdict = None
         self._phonunk = None
         self._map_table = Mapping()
         self._dag_phon = DAGPhon()
+        self._cache = LRUCache(cachesize)
+        self._cache_changed = False
 
         self.set_dict(pdict)
         self.set_maptable(maptable)
@@ -114,6 +130,7 @@ class DictPhon(object):
 
         self._pdict = pdict
         self._phonunk = PhonUnk(self._pdict.get_dict())
+        self.clear_cache()
 
     # -----------------------------------------------------------------------
 
@@ -132,6 +149,92 @@ class DictPhon(object):
 
         self._map_table = map_table
         self._map_table.set_keep_miss(False)
+        self.clear_cache()
+
+    # -----------------------------------------------------------------------
+
+    def clear_cache(self):
+        """ Forget all the memorized phonetizations. """
+
+        self._cache.clear()
+        self._cache_changed = False
+
+    # -----------------------------------------------------------------------
+
+    def load_cache(self, filename):
+        """
+        Load memorized phonetizations from a file.
+
+        The file must have been saved with the same dictionary and mapping
+        table: the caller is responsible of this.
+
+        :param filename: (str) Name of a file created by save_cache.
+        :returns: (bool) The cache was loaded or not.
+
+        """
+        items = self.__read_cache(filename)
+        if items is None:
+            return False
+
+        for key, value in items:
+            self._cache.set(key, value)
+        return True
+
+    # -----------------------------------------------------------------------
+
+    def save_cache(self, filename, merge=False):
+        """
+        Save the memorized phonetizations into a file, if they changed
+        since the last load or save.
+
+        Several processes can save the same file: the file is locked while
+        it is read then written.
+
+        :param filename: (str) Name of the file to write.
+        :param merge: (bool) Keep the phonetizations of the file, for
+        example saved by another process since it was loaded.
+        :returns: (bool) The cache was saved or not.
+
+        """
+        if self._cache_changed is False:
+            return False
+
+        try:
+            with file_lock(filename):
+                items = self._cache.items()
+                if merge is True:
+                    cache = LRUCache(self._cache.get_maxsize())
+                    for key, value in (self.__read_cache(filename) or []) + items:
+                        cache.set(key, value)
+                    items = cache.items()
+
+                with atomic_write(filename) as fp:
+                    pickle.dump((CACHE_VERSION, items), fp, pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logging.info('Save phonetization cache failed: %s' % str(e))
+            return False
+
+        self._cache_changed = False
+        return True
+
+    # -----------------------------------------------------------------------
+
+    def __read_cache(self, filename):
+        """
+        Return the list of (key, value) of a cache file, or None.
+
+        """
+        try:
+            with open(filename, 'rb') as fp:
+                (version, items) = pickle.load(fp)
+        except Exception as e:
+            logging.info('Load phonetization cache failed: %s' % str(e))
+            return None
+
+        if version != CACHE_VERSION:
+            return None
+
+        return items
 
     # -----------------------------------------------------------------------
 
@@ -192,41 +295,14 @@ class DictPhon(object):
         tab = []
 
         for entry in tokens:
-            phon = self._pdict.unkstamp
-            status = OK_ID
-
-            # Enriched Orthographic Transcription Convention:
-            # entry can be already in SAMPA.
-            if entry.startswith("/") is True and entry.endswith("/") is True:
-                phon = entry.strip("/")
-                # Must use SAMPA (including minus to separate phones)
-
-            else:
-
-                phon = self.get_phon_entry(entry)
+            key = (entry, phonunk)
+            result = self._cache.get(key)
+            if result is None:
+                result = self._get_phon_token(entry, phonunk)
+                self._cache.set(key, result)
+                self._cache_changed = True
 
-                if phon == self._pdict.unkstamp:
-                    status = ERROR_ID
-
-                    # A missing compound word?
-                    if "-" in entry or "'" in entry or "_" in entry:
-                        _tabpron = [self.get_phon_entry(w) for w in re.split(u"[-'_]", entry)]
-
-                        # OK, finally the entry is in the dictionary?
-                        if not self._pdict.unkstamp in _tabpron:
-                            # ATTENTION: each part can have variants! must be decomposed.
-                            self._dag_phon.variants = 4
-                            phon = to_strip(self._dag_phon.decompose(" ".join(_tabpron)))
-                            status = WARNING_ID
-
-                    if phon == self._pdict.unkstamp and phonunk is True:
-                        try:
-                            phon = self._phonunk.get_phon(entry)
-                            status = WARNING_ID
-                        except Exception:
-                            pass
-
-            tab.append((entry, phon, status))
+            tab.append((entry, result[0], result[1]))
 
         return tab
 
@@ -255,6 +331,53 @@ class DictPhon(object):
     # Private
     # -----------------------------------------------------------------------
 
+    def _get_phon_token(self, entry, phonunk):
+        """
+        Return the phonetization of a token, with the status.
+
+        :param entry: (str) The token to phonetize.
+        :param phonunk: (bool) Phonetize unknown words (or not).
+        :returns: A tuple (phon, status).
+
+        """
+        phon = self._pdict.unkstamp
+        status = OK_ID
+
+        # Enriched Orthographic Transcription Convention:
+        # entry can be already in SAMPA.
+        if entry.startswith("/") is True and entry.endswith("/") is True:
+            phon = entry.strip("/")
+            # Must use SAMPA (including minus to separate phones)
+
+        else:
+
+            phon = self.get_phon_entry(entry)
+
+            if phon == self._pdict.unkstamp:
+                status = ERROR_ID
+
+                # A missing compound word?
+                if "-" in entry or "'" in entry or "_" in entry:
+                    _tabpron = [self.get_phon_entry(w) for w in re.split(u"[-'_]", entry)]
+
+                    # OK, finally the entry is in the dictionary?
+                    if not self._pdict.unkstamp in _tabpron:
+                        # ATTENTION: each part can have variants! must be decomposed.
+                        self._dag_phon.variants = 4
+                        phon = to_strip(self._dag_phon.decompose(" ".join(_tabpron)))
+                        status = WARNING_ID
+
+                if phon == self._pdict.unkstamp and phonunk is True:
+                    try:
+                        phon = self._phonunk.get_phon(entry)
+                        status = WARNING_ID
+                    except Exception:
+                        pass
+
+        return (phon, status)
+
+    # -----------------------------------------------------------------------
+
     def _map_phonentry(self, phonentry):
         """
         Map phonemes of a phonetized entry.
@@ -39,6 +39,7 @@ import re
 
 from dagphon import DAGPhon
 import resources.rutils as rutils
+from resources.trie import Trie
 
 LIMIT_SIZE = 40  # Max nb of characters of an unknown entry
 
@@ -87,6 +88,10 @@ class PhonUnk(object):
         self.prondict = prondict
         self.dagphon = DAGPhon(variants=4)
 
+        # Tries of the entries and of the reversed entries, created on demand
+        self._trie = None
+        self._rtrie = None
+
     # ------------------------------------------------------------------
     # Getters and Setters
     # ------------------------------------------------------------------
@@ -125,6 +130,10 @@ class PhonUnk(object):
         if len(entry) > LIMIT_SIZE:
             raise Exception('Unable to phonetize the unknown token (too long): '+entry)
 
+        if self._trie is None:
+            self._trie = Trie(self.prondict.keys())
+            self._rtrie = Trie(key[::-1] for key in self.prondict.keys())
+
         # Find all pronunciations of segments with a longest matching algo.
         _tabstr = re.split(u"[-'_\s]",_str)
         pronlr = ""
@@ -167,17 +176,10 @@ class PhonUnk(object):
     def __longestlr(self, entry):
         """
         Select the longest phonetization of an entry, from the end.
+        Return the index of the end of the longest string of the dictionary
+        starting the entry, or 0 if no pronunciation was found.
         """
-        i = len(entry)
-        while i > 0:
-            # Find in the dictionary a substring from 0 to i
-            if entry[:i] in self.prondict:
-                # Return index for the longest string
-                return i
-            i -= 1
-
-        # Did not find any pronunciation for this entry!
-        return 0
+        return self._trie.longest_prefix(entry)
 
     # -----------------------------------------------------------------------
 
@@ -233,17 +235,10 @@ class PhonUnk(object):
     def __longestrl(self, entry):
         """
         Select the longest phonetization of an entry, from the start.
+        Return the index of the start of the longest string of the dictionary
+        ending the entry, or len(entry) if no pronunciation was found.
         """
-        i = 0
-        while i < len(entry):
-            # Find in the dictionary a substring from i to the entry-length
-            if entry[i:] in self.prondict:
-                # Return index for the longest string
-                return i
-            i += 1
-
-        # Did not find any pronunciation for this entry!
-        return len(entry)
+        return len(entry) - self._rtrie.longest_prefix(entry[::-1])
 
     # -----------------------------------------------------------------------
 
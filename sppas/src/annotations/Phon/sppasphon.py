@@ -35,6 +35,7 @@
 # File: phon.py
 # ---------------------------------------------------------------------------
 
+import os
 import logging
 
 import annotationdata.aio
@@ -52,6 +53,10 @@ from annotations.sppasbase import sppasBase
 
 # ---------------------------------------------------------------------------
 
+CACHE_FILENAME_EXT = ".phoncache"
+
+# ---------------------------------------------------------------------------
+
 
 class sppasPhon( sppasBase ):
     """
@@ -86,6 +91,7 @@ class sppasPhon( sppasBase ):
 
         # Pronunciation dictionary
         self.maptable = None
+        self._mapfile = mapfile
         if mapfile is not None:
             self.maptable = Mapping( mapfile )
 
@@ -167,6 +173,58 @@ class sppasPhon( sppasBase ):
         pdict = DictPron(dictfilename, unkstamp=UNKSTAMP, nodump=False)
         self.phonetizer = DictPhon( pdict, self.maptable )
 
+        # Phonetizations of the previous sessions
+        self._dictfile = dictfilename
+        self._cachefile = self.get_cache_filename(dictfilename)
+        if self._has_cache(dictfilename) is True:
+            self.phonetizer.load_cache( self._cachefile )
+
+    # -----------------------------------------------------------------------
+
+    def get_cache_filename(self, dictfilename):
+        """
+        Return the name of the file to save phonetizations of the sessions.
+        It depends on both the dictionary and the mapping table.
+
+        @param dictfilename (str- IN) The pronunciation dictionary file name.
+
+        """
+        base = os.path.splitext(dictfilename)[0]
+        if self._mapfile is not None:
+            base = base + "-" + os.path.splitext(os.path.basename(self._mapfile))[0]
+
+        return base + CACHE_FILENAME_EXT
+
+    # -----------------------------------------------------------------------
+
+    def save_cache(self):
+        """
+        Save the phonetizations memorized since the dictionary was set, to
+        be used by the next sessions.
+        It must be called once, when all the files are phonetized. The
+        phonetizations saved meanwhile by other processes are kept.
+
+        @return (bool) The cache was saved or not.
+
+        """
+        merge = self._has_cache(self._dictfile)
+        return self.phonetizer.save_cache( self._cachefile, merge )
+
+    # -----------------------------------------------------------------------
+
+    def _has_cache(self, dictfilename):
+        """ Test if the cache file exists and is newer than the resources. """
+
+        if os.path.isfile(self._cachefile) is False:
+            return False
+
+        tcache = os.path.getmtime(self._cachefile)
+        for filename in (dictfilename, self._mapfile):
+            if filename is not None and os.path.getmtime(filename) >= tcache:
+                return False
+
+        return True
+
     # -----------------------------------------------------------------------
 
     def phonetize(self, entry):
@@ -218,6 +276,7 @@ class sppasPhon( sppasBase ):
         if tier is None:
             return t
 
+        annotations = []
         for a in tier:
 
             af = a.Copy()
@@ -231,8 +290,9 @@ class sppasPhon( sppasBase ):
                     phon = self.phonetize( text.GetValue() )
                     text.SetValue( phon )
 
-            t.Append( af )
+            annotations.append( af )
 
+        t.Extend( annotations )
         return t
 
     # -----------------------------------------------------------------------
@@ -272,19 +332,20 @@ class sppasPhon( sppasBase ):
 
     # ------------------------------------------------------------------------
 
-    def run( self, inputfilename, outputfile ):
+    def run( self, inputfilename, outputfile=None ):
         """
         Run the Phonetization process on an input file.
 
-        @param inputfilename (str - IN) the input file name with tokenization
+        @param inputfilename (str or Transcription - IN) the input file name with tokenization
         @param outputfile (str - IN) the output file name of the phonetization
+        @return Transcription
 
         """
         self.print_options()
         self.print_diagnosis(inputfilename)
 
         # Get the tier to be phonetized.
-        trsinput = annotationdata.aio.read( inputfilename )
+        trsinput = self.get_transcription( inputfilename )
         tierinput = self.get_input_tier(trsinput)
         if tierinput is None:
             raise Exception("No tier found with tokenization. "
@@ -298,6 +359,9 @@ class sppasPhon( sppasBase ):
         trsoutput.Append( tierphon )
 
         # Save in a file
-        annotationdata.aio.write( outputfile,trsoutput )
+        if outputfile is not None:
+            annotationdata.aio.write( outputfile,trsoutput )
+
+        return trsoutput
 
     # -----------------------------------------------------------------------
@@ -181,9 +181,7 @@ class Repetitions:
         # Test if the echo is strict
 
         # create a string with the tokens of the echoing spk
-        l = ""
-        for i in range(speaker2.get_size()):
-            l = l + " " + speaker2.get_token(i)
+        l = speaker2.get_string()
 
         # create a string with the tokens of the source speaker
         t = ""
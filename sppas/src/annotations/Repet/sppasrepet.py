@@ -479,8 +479,14 @@ class sppasRepet(sppasBase):
         """
         Run the Repetition Automatic Detection annotation.
 
-        @param inputfilename
+        If no output file name is given, the repetitions are added to the
+        first input: either the file is updated or, if the input is a
+        Transcription, a new one with only the repetitions is returned.
+
+        @param inputfilename1 (str or Transcription)
+        @param inputfilename2 (str or Transcription)
         @param outputfilename
+        @return Transcription
 
         """
         self.print_options()
@@ -490,14 +496,14 @@ class sppasRepet(sppasBase):
         tokentier2 = -1    # No echoing speaker
 
         # Find the token tier
-        trsinput1 = annotationdata.aio.read(inputfilename1)
+        trsinput1 = self.get_transcription(inputfilename1)
         for i in range(trsinput1.GetSize()):
             if "token" in trsinput1[i].GetName().lower() and "align" in trsinput1[i].GetName().lower():
                 tokentier1 = i
                 break
         if inputfilename2 is not None:
             #find the token tier
-            trsinput2 = annotationdata.aio.read(inputfilename2)
+            trsinput2 = self.get_transcription(inputfilename2)
             for i in range(trsinput2.GetSize()):
                 if "token" in trsinput2[i].GetName().lower() and "align" in trsinput2[i].GetName().lower():
                     tokentier2 = i
@@ -527,8 +533,8 @@ class sppasRepet(sppasBase):
             (srctier,reptier) = self.otherdetection(tier1 , tier2)
 
         # Manage results:
-        # An output file name is given
-        if outputfilename:
+        # An output file name is given, or nothing to update
+        if outputfilename or isinstance(inputfilename1, Transcription):
             trsoutput = Transcription("Repetitions")
         # the repeat tier is added to the input transcription
         else:
@@ -543,6 +549,9 @@ class sppasRepet(sppasBase):
         trsoutput.SetMaxTime(trsinput1.GetMaxTime()) # hum, in case of OR... not sure! to be verified.
 
         # Save
-        annotationdata.aio.write(outputfilename, trsoutput)
+        if outputfilename is not None:
+            annotationdata.aio.write(outputfilename, trsoutput)
+
+        return trsoutput
 
     # ------------------------------------------------------------------------
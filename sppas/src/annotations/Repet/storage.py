@@ -47,6 +47,7 @@ __copyright__ = """Copyright (C) 2011-2015  Brigitte Bigi"""
 import sys
 from os.path import *
 import re
+import bisect
 
 # ######################################################################### #
 
@@ -95,12 +96,42 @@ class DataRepetition:
 class DataSpeaker:
     """
     Class to store data of a speaker.
+
+    Tokens are cleaned once, and the indexes of the tokens are stored
+    by their cleaned string, so that finding a repetition of a token
+    doesn't require to examine the tokens one by one.
     """
 
     def __init__(self, tokens, stopwords=None):
         self._stopwords  = stopwords
         self._tokens     = tokens
 
+        # Results of is_token() for the already asked strings
+        self._istoken = {}
+
+        # The cleaned tokens, as returned by get_token(), and the same
+        # cleaned again, as compared by is_token_repeat().
+        self._clean  = [self.__clean(t) for t in tokens]
+        self._clean2 = [self.__clean(t) for t in self._clean]
+
+        # Index of the next token after each index (-1 for the last one)
+        self._next = [-1] * (len(tokens) + 1)
+        cnext = -1
+        for i in range(len(tokens)-1, -1, -1):
+            self._next[i+1] = cnext
+            if self.is_token(tokens[i]) is True:
+                cnext = i
+        self._next[0] = cnext
+
+        # Indexes of the tokens (the ones get_next_token can return),
+        # for each cleaned string
+        self._index = {}
+        for i in range(len(tokens)):
+            if self.is_token(tokens[i]) is True:
+                self._index.setdefault(self._clean2[i], []).append(i)
+
+        self._string = None
+
     # End __init__
     # ------------------------------------------------------------------
 
@@ -108,11 +139,19 @@ class DataSpeaker:
     def get_token(self, idx):
         if idx >= len(self._tokens):
             return None
-        return self.__clean( self._tokens[idx] )
+        return self._clean[idx]
 
     def get_size(self):
         return len(self._tokens)
 
+    def get_string(self):
+        """
+        Return all the cleaned tokens, each one preceded by a space.
+        """
+        if self._string is None:
+            self._string = "".join(" " + t for t in self._clean)
+        return self._string
+
     # ------------------------------------------------------------------
 
 
@@ -137,6 +176,19 @@ class DataSpeaker:
         if token is None:
             return False
 
+        result = self._istoken.get(token, None)
+        if result is None:
+            result = self.__is_token(token)
+            self._istoken[token] = result
+        return result
+
+    # End is_token
+    # ------------------------------------------------------------------
+
+
+    def __is_token(self, token):
+        """ Ask a string to be a token or not (not memorized). """
+
         # Ensure all regexp will be efficient
         __tok = " " + self.__clean(token) + " "
 
@@ -165,7 +217,6 @@ class DataSpeaker:
             return False
         return True
 
-    # End is_token
     # ------------------------------------------------------------------
 
 
@@ -177,13 +228,17 @@ class DataSpeaker:
         :param current (int)
 
         """
-        cnext = current + 1
-        while cnext < len(self._tokens):
-            if self.is_token(self._tokens[cnext]) is True:
-                return cnext
-            cnext = cnext + 1
+        if current + 1 >= len(self._tokens):
+            return -1
+        if current < -1:
+            cnext = current + 1
+            while cnext < 0:
+                if self.is_token(self._tokens[cnext]) is True:
+                    return cnext
+                cnext = cnext + 1
+            current = -1
 
-        return -1
+        return self._next[current+1]
 
     # End get_next_token
     # ------------------------------------------------------------------
@@ -194,30 +249,51 @@ class DataSpeaker:
         Ask for a token to be repeated by the otherspeaker.
         Return the index of the repetition or -1.
 
+        The repetition is the first token of otherspeaker, from othercurrent,
+        equal to the token: it is searched in the indexes of otherspeaker.
+
         :param current (int)
 
         """
 
         # the token to search
-        __c1 = self.__clean(self._tokens[current])
+        __c1 = self._clean[current]
         # is it a token?
         if self.is_token( __c1 ) == False:
             return -1
 
-        while othercurrent >= 0 and othercurrent < otherspeaker.get_size():
-            othertoken = otherspeaker.get_token(othercurrent)
-            __c2 = self.__clean(othertoken)
-            if __c1 == __c2:
-                return othercurrent
-            # try next one
-            othercurrent = otherspeaker.get_next_token(othercurrent)
+        if othercurrent < 0 or othercurrent >= otherspeaker.get_size():
+            return -1
 
-        return -1
+        return otherspeaker.find_token(__c1, othercurrent)
 
     # End is_token_other_repeat
     # ------------------------------------------------------------------
 
 
+    def find_token(self, token, current):
+        """
+        Return the index of the first token equal to a cleaned token,
+        among the token at index current and the next ones, or -1.
+
+        :param token (String) a cleaned token
+        :param current (int)
+
+        """
+        if self._clean2[current] == token:
+            return current
+
+        indexes = self._index.get(token, None)
+        if indexes is not None:
+            i = bisect.bisect_right(indexes, current)
+            if i < len(indexes):
+                return indexes[i]
+
+        return -1
+
+    # ------------------------------------------------------------------
+
+
     def __clean(self, entry):
         """ Clean a string by removing tabs, CR/LF, and some punctuation.
             Parameters:
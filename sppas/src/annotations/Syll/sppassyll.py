@@ -215,15 +215,16 @@ class sppasSyll( sppasBase ):
         """
         Perform the Syllabification process.
 
-        @param inputfilename (string) annotated file including time-aligned phonemes
+        @param inputfilename (string or Transcription) annotated file including time-aligned phonemes
         @param outputfilename
+        @return Transcription
 
         """
         self.print_options()
         self.print_diagnosis(inputfilename)
 
         # Get the tier to syllabify
-        trsinput = annotationdata.aio.read(inputfilename)
+        trsinput = self.get_transcription(inputfilename)
         phonemes = self.get_input_tier(trsinput)
         if phonemes is None:
             raise Exception("No tier found with time-aligned phonemes. "
@@ -238,6 +239,9 @@ class sppasSyll( sppasBase ):
         syllables = self.convert( phonemes, intervals )
 
         # Save in a file
-        annotationdata.aio.write( outputfilename,syllables )
+        if outputfilename is not None:
+            annotationdata.aio.write( outputfilename,syllables )
+
+        return syllables
 
     # ------------------------------------------------------------------------
@@ -205,8 +205,10 @@ class sppasTok(sppasBase):
         """
         Return the tier with transcription, or None.
 
+        @param inputfilename (str or Transcription)
+
         """
-        trsinput  = annotationdata.aio.read(inputfilename)
+        trsinput  = self.get_transcription(inputfilename)
         tierinput = None
 
         for tier in trsinput:
@@ -240,12 +242,13 @@ class sppasTok(sppasBase):
 
     # ------------------------------------------------------------------------
 
-    def run(self, inputfilename, outputfilename):
+    def run(self, inputfilename, outputfilename=None):
         """
         Run the Tokenization process on an input file.
 
-        @param inputfilename (str - IN) the input file name of the transcription
+        @param inputfilename (str or Transcription - IN) the input file name of the transcription
         @param outputfilename (str - IN) the output file name of the tokenization
+        @return Transcription
 
         """
         self.print_options()
@@ -272,7 +275,10 @@ class sppasTok(sppasBase):
             trsoutput.Add(tierStokens)
 
         # Save in a file
-        annotationdata.aio.write(outputfilename,trsoutput)
+        if outputfilename is not None:
+            annotationdata.aio.write(outputfilename,trsoutput)
+
+        return trsoutput
 
     # ------------------------------------------------------------------------
     # Private: some workers...
@@ -285,16 +291,23 @@ class sppasTok(sppasBase):
         """
         tiername = "Tokenization-Standard" if std is True else "Tokenization"
         tokens = Tier(tiername)
+        annotations = []
+        texts = []
         for a in tier:
 
             af = a.Copy()
             for text in af.GetLabel().GetLabels():
                 # Do not tokenize an empty label, noises, laughter...
                 if text.IsSpeech() is True:
-                    tokenized = self.tokenizer.tokenize(text.GetValue(), std=std)
-                    text.SetValue(tokenized)
-            tokens.Append(af)
+                    texts.append(text)
+            annotations.append(af)
+
+        # Tokenize all the texts at once
+        tokenized = self.tokenizer.tokenize_many([text.GetValue() for text in texts], std=std)
+        for text, value in zip(texts, tokenized):
+            text.SetValue(value)
 
+        tokens.Extend(annotations)
         return tokens
 
     # -----------------------------------------------------------------------
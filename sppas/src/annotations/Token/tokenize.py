@@ -89,7 +89,131 @@ def character_based(lang):
     return False
 
 # ---------------------------------------------------------------------------
+# Compiled regular expressions
+# ---------------------------------------------------------------------------
 
+# Notice that the calls to re.sub() of the enriched orthographic transcription
+# rules were given re.UNICODE as the count of substitutions and not as a
+# flag: the patterns are compiled and applied the same way.
+TOE_COUNT = re.UNICODE
+
+
+def _compile_rules(rules):
+    """ Return the list of (compiled pattern, replacement) of a list of rules. """
+    return [(re.compile(pattern), repl) for pattern, repl in rules]
+
+
+def _apply_rules(rules, entry, count=0):
+    """ Apply a list of compiled rules to a string. """
+    for regex, repl in rules:
+        entry = regex.sub(repl, entry, count)
+    return entry
+
+# Split of characters of character-based languages
+CHARS_NUMBERS = re.compile(u"([０-９0-9a-zA-ZＡ-Ｔ\s]+\.?[０-９0-9a-zA-ZＡ-Ｔ\s]+)")
+CHARS_DATES = re.compile(u"([０-９0-9\s]+\.?[月年日\s]+)")
+CHARS_DOT = re.compile(u'[\s]*・[\s]*')
+
+# Split numbers if sticked to characters (not on character-based languages)
+SPLIT_NUMBERS = _compile_rules([
+    (u'([0-9])([a-zA-Z])', ur'\1 \2'),
+    (u'([a-zA-Z])([0-9])', ur'\1 \2')])
+
+# Split some punctuation, and dots if sticked to a word
+SPLIT_PUNCT = _compile_rules([
+    (u'\\[\\]', ur'\\] \\['),
+    (u' \.([\w-])', ur'. \1'),
+    (u'^\.([\w-])', ur'. \1')])
+
+# Specific case of float numbers
+NUMBER_SEP = _compile_rules([
+    (u'([0-9])\.([0-9])', ur'\1 NUMBER_SEP_POINT \2'),
+    (u'([0-9])\,([0-9])', ur'\1 NUMBER_SEP \2')])
+
+COMPOUND_SPLIT = re.compile("([-'.])")
+
+# Information of the enriched orthographic transcription to be removed
+CLEAN_TOE = _compile_rules([
+    # Proper names: $ name ,P\$
+    (u',\s?[PTS]+\s?[\\/\\\]+\s?\\$', ur''),
+    (ur'\$', ur''),
+    (u'(gpd_[0-9]+)', ur" "),
+    (u'(gpf_[0-9]+)', ur" "),
+    (u'(ipu_[0-9]+)', ur" "),
+    # Remove invalid parenthesis content
+    (ur'\s+\([\w\xaa-\xff]+\)\s+', ' '),
+    (ur'^\([\w\xaa-\xff]+\)\s+', ' '),
+    (ur'\s+\([\w\xaa-\xff]+\)$', ' ')])
+CLEAN_TOE_PRON = re.compile(ur'\s*\[([^,]+),([^,]+)\]')
+
+
+def _toe_rules(std):
+    """ Return the rules to create the faked or the standard spelling. """
+    rules = []
+    if std is False:
+        # Stick unregular Liaisons to the previous token
+        rules.append((u' =([\w]+)=', ur'-\1'))
+    else:
+        # Remove Liaisons
+        rules.append((u' =([\w]+)=', ur' '))
+
+    rules.extend([
+        # Laughing sequences
+        (u"\s?@\s?@\s?", u" "),
+        # Laughing
+        (u"([\w\xaa-\xff]+)@", ur"\1 @"),
+        (u"@([\w\xaa-\xff]+)", ur"@ \1"),
+        # Noises
+        (u"([\w\xaa-\xff]+)\*", ur"\1 *"),
+        (u"\*([\w\xaa-\xff]+)", ur"* \1"),
+        # Transcriptor comment's: {comment}
+        (u'\\{[\s\w\xaa-\xff\-:]+\\}', ur''),
+        # Transcriptor comment's: [comment]
+        (u'\\[[\s\w\xaa-\xff\-:]+\\]', ur'')])
+
+    if std is False:
+        # Special elisions (remove parenthesis content)
+        rules.append((u'\\([\s\w\xaa-\xff\-\']+\\)', ur''))
+    else:
+        # Special elisions (keep parenthesis content)
+        rules.append((u'\\(([\s\w\xaa-\xff\-]+)\\)', ur'\1'))
+
+    # Morphological variants are ignored for phonetization (same pronunciation!)
+    rules.extend([
+        (u'\s+\\<([\-\'\s\w\xaa-\xff]+),[\-\'\s\w\xaa-\xff]+\\>', ur' \1'),
+        (u'\s+\\{([\-\'\s\w\xaa-\xff]+),[\-\'\s\w\xaa-\xff]+\\}', ur' \1'),
+        (u'\s+\\/([\-\'\s\w0-9\xaa-\xff]+),[\-\'\s\w0-9\xaa-\xff]+\\/', ur' \1')])
+
+    if std is False:
+        # Special pronunciations (keep right part)
+        rules.append((u'\s+\\[([\s\w\xaa-\xff/-]+),([\s\w\xaa-\xff/]+)\\]', ur' \2'))
+    else:
+        # Special pronunciations (keep left part)
+        rules.append((u'\s+\\[([\s\w\xaa-\xff\\/-]+),[\s\w\xaa-\xff\\/]+\\]', ur' \1'))
+
+    rules.extend([
+        # Proper names: $ name ,P\$
+        (u',\s?[PTS]+\s?[\\/\\\]+\s?\\$', ur''),
+        (u'\\$', ur''),
+        # Add a space if some punctuation are sticked to a word
+        # TODO: do the same with the whole list of punctuations (in rutils).
+        (u'([\w\xaa-\xff]+),', ur'\1 ,'),
+        (u'([\w\xaa-\xff]+)\+', ur'\1 +'),
+        (u'([\w\xaa-\xff]+);', ur'\1 ,'),
+        (u'([\w\xaa-\xff]+):', ur'\1 :'),
+        (u'([\w\xaa-\xff]+)\(', ur'\1 ('),
+        (u'([\w\xaa-\xff]+)\)', ur'\1)'),
+        (u'([\w\xaa-\xff]+)\{', ur'\1 {'),
+        (u'([\w\xaa-\xff]+)\}', ur'\1 }'),
+        (u'([\w\xaa-\xff]+)=', ur'\1 ='),
+        (u'([\w\xaa-\xff]+)\?', ur'\1 ?'),
+        (u'([\w\xaa-\xff]+)\!', ur'\1 !'),
+        (u"\s(?=,[0-9]+)", "")])
+
+    return _compile_rules(rules)
+
+TOE_FAKED = _toe_rules(False)
+TOE_STANDARD = _toe_rules(True)
 
 # ---------------------------------------------------------------------------
 # DictTok main class
@@ -154,6 +278,17 @@ class DictTok(object):
         self.num2letter = sppasNum(lang)
         self.delimiter = u' '
 
+        # compiled data
+        self._char_based = False
+        self._split_rules = []
+        self._utf_repl = [(k, self.dicoutf.replace(k)) for k in self.dicoutf.get_keys()]
+        self._repl_state = None
+        self._repl_index = {}
+        self._repl_keys = []
+        self._repl_lengths = []
+        self.__compile_lang()
+        self.__compile_repl()
+
     # ------------------------------------------------------------------
     # Options
     # ------------------------------------------------------------------
@@ -188,6 +323,7 @@ class DictTok(object):
 
         """
         self.repl = repl
+        self.__compile_repl()
 
     # -------------------------------------------------------------------------
 
@@ -210,6 +346,64 @@ class DictTok(object):
 
         """
         self.lang = lang
+        self.__compile_lang()
+
+    # -------------------------------------------------------------------------
+
+    def __compile_lang(self):
+        """ Fix the language-specific rules. """
+
+        self._char_based = character_based(self.lang)
+        self._split_rules = SPLIT_NUMBERS
+        if self._char_based is True:
+            # numbers sticked to characters: it can be a tone!
+            self._split_rules = []
+
+    # -------------------------------------------------------------------------
+
+    def __compile_repl(self):
+        """
+        Index the keys of the dictionary of replacements by their rank, and
+        store the lengths of the keys, to find the ones ending a token with
+        one lookup for each length. The index is created again when the
+        dictionary is modified (see DictRepl.get_version()).
+
+        """
+        self._repl_state = (self.repl, self.repl.get_version())
+        self._repl_keys = self.repl.get_keys()
+        self._repl_index = dict((k, i) for i, k in enumerate(self._repl_keys))
+        self._repl_lengths = sorted(set(len(k) for k in self._repl_keys))
+
+    # -------------------------------------------------------------------------
+
+    def __split_repl(self, t):
+        """
+        Split the replacement keys ending a token.
+
+        Keys are examined in the order of the dictionary, as if each one
+        were tested with endswith(): the next key to split is the first one
+        after the previous split that ends the token.
+
+        """
+        if self._repl_state != (self.repl, self.repl.get_version()):
+            self.__compile_repl()
+
+        rank = -1
+        while True:
+            best = None
+            for l in self._repl_lengths:
+                if l > len(t):
+                    break
+                i = self._repl_index.get(t[len(t)-l:], -1)
+                if i > rank and (best is None or i < best):
+                    best = i
+            if best is None:
+                return t
+
+            r = self._repl_keys[best]
+            t = t[:-len(r)]
+            t = t + ' ' + r
+            rank = best
 
     # -------------------------------------------------------------------------
     # Language independent modules
@@ -230,12 +424,12 @@ class DictTok(object):
         tmp =  " ".join(y)
 
         # split all characters except numbers and ascii characters
-        sstr = re.sub(u"([０-９0-9a-zA-ZＡ-Ｔ\s]+\.?[０-９0-9a-zA-ZＡ-Ｔ\s]+)", lambda o: u" %s " % o.group(0).replace(" ",""), tmp)
+        sstr = CHARS_NUMBERS.sub(lambda o: u" %s " % o.group(0).replace(" ",""), tmp)
         # and dates...
         if not self.speech:
-            sstr = re.sub(u"([０-９0-9\s]+\.?[月年日\s]+)", lambda o: u" %s " % o.group(0).replace(" ",""), sstr)
+            sstr = CHARS_DATES.sub(lambda o: u" %s " % o.group(0).replace(" ",""), sstr)
         # and ・
-        sstr = re.sub(u'[\s]*・[\s]*', u"・", sstr)
+        sstr = CHARS_DOT.sub(u"・", sstr)
         return sstr
 
     # -------------------------------------------------------------------------
@@ -253,7 +447,7 @@ class DictTok(object):
         """
 
         s = utt
-        if character_based(self.lang):
+        if self._char_based is True:
             s = self.split_characters(s)
 
         toks = []
@@ -261,25 +455,16 @@ class DictTok(object):
             # if not a phonetized entry
             if t.startswith("/") is False and t.endswith("/") is False:
                 if std is False:
-                    if not character_based(self.lang):
-                        # Split numbers if sticked to characters
-                        # attention: do not replace [a-zA-Z] by [\w] (because \w includes numbers)
-                        # and not on Asian languages: it can be a tone!
-                        t = re.sub(u'([0-9])([a-zA-Z])', ur'\1 \2', t)
-                        t = re.sub(u'([a-zA-Z])([0-9])', ur'\1 \2', t)
-
-                # Split some punctuation
-                t = re.sub(u'\\[\\]', ur'\\] \\[', t)
+                    # Split numbers if sticked to characters
+                    # attention: do not replace [a-zA-Z] by [\w] (because \w includes numbers)
+                    # and not on Asian languages: it can be a tone!
+                    t = _apply_rules(self._split_rules, t)
 
-                # Split dots if sticked to a word
-                t = re.sub(u' \.([\w-])', ur'. \1', t)
-                t = re.sub(u'^\.([\w-])', ur'. \1', t)
+                # Split some punctuation, and dots if sticked to a word
+                t = _apply_rules(SPLIT_PUNCT, t)
 
                 # Split replacement characters
-                for r in self.repl.get_keys():
-                    if t.endswith(r):
-                        t = t[:-len(r)]
-                        t = t + ' ' + r
+                t = self.__split_repl(t)
             toks.append(t.strip())
 
         s = " ".join(toks)
@@ -294,15 +479,19 @@ class DictTok(object):
     def __stick_longest(self, utt, attachement = "_"):
         """ Longest matching algorithm. """
         tabtoks = utt.split(" ")
-        i = len(tabtoks)
-        while i>0:
-            # try to stick all tokens
-            _token = attachement.join(tabtoks)
-            if self.vocab.is_unk(_token) is False:
-                return (i,_token)
-            tabtoks.pop()
-            i -= 1
-        return (1,utt.split(" ")[0])
+        sticked = attachement.join(tabtoks)
+        # all the entries of the vocabulary starting the sticked tokens
+        ends = set(self.vocab.get_trie().prefixes(sticked))
+
+        # the longest one ending at the end of a token
+        longest = (1, tabtoks[0])
+        end = -len(attachement)
+        for i, tok in enumerate(tabtoks, 1):
+            end += len(attachement) + len(tok)
+            if end in ends:
+                longest = (i, sticked[:end])
+
+        return longest
 
     # -------------------------------------------------------------------------
 
@@ -347,8 +536,7 @@ class DictTok(object):
         """
         # Specific case of float numbers
         sent = ' '.join(utt)
-        sent = re.sub(u'([0-9])\.([0-9])', ur'\1 NUMBER_SEP_POINT \2', sent)
-        sent = re.sub(u'([0-9])\,([0-9])', ur'\1 NUMBER_SEP \2', sent)
+        sent = _apply_rules(NUMBER_SEP, sent)
         sent = rutils.to_strip(sent)
         _utt = sent.split()
 
@@ -382,25 +570,23 @@ class DictTok(object):
 
                 # Split the unknown token into a list
                 # KEEP special chars ('-.) in the array!
-                _tabtoks = re.split("([-'.])",tok)
+                _tabtoks = COMPOUND_SPLIT.split(tok)
 
                 # Explore the list from left to right
                 t1 = 0
                 while t1<len(_tabtoks):
-                    i = len(_tabtoks)
-                    i_ok = 0
-                    # Find the longest string in the dict
-                    while i>=t1 and i_ok==0:
-                        _token = _tabtoks[t1]
-                        if i > (t1+1):
-                            for j in range(t1+1,i):
-                                _token += _tabtoks[j]
-                            if self.vocab.is_unk(_token) is False:
-                                i_ok = j+1
-                        else:
-                            i_ok = 1
-                            _token = _tabtoks[t1]
-                        i -= 1
+                    # Find the longest string in the dict: all the entries
+                    # starting the remaining string are found in one pass
+                    _remain = "".join(_tabtoks[t1:])
+                    ends = set(self.vocab.get_trie().prefixes(_remain))
+                    i_ok = 1
+                    _token = _tabtoks[t1]
+                    end = len(_tabtoks[t1])
+                    for j in range(t1+1, len(_tabtoks)):
+                        end += len(_tabtoks[j])
+                        if end in ends:
+                            i_ok = j+1
+                            _token = _remain[:end]
                     t1 += i_ok
                     t2 = rutils.to_strip(_token)
                     if len(t2)>0:
@@ -480,20 +666,10 @@ class DictTok(object):
         @return string
 
         """
-        # Proper names: $ name ,P\$
-        entry = re.sub(u',\s?[PTS]+\s?[\\/\\\]+\s?\\$', ur'', entry, re.UNICODE)
-        entry = re.sub(ur'\$', ur'', entry, re.UNICODE)
-
-        entry = re.sub(u'(gpd_[0-9]+)', ur" ", entry, re.UNICODE)
-        entry = re.sub(u'(gpf_[0-9]+)', ur" ", entry, re.UNICODE)
-        entry = re.sub(u'(ipu_[0-9]+)', ur" ", entry, re.UNICODE)
+        # Proper names, silent pauses, invalid parenthesis content
+        entry = _apply_rules(CLEAN_TOE, entry, TOE_COUNT)
 
-        # Remove invalid parenthesis content
-        entry = re.sub(ur'\s+\([\w\xaa-\xff]+\)\s+', ' ', entry, re.UNICODE)
-        entry = re.sub(ur'^\([\w\xaa-\xff]+\)\s+', ' ', entry, re.UNICODE)
-        entry = re.sub(ur'\s+\([\w\xaa-\xff]+\)$', ' ', entry, re.UNICODE)
-
-        entry = re.sub(ur'\s*\[([^,]+),([^,]+)\]', self.__repl, entry, re.UNICODE)
+        entry = CLEAN_TOE_PRON.sub(self.__repl, entry, TOE_COUNT)
         return " ".join(entry.split())
 
     # ------------------------------------------------------------------
@@ -515,71 +691,13 @@ class DictTok(object):
         _fentry = " " + unicode(entry) + " "
 
         if std is False:
-            # Stick unregular Liaisons to the previous token
-            _fentry = re.sub(u' =([\w]+)=', ur'-\1', _fentry, re.UNICODE)
-        else:
-            # Remove Liaisons
-            _fentry = re.sub(u' =([\w]+)=', ur' ', _fentry, re.UNICODE)
-
-        # Laughing sequences
-        _fentry = re.sub(u"\s?@\s?@\s?", u" ", _fentry, re.UNICODE)
-
-        # Laughing
-        _fentry = re.sub(u"([\w\xaa-\xff]+)@", ur"\1 @", _fentry, re.UNICODE)
-        _fentry = re.sub(u"@([\w\xaa-\xff]+)", ur"@ \1", _fentry, re.UNICODE)
-
-        # Noises
-        _fentry = re.sub(u"([\w\xaa-\xff]+)\*", ur"\1 *", _fentry, re.UNICODE)
-        _fentry = re.sub(u"\*([\w\xaa-\xff]+)", ur"* \1", _fentry, re.UNICODE)
-
-        # Transcriptor comment's: {comment}
-        _fentry = re.sub(u'\\{[\s\w\xaa-\xff\-:]+\\}', ur'', _fentry, re.UNICODE)
-        # Transcriptor comment's: [comment]
-        _fentry = re.sub(u'\\[[\s\w\xaa-\xff\-:]+\\]', ur'', _fentry, re.UNICODE)
-        # Transcription comment's: (comment)
-        #_fentry = re.sub(u' \\([\s\w\xaa-\xff\-:]+\\) ', ur'', _fentry, re.UNICODE) # .... warning!
-
-        if std is False:
-            # Special elisions (remove parenthesis content)
-            _fentry = re.sub(u'\\([\s\w\xaa-\xff\-\']+\\)', ur'', _fentry, re.UNICODE)
-        else:
-            # Special elisions (keep parenthesis content)
-            _fentry = re.sub(u'\\(([\s\w\xaa-\xff\-]+)\\)', ur'\1', _fentry, re.UNICODE)
-
-        # Morphological variants are ignored for phonetization (same pronunciation!)
-        _fentry = re.sub(u'\s+\\<([\-\'\s\w\xaa-\xff]+),[\-\'\s\w\xaa-\xff]+\\>', ur' \1', _fentry, re.UNICODE)
-        _fentry = re.sub(u'\s+\\{([\-\'\s\w\xaa-\xff]+),[\-\'\s\w\xaa-\xff]+\\}', ur' \1', _fentry, re.UNICODE)
-        _fentry = re.sub(u'\s+\\/([\-\'\s\w0-9\xaa-\xff]+),[\-\'\s\w0-9\xaa-\xff]+\\/', ur' \1', _fentry, re.UNICODE)
-
-        if std is False:
-            # Special pronunciations (keep right part)
-            _fentry = re.sub(u'\s+\\[([\s\w\xaa-\xff/-]+),([\s\w\xaa-\xff/]+)\\]', ur' \2', _fentry, re.UNICODE)
+            _fentry = _apply_rules(TOE_FAKED, _fentry, TOE_COUNT)
         else:
-            # Special pronunciations (keep left part)
-            _fentry = re.sub(u'\s+\\[([\s\w\xaa-\xff\\/-]+),[\s\w\xaa-\xff\\/]+\\]', ur' \1', _fentry, re.UNICODE)
-
-        # Proper names: $ name ,P\$
-        _fentry = re.sub(u',\s?[PTS]+\s?[\\/\\\]+\s?\\$', ur'', _fentry, re.UNICODE)
-        _fentry = re.sub(u'\\$', ur'', _fentry, re.UNICODE)
-
-        # Add a space if some punctuation are sticked to a word
-        # TODO: do the same with the whole list of punctuations (in rutils).
-#        _fentry = re.sub(u'([:+^@}\(\){~|=]+)([\xaa-\xff]+)', ur'\1 \2', _fentry, re.UNICODE)
-        _fentry = re.sub(u'([\w\xaa-\xff]+),', ur'\1 ,', _fentry, re.UNICODE)
-        _fentry = re.sub(u'([\w\xaa-\xff]+)\+', ur'\1 +', _fentry, re.UNICODE)
-        _fentry = re.sub(u'([\w\xaa-\xff]+);', ur'\1 ,', _fentry, re.UNICODE)
-        _fentry = re.sub(u'([\w\xaa-\xff]+):', ur'\1 :', _fentry, re.UNICODE)
-        _fentry = re.sub(u'([\w\xaa-\xff]+)\(', ur'\1 (', _fentry, re.UNICODE)
-        _fentry = re.sub(u'([\w\xaa-\xff]+)\)', ur'\1)', _fentry, re.UNICODE)
-        _fentry = re.sub(u'([\w\xaa-\xff]+)\{', ur'\1 {', _fentry, re.UNICODE)
-        _fentry = re.sub(u'([\w\xaa-\xff]+)\}', ur'\1 }', _fentry, re.UNICODE)
-        _fentry = re.sub(u'([\w\xaa-\xff]+)=', ur'\1 =', _fentry, re.UNICODE)
-        _fentry = re.sub(u'([\w\xaa-\xff]+)\?', ur'\1 ?', _fentry, re.UNICODE)
-        _fentry = re.sub(u'([\w\xaa-\xff]+)\!', ur'\1 !', _fentry, re.UNICODE)
-        #_fentry = re.sub(u'([\w\xaa-\xff]+)\/', ur'\1 !', _fentry, re.UNICODE) # no: if sampa in special pron.
-        _fentry = re.sub(u"\s(?=,[0-9]+)", "" , _fentry, re.UNICODE)
+            _fentry = _apply_rules(TOE_STANDARD, _fentry, TOE_COUNT)
 
         # Correction of errors
+        if "/" not in _fentry:
+            return rutils.to_strip(_fentry)
         s = ""
         inpron=False
         for c in _fentry:
@@ -617,7 +735,7 @@ class DictTok(object):
         # Step 4: stick (using the dictionary)
         try:
             attachement = "_"
-            if character_based(self.lang):
+            if self._char_based is True:
                 attachement = ""
             utt = self.stick(utt,attachement)
         except Exception as e:
@@ -680,8 +798,8 @@ class DictTok(object):
 
         # Remove UTF-8 specific characters that are not in our dictionaries!
         try:
-            for key in self.dicoutf.get_keys():
-                _str = _str.replace(key, self.dicoutf.replace(key))
+            for key, value in self._utf_repl:
+                _str = _str.replace(key, value)
         except Exception as e:
             raise UnicodeError('Error during cleaning: %s'%str(e))
 
@@ -699,3 +817,26 @@ class DictTok(object):
         # THE ENTRY IS NOW A LIST OF STRINGS.
         # ---------------------------------------------------
         return self.tokenize_list(utt, std)
+
+    # ------------------------------------------------------------------
+
+    def tokenize_many(self, utterances, std=False):
+        """
+        Tokenize a list of utterrances.
+        An utterance occurring several times is tokenized only once.
+
+        @param utterances (list of UTF8-String)
+        @param std (Boolean) In case of enriched transcription, std is used
+        to fix the output as standard or faked spelling
+
+        @return A list of strings (the tokenized transcriptions)
+
+        """
+        tokenized = {}
+        result = []
+        for entry in utterances:
+            if entry not in tokenized:
+                tokenized[entry] = self.tokenize(entry, std)
+            result.append(tokenized[entry])
+
+        return result
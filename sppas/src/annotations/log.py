@@ -39,6 +39,7 @@ import datetime
 import codecs
 import logging
 import os
+import StringIO
 
 from sp_glob import program, version, copyright, url, author, contact
 from sp_glob import encoding
@@ -83,6 +84,22 @@ class sppasLog( object ):
     def open(self, logfilename):
         self.logfp = codecs.open(logfilename, 'a+', encoding)
 
+    def open_buffer(self):
+        """
+        Write messages into a memory buffer instead of a file.
+        It allows a process to send its messages to the one that owns the
+        log file (see get_buffer).
+
+        """
+        self.logfp = codecs.getwriter(encoding)(StringIO.StringIO())
+
+    def get_buffer(self):
+        """
+        Return the content of the memory buffer (see open_buffer).
+
+        """
+        return self.logfp.getvalue().decode(encoding)
+
     # ----------------------------------------------------------------------
     # Write data
     # ----------------------------------------------------------------------
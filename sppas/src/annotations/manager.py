@@ -45,6 +45,8 @@ __copyright__ = """Copyright (C) 2011-2015  Brigitte Bigi"""
 # ----------------------------------------------------------------------------
 
 import os
+import multiprocessing
+import multiprocessing.util
 
 import utils.fileutils
 
@@ -98,6 +100,12 @@ class sppasAnnotationsManager(Thread):
         self._progress = None
         self._logfile  = None
         self._domerge  = True
+        self._jobs     = 1
+        self._pipeline = False
+        self._save     = True
+
+        # Annotate the files, and keep the results in pipeline mode
+        self._annotator = sppasFileAnnotator(parameters)
 
         self.start()
 
@@ -109,6 +117,8 @@ class sppasAnnotationsManager(Thread):
 
         Available options are:
             - domerge (bool) create a merged TextGrid file.
+            - jobs (int) number of processes to annotate files.
+            - pipeline (bool) chain annotations in memory.
 
         @param options (option)
 
@@ -121,6 +131,12 @@ class sppasAnnotationsManager(Thread):
             if key == "domerge":
                 self.set_domerge(opt.get_value())
 
+            elif key == "jobs":
+                self.set_jobs(opt.get_value())
+
+            elif key == "pipeline":
+                self.set_pipeline(opt.get_value())
+
             else:
                 raise Exception('Unknown key option: %s'%key)
 
@@ -138,6 +154,44 @@ class sppasAnnotationsManager(Thread):
 
     # ----------------------------------------------------------------------
 
+    def set_jobs(self, jobs):
+        """
+        Fix the number of processes used to annotate the files.
+        If jobs is greater than 1, the files of each annotation step are
+        distributed over a pool of processes; the merge is performed only
+        after all the steps are completed.
+
+        @param jobs (int) number of processes, 0 for the number of CPUs
+
+        """
+        jobs = int(jobs)
+        if jobs < 0:
+            raise ValueError('Number of jobs must be a positive value. Got: %d'%jobs)
+        if jobs == 0:
+            jobs = multiprocessing.cpu_count()
+        self._jobs = jobs
+
+    # ----------------------------------------------------------------------
+
+    def set_pipeline(self, pipeline, save=True):
+        """
+        Fix the pipeline option.
+        If pipeline is set to True, the files are annotated one after the
+        other by all the steps, and the result of the tokenization,
+        phonetization, alignment, syllabification and repetitions is given
+        to the next steps and to the merge as a Transcription, instead of
+        being written then read again. The results of a file are written,
+        merged then released when all its annotations are done.
+        The pipeline is performed with only one process (see set_jobs).
+
+        @param pipeline (Boolean)
+        @param save (Boolean) write the files of the results
+
+        """
+        self._pipeline = pipeline
+        self._save = save
+        self._annotator.set_pipeline(pipeline)
+
     # -----------------------------------------------------------------------
 
     def set_filelist(self, extension, not_ext=[], not_start=[]):
@@ -203,24 +257,24 @@ class sppasAnnotationsManager(Thread):
 
     # ------------------------------------------------------------------------
 
-    def _get_filename(self, filename, extensions):
+    def _save_results(self, filename):
         """
-        Return a filename corresponding to one of extensions.
+        Write the files of the results of a file kept in memory (pipeline mode).
 
         @param filename input file name
-        @param extensions is the list of expected extension
-        @return a file name of the first existing file with an expected extension or None
 
         """
-
-        for ext in extensions:
-
-            extfilename = os.path.splitext(filename)[0] + ext
-            newfilename = utils.fileutils.exists(extfilename)
-            if newfilename is not None and os.path.isfile(newfilename):
-                return newfilename
-
-        return None
+        for (f, pattern) in sorted(self._annotator.results.keys()):
+            if f != filename:
+                continue
+            outname = os.path.splitext(f)[0] + pattern + self.parameters.get_output_format()
+            try:
+                annotationdata.aio.write(outname, self._annotator.results[(f, pattern)])
+                if self._logfile is not None:
+                    self._logfile.print_message(outname, indent=1, status=0)
+            except Exception as e:
+                if self._logfile is not None:
+                    self._logfile.print_message("%s for file %s\n"%(str(e),outname), indent=1, status=-1)
 
     # ------------------------------------------------------------------------
     # Run annotations.
@@ -234,908 +288,1130 @@ class sppasAnnotationsManager(Thread):
         @return number of files processed successfully
 
         """
-        # Initializations
-        step = self.parameters.get_step(stepidx)
-        stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0,"")
-
-        # Get the list of input file names, with the ".wav" (or ".wave") extension
         filelist = self.set_filelist(".wav")#,not_start=["track_"])
-        if len(filelist) == 0:
-            return 0
-        total = len(filelist)
+        return self._run_step(stepidx, filelist)
 
-        # Create annotation instance
-        try:
-            m = sppasMomel(self._logfile)
-        except Exception as e:
-            if self._logfile is not None:
-                self._logfile.print_message("%s\n"%str(e), indent=1,status=1)
-            return 0
+    # ------------------------------------------------------------------------
 
-        # Execute annotation for each file in the list
-        for i,f in enumerate(filelist):
+    def run_intsint(self, stepidx):
+        """
+        Execute the SPPAS implementation of Intsint.
 
-            # fix the default values
-            m.fix_options(step.get_options())
+        @param stepidx index of this annotations in the parameters
+        @return number of files processed successfully
 
-            # Indicate the file to be processed
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
-            if self._logfile is not None:
-                self._logfile.print_message(stepname+" of file " + f, indent=1)
+        """
+        filelist = self.set_filelist(".wav")#,not_start=["track_"])
+        return self._run_step(stepidx, filelist)
 
-            # Get the input file
-            inname = self._get_filename(f, [".hz", ".PitchTier"])
-            if inname is not None:
+    # ------------------------------------------------------------------------
 
-                # Fix output file names
-                outname = os.path.splitext(f)[0]+"-momel.PitchTier"
-                textgridoutname = os.path.splitext(f)[0] + '-momel' + self.parameters.get_output_format()
+    def run_ipusegmentation(self, stepidx):
+        """
+        Execute the SPPAS-IPUSegmentation program.
 
-                # Execute annotation
-                try:
-                    m.run(inname, trsoutput=textgridoutname, outputfile=outname)
-                    files_processed_success += 1
-                    if self._logfile is not None:
-                        self._logfile.print_message(textgridoutname,indent=2,status=0)
-                except Exception as e:
-                    if self._logfile is not None:
-                        self._logfile.print_message(textgridoutname+": %s"%str(e),indent=2,status=-1)
-            else:
-                if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a file with pitch values. Read the documentation for details.",indent=2,status=2)
+        @return number of files processed successfully
 
-            # Indicate progress
-            self._progress.set_fraction(float((i+1))/float(total))
-            if self._logfile is not None:
-                self._logfile.print_newline()
+        """
+        filelist = self.set_filelist(".wav")
+        return self._run_step(stepidx, filelist)
 
-        # Indicate completed!
-        self._progress.update(1,"Completed (%d files successfully over %d files).\n"%(files_processed_success,total))
-        self._progress.set_header("")
+    # ------------------------------------------------------------------------
 
-        return files_processed_success
+    def run_tokenization(self, stepidx):
+        """
+        Execute the SPPAS-Tokenization program.
+
+        @return number of files processed successfully
+
+        """
+        filelist = self.set_filelist(".wav")#,not_start=["track_"])
+        return self._run_step(stepidx, filelist)
 
     # ------------------------------------------------------------------------
 
-    def run_intsint(self, stepidx):
+    def run_phonetization(self, stepidx):
         """
-        Execute the SPPAS implementation of Intsint.
+        Execute the SPPAS-Phonetization program.
 
-        @param stepidx index of this annotations in the parameters
         @return number of files processed successfully
 
         """
-        # Initializations
-        stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0,"")
-
-        # Get the list of input file names, with the ".wav" (or ".wave") extension
         filelist = self.set_filelist(".wav")#,not_start=["track_"])
-        if len(filelist) == 0:
-            return 0
-        total = len(filelist)
+        return self._run_step(stepidx, filelist)
 
-        # Create annotation instance
-        try:
-            intsint = sppasIntsint(self._logfile)
-        except Exception as e:
-            if self._logfile is not None:
-                self._logfile.print_message("%s\n"%str(e), indent=1,status=1)
-            return 0
+    # ------------------------------------------------------------------------
 
-        # Execute annotation for each file in the list
-        for i,f in enumerate(filelist):
+    def run_chunks_alignment(self, stepidx):
+        """
+        Execute the SPPAS Chunks alignment program.
 
-            # Indicate the file to be processed
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
-            if self._logfile is not None:
-                self._logfile.print_message(stepname+" of file " + f, indent=1)
+        """
+        filelist = self.set_filelist(".wav")#,not_start=["track_"])
+        return self._run_step(stepidx, filelist)
 
-            # Get the input file
-            ext = ['-momel'+self.parameters.get_output_format()]
-            for e in annotationdata.aio.extensions_out:
-                ext.append('-momel'+e)
+    # ------------------------------------------------------------------------
 
-            inname = self._get_filename(f, ext)
-            if inname is not None:
+    def run_alignment(self, stepidx):
+        """
+        Execute the SPPAS-Alignment program.
 
-                # Fix output file names
-                outname = os.path.splitext(f)[0] + '-intsint' + self.parameters.get_output_format()
+        """
+        filelist = self.set_filelist(".wav")#,not_start=["track_"])
+        return self._run_step(stepidx, filelist)
 
-                # Execute annotation
-                try:
-                    intsint.run(inname, outname)
-                    files_processed_success += 1
-                    if self._logfile is not None:
-                        self._logfile.print_message(outname,indent=2,status=0)
-                except Exception as e:
-                    if self._logfile is not None:
-                        self._logfile.print_message(outname+": %s"%str(e),indent=2,status=-1)
-            else:
-                if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a file with momel targets. Read the documentation for details.",indent=2,status=2)
+    # ------------------------------------------------------------------------
 
-            # Indicate progress
-            self._progress.set_fraction(float((i+1))/float(total))
-            if self._logfile is not None:
-                self._logfile.print_newline()
+    def run_syllabification(self, stepidx):
+        """
+        Execute the SPPAS syllabification.
 
-        # Indicate completed!
-        self._progress.update(1,"Completed (%d files successfully over %d files).\n"%(files_processed_success,total))
-        self._progress.set_header("")
+        """
+        filelist = self.set_filelist(".wav",not_start=["track_"])
+        return self._run_step(stepidx, filelist)
 
-        return files_processed_success
+    # ------------------------------------------------------------------------
+
+    def run_repetition(self, stepidx):
+        """
+        Execute the automatic repetitions detection.
 
+        """
+        filelist = self.set_filelist(".wav",not_start=["track_"])
+        return self._run_step(stepidx, filelist)
+
+    # ------------------------------------------------------------------------
+    # Run one annotation step on a list of files.
     # ------------------------------------------------------------------------
 
-    def run_ipusegmentation(self, stepidx):
+    def _run_step(self, stepidx, filelist):
         """
-        Execute the SPPAS-IPUSegmentation program.
+        Execute an annotation step on each file of a list, either
+        sequentially or with a pool of processes (see set_jobs).
 
+        @param stepidx index of this annotations in the parameters
+        @param filelist list of wav file names
         @return number of files processed successfully
 
         """
         # Initializations
-        step = self.parameters.get_step(stepidx)
         stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
         self._progress.set_header(stepname)
         self._progress.update(0,"")
 
-        # Get the list of input file names, with the ".wav" extension
-        filelist = self.set_filelist(".wav")
         if len(filelist) == 0:
             return 0
-        total = len(filelist)
-
-        # Create annotation instance, and fix options
-        try:
-            seg = sppasIPUs(self._logfile)
-        except Exception as e:
-            if self._logfile is not None:
-                self._logfile.print_message("%s\n"%str(e), indent=1,status=4)
-            return 0
 
-        # Execute the annotation for each file in the list
-        for i,f in enumerate(filelist):
-
-            # fix the default values
-            seg.reset()
-            seg.fix_options(step.get_options())
-
-            # Indicate the file to be processed
-            if self._logfile is not None:
-                self._logfile.print_message(stepname+" of file "+f, indent=1)
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
-
-            # Fix input/output file name
-            outname = os.path.splitext(f)[0] + self.parameters.get_output_format()
-
-            # Is there already an existing IPU-seg (in any format)!
-            ext = []
-            for e in annotationdata.aio.extensions_in:
-                if not e in ['.txt','.hz', '.PitchTier']:
-                    ext.append(e)
-            existoutname = self._get_filename(f, ext)
-
-            # it's existing... but not in the expected format: convert!
-            if existoutname is not None and existoutname != outname:
-                # just copy the file!
-                if self._logfile is not None:
-                    self._logfile.print_message('Export '+existoutname, indent=2)
-                    self._logfile.print_message('into '+outname, indent=2)
-                try:
-                    t = annotationdata.aio.read(existoutname)
-                    annotationdata.aio.write(outname,t)
-                    # OK, now outname is as expected! (or not...)
-                except Exception:
-                    pass
-
-            # Execute annotation
-            tgfname = utils.fileutils.exists(outname)
-            if tgfname is None:
-                # No already existing IPU seg., but perhaps a txt.
-                txtfile = self._get_filename(f, [".txt"])
-                if self._logfile is not None:
-                    if txtfile:
-                        self._logfile.print_message("A transcription was found, perform Silence/Speech segmentation time-aligned with a transcription %s"%txtfile, indent=2,status=3)
-                    else:
-                        self._logfile.print_message("No transcription was found, perform Silence/Speech segmentation only.", indent=2,status=3)
-                try:
-                    seg.run(f, trsinputfile=txtfile, ntracks=None, diroutput=None, tracksext=None, trsoutput=outname)
-                    files_processed_success += 1
-                    if self._logfile is not None:
-                        self._logfile.print_message(outname, indent=2,status=0)
-                except Exception as e:
-                    if self._logfile is not None:
-                        self._logfile.print_message("%s for file %s\n"%(str(e),outname), indent=2,status=-1)
-            else:
-                if seg.get_option('dirtracks') is True:
-                    self._logfile.print_message("A time-aligned transcription was found, split into multiple files", indent=2,status=3)
-                    try:
-                        seg.run(f, trsinputfile=tgfname, ntracks=None, diroutput=None, tracksext=None, trsoutput=None)
-                        files_processed_success += 1
-                        if self._logfile is not None:
-                            self._logfile.print_message(tgfname, indent=2,status=0)
-                    except Exception as e:
-                        if self._logfile is not None:
-                            self._logfile.print_message("%s for file %s\n"%(str(e),tgfname), indent=2,status=-1)
-                else:
-                    if self._logfile is not None:
-                        self._logfile.print_message("because a previous segmentation is existing.", indent=2,status=2)
-
-            # Indicate progress
-            self._progress.set_fraction(float((i+1))/float(total))
-            if self._logfile is not None:
-                self._logfile.print_newline()
+        if self._jobs > 1 and len(filelist) > 1 and self._pipeline is False:
+            files_processed_success = self.__run_pool(stepidx, filelist)
+        else:
+            files_processed_success = self.__run_sequential(stepidx, filelist)
 
         # Indicate completed!
-        self._progress.update(1,"Completed (%d files successfully over %d files).\n"%(files_processed_success,total))
+        self._progress.update(1,"Completed (%d files successfully over %d files).\n"%(files_processed_success,len(filelist)))
         self._progress.set_header("")
 
         return files_processed_success
 
     # ------------------------------------------------------------------------
 
-    def run_tokenization(self, stepidx):
+    def __run_sequential(self, stepidx, filelist):
         """
-        Execute the SPPAS-Tokenization program.
-
-        @return number of files processed successfully
+        Execute an annotation step on each file of the list, one after the
+        other, with only one instance of the annotation.
 
         """
-        # Initializations
-        step = self.parameters.get_step(stepidx)
         stepname = self.parameters.get_step_name(stepidx)
         files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0,"")
-
-        # Get the list of input file names, with the ".wav" (or ".wave") extension
-        filelist = self.set_filelist(".wav")#,not_start=["track_"])
-        if len(filelist) == 0:
-            return 0
         total = len(filelist)
 
         # Create annotation instance
         try:
             self._progress.set_text("Loading resources...")
-            t = sppasTok(step.get_langresource(), logfile=self._logfile, lang=step.get_lang())
+            a = self._annotator.create_annotation(stepidx)
         except Exception as e:
-            if self._logfile is not None:
-                self._logfile.print_message("%s\n"%str(e), indent=1,status=4)
+            self._annotator.print_creation_error(stepidx, e)
             return 0
 
         # Execute the annotation for each file in the list
         for i,f in enumerate(filelist):
 
-            # fix the default values
-            t.fix_options(step.get_options())
-
             # Indicate the file to be processed
             self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
             if self._logfile is not None:
                 self._logfile.print_message(stepname+" of file " + f, indent=1)
 
-            # Get the input file
-            inname = self._get_filename(f, [self.parameters.get_output_format()] + annotationdata.aio.extensions_out)
-            if inname is not None:
-
-                # Fix output file name
-                outname = os.path.splitext(f)[0] + '-token' + self.parameters.get_output_format()
-
-                # Execute annotation
-                try:
-                    t.run(inname, outname)
-                except Exception as e:
-                    if self._logfile is not None:
-                        self._logfile.print_message("%s for file %s\n"%(str(e),outname), indent=2,status=-1)
-                else:
-                    files_processed_success += 1
-                    if self._logfile is not None:
-                        self._logfile.print_message(outname, indent=2,status=0)
-
-            else:
-                if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a file with transcription. Read the documentation for details.",indent=2,status=2)
+            # Execute annotation
+            files_processed_success += self._annotator.annotate_file(a, stepidx, f)
 
             # Indicate progress
             self._progress.set_fraction(float((i+1))/float(total))
             if self._logfile is not None:
                 self._logfile.print_newline()
 
-        # Indicate completed!
-        self._progress.update(1,"Completed (%d files successfully over %d files).\n"%(files_processed_success,total))
-        self._progress.set_header("")
+        self._annotator.close_annotation(a, stepidx)
 
         return files_processed_success
 
     # ------------------------------------------------------------------------
 
-    def run_phonetization(self, stepidx):
+    def __run_pool(self, stepidx, filelist):
         """
-        Execute the SPPAS-Phonetization program.
+        Execute an annotation step on the files of the list, distributed over
+        a pool of processes.
 
-        @return number of files processed successfully
+        Each process creates its own instance of the annotation, so that
+        resources are loaded only once per process. Messages of each file are
+        collected by the process then copied into the log file, and progress
+        is indicated, in the order of the list.
 
         """
-        # Initializations
-        step = self.parameters.get_step(stepidx)
         stepname = self.parameters.get_step_name(stepidx)
         files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0,"")
-
-        # Get the list of input file names, with the ".wav" (or ".wave") extension
-        filelist = self.set_filelist(".wav")#,not_start=["track_"])
-        if len(filelist) == 0:
-            return 0
         total = len(filelist)
 
-        # Create annotation instance
+        self._progress.set_text("Loading resources...")
+        pool = multiprocessing.Pool(processes=min(self._jobs, total),
+                                    initializer=_init_worker,
+                                    initargs=(self.parameters, stepidx))
         try:
-            self._progress.set_text("Loading resources...")
-            p = sppasPhon(step.get_langresource(), logfile=self._logfile)
-        except Exception as e:
-            if self._logfile is not None:
-                self._logfile.print_message("%s\n"%e, indent=1,status=4)
-            return 0
-
-        # Execute the annotation for each file in the list
-        for i,f in enumerate(filelist):
-
-            # fix the default values
-            p.fix_options(step.get_options())
-
-            # Indicate the file to be processed
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
-            if self._logfile is not None:
-                self._logfile.print_message(stepname+" of file " + f, indent=1)
-
-            # Get the input file
-            ext = ['-token'+self.parameters.get_output_format()]
-            for e in annotationdata.aio.extensions_out_multitiers:
-                ext.append('-token'+e)
-
-            inname = self._get_filename(f, ext)
-            if inname is not None:
-
-                # Fix output file name
-                outname = os.path.splitext(f)[0] + '-phon' + self.parameters.get_output_format()
+            for i,(f,success,messages) in enumerate(pool.imap(_annotate_worker_file, filelist)):
 
-                # Execute annotation
-                try:
-                    p.run(inname, outname)
-                except Exception as e:
-                    #import traceback
-                    #print traceback.format_exc()
-                    if self._logfile is not None:
-                        self._logfile.print_message("%s for file %s\n"%(str(e),outname), indent=2,status=-1)
-                else:
-                    files_processed_success += 1
-                    if self._logfile is not None:
-                        self._logfile.print_message(outname, indent=2,status=0)
-
-            else:
+                # Indicate the file which was processed
+                self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
                 if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a file with toketization. Read the documentation for details.",indent=2,status=2)
+                    self._logfile.print_message(stepname+" of file " + f, indent=1)
+                    self._logfile.print_rawtext(messages)
 
-            # Indicate progress
-            self._progress.set_fraction(float((i+1))/float(total))
-            if self._logfile is not None:
-                self._logfile.print_newline()
+                files_processed_success += success
 
-        # Indicate completed!
-        self._progress.update(1,"Completed (%d files successfully over %d files).\n"%(files_processed_success,total))
-        self._progress.set_header("")
+                # Indicate progress
+                self._progress.set_fraction(float((i+1))/float(total))
+                if self._logfile is not None:
+                    self._logfile.print_newline()
+            pool.close()
+        except Exception:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
 
         return files_processed_success
 
     # ------------------------------------------------------------------------
 
-    def run_chunks_alignment(self, stepidx):
+    def _get_filelist(self, stepidx):
         """
-        Execute the SPPAS Chunks alignment program.
+        Return the list of the wav file names to annotate by a step
+        (see the run_* methods).
 
-        """
-        # Initializations
-        step = self.parameters.get_step(stepidx)
-        stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0,"")
-
-        # Get the list of input file names, with the ".wav" (or ".wave") extension
-        filelist = self.set_filelist(".wav")#,not_start=["track_"])
-        if len(filelist) == 0:
-            return 0
-        total = len(filelist)
+        @param stepidx index of this annotations in the parameters
 
-        # Create annotation instance
-        try:
-            a = sppasChunks(step.get_langresource(), logfile=self._logfile)
-        except Exception as e:
-            if self._logfile is not None:
-                self._logfile.print_message("%s\n"%str(e), indent=1,status=4)
-            return 0
+        """
+        if self.parameters.get_step_key(stepidx) in ("syll", "repet"):
+            return self.set_filelist(".wav",not_start=["track_"])
+        return self.set_filelist(".wav")
 
-        # Execute the annotation for each file in the list
-        for i, f in enumerate(filelist):
+    # ------------------------------------------------------------------------
 
-            # fix the default values
-            a.fix_options(step.get_options())
+    def __add_trs(self, trs, filename, pattern):
+        if (filename, pattern) in self._annotator.results:
+            trsinput = self._annotator.results[(filename, pattern)]
+        else:
+            trsinput = annotationdata.aio.read(os.path.splitext(filename)[0] + pattern + self.parameters.get_output_format())
+        for tier in trsinput:
+            alreadin = False
+            if trs.IsEmpty() is False:
+                tiername = tier.GetName()
+                for t in trs:
+                    if t.GetName() == tiername:
+                        alreadin = True
+            if alreadin is False:
+                trs.Add(tier)
 
-            # Indicate the file to be processed
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
-            if self._logfile is not None:
-                self._logfile.print_message(stepname+" of file " + f, indent=1)
+    # ------------------------------------------------------------------------
 
-            # Get the input file: only txt and xra supports non-time-aligned data
-            extt = ['-token.txt', '-token.xra']
-            extp = ['-phon.txt', '-phon.xra']
+    def merge(self):
+        """
+        Merge all annotated files.
+        Force output format to TextGrid.
+        It will be changed to XRA as soon as SppasEdit will allow to view:
+            - annotation overlaps
+            - alternative labels
+            - hierarchy
 
-            inname = self._get_filename(f, extp)
-            intok  = self._get_filename(f, extt)
-            if inname is not None and intok is not None:
+        """
+        self._progress.set_header("Create a merged TextGrid file...")
+        self._progress.update(0, "")
 
-                # Fix output file name
-                outname = os.path.splitext(f)[0] + '-chunks' + self.parameters.get_output_format()
+        # Get the list of files with the ".wav" extension
+        filelist = self.set_filelist(".wav", ["track_"])
+        total = len(filelist)
 
-                # Execute annotation
-                try:
-                    a.run(inname, intok, f, outname)
-                except Exception as e:
-                    if self._logfile is not None:
-                        stre = unicode(e.message).encode("utf-8")
-                        self._logfile.print_message("%s for file %s\n"%(stre,outname), indent=2,status=-1)
-                else:
-                    files_processed_success += 1
-                    if self._logfile is not None:
-                        self._logfile.print_message(outname, indent=2,status=0)
+        for i, f in enumerate(filelist):
 
-            else:
-                if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a raw file with phonetization/tokenization. Read the documentation for details.",indent=2,status=2)
+            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
+            self._merge_file(f)
 
-            # Indicate progress
             self._progress.set_fraction(float((i+1))/float(total))
             if self._logfile is not None:
                 self._logfile.print_newline()
 
-        # Indicate completed!
-        self._progress.update(1,"Completed (%d files successfully over %d files).\n"%(files_processed_success,total))
+        self._progress.update(1, "Completed.")
         self._progress.set_header("")
 
-        return files_processed_success
-
     # ------------------------------------------------------------------------
 
-    def run_alignment(self, stepidx):
+    def _merge_file(self, f):
         """
-        Execute the SPPAS-Alignment program.
+        Merge the annotated files of a wav file.
+
+        @param f the wav file name
 
         """
-        # Initializations
-        step = self.parameters.get_step(stepidx)
-        stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0,"")
+        nbfiles = 0
 
-        # Get the list of input file names, with the ".wav" (or ".wave") extension
-        filelist = self.set_filelist(".wav")#,not_start=["track_"])
-        if len(filelist) == 0:
-            return 0
-        total = len(filelist)
+        # Change f, to allow "replace" to work properly
+        basef = os.path.splitext(f)[0]
 
-        # Create annotation instance
+        if self._logfile is not None:
+            self._logfile.print_message("Merge outputs " + f, indent=1)
+
+        trs = Transcription()
+        try:
+            self.__add_trs(trs, f, "") # Transcription
+            nbfiles = nbfiles + 1
+        except Exception:
+            pass
+        try:
+            self.__add_trs(trs, f, "-token") # Tokenization
+            nbfiles = nbfiles + 1
+        except Exception:
+            pass
+        try:
+            self.__add_trs(trs, f, "-phon") # Phonetization
+            nbfiles = nbfiles + 1
+        except Exception:
+            pass
+        try:
+            self.__add_trs(trs, f, "-chunks") # PhonAlign, TokensAlign
+            nbfiles = nbfiles + 1
+        except Exception:
+            pass
+        try:
+            self.__add_trs(trs, f, "-palign") # PhonAlign, TokensAlign
+            nbfiles = nbfiles + 1
+        except Exception:
+            pass
+        try:
+            self.__add_trs(trs, f, "-salign") # Syllables
+            nbfiles = nbfiles + 1
+        except Exception:
+            pass
+        try:
+            self.__add_trs(trs, f, "-ralign") # Repetitions
+            nbfiles = nbfiles + 1
+        except Exception:
+            pass
+        try:
+            self.__add_trs(trs, f, "-momel") # Momel
+            nbfiles = nbfiles + 1
+        except Exception:
+            pass
         try:
-            a = sppasAlign(step.get_langresource(), logfile=self._logfile)
+            self.__add_trs(trs, f, "-intsint") # INTSINT
+            nbfiles = nbfiles + 1
+        except Exception:
+            pass
+
+        try:
+            if nbfiles > 1:
+                infotier = sppasMetaInfoTier()
+                tier = infotier.create_time_tier(trs.GetBegin(),trs.GetEnd())
+                trs.Add(tier)
+                annotationdata.aio.write(basef + "-merge.TextGrid", trs)
+                if self._logfile is not None:
+                    self._logfile.print_message(basef + "-merge.TextGrid", indent=2, status=0)
+            elif self._logfile is not None:
+                self._logfile.print_message("", indent=2, status=2)
         except Exception as e:
             if self._logfile is not None:
-                self._logfile.print_message("%s\n"%str(e), indent=1,status=4)
-            return 0
+                self._logfile.print_message(str(e), indent=2, status=-1)
 
-        # Execute the annotation for each file in the list
-        for i,f in enumerate(filelist):
+    # ------------------------------------------------------------------------
 
-            # fix the default values
-            a.fix_options(step.get_options())
+    def __run_steps(self):
+        """
+        Execute the activated steps, one after the other, on all the files.
 
-            # Indicate the file to be processed
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
+        @return the number of files processed successfully by each step
+
+        """
+        nbruns = []
+        steps = False
+
+        for i in range(self.parameters.get_step_numbers()):
+
+            nbruns.append(-1)
+            if self.parameters.get_step_status(i) is True:
+
+                if self._logfile is not None:
+                    self._logfile.print_step(i)
+
+                if steps is False:
+                    steps=True
+                else:
+                    self._progress.set_new()
+
+                if self.parameters.get_step_key(i) == "momel":
+                    nbruns[i] = self.run_momel(i)
+                elif self.parameters.get_step_key(i) == "intsint":
+                    nbruns[i] = self.run_intsint(i)
+                elif self.parameters.get_step_key(i) == "ipus":
+                    nbruns[i] = self.run_ipusegmentation(i)
+                elif self.parameters.get_step_key(i) == "tok":
+                    nbruns[i] = self.run_tokenization(i)
+                elif self.parameters.get_step_key(i) == "phon":
+                    nbruns[i] = self.run_phonetization(i)
+                elif self.parameters.get_step_key(i) == "chunks":
+                    nbruns[i] = self.run_chunks_alignment(i)
+                elif self.parameters.get_step_key(i) == "align":
+                    nbruns[i] = self.run_alignment(i)
+                elif self.parameters.get_step_key(i) == "syll":
+                    nbruns[i] = self.run_syllabification(i)
+                elif self.parameters.get_step_key(i) == "repet":
+                    nbruns[i] = self.run_repetition(i)
+                elif self._logfile is not None:
+                    self._logfile.print_message('Unrecognized annotation step:%s' % self.parameters.get_step_name(i))
+
+        return nbruns
+
+    # ------------------------------------------------------------------------
+
+    def __run_pipeline(self):
+        """
+        Execute the activated steps file by file, and chain their results
+        in memory (see set_pipeline). The results of a file are written and
+        merged when all its steps are done, then they are released: only the
+        results of one file are kept in memory.
+
+        @return the number of files processed successfully by each step
+
+        """
+        nbruns = []
+        steps = []
+        for i in range(self.parameters.get_step_numbers()):
+            nbruns.append(-1)
+            if self.parameters.get_step_status(i) is True:
+                steps.append(i)
+
+        # The resources of each step are loaded only once
+        annotations = {}
+        filesets = {}
+        filelist = []
+        allfiles = set()
+        for i in steps:
             if self._logfile is not None:
-                self._logfile.print_message(stepname+" of file " + f, indent=1)
+                self._logfile.print_step(i)
+            self._progress.set_header(self.parameters.get_step_name(i))
+            self._progress.set_text("Loading resources...")
+            nbruns[i] = 0
+            try:
+                annotations[i] = self._annotator.create_annotation(i)
+            except Exception as e:
+                self._annotator.print_creation_error(i, e)
+                continue
 
-            # Get the input file
-            extt = ['-token'+self.parameters.get_output_format()]
-            extp = ['-phon'+self.parameters.get_output_format()]
-            for e in annotationdata.aio.extensions_out:
-                extt.append('-token'+e)
-                extp.append('-phon'+e)
-            extt.append('-chunks'+self.parameters.get_output_format())
-            extp.append('-chunks'+self.parameters.get_output_format())
-
-            inname = self._get_filename(f, extp)
-            intok  = self._get_filename(f, extt)
-            if inname is not None:
-
-                # Fix output file name
-                outname = os.path.splitext(f)[0] + '-palign' + self.parameters.get_output_format()
-
-                # Execute annotation
-                try:
-                    a.run(inname, intok, f, outname)
-                except Exception as e:
+            files = self._get_filelist(i)
+            filelist.extend(f for f in files if not f in allfiles)
+            filesets[i] = set(files)
+            allfiles.update(files)
+
+        mergeset = set()
+        if self._domerge is True:
+            mergeset = set(self.set_filelist(".wav", ["track_"]))
+
+        self._progress.set_header("Annotations chained in memory")
+        self._progress.update(0, "")
+        total = len(filelist)
+
+        for n,f in enumerate(filelist):
+            self._progress.set_text(os.path.basename(f)+" ("+str(n+1)+"/"+str(total)+")")
+
+            for i in steps:
+                if i in filesets and f in filesets[i]:
                     if self._logfile is not None:
-                        stre = unicode(e.message).encode("utf-8")
-                        self._logfile.print_message("%s for file %s\n"%(stre,outname), indent=2,status=-1)
-                else:
-                    files_processed_success += 1
+                        self._logfile.print_message(self.parameters.get_step_name(i)+" of file " + f, indent=1)
+                    nbruns[i] += self._annotator.annotate_file(annotations[i], i, f)
                     if self._logfile is not None:
-                        self._logfile.print_message(outname, indent=2,status=0)
+                        self._logfile.print_newline()
 
-            else:
+            if self._save is True:
+                self._save_results(f)
+            if f in mergeset:
+                self._merge_file(f)
                 if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a file with phonetization. Read the documentation for details.",indent=2,status=2)
+                    self._logfile.print_newline()
 
-            # Indicate progress
-            self._progress.set_fraction(float((i+1))/float(total))
-            if self._logfile is not None:
-                self._logfile.print_newline()
+            # Release the results of this file
+            for key in [k for k in self._annotator.results if k[0] == f]:
+                del self._annotator.results[key]
 
-        # Indicate completed!
-        self._progress.update(1,"Completed (%d files successfully over %d files).\n"%(files_processed_success,total))
+            self._progress.set_fraction(float((n+1))/float(total))
+
+        for i in annotations:
+            self._annotator.close_annotation(annotations[i], i)
+
+        self._progress.update(1, "Completed.")
         self._progress.set_header("")
 
-        return files_processed_success
+        return nbruns
 
     # ------------------------------------------------------------------------
 
-    def run_syllabification(self, stepidx):
+    def run_annotations(self, progress):
         """
-        Execute the SPPAS syllabification.
+        Execute activated SPPAS steps.
+        Get execution information from the 'parameters' object.
+
+        """
+        self._progress = progress
+
+        # ##################################################################### #
+        # Print header message in the log file
+        # ##################################################################### #
+        try:
+            self._logfile = sppasLog(self.parameters)
+            self._logfile.open_new(self.parameters.get_logfilename())
+            self._logfile.print_header()
+        except Exception:
+            self._logfile=None
+            pass
+        self._annotator.set_logfile(self._logfile)
+
+        if self._pipeline is True and self._jobs > 1 and self._logfile is not None:
+            self._logfile.print_message("Annotations are chained in memory: files are annotated with only one process.", status=1)
+
+        # ##################################################################### #
+        # Run!
+        # ##################################################################### #
+        self._annotator.results = {}
+        if self._pipeline is True:
+            nbruns = self.__run_pipeline()
+        else:
+            nbruns = self.__run_steps()
+
+        if self._logfile is not None:
+            self._logfile.print_separator()
+            self._logfile.print_newline()
+            self._logfile.print_separator()
+
+        if self._domerge and self._pipeline is False: self.merge()
+
+        # ##################################################################### #
+        # Log file: Final information
+        # ##################################################################### #
+        if self._logfile is not None:
+            self._logfile.print_separator()
+            self._logfile.print_message('Result statistics:')
+            self._logfile.print_separator()
+            for i in range(self.parameters.get_step_numbers()):
+                self._logfile.print_stat(i, nbruns[i])
+            self._logfile.print_separator()
+            self._logfile.close()
+
+# ----------------------------------------------------------------------------
+
+
+class sppasFileAnnotator(object):
+    """
+    @author:       Brigitte Bigi
+    @organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    @contact:      brigitte.bigi@gmail.com
+    @license:      GPL, v3
+    @copyright:    Copyright (C) 2011-2016  Brigitte Bigi
+    @summary:      Annotate files with the annotations of the steps.
+
+    Create the instance of the annotation of a step, then annotate files
+    with it. It is used by sppasAnnotationsManager, and by the processes of
+    its pool: it has no thread state.
+
+    """
+    def __init__(self, parameters, logfile=None):
+        """
+        Create a new sppasFileAnnotator instance.
+
+        @param parameters (sppasParam) SPPAS parameters, i.e. config of annotations
+        @param logfile (sppasLog) the log of the annotations
+
+        """
+        self.parameters = parameters
+        self._logfile  = logfile
+        self._pipeline = False
+
+        # Results of the steps kept in memory, in pipeline mode: the key is
+        # a tuple (wav file name, output pattern)
+        self.results   = {}
+
+    # ------------------------------------------------------------------------
+
+    def set_logfile(self, logfile):
+        """
+        Fix the log of the annotations.
+
+        @param logfile (sppasLog)
+
+        """
+        self._logfile = logfile
+
+    # ------------------------------------------------------------------------
+
+    def set_pipeline(self, pipeline):
+        """
+        Fix the pipeline option: if True, the results of the tokenization,
+        phonetization, alignment, syllabification and repetitions are kept
+        in memory (see results), instead of being written.
+
+        @param pipeline (Boolean)
+
+        """
+        self._pipeline = pipeline
+
+    # ------------------------------------------------------------------------
+
+    def print_creation_error(self, stepidx, error, indent=1):
+        """
+        Print the message of an annotation which can't be created: a warning
+        for Momel and INTSINT, an error for the others.
+
+        @param stepidx index of this annotations in the parameters
+        @param error (Exception) the reason
+
+        """
+        if self._logfile is None:
+            return
+        status = 4
+        if self.parameters.get_step_key(stepidx) in ("momel", "intsint"):
+            status = 1
+        self._logfile.print_message("%s\n"%str(error), indent=indent, status=status)
+
+    # ------------------------------------------------------------------------
+
+    def _get_filename(self, filename, extensions):
+        """
+        Return a filename corresponding to one of extensions.
+
+        @param filename input file name
+        @param extensions is the list of expected extension
+        @return a file name of the first existing file with an expected extension or None
+
+        """
+
+        for ext in extensions:
+
+            extfilename = os.path.splitext(filename)[0] + ext
+            newfilename = utils.fileutils.exists(extfilename)
+            if newfilename is not None and os.path.isfile(newfilename):
+                return newfilename
+
+        return None
+
+    # ------------------------------------------------------------------------
+
+    def _get_input(self, filename, pattern, extensions):
+        """
+        Return the result of a previous step: either its Transcription if it
+        was kept in memory (pipeline mode) or its file name.
+
+        @param filename input file name
+        @param pattern is the pattern of the output of the previous step (-token, -phon, ...)
+        @param extensions is the list of expected extension
+        @return a Transcription or a file name or None
+
+        """
+        if (filename, pattern) in self.results:
+            return self.results[(filename, pattern)]
+
+        return self._get_filename(filename, extensions)
+
+    # ------------------------------------------------------------------------
+
+    def create_annotation(self, stepidx):
+        """
+        Create the instance of the annotation of a step, i.e. load its
+        resources.
+
+        @param stepidx index of this annotations in the parameters
+
+        """
+        step = self.parameters.get_step(stepidx)
+        key  = self.parameters.get_step_key(stepidx)
+
+        if key == "momel":
+            return sppasMomel(self._logfile)
+        elif key == "intsint":
+            return sppasIntsint(self._logfile)
+        elif key == "ipus":
+            return sppasIPUs(self._logfile)
+        elif key == "tok":
+            return sppasTok(step.get_langresource(), logfile=self._logfile, lang=step.get_lang())
+        elif key == "phon":
+            return sppasPhon(step.get_langresource(), logfile=self._logfile)
+        elif key == "chunks":
+            return sppasChunks(step.get_langresource(), logfile=self._logfile)
+        elif key == "align":
+            return sppasAlign(step.get_langresource(), logfile=self._logfile)
+        elif key == "syll":
+            return sppasSyll(step.get_langresource(), self._logfile)
+        elif key == "repet":
+            return sppasRepet(step.get_langresource(), self._logfile)
+
+        raise Exception('Unrecognized annotation step: %s'%self.parameters.get_step_name(stepidx))
+
+    # ------------------------------------------------------------------------
+
+    def close_annotation(self, a, stepidx):
+        """
+        Terminate the instance of the annotation of a step, when all the
+        files were annotated. The processes of a pool call it when they
+        exit (see _init_worker).
+
+        @param a the annotation instance (see create_annotation)
+        @param stepidx index of this annotations in the parameters
+
+        """
+        if self.parameters.get_step_key(stepidx) == "phon":
+            # the phonetizations of this session are kept for the next ones
+            a.save_cache()
+
+    # ------------------------------------------------------------------------
+
+    def annotate_file(self, a, stepidx, f):
+        """
+        Execute the annotation of a step on a file.
+
+        @param a the annotation instance (see create_annotation)
+        @param stepidx index of this annotations in the parameters
+        @param f the wav file name
+        @return 1 if the file was processed successfully, 0 otherwise
+
+        """
+        step = self.parameters.get_step(stepidx)
+        key  = self.parameters.get_step_key(stepidx)
+
+        if key == "momel":
+            return self.__annotate_momel(a, step, f)
+        elif key == "intsint":
+            return self.__annotate_intsint(a, step, f)
+        elif key == "ipus":
+            return self.__annotate_ipus(a, step, f)
+        elif key == "tok":
+            return self.__annotate_tok(a, step, f)
+        elif key == "phon":
+            return self.__annotate_phon(a, step, f)
+        elif key == "chunks":
+            return self.__annotate_chunks(a, step, f)
+        elif key == "align":
+            return self.__annotate_align(a, step, f)
+        elif key == "syll":
+            return self.__annotate_syll(a, step, f)
+        elif key == "repet":
+            return self.__annotate_repet(a, step, f)
+
+        return 0
+
+    # ------------------------------------------------------------------------
+
+    def __annotate_momel(self, m, step, f):
+        # fix the default values
+        m.fix_options(step.get_options())
+
+        # Get the input file. Without pitch file, pitch is estimated from the audio file.
+        inname = self._get_filename(f, [".hz", ".PitchTier"])
+        if inname is None:
+            inname = f
+
+        # Fix output file names
+        outname = os.path.splitext(f)[0]+"-momel.PitchTier"
+        textgridoutname = os.path.splitext(f)[0] + '-momel' + self.parameters.get_output_format()
+
+        # Execute annotation
+        try:
+            m.run(inname, trsoutput=textgridoutname, outputfile=outname)
+        except Exception as e:
+            if self._logfile is not None:
+                self._logfile.print_message(textgridoutname+": %s"%str(e),indent=2,status=-1)
+            return 0
+
+        if self._logfile is not None:
+            self._logfile.print_message(textgridoutname,indent=2,status=0)
+        return 1
 
-        """
-        # Initializations
-        step = self.parameters.get_step(stepidx)
-        stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0,"")
+    # ------------------------------------------------------------------------
 
-        # Get the list of input file names, with the ".wav" (or ".wave") extension
-        filelist = self.set_filelist(".wav",not_start=["track_"])
-        if len(filelist) == 0:
+    def __annotate_intsint(self, intsint, step, f):
+        # Get the input file
+        ext = ['-momel'+self.parameters.get_output_format()]
+        for e in annotationdata.aio.extensions_out:
+            ext.append('-momel'+e)
+
+        inname = self._get_filename(f, ext)
+        if inname is None:
+            if self._logfile is not None:
+                self._logfile.print_message("Failed to find a file with momel targets. Read the documentation for details.",indent=2,status=2)
             return 0
-        total = len(filelist)
 
-        # Create annotation instance
+        # Fix output file names
+        outname = os.path.splitext(f)[0] + '-intsint' + self.parameters.get_output_format()
+
+        # Execute annotation
         try:
-            s = sppasSyll(step.get_langresource(), self._logfile)
+            intsint.run(inname, outname)
         except Exception as e:
             if self._logfile is not None:
-                self._logfile.print_message("%s\n"%str(e), indent=1,status=4)
+                self._logfile.print_message(outname+": %s"%str(e),indent=2,status=-1)
             return 0
 
-        for i,f in enumerate(filelist):
+        if self._logfile is not None:
+            self._logfile.print_message(outname,indent=2,status=0)
+        return 1
 
-            # fix the default values
-            s.fix_options(step.get_options())
+    # ------------------------------------------------------------------------
 
-            # Indicate the file to be processed
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
-            if self._logfile is not None:
-                self._logfile.print_message(stepname+" of file " + f, indent=1)
+    def __annotate_ipus(self, seg, step, f):
+        # fix the default values
+        seg.reset()
+        seg.fix_options(step.get_options())
 
-            # Get the input file
-            ext = ['-palign'+self.parameters.get_output_format()]
-            for e in annotationdata.aio.extensions_out_multitiers:
-                ext.append('-palign'+e)
+        # Fix input/output file name
+        outname = os.path.splitext(f)[0] + self.parameters.get_output_format()
 
-            inname = self._get_filename(f,ext)
-            if inname is not None:
+        # Is there already an existing IPU-seg (in any format)!
+        ext = []
+        for e in annotationdata.aio.extensions_in:
+            if not e in ['.txt','.hz', '.PitchTier']:
+                ext.append(e)
+        existoutname = self._get_filename(f, ext)
 
-                # Fix output file name
-                outname = os.path.splitext(f)[0] + '-salign' + self.parameters.get_output_format()
+        # it's existing... but not in the expected format: convert!
+        if existoutname is not None and existoutname != outname:
+            # just copy the file!
+            if self._logfile is not None:
+                self._logfile.print_message('Export '+existoutname, indent=2)
+                self._logfile.print_message('into '+outname, indent=2)
+            try:
+                t = annotationdata.aio.read(existoutname)
+                annotationdata.aio.write(outname,t)
+                # OK, now outname is as expected! (or not...)
+            except Exception:
+                pass
 
-                # Execute annotation
-                try:
-                    s.run(inname, outname)
-                except Exception as e:
-                    if self._logfile is not None:
-                        self._logfile.print_message("%s for file %s\n"%(str(e),outname), indent=2,status=-1)
+        # Execute annotation
+        tgfname = utils.fileutils.exists(outname)
+        if tgfname is None:
+            # No already existing IPU seg., but perhaps a txt.
+            txtfile = self._get_filename(f, [".txt"])
+            if self._logfile is not None:
+                if txtfile:
+                    self._logfile.print_message("A transcription was found, perform Silence/Speech segmentation time-aligned with a transcription %s"%txtfile, indent=2,status=3)
                 else:
-                    files_processed_success += 1
-                    if self._logfile is not None:
-                        self._logfile.print_message(outname, indent=2,status=0)
-            else:
+                    self._logfile.print_message("No transcription was found, perform Silence/Speech segmentation only.", indent=2,status=3)
+            try:
+                seg.run(f, trsinputfile=txtfile, ntracks=None, diroutput=None, tracksext=None, trsoutput=outname)
+            except Exception as e:
                 if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a file with time-aligned phonemes. Read the documentation for details.",indent=2,status=2)
-
-            # Indicate progress
-            self._progress.set_fraction(float((i+1))/float(total))
+                    self._logfile.print_message("%s for file %s\n"%(str(e),outname), indent=2,status=-1)
+                return 0
             if self._logfile is not None:
-                self._logfile.print_newline()
+                self._logfile.print_message(outname, indent=2,status=0)
+            return 1
 
-        # Indicate completed!
-        self._progress.update(1,"Completed (%d files successfully over %d files).\n"%(files_processed_success,total))
-        self._progress.set_header("")
+        if seg.get_option('dirtracks') is True:
+            if self._logfile is not None:
+                self._logfile.print_message("A time-aligned transcription was found, split into multiple files", indent=2,status=3)
+            try:
+                seg.run(f, trsinputfile=tgfname, ntracks=None, diroutput=None, tracksext=None, trsoutput=None)
+            except Exception as e:
+                if self._logfile is not None:
+                    self._logfile.print_message("%s for file %s\n"%(str(e),tgfname), indent=2,status=-1)
+                return 0
+            if self._logfile is not None:
+                self._logfile.print_message(tgfname, indent=2,status=0)
+            return 1
 
-        return files_processed_success
+        if self._logfile is not None:
+            self._logfile.print_message("because a previous segmentation is existing.", indent=2,status=2)
+        return 0
 
     # ------------------------------------------------------------------------
 
-    def run_repetition(self, stepidx):
-        """
-        Execute the automatic repetitions detection.
-
-        """
-        # Initializations
-        step = self.parameters.get_step(stepidx)
-        stepname = self.parameters.get_step_name(stepidx)
-        files_processed_success = 0
-        self._progress.set_header(stepname)
-        self._progress.update(0,"")
+    def __annotate_tok(self, t, step, f):
+        # fix the default values
+        t.fix_options(step.get_options())
 
-        # Get the list of input file names, with the ".wav" (or ".wave") extension
-        filelist = self.set_filelist(".wav",not_start=["track_"])
-        if len(filelist) == 0:
+        # Get the input file
+        inname = self._get_filename(f, [self.parameters.get_output_format()] + annotationdata.aio.extensions_out)
+        if inname is None:
+            if self._logfile is not None:
+                self._logfile.print_message("Failed to find a file with transcription. Read the documentation for details.",indent=2,status=2)
             return 0
-        total = len(filelist)
 
-        # Create annotation instance
+        # Fix output file name
+        outname = os.path.splitext(f)[0] + '-token' + self.parameters.get_output_format()
+
+        # Execute annotation
         try:
-            self._progress.set_text("Loading resources...")
-            r = sppasRepet(step.get_langresource(), self._logfile)
+            if self._pipeline is True:
+                self.results[(f, '-token')] = t.run(inname)
+            else:
+                t.run(inname, outname)
         except Exception as e:
             if self._logfile is not None:
-                self._logfile.print_message("%s\n"%str(e), indent=1,status=4)
+                self._logfile.print_message("%s for file %s\n"%(str(e),outname), indent=2,status=-1)
             return 0
 
-        for i, f in enumerate(filelist):
+        # in pipeline mode, outname is written later (see sppasAnnotationsManager._save_results)
+        if self._logfile is not None and self._pipeline is False:
+            self._logfile.print_message(outname, indent=2,status=0)
+        return 1
 
-            # fix the default values
-            r.fix_options(step.get_options())
+    # ------------------------------------------------------------------------
 
-            # Indicate the file to be processed
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
-            if self._logfile is not None:
-                self._logfile.print_message(stepname+" of file " + f, indent=1)
+    def __annotate_phon(self, p, step, f):
+        # fix the default values
+        p.fix_options(step.get_options())
 
-            # Get the input file
-            ext = ['-palign'+self.parameters.get_output_format()]
-            for e in annotationdata.aio.extensions_out_multitiers:
-                ext.append('-palign'+e)
+        # Get the input file
+        ext = ['-token'+self.parameters.get_output_format()]
+        for e in annotationdata.aio.extensions_out_multitiers:
+            ext.append('-token'+e)
 
-            inname = self._get_filename(f, ext)
-            if inname is not None:
+        inname = self._get_input(f, '-token', ext)
+        if inname is None:
+            if self._logfile is not None:
+                self._logfile.print_message("Failed to find a file with toketization. Read the documentation for details.",indent=2,status=2)
+            return 0
 
-                # Fix output file name
-                outname = os.path.splitext(f)[0] + '-ralign' + self.parameters.get_output_format()
+        # Fix output file name
+        outname = os.path.splitext(f)[0] + '-phon' + self.parameters.get_output_format()
 
-                # Execute annotation
-                try:
-                    r.run(inname, None, outname)
-                except Exception as e:
-                    if self._logfile is not None:
-                        self._logfile.print_message("%s for file %s\n"%(str(e),outname), indent=2,status=-1)
-                else:
-                    files_processed_success += 1
-                    if self._logfile is not None:
-                        self._logfile.print_message(outname, indent=2,status=0)
+        # Execute annotation
+        try:
+            if self._pipeline is True:
+                self.results[(f, '-phon')] = p.run(inname)
             else:
-                if self._logfile is not None:
-                    self._logfile.print_message("Failed to find a file with time-aligned tokens. Read the documentation for details.",indent=2,status=2)
-
-            # Indicate progress
-            self._progress.set_fraction(float((i+1))/float(total))
+                p.run(inname, outname)
+        except Exception as e:
             if self._logfile is not None:
-                self._logfile.print_newline()
-
-        # Indicate completed!
-        self._progress.update(1,"Completed (%d files successfully over %d files).\n"%(files_processed_success,total))
-        self._progress.set_header("")
+                self._logfile.print_message("%s for file %s\n"%(str(e),outname), indent=2,status=-1)
+            return 0
 
-        return files_processed_success
+        # in pipeline mode, outname is written later (see sppasAnnotationsManager._save_results)
+        if self._logfile is not None and self._pipeline is False:
+            self._logfile.print_message(outname, indent=2,status=0)
+        return 1
 
     # ------------------------------------------------------------------------
 
-    def __add_trs(self, trs, trsinputfile):
-        trsinput = annotationdata.aio.read(trsinputfile)
-        for tier in trsinput:
-            alreadin = False
-            if trs.IsEmpty() is False:
-                tiername = tier.GetName()
-                for t in trs:
-                    if t.GetName() == tiername:
-                        alreadin = True
-            if alreadin is False:
-                trs.Add(tier)
+    def __annotate_chunks(self, a, step, f):
+        # fix the default values
+        a.fix_options(step.get_options())
 
-    # ------------------------------------------------------------------------
+        # Get the input file: only txt and xra supports non-time-aligned data
+        extt = ['-token.txt', '-token.xra']
+        extp = ['-phon.txt', '-phon.xra']
 
-    def merge(self):
-        """
-        Merge all annotated files.
-        Force output format to TextGrid.
-        It will be changed to XRA as soon as SppasEdit will allow to view:
-            - annotation overlaps
-            - alternative labels
-            - hierarchy
+        inname = self._get_input(f, '-phon', extp)
+        intok  = self._get_input(f, '-token', extt)
+        if inname is None or intok is None:
+            if self._logfile is not None:
+                self._logfile.print_message("Failed to find a raw file with phonetization/tokenization. Read the documentation for details.",indent=2,status=2)
+            return 0
 
-        """
-        self._progress.set_header("Create a merged TextGrid file...")
-        self._progress.update(0, "")
+        # Fix output file name
+        outname = os.path.splitext(f)[0] + '-chunks' + self.parameters.get_output_format()
 
-        # Get the list of files with the ".wav" extension
-        filelist = self.set_filelist(".wav", ["track_"])
-        total = len(filelist)
+        # Execute annotation
+        try:
+            a.run(inname, intok, f, outname)
+        except Exception as e:
+            if self._logfile is not None:
+                stre = unicode(e.message).encode("utf-8")
+                self._logfile.print_message("%s for file %s\n"%(stre,outname), indent=2,status=-1)
+            return 0
 
-        output_format = self.parameters.get_output_format()
+        if self._logfile is not None:
+            self._logfile.print_message(outname, indent=2,status=0)
+        return 1
 
-        for i, f in enumerate(filelist):
+    # ------------------------------------------------------------------------
 
-            nbfiles = 0
+    def __annotate_align(self, a, step, f):
+        # fix the default values
+        a.fix_options(step.get_options())
+
+        # Get the input file
+        extt = ['-token'+self.parameters.get_output_format()]
+        extp = ['-phon'+self.parameters.get_output_format()]
+        for e in annotationdata.aio.extensions_out:
+            extt.append('-token'+e)
+            extp.append('-phon'+e)
+        extt.append('-chunks'+self.parameters.get_output_format())
+        extp.append('-chunks'+self.parameters.get_output_format())
+
+        inname = self._get_input(f, '-phon', extp)
+        intok  = self._get_input(f, '-token', extt)
+        if inname is None:
+            if self._logfile is not None:
+                self._logfile.print_message("Failed to find a file with phonetization. Read the documentation for details.",indent=2,status=2)
+            return 0
 
-            # Change f, to allow "replace" to work properly
-            basef = os.path.splitext(f)[0]
+        # Fix output file name
+        outname = os.path.splitext(f)[0] + '-palign' + self.parameters.get_output_format()
 
+        # Execute annotation
+        try:
+            if self._pipeline is True:
+                self.results[(f, '-palign')] = a.run(inname, intok, f)
+            else:
+                a.run(inname, intok, f, outname)
+        except Exception as e:
             if self._logfile is not None:
-                self._logfile.print_message("Merge outputs " + f, indent=1)
-            self._progress.set_text(os.path.basename(f)+" ("+str(i+1)+"/"+str(total)+")")
+                stre = unicode(e.message).encode("utf-8")
+                self._logfile.print_message("%s for file %s\n"%(stre,outname), indent=2,status=-1)
+            return 0
 
-            trs = Transcription()
-            try:
-                self.__add_trs(trs, basef + output_format) # Transcription
-                nbfiles = nbfiles + 1
-            except Exception:
-                pass
-            try:
-                self.__add_trs(trs, basef + "-token" + output_format) # Tokenization
-                nbfiles = nbfiles + 1
-            except Exception:
-                pass
-            try:
-                self.__add_trs(trs, basef + "-phon" + output_format) # Phonetization
-                nbfiles = nbfiles + 1
-            except Exception:
-                pass
-            try:
-                self.__add_trs(trs, basef + "-chunks" + output_format) # PhonAlign, TokensAlign
-                nbfiles = nbfiles + 1
-            except Exception:
-                pass
-            try:
-                self.__add_trs(trs, basef + "-palign" + output_format) # PhonAlign, TokensAlign
-                nbfiles = nbfiles + 1
-            except Exception:
-                pass
-            try:
-                self.__add_trs(trs, basef + "-salign" + output_format) # Syllables
-                nbfiles = nbfiles + 1
-            except Exception:
-                pass
-            try:
-                self.__add_trs(trs, basef + "-ralign" + output_format) # Repetitions
-                nbfiles = nbfiles + 1
-            except Exception:
-                pass
-            try:
-                self.__add_trs(trs, basef + "-momel" + output_format) # Momel
-                nbfiles = nbfiles + 1
-            except Exception:
-                pass
-            try:
-                self.__add_trs(trs, basef + "-intsint" + output_format) # INTSINT
-                nbfiles = nbfiles + 1
-            except Exception:
-                pass
+        # in pipeline mode, outname is written later (see sppasAnnotationsManager._save_results)
+        if self._logfile is not None and self._pipeline is False:
+            self._logfile.print_message(outname, indent=2,status=0)
+        return 1
 
-            try:
-                if nbfiles > 1:
-                    infotier = sppasMetaInfoTier()
-                    tier = infotier.create_time_tier(trs.GetBegin(),trs.GetEnd())
-                    trs.Add(tier)
-                    annotationdata.aio.write(basef + "-merge.TextGrid", trs)
-                    if self._logfile is not None:
-                        self._logfile.print_message(basef + "-merge.TextGrid", indent=2, status=0)
-                elif self._logfile is not None:
-                    self._logfile.print_message("", indent=2, status=2)
-            except Exception as e:
-                if self._logfile is not None:
-                    self._logfile.print_message(str(e), indent=2, status=-1)
+    # ------------------------------------------------------------------------
 
-            self._progress.set_fraction(float((i+1))/float(total))
+    def __annotate_syll(self, s, step, f):
+        # fix the default values
+        s.fix_options(step.get_options())
+
+        # Get the input file
+        ext = ['-palign'+self.parameters.get_output_format()]
+        for e in annotationdata.aio.extensions_out_multitiers:
+            ext.append('-palign'+e)
+
+        inname = self._get_input(f, '-palign', ext)
+        if inname is None:
             if self._logfile is not None:
-                self._logfile.print_newline()
+                self._logfile.print_message("Failed to find a file with time-aligned phonemes. Read the documentation for details.",indent=2,status=2)
+            return 0
 
-        self._progress.update(1, "Completed.")
-        self._progress.set_header("")
+        # Fix output file name
+        outname = os.path.splitext(f)[0] + '-salign' + self.parameters.get_output_format()
+
+        # Execute annotation
+        try:
+            if self._pipeline is True:
+                self.results[(f, '-salign')] = s.run(inname)
+            else:
+                s.run(inname, outname)
+        except Exception as e:
+            if self._logfile is not None:
+                self._logfile.print_message("%s for file %s\n"%(str(e),outname), indent=2,status=-1)
+            return 0
+
+        # in pipeline mode, outname is written later (see sppasAnnotationsManager._save_results)
+        if self._logfile is not None and self._pipeline is False:
+            self._logfile.print_message(outname, indent=2,status=0)
+        return 1
 
     # ------------------------------------------------------------------------
 
-    def run_annotations(self, progress):
-        """
-        Execute activated SPPAS steps.
-        Get execution information from the 'parameters' object.
+    def __annotate_repet(self, r, step, f):
+        # fix the default values
+        r.fix_options(step.get_options())
 
-        """
-        self._progress = progress
+        # Get the input file
+        ext = ['-palign'+self.parameters.get_output_format()]
+        for e in annotationdata.aio.extensions_out_multitiers:
+            ext.append('-palign'+e)
 
-        # ##################################################################### #
-        # Print header message in the log file
-        # ##################################################################### #
+        inname = self._get_input(f, '-palign', ext)
+        if inname is None:
+            if self._logfile is not None:
+                self._logfile.print_message("Failed to find a file with time-aligned tokens. Read the documentation for details.",indent=2,status=2)
+            return 0
+
+        # Fix output file name
+        outname = os.path.splitext(f)[0] + '-ralign' + self.parameters.get_output_format()
+
+        # Execute annotation
         try:
-            self._logfile = sppasLog(self.parameters)
-            self._logfile.open_new(self.parameters.get_logfilename())
-            self._logfile.print_header()
-        except Exception:
-            self._logfile=None
-            pass
+            if self._pipeline is True:
+                if not isinstance(inname, Transcription):
+                    inname = annotationdata.aio.read(inname)
+                self.results[(f, '-ralign')] = r.run(inname)
+            else:
+                r.run(inname, None, outname)
+        except Exception as e:
+            if self._logfile is not None:
+                self._logfile.print_message("%s for file %s\n"%(str(e),outname), indent=2,status=-1)
+            return 0
 
-        # ##################################################################### #
-        # Run!
-        # ##################################################################### #
-        nbruns = []
-        steps = False
+        # in pipeline mode, outname is written later (see sppasAnnotationsManager._save_results)
+        if self._logfile is not None and self._pipeline is False:
+            self._logfile.print_message(outname, indent=2,status=0)
+        return 1
 
-        for i in range(self.parameters.get_step_numbers()):
+# ----------------------------------------------------------------------------
+# Processes of the pool (see sppasAnnotationsManager.set_jobs)
+# ----------------------------------------------------------------------------
 
-            nbruns.append(-1)
-            if self.parameters.get_step_status(i) is True:
+_worker = None
 
-                if self._logfile is not None:
-                    self._logfile.print_step(i)
+def _init_worker(parameters, stepidx):
+    """
+    Initialize a process of the pool: create the annotation of the step,
+    which loads its resources only once for all the files of this process.
+    The annotation is closed when the process exits, for example to save
+    the phonetizations of the process.
 
-                if steps is False:
-                    steps=True
-                else:
-                    self._progress.set_new()
+    """
+    global _worker
+
+    logfile = sppasLog(parameters)
+    logfile.open_buffer()
+    annotator = sppasFileAnnotator(parameters, logfile)
+    try:
+        annotation = annotator.create_annotation(stepidx)
+        error = None
+    except Exception as e:
+        annotation = None
+        error = e
+    else:
+        # the process exits when the pool is closed
+        multiprocessing.util.Finalize(annotator, annotator.close_annotation,
+                                      args=(annotation, stepidx), exitpriority=10)
+
+    _worker = (annotator, logfile, annotation, stepidx, error)
 
-                if self.parameters.get_step_key(i) == "momel":
-                    nbruns[i] = self.run_momel(i)
-                elif self.parameters.get_step_key(i) == "intsint":
-                    nbruns[i] = self.run_intsint(i)
-                elif self.parameters.get_step_key(i) == "ipus":
-                    nbruns[i] = self.run_ipusegmentation(i)
-                elif self.parameters.get_step_key(i) == "tok":
-                    nbruns[i] = self.run_tokenization(i)
-                elif self.parameters.get_step_key(i) == "phon":
-                    nbruns[i] = self.run_phonetization(i)
-                elif self.parameters.get_step_key(i) == "chunks":
-                    nbruns[i] = self.run_chunks_alignment(i)
-                elif self.parameters.get_step_key(i) == "align":
-                    nbruns[i] = self.run_alignment(i)
-                elif self.parameters.get_step_key(i) == "syll":
-                    nbruns[i] = self.run_syllabification(i)
-                elif self.parameters.get_step_key(i) == "repet":
-                    nbruns[i] = self.run_repetition(i)
-                elif self._logfile is not None:
-                    self._logfile.print_message('Unrecognized annotation step:%s' % self.parameters.get_step_name(i))
+# ----------------------------------------------------------------------------
 
-        if self._logfile is not None:
-            self._logfile.print_separator()
-            self._logfile.print_newline()
-            self._logfile.print_separator()
+def _annotate_worker_file(f):
+    """
+    Annotate a file in a process of the pool.
 
-        if self._domerge: self.merge()
+    @return a tuple (filename, 1 if success or 0, messages of the log)
 
-        # ##################################################################### #
-        # Log file: Final information
-        # ##################################################################### #
-        if self._logfile is not None:
-            self._logfile.print_separator()
-            self._logfile.print_message('Result statistics:')
-            self._logfile.print_separator()
-            for i in range(self.parameters.get_step_numbers()):
-                self._logfile.print_stat(i, nbruns[i])
-            self._logfile.print_separator()
-            self._logfile.close()
+    """
+    annotator, logfile, annotation, stepidx, error = _worker
+    logfile.open_buffer()
 
-    # ------------------------------------------------------------------------
+    if annotation is None:
+        annotator.print_creation_error(stepidx, error, indent=2)
+        return (f, 0, logfile.get_buffer())
+
+    try:
+        success = annotator.annotate_file(annotation, stepidx, f)
+    except Exception as e:
+        logfile.print_message("%s for file %s\n"%(str(e),f), indent=2,status=-1)
+        success = 0
+
+    return (f, success, logfile.get_buffer())
@@ -39,6 +39,9 @@ import logging
 from sp_glob import ERROR_ID, WARNING_ID, OK_ID, INFO_ID
 from annotations.diagnosis import sppasDiagnosis
 
+import annotationdata.aio
+from annotationdata.transcription import Transcription
+
 # ---------------------------------------------------------------------------
 
 class sppasBase( object ):
@@ -126,12 +129,29 @@ class sppasBase( object ):
     def print_diagnosis(self, *filenames):
         """
         Print the diagnosis of a list of files in the user log.
+        Transcriptions given instead of file names are not diagnosed.
 
         """
         self.print_message("Diagnosis: ", indent=2, status=None)
         for filename in filenames:
-            if filename is not None:
+            if filename is not None and not isinstance(filename, Transcription):
                 (s,m) = self._diag.checkfile( filename )
                 self.print_message(" - %s: %s"%(filename,m), indent=3, status=None)
 
     # -----------------------------------------------------------------------
+
+    def get_transcription(self, trsinput):
+        """
+        Return a transcription from either a file name or a Transcription.
+        It allows annotations to be chained in memory, without writing then
+        reading the files of the intermediate results.
+
+        @param trsinput (str or Transcription)
+        @return Transcription
+
+        """
+        if isinstance(trsinput, Transcription):
+            return trsinput
+        return annotationdata.aio.read(trsinput)
+
+    # -----------------------------------------------------------------------
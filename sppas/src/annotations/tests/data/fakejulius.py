@@ -0,0 +1,71 @@
+#!/usr/bin/env python2
+# -*- coding: utf8 -*-
+"""
+A scripted fake julius, in module mode, to test JuliusSession.
+
+It accepts the module commands CHANGEGRAM, GRAMINFO and DIE, reads the
+audio file names on its standard input and sends the recognition result
+and the forced alignment of the first pronunciation of each word (10 frames
+per phone) on the module port, like julius does.
+
+"""
+import sys
+import socket
+
+args = sys.argv[1:]
+port = int(args[args.index("-module")+1])
+
+server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+server.bind(("127.0.0.1", port))
+server.listen(1)
+conn, addr = server.accept()
+module = conn.makefile("r")
+
+print "fake julius started"
+sys.stdout.flush()
+
+words = []
+while True:
+    command = module.readline().strip()
+    if len(command) == 0 or command == "DIE":
+        break
+
+    if command.startswith("CHANGEGRAM"):
+        while module.readline().strip() != "DFAEND":
+            pass
+        words = []
+        line = module.readline().strip()
+        while line != "DICEND":
+            idx, entry = line.split(" ", 1)
+            if int(idx) == len(words):
+                token = entry[entry.index("[")+1:entry.index("]")]
+                words.append( (token, entry[entry.index("]")+1:].split()) )
+            line = module.readline().strip()
+
+    elif command == "GRAMINFO":
+        conn.sendall("<GRAMINFO>\n  %d words\n</GRAMINFO>\n.\n" % len(words))
+
+        inputwav = sys.stdin.readline().strip()
+        if len(inputwav) == 0:
+            break
+
+        conn.sendall('<INPUT STATUS="STARTREC" TIME="0"/>\n.\n')
+        message = '<RECOGOUT>\n  <SHYPO RANK="1" SCORE="-1000.0" GRAM="0">\n'
+        for w,phones in words:
+            message += '    <WHYPO WORD="%s" CLASSID="%s" PHONE="%s" CM="1.000"/>\n' % (w, w, " ".join(phones))
+        message += '  </SHYPO>\n</RECOGOUT>\n.\n'
+        conn.sendall(message)
+
+        # the format of the messages of julius (see julius_module.txt)
+        message = '<ALIGN TYPE="phoneme">\n'
+        frame = 0
+        for w,phones in words:
+            for phone in phones:
+                message += '  <PHONEME PHONE="%s" BEGINFRAME="%d" ENDFRAME="%d" SCORE="-10.000000"/>\n' % (phone, frame, frame+9)
+                frame += 10
+        message += '</ALIGN>\n.\n'
+        conn.sendall(message)
+
+conn.close()
+server.close()
@@ -3,11 +3,17 @@
 
 import unittest
 import os.path
+import sys
+import shutil
+import tempfile
+import multiprocessing
 
 import annotations.Align.aligners as aligners
 import annotations.Align.aligners.basicalign as basicalign
 import annotations.Align.aligners.juliusalign as juliusalign
 import annotations.Align.aligners.hvitealign as hvitealign
+from annotations.Align.aligners.alignerio import AlignerIO
+from annotations.Align.sppasalign import sppasAlign
 
 # ---------------------------------------------------------------------------
 
@@ -19,6 +25,16 @@ from sp_glob import SAMPLES_PATH
 MODELDIR = os.path.join(RESOURCES_PATH, "models")
 sample_1 = os.path.join(SAMPLES_PATH, "samples-eng", "oriana1.wav")  # mono; 16000Hz; 16bits
 
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+FAKE_JULIUS = [ sys.executable, os.path.join(DATA, "fakejulius.py") ]
+
+
+def add_tiedlist_entries(modeldir, prefix):
+    """ Add entries in the tiedlist one by one, in a process. """
+    aligner = basicalign.BaseAligner( modeldir )
+    for i in range(10):
+        aligner.add_tiedlist( ["%s%d-b+a" % (prefix, i)] )
+
 # ---------------------------------------------------------------------------
 
 
@@ -48,6 +64,50 @@ class TestBaseAligner( unittest.TestCase ):
         with self.assertRaises(NotImplementedError):
             self._aligner.run_alignment( "audio", "output")
 
+    def test_add_tiedlist(self):
+        modeldir = tempfile.mkdtemp()
+        try:
+            tiedfile = os.path.join(modeldir, "tiedlist")
+            with open(tiedfile, "w") as fp:
+                fp.write("a\nb\na-b+a\nx-b+a a-b+a\n")
+            aligner1 = basicalign.BaseAligner( modeldir )
+            aligner2 = basicalign.BaseAligner( modeldir )
+            version = aligner2.get_tiedlist_version()
+            self.assertIsNotNone( version )
+
+            self.assertEqual( aligner1.add_tiedlist( ["b-b+a"] ), ["b-b+a"] )
+            self.assertEqual( aligner2.add_tiedlist( ["b-b+a"] ), [] )
+            # the other aligners know that the tiedlist was modified
+            self.assertNotEqual( aligner2.get_tiedlist_version(), version )
+            with open(tiedfile, "r") as fp:
+                self.assertTrue( "b-b+a a-b+a\n" in fp.read() )
+            # only the tiedlist, its backup and its lock
+            self.assertEqual( len(os.listdir(modeldir)), 3 )
+        finally:
+            shutil.rmtree( modeldir )
+
+    def test_add_tiedlist_processes(self):
+        modeldir = tempfile.mkdtemp()
+        try:
+            tiedfile = os.path.join(modeldir, "tiedlist")
+            with open(tiedfile, "w") as fp:
+                fp.write("a\nb\na-b+a\nx-b+a a-b+a\n")
+            processes = [multiprocessing.Process(target=add_tiedlist_entries, args=(modeldir, prefix))
+                         for prefix in ("p", "q")]
+            for p in processes:
+                p.start()
+            for p in processes:
+                p.join()
+
+            # the entries added by a process are not lost by the other one
+            with open(tiedfile, "r") as fp:
+                content = fp.read()
+            for prefix in ("p", "q"):
+                for i in range(10):
+                    self.assertTrue( "%s%d-b+a a-b+a\n" % (prefix, i) in content )
+        finally:
+            shutil.rmtree( modeldir )
+
 # ---------------------------------------------------------------------------
 
 
@@ -108,6 +168,113 @@ class TestJuliusAlign( unittest.TestCase ):
     def setUp(self):
         self._modeldir = os.path.join(MODELDIR, "models-fra")
         self._aligner = juliusalign.JuliusAligner( self._modeldir )
+        self._workdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self._aligner.close_session()
+        shutil.rmtree( self._workdir )
+
+    def test_session(self):
+        self._aligner.open_session( FAKE_JULIUS )
+        aio = AlignerIO()
+
+        session = None
+        for track in range(1,4):
+            inputwav = os.path.join(self._workdir, "track_%.06d.wav"%track)
+            shutil.copy(os.path.join(DATA, "track_000000.wav"), inputwav)
+            basename = os.path.splitext(inputwav)[0]
+
+            self._aligner.set_phones( "b-o-Z-u-R|b-o-Z-u m-@-s-j-2" )
+            self._aligner.set_tokens( "bonjour monsieur" )
+            self._aligner.run_alignment( inputwav, basename )
+
+            # julius was started only once
+            if session is None:
+                session = self._aligner._session
+            self.assertTrue( session.is_alive() )
+            self.assertIs( session, self._aligner._session )
+
+            phones, words = aio.read_aligned( basename )
+            self.assertEqual( [p[2] for p in phones], ["b","o","Z","u","R","m","@","s","j","2"] )
+            self.assertEqual( phones[0][0], 0. )
+            self.assertEqual( phones[-1][1], 0.99 )
+            self.assertEqual( [w[2] for w in words], ["bonjour","monsieur"] )
+
+        self._aligner.close_session()
+        self.assertFalse( session.is_alive() )
+
+    def test_format_result(self):
+        # the messages julius sent on the module port, while aligning
+        # "bonjour monsieur" with the option -palign
+        with open(os.path.join(DATA, "julius_module.txt"), "r") as fp:
+            messages = [ m.strip() for m in fp.read().split("\n.\n") ]
+        messages = [ m for m in messages if m.startswith("<RECOGOUT") or m.startswith("<ALIGN") ]
+        message = "\n".join(messages)
+
+        basename = os.path.join(self._workdir, "track_000001")
+        with open(basename + ".palign", "w") as fp:
+            fp.write( juliusalign.JuliusSession._format_result(message) )
+        phones, words = AlignerIO().read_aligned( basename )
+        self.assertEqual( [p[2] for p in phones], ["b","o","Z","u","R","m","@","s","j","2"] )
+        self.assertEqual( (phones[0][0], phones[0][1]), (0., 0.08) )
+        self.assertEqual( phones[-1][1], 0.97 )
+        self.assertEqual( [w[2] for w in words], ["bonjour","monsieur"] )
+        self.assertEqual( [w[3] for w in words], [0.953, 0.871] )
+
+        # another alignment than the one of the option -palign
+        with self.assertRaises(Exception):
+            juliusalign.JuliusSession._format_result(message.replace("PHONEME PHONE=", "PHONEME NAME="))
+        with self.assertRaises(Exception):
+            juliusalign.JuliusSession._format_result(message.replace('TYPE="phoneme"', 'TYPE="state"'))
+
+# ---------------------------------------------------------------------------
+
+class TestSppasAlign( unittest.TestCase ):
+
+    def setUp(self):
+        self._modeldir = os.path.join(MODELDIR, "models-fra")
+        self._workdirs = []
+
+    def tearDown(self):
+        for workdir in self._workdirs:
+            shutil.rmtree( workdir )
+
+    def _convert_tracks(self, jobs):
+        workdir = tempfile.mkdtemp()
+        self._workdirs.append( workdir )
+        phones = [ "b-o-Z-u-R|b-o-Z-u m-@-s-j-2", "", "b-o-Z-u-R", "m-@-s-j-2 b-o-Z-u-R" ]
+        tokens = [ "bonjour monsieur", "", "bonjour", "monsieur bonjour" ]
+        for i in range(len(phones)):
+            basename = os.path.join(workdir, "track_%.06d"%(i+1))
+            shutil.copy(os.path.join(DATA, "track_000000.wav"), basename+".wav")
+            with open(basename+".pron", "w") as fp:
+                fp.write(phones[i])
+            with open(basename+".term", "w") as fp:
+                fp.write(tokens[i])
+
+        a = sppasAlign( self._modeldir )
+        a.set_aligner( "basic" )
+        a.set_jobs( jobs )
+        a.convert_tracks( workdir, None )
+
+        results = {}
+        for filename in sorted(os.listdir(workdir)):
+            with open(os.path.join(workdir, filename), "rb") as fp:
+                results[filename] = fp.read()
+        return results
+
+    def test_jobs(self):
+        a = sppasAlign( self._modeldir )
+        with self.assertRaises(ValueError):
+            a.set_jobs( -1 )
+        a.set_jobs( 0 )
+        self.assertTrue( a._options['jobs'] > 0 )
+
+    def test_convert_tracks(self):
+        expected = self._convert_tracks( 1 )
+        self.assertEqual( len(expected), 16 )
+        self.assertEqual( self._convert_tracks( 3 ), expected )
+        self.assertEqual( self._convert_tracks( 8 ), expected )
 
 # ---------------------------------------------------------------------------
 
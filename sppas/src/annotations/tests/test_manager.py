@@ -0,0 +1,133 @@
+#!/usr/bin/env python2
+# -*- coding:utf-8 -*-
+
+import unittest
+import os
+import shutil
+import multiprocessing
+
+from annotationdata.transcription import Transcription
+from annotationdata.annotation import Annotation
+from annotationdata.label.label import Label
+from annotationdata.ptime.point import TimePoint
+from annotationdata.ptime.interval import TimeInterval
+import annotationdata.aio
+from annotations.log import sppasLog
+from annotations.manager import sppasFileAnnotator
+from annotations.manager import _init_worker, _annotate_worker_file
+from annotations.Phon.sppasphon import sppasPhon
+import utils.fileutils
+
+# ---------------------------------------------------------------------------
+
+TEMP = utils.fileutils.gen_name()
+
+# ---------------------------------------------------------------------------
+
+
+class FakeStep(object):
+    def __init__(self, resource=None):
+        self.resource = resource
+
+    def get_options(self):
+        return []
+
+    def get_langresource(self):
+        return self.resource
+
+
+class FakeParameters(object):
+    """ The parameters of a single step. """
+    def __init__(self, key, resource=None):
+        self.key = key
+        self.resource = resource
+
+    def get_step(self, stepidx):
+        return FakeStep(self.resource)
+
+    def get_step_key(self, stepidx):
+        return self.key
+
+    def get_output_format(self):
+        return ".xra"
+
+
+class FakeAnnotation(object):
+    """ Record the arguments of run() and return a Transcription. """
+    def __init__(self):
+        self.args = None
+
+    def fix_options(self, options):
+        pass
+
+    def run(self, *args):
+        self.args = args
+        return Transcription()
+
+# ---------------------------------------------------------------------------
+
+
+class TestFileAnnotator(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.exists(TEMP) is False:
+            os.mkdir(TEMP)
+        self.wav = os.path.join(TEMP, "sample.wav")
+
+    def tearDown(self):
+        shutil.rmtree(TEMP)
+
+    def test_pipeline_chunks(self):
+        # chunks is given the tokenization and the phonetization in memory
+        annotator = sppasFileAnnotator(FakeParameters("chunks"))
+        annotator.set_pipeline(True)
+        tokens = Transcription("tokens")
+        phones = Transcription("phones")
+        annotator.results[(self.wav, "-token")] = tokens
+        annotator.results[(self.wav, "-phon")] = phones
+
+        a = FakeAnnotation()
+        self.assertEqual(annotator.annotate_file(a, 0, self.wav), 1)
+        self.assertIs(a.args[0], phones)
+        self.assertIs(a.args[1], tokens)
+
+    def test_pipeline_log(self):
+        # the result kept in memory is not reported as written
+        with open(os.path.join(TEMP, "sample.xra"), "w") as fp:
+            fp.write("")
+        parameters = FakeParameters("tok")
+        logfile = sppasLog(parameters)
+        logfile.open_buffer()
+        annotator = sppasFileAnnotator(parameters, logfile)
+        outname = os.path.join(TEMP, "sample-token.xra")
+
+        annotator.set_pipeline(True)
+        self.assertEqual(annotator.annotate_file(FakeAnnotation(), 0, self.wav), 1)
+        self.assertIn((self.wav, "-token"), annotator.results)
+        self.assertNotIn(outname, logfile.get_buffer())
+
+        annotator.set_pipeline(False)
+        self.assertEqual(annotator.annotate_file(FakeAnnotation(), 0, self.wav), 1)
+        self.assertIn(outname, logfile.get_buffer())
+
+    def test_pool_cache(self):
+        # the phonetizations of all the processes of a pool are saved
+        dictfile = os.path.join(TEMP, "abc.dict")
+        with open(dictfile, "w") as fp:
+            fp.write("a [a] a\nb [b] b\nc [c] c\n")
+        wavs = []
+        for name, text in (("ab", "a b"), ("c", "c")):
+            trs = Transcription()
+            tier = trs.NewTier("Tokens")
+            tier.Append(Annotation(TimeInterval(TimePoint(0.), TimePoint(1.)), Label(text)))
+            annotationdata.aio.write(os.path.join(TEMP, name + "-token.xra"), trs)
+            wavs.append(os.path.join(TEMP, name + ".wav"))
+
+        pool = multiprocessing.Pool(2, initializer=_init_worker,
+                                    initargs=(FakeParameters("phon", dictfile), 0))
+        results = pool.map(_annotate_worker_file, wavs, chunksize=1)
+        pool.close()
+        pool.join()
+
+        self.assertEqual([r[1] for r in results], [1, 1])
+        self.assertEqual(len(sppasPhon(dictfile).phonetizer._cache), 3)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python2
+# -*- coding:utf-8 -*-
+
+import unittest
+import os.path
+import math
+import random
+
+from annotations.Momel.momel import Momel
+from annotations.Momel.sppasmomel import sppasMomel
+from sp_glob import SAMPLES_PATH
+
+# -------------------------------------------------------------------------
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# -------------------------------------------------------------------------
+
+
+def synthetic_pitch(n):
+    """ Return n pitch values, with unvoiced parts. """
+    random.seed(7)
+    pitch = []
+    for i in range(n):
+        if (i // 150) % 4 == 3 or random.random() < 0.05:
+            pitch.append(0.)
+        else:
+            pitch.append(150. + 40. * math.sin(i / 23.) + random.gauss(0., 5.))
+    return pitch
+
+# -------------------------------------------------------------------------
+
+
+class TestMomel(unittest.TestCase):
+
+    def setUp(self):
+        self.pitch = synthetic_pitch(600)
+
+    def __cible(self, momel):
+        """ Targets estimated with calcrgp on each window. """
+        pond = [1.0 if v > momel.SEUILV else 0.0 for v in momel.hzptr]
+        targets = []
+        for ix in range(momel.nval):
+            dpx = max(0, ix - int(momel.lfen1 / 2))
+            fpx = min(momel.nval, ix - int(momel.lfen1 / 2) + momel.lfen1 + 1)
+            pondloc = pond[:]
+            nsup = 0
+            nsupr = -1
+            xc = yc = 0.
+            ok = True
+            while nsup > nsupr:
+                nsupr = nsup
+                nsup = 0
+                try:
+                    momel.calcrgp(pondloc, dpx, fpx-1)
+                except ValueError:
+                    ok = False
+                    break
+                for x in range(dpx, fpx):
+                    hzes = momel.a0 + (momel.a1 + momel.a2 * float(x)) * float(x)
+                    if momel.hzptr[x] == 0. or hzes / momel.hzptr[x] > momel.maxec:
+                        nsup += 1
+                        pondloc[x] = 0.
+            if ok is True and momel.a2 != 0.:
+                vxc = -momel.a1 / (momel.a2 + momel.a2)
+                if ix - momel.lfen1 < vxc < ix + momel.lfen1:
+                    vyc = momel.a0 + (momel.a1 + momel.a2 * vxc) * vxc
+                    if momel.hzinf < vyc < momel.hzsup:
+                        xc = vxc
+                        yc = vyc
+            targets.append((xc, yc))
+        return targets
+
+    def test_cible(self):
+        momel = Momel()
+        momel.set_pitch_array(self.pitch)
+        momel.elim_glitch()
+        momel.cible()
+        expected = self.__cible(momel)
+        self.assertEqual(len(momel.cib), len(expected))
+        for c, (x, y) in zip(momel.cib, expected):
+            self.assertAlmostEqual(c.get_x(), x, places=5)
+            self.assertAlmostEqual(c.get_y(), y, places=5)
+
+    def test_cible_long(self):
+        # targets of a long track, estimated with calcrgp on each window
+        momel = Momel()
+        momel.set_pitch_array(synthetic_pitch(12000))
+        momel.elim_glitch()
+        momel.cible()
+        with open(os.path.join(DATA, "momel_cible.txt")) as fd:
+            for line in fd:
+                ix, x, y = line.split()
+                c = momel.cib[int(ix)]
+                self.assertAlmostEqual(c.get_x(), float(x), places=4)
+                self.assertAlmostEqual(c.get_y(), float(y), places=4)
+
+    def test_annotate(self):
+        targets = Momel().annotate(self.pitch)
+        self.assertTrue(len(targets) > 0)
+        xs = [t.get_x() for t in targets]
+        self.assertEqual(xs, sorted(xs))
+        with self.assertRaises(IOError):
+            Momel().annotate([])
+
+    def test_set_pitch(self):
+        # pitch values are estimated from an audio file
+        pitch = sppasMomel().set_pitch(os.path.join(SAMPLES_PATH, "samples-fra", "AC track_0379.wav"))
+        self.assertEqual(len(pitch), 233)
+        self.assertTrue(len([p for p in pitch if p > 0.]) > 50)
+        self.assertTrue(len(Momel().annotate(pitch)) > 0)
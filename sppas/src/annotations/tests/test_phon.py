@@ -3,18 +3,25 @@
 
 import unittest
 import os.path
+import shutil
 
 from annotations.Phon.phonetize import DictPhon
-from annotations.Phon.dagphon import DAGPhon
+from annotations.Phon.dagphon import DAGPhon, DAG
 from annotations.Phon.phonunk import PhonUnk
 from annotations.Phon.sppasphon import sppasPhon
 
 from resources.dictpron import DictPron
 from resources.mapping import Mapping
+from annotationdata.transcription import Transcription
+from annotationdata.annotation import Annotation
+from annotationdata.label.label import Label
+from annotationdata.ptime.interval import TimeInterval
+from annotationdata.ptime.point import TimePoint
 
 from sp_glob import RESOURCES_PATH
 from sp_glob import UNKSTAMP
 from sp_glob import ERROR_ID, WARNING_ID, OK_ID
+import utils.fileutils
 
 # ---------------------------------------------------------------------------
 
@@ -55,6 +62,29 @@ class TestDictPhon( unittest.TestCase ):
         self.assertEqual(self.grph.get_phon_tokens(['/a/','d']), [('/a/','a',OK_ID),('d',UNKSTAMP,ERROR_ID)])
         self.assertEqual(self.grph.get_phon_tokens(['/A-a/','d']), [('/A-a/','A-a',OK_ID),('d',UNKSTAMP,ERROR_ID)])
 
+    def test_cache(self):
+        tokens = ['a', 'aa', 'a', 'd']
+        expected = self.grph.get_phon_tokens(tokens)
+        self.assertEqual(self.grph.get_phon_tokens(tokens), expected)
+        self.assertEqual(self.grph.get_phon_tokens(['aa'], phonunk=False), [('aa',UNKSTAMP,ERROR_ID)])
+
+        filename = utils.fileutils.gen_name() + ".phoncache"
+        try:
+            self.assertTrue(self.grph.save_cache(filename))
+            self.assertFalse(self.grph.save_cache(filename))
+            grph = DictPhon(self.dd)
+            self.assertTrue(grph.load_cache(filename))
+            self.assertEqual(len(grph._cache), 4)
+            self.assertEqual(grph.get_phon_tokens(tokens), expected)
+            self.assertFalse(grph.save_cache(filename))
+        finally:
+            os.remove(filename)
+        self.assertFalse(self.grph.load_cache(filename))
+
+        # the cache is cleared if the resources change
+        self.grph.set_maptable(Mapping())
+        self.assertEqual(len(self.grph._cache), 0)
+
     def test_phonetize(self):
         with self.assertRaises(TypeError):
             self.grph.phonetize('A',delimiter="_-")
@@ -127,7 +157,7 @@ class TestDAGPhon(unittest.TestCase):
     def test_decompose(self):
         self.assertEqual(self.dd.decompose("a","b"), "a|b")
         self.assertEqual(self.dd.decompose("a|A b"), "a-b|A-b")
-        self.assertEqual(self.dd.decompose("a|A","b|B"), "a|A|B|b")
+        self.assertEqual(self.dd.decompose("a|A","b|B"), "a|A|b|B")
 
         result = "p1-p2-x3|p1-x2-x3|p1-p2-p3|p1-x2-p3"
         self.assertEqual(set(self.dd.decompose("p1 p2|x2 p3|x3").split("|")), set(result.split("|")))
@@ -138,6 +168,24 @@ class TestDAGPhon(unittest.TestCase):
         result = 'p1-p2-p3|p1-x2-p3|x1-x2-x3'
         self.assertEqual(set(self.dd.decompose("p1 p2|x2 p3", "x1 x2 x3").split("|")), set(result.split("|")))
 
+    def test_decompose_variants(self):
+        # the shorter variants are chosen
+        self.assertEqual(self.dd.decompose("a-b|c d|e-f-g", "h"), "h|c-d|a-b-d|c-e-f-g")
+        self.assertEqual(DAGPhon(variants=1).decompose("a-b|c d|e-f-g"), "c-d")
+        self.assertEqual(len(DAGPhon(variants=0).decompose("a-b|c d|e-f-g").split("|")), 4)
+
+        # a limited number of variants is found among a huge number of paths
+        pron = " ".join(["a|b|c|d-e"]*50)
+        self.assertEqual(len(self.dd.decompose(pron).split("|")), 4)
+        self.assertEqual(DAGPhon(variants=1).decompose(pron), "-".join(["a"]*50))
+
+    def test_find_best_paths(self):
+        dag = DAG()
+        dag.Graph = {'A': ['B', 'C'], 'B': ['C', 'D'], 'C': ['D']}
+        paths = list(dag.find_best_paths('A', 'D', lambda n: 1))
+        self.assertEqual(paths, [(3, ['A', 'B', 'D']), (3, ['A', 'C', 'D']), (4, ['A', 'B', 'C', 'D'])])
+        self.assertEqual(list(dag.find_best_paths('D', 'A', lambda n: 1)), [])
+
 # ---------------------------------------------------------------------------
 
 
@@ -170,6 +218,45 @@ class TestSppasPhon(unittest.TestCase):
 # ---------------------------------------------------------------------------
 
 
+class TestSppasPhonCache(unittest.TestCase):
+
+    def test_cache(self):
+        tmpdir = utils.fileutils.gen_name()
+        os.mkdir(tmpdir)
+        try:
+            dictfile = os.path.join(tmpdir, "ab.dict")
+            with open(dictfile, "w") as fp:
+                fp.write("a [a] a\nb [b] b\n")
+            trs = Transcription()
+            tier = trs.NewTier("Tokens")
+            tier.Append(Annotation(TimeInterval(TimePoint(0.), TimePoint(1.)), Label("a b a")))
+
+            sp = sppasPhon(dictfile)
+            sp.run(trs)
+            # the cache is saved once, at the end of the session
+            cachefile = sp.get_cache_filename(dictfile)
+            self.assertFalse(os.path.exists(cachefile))
+            self.assertTrue(sp.save_cache())
+            self.assertTrue(os.path.exists(cachefile))
+            self.assertFalse(sp.save_cache())
+            self.assertEqual(len(sppasPhon(dictfile).phonetizer._cache), 2)
+
+            # the phonetizations saved by another process are kept
+            sp1 = sppasPhon(dictfile)
+            sp2 = sppasPhon(dictfile)
+            tier[0].GetLabel().SetValue("c")
+            sp1.run(trs)
+            tier[0].GetLabel().SetValue("d")
+            sp2.run(trs)
+            self.assertTrue(sp1.save_cache())
+            self.assertTrue(sp2.save_cache())
+            self.assertEqual(len(sppasPhon(dictfile).phonetizer._cache), 4)
+        finally:
+            shutil.rmtree(tmpdir)
+
+# ---------------------------------------------------------------------------
+
+
 class TestPhonUnk(unittest.TestCase):
 
     def setUp(self):
@@ -0,0 +1,59 @@
+#!/usr/bin/env python2
+# -*- coding:utf-8 -*-
+
+import unittest
+
+from annotations.Repet.detectrepetition import Repetitions
+from annotations.Repet.storage import DataSpeaker
+
+# -------------------------------------------------------------------------
+
+L1 = u" tout et rien être insolite alors aller y # bon et si on pérorer sur ce que on voir à_travers + tout et rien".split()
+L2 = u" donc euh # tout et rien être insolite # * oh oui ce être tout_à_fait insolite ouais + ouais ouais ouais ouais ouais surtout que là ".split()
+
+# -------------------------------------------------------------------------
+
+
+class TestDataSpeaker(unittest.TestCase):
+
+    def test_tokens(self):
+        spk = DataSpeaker([u"<a>", u"euh", u"b-", u"#", u"a", u"b"])
+        self.assertEqual(spk.get_token(0), u"a")
+        self.assertEqual(spk.get_token(2), u"b")
+        self.assertIsNone(spk.get_token(6))
+        self.assertFalse(spk.is_token(u"euh"))
+        self.assertTrue(spk.is_token(u"a"))
+        self.assertEqual(spk.get_next_token(-1), 0)
+        self.assertEqual(spk.get_next_token(0), 2)
+        self.assertEqual(spk.get_next_token(2), 4)
+        self.assertEqual(spk.get_next_token(5), -1)
+        self.assertEqual(spk.get_string(), u" a euh b # a b")
+
+    def test_is_token_repeat(self):
+        spk = DataSpeaker([u"<a>", u"euh", u"b-", u"#", u"a", u"b"])
+        self.assertEqual(spk.is_token_repeat(0, 1, spk), 4)
+        self.assertEqual(spk.is_token_repeat(0, 0, spk), 0)
+        self.assertEqual(spk.is_token_repeat(2, 3, spk), 5)
+        self.assertEqual(spk.is_token_repeat(4, 5, spk), -1)
+        self.assertEqual(spk.is_token_repeat(1, 2, spk), -1)
+        self.assertEqual(spk.is_token_repeat(0, -1, spk), -1)
+
+# -------------------------------------------------------------------------
+
+
+class TestRepetitions(unittest.TestCase):
+
+    def __repeats(self, r):
+        return [(d.get_source(), d.get_repetition()) for d in r.get_repeats()]
+
+    def test_self_repetitions(self):
+        r = Repetitions()
+        r.detect(DataSpeaker(L1), len(L1)-1, None)
+        self.assertEqual(self.__repeats(r), [((0, 2), [(21, 23)]), ((10, 10), [(22, 22)]), ((12, 12), [(17, 17)])])
+        r.detect(DataSpeaker(L2), len(L2)-1, None)
+        self.assertEqual(self.__repeats(r), [((6, 7), [(13, 15)]), ((16, 16), [(18, 18)]), ((18, 21), [(22, 22)])])
+
+    def test_other_repetitions(self):
+        r = Repetitions()
+        r.detect(DataSpeaker(L1), 1, DataSpeaker(L2))
+        self.assertEqual(self.__repeats(r), [((0, 4), [(3, 7)])])
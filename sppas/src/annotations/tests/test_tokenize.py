@@ -71,6 +71,31 @@ class TestDictTok(unittest.TestCase):
         s = self.tok.replace(text)
         self.assertEquals(" ".join(s), u"的平方 个百分比 摄氏度 公里每小时 etc € ¥ $")
 
+    def test_split(self):
+        repl = DictRepl(None, nodump=True)
+        repl.add(u"%", u"pourcents")
+        repl.add(u"€", u"euros")
+        self.tok.set_repl(repl)
+        self.assertEquals(self.tok.split(u"a2b 50% 10€ €"), [u"a", u"2", u"b", u"50", u"%", u"10", u"€", u"€"])
+        self.assertEquals(self.tok.split(u"a2b", std=True), [u"a2b"])
+
+        # keys added after the dictionary was set
+        repl.add(u"km", u"kilomètres")
+        self.assertEquals(self.tok.split(u"3km"), [u"3", u"km"])
+
+        # a key replaced by another one: the size of the dictionary is the same
+        repl.remove(u"€")
+        repl.add(u"£", u"livres")
+        self.assertEquals(self.tok.split(u"x€ x£"), [u"x€", u"x", u"£"])
+
+    def test_tokenize_many(self):
+        repl = DictRepl(os.path.join(RESOURCES_PATH, "repl", "fra.repl"), nodump=True)
+        self.tok.set_repl(repl)
+        utterances = [u"123", u"l'assiette", u"123", u""]
+        self.assertEqual(self.tok.tokenize_many(utterances),
+                         [self.tok.tokenize(u) for u in utterances])
+        self.assertEqual(self.tok.tokenize_many([]), [])
+
     def test_clean_toe(self):
         s = self.tok.clean_toe(u'(il) (ne) faut pas rêver')
         self.assertEqual(s, u"faut pas rêver")
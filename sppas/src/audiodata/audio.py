@@ -35,8 +35,7 @@
 # File: audio.py
 # ---------------------------------------------------------------------------
 
-import struct
-
+import audiodata.audioutils as audioutils
 from audiodata.audioframes   import AudioFrames
 from audiodata.audiodataexc  import AudioDataError
 from audiodata.channel       import Channel
@@ -233,14 +232,7 @@ class AudioPCM( object ):
         if index+1 > nc:
             raise AudioDataError('No channel with index %d in the audio file.'%index)
 
-        if nc == 1:
-            channel = Channel( self.get_framerate(), self.get_sampwidth(), data )
-            return self.append_channel( channel )
-
-        frames = ""
-        sw = self.get_sampwidth()
-        for i in xrange(index*sw, len(data), nc*sw):
-            frames += data[i:i+sw]
+        frames = audioutils.deinterleave(data, self.get_sampwidth(), nc, index)
         channel = Channel( self.get_framerate(), self.get_sampwidth(), frames )
 
         return self.append_channel( channel )
@@ -261,9 +253,7 @@ class AudioPCM( object ):
         data = self.read_frames(self.get_nframes())
 
         for index in range(nc):
-            frames = ""
-            for i in xrange(index*sw, len(data), nc*sw):
-                frames += data[i:i+sw]
+            frames = audioutils.deinterleave(data, sw, nc, index)
             channel = Channel( self.get_framerate(), self.get_sampwidth(), frames )
             self.append_channel(channel)
 
@@ -310,25 +300,17 @@ class AudioPCM( object ):
 
         data = self.read_frames(nframes)
 
-        # Unpack to get all values, depending on the number of bytes of each value.
-        if self.get_sampwidth() == 4 :
-            data = struct.unpack("<%ul" % (len(data) / 4), data)
-
-        elif self.get_sampwidth() == 2 :
-            data = struct.unpack("<%uh" % (len(data) / 2), data)
-
-        else :
-            data = struct.unpack("%uB"  %  len(data),      data)
-            data = [ s - 128 for s in data ]
+        # Get all values, depending on the number of bytes of each value.
+        data = audioutils.frames2samples(data, self.get_sampwidth())
 
         nc  = self.get_nchannels()
         samples = []
         if nc > 1:
             # Split channels
             for i in xrange(nc) :
-                samples.append([ data[j] for j in xrange(i, len(data), nc) ])
+                samples.append( data[i::nc].tolist() )
         else:
-            samples.append(list(data))
+            samples.append( data.tolist() )
 
         return samples
 
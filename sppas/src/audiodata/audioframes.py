@@ -36,7 +36,6 @@
 # ---------------------------------------------------------------------------
 
 import audioop
-import struct
 
 import audiodata.audioutils as audioutils
 
@@ -185,16 +184,32 @@ class AudioFrames( object ):
         else:
             rmssum = 0
             for i in xrange(self.nchannels):
-                newFrames = ""
-                for j in xrange(i*self.sampwidth, len(self.frames), self.sampwidth*self.nchannels):
-                    for k in xrange(self.sampwidth):
-                        newFrames = newFrames + self.frames[j+k]
+                newFrames = audioutils.deinterleave(self.frames, self.sampwidth, self.nchannels, i)
                 rmssum += audioop.rms(newFrames, self.sampwidth)
 
             return rmssum/self.nchannels
 
     # -----------------------------------------------------------------------
 
+    def rms_windows(self, nbframes, nbwindows):
+        """
+        Return the root mean square of consecutive windows of frames.
+        Windows after the end of the frames have a null value.
+
+        @param nbframes (int) the number of frames of a window
+        @param nbwindows (int) the number of windows
+        @return list of root mean square values
+
+        """
+        if self.nchannels > 1:
+            size = nbframes*self.sampwidth*self.nchannels
+            return [ AudioFrames(self.frames[i*size:(i+1)*size], self.sampwidth, self.nchannels).rms() for i in xrange(nbwindows) ]
+
+        size = nbframes*self.sampwidth
+        return [ audioop.rms(self.frames[i*size:(i+1)*size], self.sampwidth) for i in xrange(nbwindows) ]
+
+    # -----------------------------------------------------------------------
+
     def clipping_rate(self, factor):
         """
         Return the clipping rate of the frames.
@@ -205,22 +220,12 @@ class AudioFrames( object ):
         @return the clipping rate
 
         """
-        if self.sampwidth == 4 :
-            data = struct.unpack("<%ul" % (len(self.frames) / 4), self.frames)
-        elif self.sampwidth == 2 :
-            data = struct.unpack("<%uh" % (len(self.frames) / 2), self.frames)
-        else :
-            data = struct.unpack("%uB"  %  len(self.frames),      self.frames)
-            data = [ s - 128 for s in data ]
+        data = audioutils.frames2samples(self.frames, self.sampwidth)
 
         maxval = audioutils.get_maxval(self.sampwidth)*(factor/2.)
         minval = audioutils.get_minval(self.sampwidth)*(factor/2.)
 
-        nbclipping = 0
-
-        for i in xrange(len(data)):
-            if data[i] >= maxval or data[i] <= minval:
-                nbclipping = nbclipping + 1
+        nbclipping = sum( 1 for s in data if s >= maxval or s <= minval )
 
         return float(nbclipping)/len(data)
 
@@ -0,0 +1,261 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+# ---------------------------------------------------------------------------
+#            ___   __    __    __    ___
+#           /     |  \  |  \  |  \  /              Automatic
+#           \__   |__/  |__/  |___| \__             Annotation
+#              \  |     |     |   |    \             of
+#           ___/  |     |     |   | ___/              Speech
+#
+#
+#                           http://www.sppas.org/
+#
+# ---------------------------------------------------------------------------
+#            Laboratoire Parole et Langage, Aix-en-Provence, France
+#                   Copyright (C) 2011-2016  Brigitte Bigi
+#
+#                   This banner notice must not be removed
+# ---------------------------------------------------------------------------
+# Use of this software is governed by the GNU Public License, version 3.
+#
+# SPPAS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SPPAS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+# File: audiopeaks.py
+# ---------------------------------------------------------------------------
+
+import os
+import array
+import audioop
+import pickle
+import logging
+
+import audiodata.audioutils as audioutils
+from utils.fileutils import atomic_write
+
+# ---------------------------------------------------------------------------
+
+PEAKS_VERSION = 1
+PEAKS_FILENAME_EXT = ".peaks"
+
+# Number of frames of the buckets of each level of the pyramid.
+# Each size must be a multiple of the previous one.
+PEAKS_BUCKET_SIZES = (256, 4096, 65536)
+
+# ---------------------------------------------------------------------------
+
+class AudioPeaks( object ):
+    """
+    @author:       Brigitte Bigi
+    @organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    @contact:      brigitte.bigi@gmail.com
+    @license:      GPL, v3
+    @copyright:    Copyright (C) 2011-2017  Brigitte Bigi
+    @summary:      A pyramid of the min/max values of the channels of an audio file.
+
+    Each level of the pyramid stores, for each channel, the minimum and the
+    maximum sample values of buckets of frames. Drawing a period of an audio
+    file then requires to read only a few values per pixel, whatever the
+    duration of the period.
+
+    The pyramid can be saved into a cache file, next to the audio file.
+
+    """
+    def __init__(self, bucketsizes=PEAKS_BUCKET_SIZES):
+        """
+        Constructor.
+
+        @param bucketsizes (tuple) number of frames of the buckets of each level
+
+        """
+        self.bucketsizes = tuple(bucketsizes)
+        for i in range(1, len(self.bucketsizes)):
+            if self.bucketsizes[i] % self.bucketsizes[i-1] != 0:
+                raise ValueError('Bucket sizes must be multiples of the previous ones. Got: %s'%str(bucketsizes))
+
+        self.nframes   = 0
+        self.nchannels = 0
+        self.sampwidth = 0
+
+        # levels[l][c] is a tuple (mins, maxs) of arrays
+        self.levels = []
+
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def get_filename(audiofilename):
+        """
+        Return the name of the cache file of an audio file.
+
+        @param audiofilename (str)
+
+        """
+        return audiofilename + PEAKS_FILENAME_EXT
+
+    # ----------------------------------------------------------------------
+
+    def build(self, audio):
+        """
+        Estimate the pyramid of an opened audio file.
+        Frames are read by chunks of the largest bucket size; the position of
+        the audio file is restored.
+
+        @param audio (AudioPCM) an opened audio file
+
+        """
+        self.nframes   = audio.get_nframes()
+        self.nchannels = audio.get_nchannels()
+        self.sampwidth = audio.get_sampwidth()
+        typecode = audioutils.ARRAY_TYPECODES[self.sampwidth]
+
+        bucket = self.bucketsizes[0]
+        nbytes = bucket * self.sampwidth
+        level = [ (array.array(typecode), array.array(typecode)) for c in range(self.nchannels) ]
+
+        position = audio.tell()
+        audio.seek(0)
+        while True:
+            frames = audio.read_frames( self.bucketsizes[-1] )
+            if len(frames) == 0:
+                break
+            for c in range(self.nchannels):
+                samples = audioutils.deinterleave(frames, self.sampwidth, self.nchannels, c)
+                if self.sampwidth == 1:
+                    samples = audioop.bias(samples, 1, -128)
+                mins, maxs = level[c]
+                for i in xrange(0, len(samples), nbytes):
+                    (vmin, vmax) = audioop.minmax(samples[i:i+nbytes], self.sampwidth)
+                    mins.append(vmin)
+                    maxs.append(vmax)
+        audio.seek(position)
+
+        self.levels = [ level ]
+        for l in range(1, len(self.bucketsizes)):
+            ratio = self.bucketsizes[l] // self.bucketsizes[l-1]
+            level = []
+            for (lmins, lmaxs) in self.levels[-1]:
+                mins = array.array(typecode, [ min(lmins[i:i+ratio]) for i in xrange(0, len(lmins), ratio) ])
+                maxs = array.array(typecode, [ max(lmaxs[i:i+ratio]) for i in xrange(0, len(lmaxs), ratio) ])
+                level.append( (mins, maxs) )
+            self.levels.append( level )
+
+    # ----------------------------------------------------------------------
+
+    def load(self, filename, audio):
+        """
+        Load the pyramid from a cache file.
+        The cache is rejected if it does not match the audio file.
+
+        @param filename (str) Name of a file created by save
+        @param audio (AudioPCM) the opened audio file
+        @return (bool) The pyramid was loaded or not.
+
+        """
+        try:
+            with open(filename, 'rb') as fp:
+                (version, bucketsizes, info, levels) = pickle.load(fp)
+        except Exception as e:
+            logging.info('Load peaks failed: %s' % str(e))
+            return False
+
+        if version != PEAKS_VERSION or bucketsizes != self.bucketsizes:
+            return False
+        if info != (audio.get_nframes(), audio.get_nchannels(), audio.get_sampwidth()):
+            return False
+
+        (self.nframes, self.nchannels, self.sampwidth) = info
+        typecode = audioutils.ARRAY_TYPECODES[self.sampwidth]
+        self.levels = []
+        for level in levels:
+            channels = []
+            for (mins, maxs) in level:
+                channels.append( (array.array(typecode, mins), array.array(typecode, maxs)) )
+            self.levels.append( channels )
+
+        return True
+
+    # ----------------------------------------------------------------------
+
+    def save(self, filename):
+        """
+        Save the pyramid into a cache file.
+
+        @param filename (str) Name of the file to write.
+        @return (bool) The pyramid was saved or not.
+
+        """
+        levels = [ [ (mins.tostring(), maxs.tostring()) for (mins, maxs) in level ] for level in self.levels ]
+        info = (self.nframes, self.nchannels, self.sampwidth)
+
+        try:
+            with atomic_write(filename) as fp:
+                pickle.dump((PEAKS_VERSION, self.bucketsizes, info, levels), fp, pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logging.info('Save peaks failed: %s' % str(e))
+            return False
+
+        return True
+
+    # ----------------------------------------------------------------------
+
+    def load_or_build(self, audio, audiofilename=None):
+        """
+        Load the pyramid of an audio file from its cache file if it is newer
+        than the audio file, or build the pyramid and save the cache file.
+
+        @param audio (AudioPCM) the opened audio file
+        @param audiofilename (str) the name of the audio file. If None, the
+        pyramid is built and not saved.
+
+        """
+        if audiofilename is not None:
+            filename = AudioPeaks.get_filename(audiofilename)
+            if os.path.isfile(filename) and os.path.getmtime(filename) > os.path.getmtime(audiofilename):
+                if self.load(filename, audio) is True:
+                    return
+
+        self.build(audio)
+        if audiofilename is not None:
+            self.save(filename)
+
+    # ----------------------------------------------------------------------
+
+    def get_peaks(self, start, end, npixels):
+        """
+        Return the min/max values of the frames of a period, from the
+        coarsest level having at least npixels buckets in the period.
+
+        @param start (int) the position of the first frame of the period
+        @param end (int) the position of the frame after the period
+        @param npixels (int) number of pixels to draw the period
+        @return a list with the values of each channel, the min and max of
+        each bucket are interleaved, or None if there are not enough buckets
+        and the samples have to be read.
+
+        """
+        for l in range(len(self.levels)-1, -1, -1):
+            bucket = self.bucketsizes[l]
+            first = start // bucket
+            last = (end + bucket - 1) // bucket
+            if last - first >= npixels:
+                data = []
+                for (mins, maxs) in self.levels[l]:
+                    mins = mins[first:last]
+                    values = [0] * (2*len(mins))
+                    values[0::2] = mins.tolist()
+                    values[1::2] = maxs[first:last].tolist()
+                    data.append( values )
+                return data
+
+        return None
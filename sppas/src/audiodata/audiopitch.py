@@ -41,6 +41,25 @@ __copyright__ = """Copyright (C) 2011-2016  Brigitte Bigi"""
 
 # ----------------------------------------------------------------------------
 
+import math
+import audioop
+
+import audiodata.aio
+import audiodata.audioutils as audioutils
+
+# ----------------------------------------------------------------------------
+
+# Frame rate of the samples the pitch is estimated from.
+PITCH_FRAMERATE = 16000
+
+# Number of frames of the audio file read at a time.
+PITCH_CHUNK_SIZE = 160000
+
+# Frames with an amplitude lower than this ratio of the peak amplitude are silent.
+PITCH_SILENCE = 0.03
+
+# ----------------------------------------------------------------------------
+
 class WavePitch(object):
     """
     A pitch wav utility class.
@@ -104,13 +123,184 @@ class WavePitch(object):
 
     # ------------------------------------------------------------------
 
-    def eval_pitch(self, filename, delta=0.01):
+    def eval_pitch(self, filename, delta=0.01, minpitch=50., maxpitch=600., threshold=0.2):
         """
-        Eval pitch values... (TODO)
-        At this stage, this will do: NOTHING!
+        Eval pitch values of the first channel of an audio file.
+
+        Pitch is estimated with the YIN algorithm (de Cheveigne and Kawahara,
+        2002), one value each delta seconds; unvoiced frames are set to 0.
+        The audio file is read by chunks, so that the memory does not depend
+        on its duration.
+
+        @param filename (str) an audio file name
+        @param delta (float) the time between two pitch values, in seconds
+        @param minpitch (float) the minimum pitch value, in Hz
+        @param maxpitch (float) the maximum pitch value, in Hz
+        @param threshold (float) the threshold of the aperiodicity of voiced frames
+        @return the list of pitch values
 
         """
         self.delta = delta
-        pass
+        audio = audiodata.aio.open(filename)
+        try:
+            self.pitch = list(self.iter_pitch(audio, minpitch, maxpitch, threshold))
+        finally:
+            audio.close()
+
+        return self.pitch
+
+    # ------------------------------------------------------------------
+
+    def iter_pitch(self, audio, minpitch=50., maxpitch=600., threshold=0.2):
+        """
+        Return an iterator on the pitch values of the first channel of an
+        opened audio file, one value each delta seconds.
+
+        The value of index i is estimated on a window centered at time
+        i*delta. Frames are converted to 16 bits samples at PITCH_FRAMERATE.
+        A frame is silent if its amplitude is lower than PITCH_SILENCE of
+        the peak amplitude of the file: the file is read twice, first to get
+        its peak amplitude, then to estimate the pitch.
+
+        @param audio (AudioPCM) an opened audio file
+        @param minpitch (float) the minimum pitch value, in Hz
+        @param maxpitch (float) the maximum pitch value, in Hz
+        @param threshold (float) the threshold of the aperiodicity of voiced frames
+
+        """
+        framerate = audio.get_framerate()
+        sampwidth = audio.get_sampwidth()
+        nchannels = audio.get_nchannels()
+
+        hop    = int(round(PITCH_FRAMERATE * self.delta))
+        maxlag = int(math.ceil(PITCH_FRAMERATE / float(minpitch)))
+        minlag = max(2, int(PITCH_FRAMERATE / float(maxpitch)))
+        # the analysis window of a value is [center-maxlag/2, center+3*maxlag/2[
+        peak = self.__peak(audio)
+
+        buf = "\x00\x00" * (maxlag//2)
+        nsamples = 0
+        center = 0
+        state = None
+        end = False
+        while end is False:
+            frames = audio.read_frames(PITCH_CHUNK_SIZE)
+            if len(frames) == 0:
+                end = True
+                frames = "\x00\x00" * (2*maxlag)
+            else:
+                frames = self.__first_channel(frames, sampwidth, nchannels)
+                if framerate != PITCH_FRAMERATE:
+                    frames, state = audioop.ratecv(frames, 2, 1, framerate, PITCH_FRAMERATE, state)
+                nsamples += len(frames) // 2
+            buf += frames
+
+            # estimate the values of which the window is in the buffer
+            energies = self.__energies(buf)
+            start = 0
+            while start + 2*maxlag <= len(energies)-1 and center <= nsamples:
+                if audioop.max(buf[2*start:2*(start+2*maxlag)], 2) < PITCH_SILENCE*peak:
+                    yield 0.
+                else:
+                    yield self.__yin(buf, energies, start, maxlag, minlag, threshold)
+                start  += hop
+                center += hop
+            buf = buf[2*start:]
+
+    # ------------------------------------------------------------------
+    # Private
+    # ------------------------------------------------------------------
+
+    def __first_channel(self, frames, sampwidth, nchannels):
+        """
+        Return the 16 bits samples of the first channel of frames.
+
+        """
+        frames = audioutils.deinterleave(frames, sampwidth, nchannels, 0)
+        if sampwidth == 1:
+            frames = audioop.bias(frames, 1, -128)
+        if sampwidth != 2:
+            frames = audioop.lin2lin(frames, sampwidth, 2)
+
+        return frames
+
+    # ------------------------------------------------------------------
+
+    def __peak(self, audio):
+        """
+        Return the peak amplitude of the first channel of an opened audio
+        file, from the current position to the end. The position is then
+        restored.
+
+        """
+        sampwidth = audio.get_sampwidth()
+        nchannels = audio.get_nchannels()
+
+        pos = audio.tell()
+        peak = 0
+        frames = audio.read_frames(PITCH_CHUNK_SIZE)
+        while len(frames) > 0:
+            peak = max(peak, audioop.max(self.__first_channel(frames, sampwidth, nchannels), 2))
+            frames = audio.read_frames(PITCH_CHUNK_SIZE)
+        audio.seek(pos)
+
+        return peak
+
+    # ------------------------------------------------------------------
+
+    def __energies(self, frames):
+        """
+        Return the cumulated energies of 16 bits samples.
+
+        """
+        energies = [0]
+        e = 0
+        for s in audioutils.frames2samples(frames, 2):
+            e += s*s
+            energies.append(e)
+
+        return energies
+
+    # ------------------------------------------------------------------
+
+    def __yin(self, frames, energies, start, maxlag, minlag, threshold):
+        """
+        Return the pitch value of the window of 16 bits samples starting
+        at a given index, or 0 if the window is not voiced.
+
+        """
+        e0 = energies[start+maxlag] - energies[start]
+        if e0 == 0:
+            return 0.
+
+        # cumulative mean normalized difference function.
+        # the correlation of each lag is evaluated by audioop.
+        reference = frames[2*start:2*(start+maxlag)]
+        dn = [1.]
+        cumul = 0.
+        for tau in xrange(1, maxlag+1):
+            b = start+tau
+            r = audioop.findfactor(frames[2*b:2*(b+maxlag)], reference) * e0
+            d = e0 + energies[b+maxlag] - energies[b] - 2.*r
+            cumul += d
+            dn.append( d*tau/cumul if cumul > 0. else 1. )
+
+        # the first minimum below the threshold
+        tau = minlag
+        while tau < maxlag and dn[tau] >= threshold:
+            tau += 1
+        if dn[tau] >= threshold:
+            return 0.
+        while tau < maxlag and dn[tau+1] < dn[tau]:
+            tau += 1
+
+        # parabolic interpolation
+        period = float(tau)
+        if tau < maxlag:
+            a, b, c = dn[tau-1], dn[tau], dn[tau+1]
+            if a - 2.*b + c > 0.:
+                period += 0.5 * (a-c) / (a - 2.*b + c)
+
+        return PITCH_FRAMERATE / period
 
     # ------------------------------------------------------------------
@@ -35,9 +35,20 @@
 # File: audioutils.py
 # ---------------------------------------------------------------------------
 
+import sys
+import array
+import audioop
 import struct
 import math
 
+# ---------------------------------------------------------------------------
+
+# Typecode of the array module to store samples of a given sampwidth.
+ARRAY_TYPECODES = {}
+for _typecode in ('b', 'h', 'i', 'l'):
+    _itemsize = array.array(_typecode).itemsize
+    if not _itemsize in ARRAY_TYPECODES:
+        ARRAY_TYPECODES[_itemsize] = _typecode
 
 # ---------------------------------------------------------------------------
 
@@ -54,6 +65,85 @@ def unpack_data( data, sampwidth ):
 
 # ----------------------------------------------------------------------------
 
+def frames2samples(frames, sampwidth):
+    """
+    Turn the frames of a channel into a typed array of samples.
+    As for unpack_data(), 8 bits samples are turned into signed values.
+
+    @param frames (str) frames of only one channel.
+    @param sampwidth (int) sample width of the frames (1, 2 or 4).
+    @return (array.array) samples
+
+    """
+    if not sampwidth in (1, 2, 4):
+        raise ValueError('Expected a sample width of 1, 2 or 4 bytes. Got: %d'%sampwidth)
+
+    if sampwidth == 1:
+        frames = audioop.bias(frames, 1, -128)
+    samples = array.array( ARRAY_TYPECODES[sampwidth] )
+    samples.fromstring( frames[:len(frames)-len(frames)%sampwidth] )
+    if sys.byteorder == "big" and sampwidth > 1:
+        samples.byteswap()
+
+    return samples
+
+# ----------------------------------------------------------------------------
+
+def samples2block(samples, sampwidth):
+    """
+    Turn samples of only one channel into frames.
+    This is the reverse of frames2samples(): 8 bits samples are signed values.
+
+    @param samples (int[]) samples of only one channel.
+    @param sampwidth (int) sample width of the frames (1, 2 or 4).
+    @return frames
+
+    """
+    if not sampwidth in (1, 2, 4):
+        raise ValueError('Expected a sample width of 1, 2 or 4 bytes. Got: %d'%sampwidth)
+
+    samples = array.array( ARRAY_TYPECODES[sampwidth], samples )
+    if sys.byteorder == "big" and sampwidth > 1:
+        samples.byteswap()
+    frames = samples.tostring()
+    if sampwidth == 1:
+        frames = audioop.bias(frames, 1, 128)
+
+    return frames
+
+# ----------------------------------------------------------------------------
+
+def deinterleave(frames, sampwidth, nchannels, index):
+    """
+    Return the frames of one channel from interleaved frames.
+
+    Frames are de-interleaved with a strided slice of a typed array instead
+    of being concatenated one by one.
+
+    @param frames (str) interleaved frames of nchannels channels.
+    @param sampwidth (int) sample width of the frames.
+    @param nchannels (int) number of channels in the frames
+    @param index (int) index of the channel to extract
+    @return frames
+
+    """
+    if nchannels == 1:
+        return frames
+
+    if sampwidth == 1:
+        return frames[index::nchannels]
+
+    if sampwidth in ARRAY_TYPECODES:
+        samples = array.array( ARRAY_TYPECODES[sampwidth] )
+        samples.fromstring( frames[:len(frames)-len(frames)%sampwidth] )
+        return samples[index::nchannels].tostring()
+
+    # No array type for this sampwidth (24 bits).
+    step = sampwidth*nchannels
+    return "".join( frames[i:i+sampwidth] for i in xrange(index*sampwidth, len(frames), step) )
+
+# ----------------------------------------------------------------------------
+
 def samples2frames(samples, sampwidth, nchannel=1):
     """
     Turn samples into frames
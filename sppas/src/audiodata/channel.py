@@ -64,6 +64,10 @@ class Channel( object ):
         self.sampwidth = sampwidth
         self.position  = 0
 
+        # RMS values of the windows, for each window length
+        self._volumes      = {}
+        self._volumeframes = None
+
     # ----------------------------------------------------------------------
     # Setters
     # ----------------------------------------------------------------------
@@ -95,7 +99,7 @@ class Channel( object ):
         m = len(self.frames)
         s = p*self.sampwidth
         e = min(m, s + chuncksize*self.sampwidth )
-        f = ''.join( self.frames[i] for i in range(s,e) )
+        f = self.frames[s:e]
         self.position = p + chuncksize
 
         return f
@@ -159,6 +163,33 @@ class Channel( object ):
 
     # -----------------------------------------------------------------------
 
+    def get_volumes(self, winlen=0.01):
+        """
+        Return the root mean square values of consecutive windows.
+        The values are estimated only once for a given window length,
+        until the frames of the channel are changed.
+
+        @param winlen (float) the duration of a window, in seconds
+        @return (list) the root mean square values
+
+        """
+        if self._volumeframes is not self.frames:
+            self._volumes      = {}
+            self._volumeframes = self.frames
+
+        if not winlen in self._volumes:
+            nbframes = int(winlen * self.framerate)
+            nbvols = int(self.get_duration()/winlen) + 1
+            a = AudioFrames(self.frames, self.sampwidth, 1)
+            volumes = a.rms_windows(nbframes, nbvols)
+            if volumes[-1] == 0:
+                volumes.pop()
+            self._volumes[winlen] = volumes
+
+        return self._volumes[winlen]
+
+    # -----------------------------------------------------------------------
+
     def clipping_rate(self, factor):
         """
         Return the clipping rate of the frames.
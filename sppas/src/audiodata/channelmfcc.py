@@ -35,11 +35,205 @@
 # File: channelmfcc.py
 # ---------------------------------------------------------------------------
 
+import sys
+import math
+import cmath
+import array
+import struct
 import subprocess
+import multiprocessing
 
 from utils.type        import test_command
 from audiodata.channel import Channel
 
+import audiodata.audioutils as audioutils
+
+# ---------------------------------------------------------------------------
+
+# Basic parameter kinds of HTK files.
+HTK_BASE_KINDS = {
+    "WAVEFORM":0, "LPC":1, "LPREFC":2, "LPCEPSTRA":3, "LPDELCEP":4,
+    "IREFC":5, "MFCC":6, "FBANK":7, "MELSPEC":8, "USER":9, "DISCRETE":10
+}
+
+# Qualifiers of the parameter kinds of HTK files.
+HTK_QUALIFIERS = {
+    "_E":0o100, "_N":0o200, "_D":0o400, "_A":0o1000, "_C":0o2000,
+    "_Z":0o4000, "_K":0o10000, "_0":0o20000
+}
+
+# Parameter kinds the extractor can evaluate.
+# The log energy (_E) is not: HCopy normalises it by default (ENORMALISE,
+# ESCALE, SILFLOOR), and this normalisation is not reproduced.
+EVALUATED_KINDS = ( "MFCC", "FBANK", "MELSPEC" )
+EVALUATED_QUALIFIERS = ( "_N", "_D", "_A", "_Z", "_0" )
+
+# Value used by HTK as floor of the filterbank.
+MEL_FLOOR = 1.0
+
+# ---------------------------------------------------------------------------
+
+def split_targetkind(targetkind):
+    """
+    Split a parameter kind into its base kind and its qualifiers.
+
+    @param targetkind (str) a parameter kind, like "MFCC_0_D_N_Z"
+    @return (base, list of qualifiers)
+
+    """
+    parts = targetkind.upper().split("_")
+    base = parts[0]
+    qualifiers = [ "_"+q for q in parts[1:] ]
+    if not base in HTK_BASE_KINDS:
+        raise ValueError('Unknown parameter kind: %s'%targetkind)
+    for q in qualifiers:
+        if not q in HTK_QUALIFIERS:
+            raise ValueError('Unknown qualifier %s in parameter kind: %s'%(q,targetkind))
+
+    return base, qualifiers
+
+# ---------------------------------------------------------------------------
+
+def check_targetkind(targetkind):
+    """
+    Check that a parameter kind can be evaluated by ChannelMFCC.
+
+    @param targetkind (str) a parameter kind, like "MFCC_0_D_N_Z"
+    @return (base, list of qualifiers)
+    @raise ValueError if the parameter kind can not be evaluated
+
+    """
+    base, qualifiers = split_targetkind(targetkind)
+    if not base in EVALUATED_KINDS:
+        raise ValueError('Can not evaluate parameters of kind: %s'%base)
+    for q in qualifiers:
+        if not q in EVALUATED_QUALIFIERS:
+            raise ValueError('Can not evaluate parameters with qualifier: %s'%q)
+
+    return base, qualifiers
+
+# ---------------------------------------------------------------------------
+
+def get_parmkind(targetkind):
+    """
+    Return the code of a parameter kind, as stored in the HTK files.
+
+    @param targetkind (str) a parameter kind, like "MFCC_0_D_N_Z"
+    @return (int)
+
+    """
+    base, qualifiers = split_targetkind(targetkind)
+    code = HTK_BASE_KINDS[base]
+    for q in qualifiers:
+        code |= HTK_QUALIFIERS[q]
+
+    return code
+
+# ---------------------------------------------------------------------------
+
+def write_htk(filename, vectors, sampperiod, parmkind):
+    """
+    Write vectors of parameters into an HTK file, without compression.
+
+    @param filename (str) the file name of the .mfc file
+    @param vectors (float[][]) the vectors of parameters, one per frame
+    @param sampperiod (int) the period of the frames, in 100ns units
+    @param parmkind (int or str) the parameter kind
+
+    """
+    if not isinstance(parmkind, int):
+        parmkind = get_parmkind(parmkind)
+    vecsize = 0
+    if len(vectors) > 0:
+        vecsize = len(vectors[0])
+
+    data = array.array('f')
+    for v in vectors:
+        data.extend(v)
+    if sys.byteorder == "little":
+        data.byteswap()
+
+    with open(filename, "wb") as fp:
+        fp.write( struct.pack(">iihh", len(vectors), int(sampperiod), vecsize*4, parmkind) )
+        fp.write( data.tostring() )
+
+# ---------------------------------------------------------------------------
+
+def read_htk(filename):
+    """
+    Read an HTK file of parameters, without compression.
+
+    @param filename (str) the file name of the .mfc file
+    @return a tuple (vectors, sampperiod, parmkind)
+
+    """
+    with open(filename, "rb") as fp:
+        nsamples, sampperiod, sampsize, parmkind = struct.unpack(">iihh", fp.read(12))
+        if parmkind & HTK_QUALIFIERS["_C"]:
+            raise IOError('Compressed HTK files are not supported: %s'%filename)
+        data = array.array('f')
+        data.fromstring( fp.read(nsamples*sampsize) )
+
+    if sys.byteorder == "little":
+        data.byteswap()
+    vecsize = max(1, sampsize // 4)
+    vectors = [ data[i:i+vecsize].tolist() for i in xrange(0, len(data), vecsize) ]
+
+    return vectors, sampperiod, parmkind
+
+# ---------------------------------------------------------------------------
+
+def _evaluate_file(args):
+    """
+    Create the HTK file of parameters of an audio file, in a process of a pool.
+
+    @param args (tuple) features, audio file name, mfc file name
+    @return (bool)
+
+    """
+    features, wavfile, mfcfile = args
+    try:
+        ChannelMFCC.from_file(wavfile, features).write_htk(mfcfile, features)
+    except Exception:
+        return False
+    return True
+
+# ---------------------------------------------------------------------------
+
+def evaluate_files(features, filelist, jobs=1):
+    """
+    Create the HTK files of parameters of a list of audio files.
+
+    The files are distributed over a pool of processes if jobs is greater
+    than 1. The parameters are evaluated with the wav config of the features
+    (see ChannelMFCC.evaluate for the supported parameter kinds); the result
+    was not compared to the one of HCopy.
+
+    @param features (Features) the configuration of the parameters
+    @param filelist (list) a list of tuples (audio file name, mfc file name)
+    @param jobs (int) number of processes, 0 for the number of CPUs
+    @return a list of bool, the success of each file
+
+    """
+    if jobs == 0:
+        jobs = multiprocessing.cpu_count()
+    tasks = [ (features, wavfile, mfcfile) for wavfile, mfcfile in filelist ]
+
+    if jobs < 2 or len(tasks) < 2:
+        return [ _evaluate_file(task) for task in tasks ]
+
+    pool = multiprocessing.Pool(processes=min(jobs, len(tasks)))
+    try:
+        results = pool.map(_evaluate_file, tasks)
+        pool.close()
+    except Exception:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+    return results
+
 # ---------------------------------------------------------------------------
 
 class ChannelMFCC( object ):
@@ -63,18 +257,47 @@ class ChannelMFCC( object ):
         4. Take the discrete cosine transform of the list of mel log powers, as if it were a signal.
         5. The MFCCs are the amplitudes of the resulting spectrum.
 
+    The steps of the evaluation are the ones of the HTK HParm module:
+    pre-emphasis, Hamming window, magnitude filterbank, liftering and
+    regression coefficients. The log energy (_E) is not evaluated.
+
     """
     def __init__(self, channel=None):
         """
         Constructor.
 
-        @param channel (Channel) The channel to work on. Currently not used...!!!
+        @param channel (Channel) The channel to work on.
 
         """
         self.channel = channel
 
     # ----------------------------------------------------------------------
 
+    @staticmethod
+    def from_file(filename, features):
+        """
+        Return a ChannelMFCC of the first channel of an audio file, converted
+        to the framerate and sampwidth of the features.
+
+        @param filename (str) an audio file name
+        @param features (Features) the configuration of the parameters
+
+        """
+        import audiodata.aio
+        from audiodata.channelformatter import ChannelFormatter
+
+        audio = audiodata.aio.open(filename)
+        audio.extract_channel(0)
+        formatter = ChannelFormatter(audio.get_channel(0))
+        audio.close()
+        formatter.set_framerate(features.framerate)
+        formatter.set_sampwidth(features.sampwidth)
+        formatter.convert()
+
+        return ChannelMFCC(formatter.get_channel())
+
+    # ----------------------------------------------------------------------
+
     def hcopy(self, wavconfigfile, scpfile):
         """
         Create MFCC files from features described in the config file.
@@ -97,11 +320,231 @@ class ChannelMFCC( object ):
 
     # ----------------------------------------------------------------------
 
-    def evaluate(self, features):
+    def evaluate(self, features, targetkind=None):
         """
         Evaluate MFCC of the given channel.
 
+        @param features (Features) the configuration of the parameters
+        @param targetkind (str) the parameter kind to evaluate. Default is the
+        one of the wav config of the features (targetkindw).
+        @return a list of vectors, one per frame
+        @raise ValueError if the parameter kind can not be evaluated
+
+        """
+        if targetkind is None:
+            targetkind = features.targetkindw
+        base, qualifiers = check_targetkind(targetkind)
+
+        sampperiod = 1.0E7 / self.channel.get_framerate()
+        winsize  = int(features.win_length_ms*10000 / sampperiod)
+        winshift = int(features.win_shift_ms*10000 / sampperiod)
+        fftsize = 2
+        while fftsize < winsize:
+            fftsize *= 2
+
+        samples = audioutils.frames2samples(self.channel.frames, self.channel.get_sampwidth())
+        nframes = 0
+        if len(samples) >= winsize:
+            nframes = (len(samples) - winsize) // winshift + 1
+
+        hamming = [ 0.54 - 0.46*math.cos(2.*math.pi*i/(winsize-1)) for i in xrange(winsize) ]
+        fft = _RealFFT(fftsize)
+        melbank = _MelBank(features.num_chans, fftsize, sampperiod)
+
+        statics = []
+        for f in xrange(nframes):
+            frame = [ float(s) for s in samples[f*winshift:f*winshift+winsize] ]
+
+            # pre-emphasis then Hamming window
+            k = features.pre_em_coef
+            if k > 0.:
+                frame = [ frame[0]*(1.-k) ] + [ frame[i]-k*frame[i-1] for i in xrange(1,winsize) ]
+            frame = [ s*w for s,w in zip(frame,hamming) ]
+
+            fbank = melbank.apply( fft.magnitudes(frame) )
+            if base == "MELSPEC":
+                vector = fbank
+            else:
+                fbank = [ math.log(max(v, MEL_FLOOR)) for v in fbank ]
+                if base == "FBANK":
+                    vector = fbank
+                else:
+                    vector = self._cepstra(fbank, features.num_ceps, features.num_lift_ceps)
+                    if "_0" in qualifiers:
+                        vector.append( math.sqrt(2./len(fbank)) * sum(fbank) )
+            statics.append( vector )
+
+        # Cepstral mean subtraction
+        if "_Z" in qualifiers and nframes > 0:
+            for i in xrange(len(statics[0])):
+                mean = sum( v[i] for v in statics ) / nframes
+                for v in statics:
+                    v[i] -= mean
+
+        vectors = statics
+        if "_D" in qualifiers or "_A" in qualifiers:
+            deltas = self._regression(statics, 2)
+            vectors = [ s+d for s,d in zip(statics, deltas) ]
+            if "_A" in qualifiers:
+                accs = self._regression(deltas, 2)
+                vectors = [ v+a for v,a in zip(vectors, accs) ]
+
+        # Suppress the absolute C0
+        if "_N" in qualifiers and "_0" in qualifiers:
+            idx = len(statics[0])-1 if nframes > 0 else 0
+            vectors = [ v[:idx]+v[idx+1:] for v in vectors ]
+
+        return vectors
+
+    # ----------------------------------------------------------------------
+
+    def write_htk(self, filename, features, targetkind=None):
         """
-        raise NotImplementedError
+        Evaluate MFCC of the given channel and write them into an HTK file.
+
+        @param filename (str) the file name of the .mfc file
+        @param features (Features) the configuration of the parameters
+        @param targetkind (str) the parameter kind to evaluate. Default is the
+        one of the wav config of the features (targetkindw).
+        @return a list of vectors, one per frame
+
+        """
+        if targetkind is None:
+            targetkind = features.targetkindw
+        vectors = self.evaluate(features, targetkind)
+        write_htk(filename, vectors, features.win_shift_ms*10000, targetkind)
+
+        return vectors
 
     # ----------------------------------------------------------------------
+    # Private
+    # ----------------------------------------------------------------------
+
+    def _cepstra(self, fbank, numceps, ceplifter):
+        """
+        Return the liftered cepstral coefficients of a log filterbank.
+
+        """
+        numchans = len(fbank)
+        mfnorm = math.sqrt(2./numchans)
+        factor = math.pi / numchans
+        cepstra = []
+        for j in xrange(1, numceps+1):
+            c = mfnorm * sum( v*math.cos(j*(k+0.5)*factor) for k,v in enumerate(fbank) )
+            if ceplifter > 0:
+                c *= 1. + ceplifter/2. * math.sin(math.pi*j/ceplifter)
+            cepstra.append(c)
+
+        return cepstra
+
+    # ----------------------------------------------------------------------
+
+    def _regression(self, vectors, window):
+        """
+        Return the regression coefficients of vectors.
+        The first and the last vectors are replicated at the edges.
+
+        """
+        n = len(vectors)
+        if n == 0:
+            return []
+        norm = 2. * sum( t*t for t in xrange(1, window+1) )
+        deltas = []
+        for i in xrange(n):
+            d = [0.] * len(vectors[0])
+            for t in xrange(1, window+1):
+                after  = vectors[min(i+t, n-1)]
+                before = vectors[max(i-t, 0)]
+                d = [ x + t*(a-b) for x,a,b in zip(d,after,before) ]
+            deltas.append( [ x/norm for x in d ] )
+
+        return deltas
+
+# ---------------------------------------------------------------------------
+
+class _RealFFT( object ):
+    """
+    Magnitudes of the Fourier transform of a real signal, evaluated with a
+    complex radix-2 FFT of half the size.
+
+    """
+    def __init__(self, size):
+        self.size = size
+        half = size // 2
+        bits = half.bit_length() - 1
+        self._reverse = [ int(bin(i)[2:].zfill(bits)[::-1], 2) if bits > 0 else 0 for i in xrange(half) ]
+        self._twiddles = [ cmath.exp(-2j*math.pi*k/half) for k in xrange(half) ]
+        self._split = [ cmath.exp(-2j*math.pi*k/size) for k in xrange(half) ]
+
+    def magnitudes(self, frame):
+        """
+        Return the magnitudes of the bins 1 to size/2-1 of a frame,
+        zero-padded to the size of the FFT.
+
+        """
+        half = self.size // 2
+        frame = frame + [0.]*(self.size - len(frame))
+        z = [ complex(frame[2*i], frame[2*i+1]) for i in self._reverse ]
+
+        step = 2
+        while step <= half:
+            h = step // 2
+            tw = self._twiddles[::half//step]
+            for start in xrange(0, half, step):
+                for j in xrange(h):
+                    u = z[start+j]
+                    v = z[start+j+h] * tw[j]
+                    z[start+j]   = u + v
+                    z[start+j+h] = u - v
+            step *= 2
+
+        mags = []
+        for k in xrange(1, half):
+            a = z[k]
+            b = z[half-k].conjugate()
+            x = 0.5*(a+b) - 0.5j*self._split[k]*(a-b)
+            mags.append( abs(x) )
+
+        return mags
+
+# ---------------------------------------------------------------------------
+
+class _MelBank( object ):
+    """
+    Triangular filters on a mel scale, as defined by the HTK HSigP module.
+
+    """
+    def __init__(self, numchans, fftsize, sampperiod):
+        self.numchans = numchans
+        half = fftsize // 2
+        fres = 1.0E7 / (sampperiod * fftsize * 700.)
+        mel = lambda k: 1127. * math.log(1. + k*fres)
+
+        # centers of the filters, in mel
+        mhi = mel(half)
+        centers = [ 0. ] + [ float(c)/(numchans+1)*mhi for c in xrange(1, numchans+1) ] + [ mhi ]
+
+        # for each bin 1..half-1, the lower filter and its weight
+        self._lochan = []
+        self._lowt   = []
+        chan = 1
+        for k in xrange(1, half):
+            melk = mel(k)
+            while chan <= numchans+1 and centers[chan] < melk:
+                chan += 1
+            lo = chan - 1
+            self._lochan.append(lo)
+            self._lowt.append( (centers[lo+1]-melk) / (centers[lo+1]-centers[lo]) )
+
+    def apply(self, magnitudes):
+        """
+        Return the values of the filters for the magnitudes of the bins.
+
+        """
+        fbank = [0.] * (self.numchans+2)
+        for lo,wt,ek in zip(self._lochan, self._lowt, magnitudes):
+            t = wt*ek
+            fbank[lo] += t
+            fbank[lo+1] += ek - t
+
+        return fbank[1:self.numchans+1]
@@ -63,6 +63,10 @@ class ChannelSilence( object ):
         self.volstats   = ChannelVolume( channel, winlenght )
         self.__silences = []
 
+        # Volumes around the refined positions, and silences of each threshold
+        self.__refined  = {}
+        self.__searched = {}
+
     # ------------------------------------------------------------------
 
     def get_channel(self):
@@ -196,11 +200,14 @@ class ChannelSilence( object ):
 
         """
         delta = int(self.volstats.get_winlen() * self.channel.get_framerate())
-        from_pos = max(pos-delta,0)
-        self.channel.seek( from_pos )
-        frames = self.channel.get_frames( delta*2 )
-        c = Channel( self.channel.get_framerate(), self.channel.get_sampwidth(), frames )
-        volstats = ChannelVolume( c, winlenght )
+        from_pos = min(max(pos-delta,0), self.channel.get_nframes())
+
+        if not (from_pos,winlenght) in self.__refined:
+            sampwidth = self.channel.get_sampwidth()
+            frames = self.channel.frames[from_pos*sampwidth:(from_pos+delta*2)*sampwidth]
+            c = Channel( self.channel.get_framerate(), sampwidth, frames )
+            self.__refined[(from_pos,winlenght)] = c.get_volumes( winlenght )
+        volstats = self.__refined[(from_pos,winlenght)]
 
         if direction==1:
             for i,v in enumerate(volstats):
@@ -294,6 +301,11 @@ class ChannelSilence( object ):
         if threshold == 0:
             threshold = self.search_threshold_vol()
 
+        # The volumes were already scanned with this threshold
+        if (threshold,mintrackdur) in self.__searched:
+            self.__silences = list( self.__searched[(threshold,mintrackdur)] )
+            return threshold
+
         # This scans the volumes whether it is lower than threshold,
         # if it is it is written to silence.
         self.__silences = []
@@ -334,6 +346,7 @@ class ChannelSilence( object ):
             end_pos   = self.channel.get_nframes()
             self.__silences.append((start_pos,end_pos))
 
+        self.__searched[(threshold,mintrackdur)] = list( self.__silences )
         return threshold
 
     # ------------------------------------------------------------------
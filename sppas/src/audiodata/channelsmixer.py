@@ -35,7 +35,7 @@
 # File: channelsmixer.py
 # ---------------------------------------------------------------------------
 
-import struct
+from itertools import izip
 
 from audiodata.channel       import Channel
 from audiodata.channelframes import ChannelFrames
@@ -45,6 +45,11 @@ import audiodata.audioutils as audioutils
 
 # ---------------------------------------------------------------------------
 
+# Number of frames of each channel mixed at a time.
+MIX_BLOCK_SIZE = 65536
+
+# ---------------------------------------------------------------------------
+
 class ChannelsMixer( object ):
     """
     @authors:      Brigitte Bigi
@@ -62,6 +67,7 @@ class ChannelsMixer( object ):
         """
         self.channels = []
         self.factors  = []
+        self._peak    = None
 
     # -----------------------------------------------------------------------
 
@@ -87,6 +93,7 @@ class ChannelsMixer( object ):
         """
         self.channels.append(channel)
         self.factors.append(factor)
+        self._peak = None
 
     # -----------------------------------------------------------------------
 
@@ -112,38 +119,46 @@ class ChannelsMixer( object ):
 
     # -----------------------------------------------------------------------
 
-    def _sampleCalculator(self, channels, pos, sampwidth, factors, attenuator):
+    def _iter_blocks(self, attenuator=1):
         """
-        Return the sample value, applying a factor and an attenuator.
+        Return an iterator on the mixed samples, block by block.
+
+        Each block of frames of the channels is unpacked into a typed array,
+        then the samples of all channels are summed, with the application of
+        the factors and of the attenuator. Values are not clipped.
 
-        @param channels (Channel[]) the list of channels
-        @param pos (int) the position of the sample to calculate
-        @param sampwidth (int) the sample width
-        @param factors (float[]) the list of factors to apply to each sample of a channel (1 channel = 1 factor)
         @param attenuator (float) a factor to apply to each sum of samples
-        @return the value of the sample calculated (float)
+        @return a list of float values for each block of MIX_BLOCK_SIZE frames
 
         """
-        # variables to compare the value of the result sample to avoid clipping
-        minval = audioutils.get_minval(sampwidth)
-        maxval = audioutils.get_maxval(sampwidth)
+        sampwidth = self.channels[0].get_sampwidth()
+        blocksize = MIX_BLOCK_SIZE * sampwidth
+
+        for start in xrange(0, len(self.channels[0].frames), blocksize):
+            sums = None
+            for factor,channel in zip(self.factors,self.channels):
+                samples = audioutils.frames2samples(channel.frames[start:start+blocksize], sampwidth)
+                if sums is None:
+                    sums = [s*factor*attenuator for s in samples]
+                else:
+                    sums = [v + s*factor*attenuator for v,s in izip(sums, samples)]
+            yield sums
+
+    # -----------------------------------------------------------------------
 
-        # the result sample is the sum of each sample with the application of the factors
-        sampsum = 0
-        for factor,channel in zip(factors,channels):
-            data = channel.frames[pos:pos+sampwidth]
-            data = audioutils.unpack_data(data, sampwidth)
-            # without a cast, sum is a float!
-            sampsum += data[0]*factor*attenuator
+    def _clip(self, sums, sampwidth):
+        """
+        Truncate the values if there is clipping.
 
-        # truncate the values if there is clipping
-        if sampsum < 0:
-            return max(sampsum,minval)
+        @param sums (float[]) the values of the samples
+        @param sampwidth (int) the sample width
+        @return the list of values as int
 
-        elif sampsum > 0:
-            return min(sampsum,maxval)
+        """
+        minval = audioutils.get_minval(sampwidth)
+        maxval = audioutils.get_maxval(sampwidth)
 
-        return 0
+        return [int(minval if v < minval else maxval if v > maxval else v) for v in sums]
 
     # -----------------------------------------------------------------------
 
@@ -151,6 +166,9 @@ class ChannelsMixer( object ):
         """
         Mix the channels of the list in one.
 
+        The maximum absolute value of the mix is estimated in the same pass:
+        if the attenuator is 1, get_max() does not have to read the channels.
+
         @param attenuator (float) the factor to apply to each sample calculated
         @return the result Channel
 
@@ -161,18 +179,17 @@ class ChannelsMixer( object ):
         sampwidth = self.channels[0].get_sampwidth()
         framerate = self.channels[0].get_framerate()
 
-        frames = ""
-        if sampwidth == 4:
-            for s in xrange(0, len(self.channels[0].frames), sampwidth):
-                frames += struct.pack("<l", long(self._sampleCalculator(self.channels, s, sampwidth, self.factors, attenuator)))
-        elif sampwidth == 2:
-            for s in xrange(0, len(self.channels[0].frames), sampwidth):
-                frames += struct.pack("<h", int(self._sampleCalculator(self.channels, s, sampwidth, self.factors, attenuator)))
-        else:
-            for s in xrange(0, len(self.channels[0].frames), sampwidth):
-                frames += struct.pack("<b", int(self._sampleCalculator(self.channels, s, sampwidth, self.factors, attenuator)))
+        blocks = []
+        peak = 0
+        for sums in self._iter_blocks(attenuator):
+            if len(sums) > 0:
+                peak = max(peak, max(sums), -min(sums))
+            blocks.append( audioutils.samples2block(self._clip(sums, sampwidth), sampwidth) )
+
+        if attenuator == 1:
+            self._peak = peak
 
-        return Channel(framerate, sampwidth, str(frames))
+        return Channel(framerate, sampwidth, "".join(blocks))
 
     # -----------------------------------------------------------------------
 
@@ -189,16 +206,38 @@ class ChannelsMixer( object ):
         sampwidth = self.channels[0].get_sampwidth()
         minval = 0
         maxval = 0
-        sampsum = 0
-        for s in xrange(0, len(self.channels[0].frames), sampwidth):
-            sampsum = long(self._sampleCalculator(self.channels, s, sampwidth, self.factors, 1))
-            maxval = max(sampsum, maxval)
-            minval = min(sampsum, minval)
+        for sums in self._iter_blocks():
+            if len(sums) > 0:
+                samples = self._clip(sums, sampwidth)
+                maxval = max(long(max(samples)), maxval)
+                minval = min(long(min(samples)), minval)
 
         return (minval, maxval)
 
     # -----------------------------------------------------------------------
 
+    def get_max(self):
+        """
+        Return the maximum absolute value of the mixed samples, before clipping.
+        It is used to estimate the attenuator to apply to avoid clipping.
+
+        @return the max value (float)
+
+        """
+        if self._peak is None:
+            # ensuring conformity
+            self.check_channels()
+
+            peak = 0
+            for sums in self._iter_blocks():
+                if len(sums) > 0:
+                    peak = max(peak, max(sums), -min(sums))
+            self._peak = peak
+
+        return self._peak
+
+    # -----------------------------------------------------------------------
+
     def norm_length(self):
         """
         Normalize the number of frames of all the channels by appending silence at the end.
@@ -213,5 +252,6 @@ class ChannelsMixer( object ):
                 fragment = ChannelFrames(self.channels[i].frames)
                 fragment.append_silence(nframes - self.channels[i].get_nframes())
                 self.channels[i] = Channel(self.channels[i].get_framerate(), self.channels[i].get_sampwidth(), fragment.get_frames())
+        self._peak = None
 
     # -----------------------------------------------------------------------
@@ -35,7 +35,6 @@
 # File: channelvolume.py
 # ----------------------------------------------------------------------------
 
-from audiodata.audioframes import AudioFrames
 from basevolume import BaseVolume
 
 # ----------------------------------------------------------------------------
@@ -63,27 +62,8 @@ class ChannelVolume( BaseVolume ):
         BaseVolume.__init__(self)
         self.winlen = winlen
 
-        # Remember current position
-        pos = channel.tell()
-
-        # Rewind to the beginning
-        channel.rewind()
-
-        # Constants
-        nbframes = int(winlen * channel.get_framerate())
-        nbvols = int(channel.get_duration()/winlen) + 1
-        self.volumes = [0]*nbvols
-
-        for i in range(nbvols):
-            frames = channel.get_frames( nbframes )
-            a = AudioFrames( frames, channel.get_sampwidth(), 1)
-            self.volumes[i] = a.rms()
-
-        if self.volumes[-1] == 0:
-            self.volumes.pop()
-
-        # Returns to the position where we was before
-        channel.seek(pos)
+        # The channel estimates the volumes in one pass, then keep them
+        self.volumes = list( channel.get_volumes(winlen) )
 
         self.rms = channel.rms()
 
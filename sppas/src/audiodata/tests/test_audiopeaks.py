@@ -0,0 +1,90 @@
+#!/usr/bin/env python2
+# -*- coding: utf8 -*-
+
+import unittest
+import os
+import random
+import struct
+import shutil
+
+import audiodata.aio
+from audiodata.audio import AudioPCM
+from audiodata.channel import Channel
+from audiodata.audiopeaks import AudioPeaks
+from utils.fileutils import gen_name
+
+# ---------------------------------------------------------------------------
+
+
+class TestAudioPeaks(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(3)
+        self.tmpdir = gen_name()
+        os.mkdir(self.tmpdir)
+        self.samples = []
+        audio = AudioPCM()
+        for c in range(2):
+            samples = [ random.randint(-30000, 30000) for i in range(10000) ]
+            self.samples.append(samples)
+            audio.append_channel( Channel(16000, 2, struct.pack("<%dh"%len(samples), *samples)) )
+        self.wav = os.path.join(self.tmpdir, "noise.wav")
+        audiodata.aio.save(self.wav, audio)
+        self.audio = audiodata.aio.open(self.wav)
+
+    def tearDown(self):
+        self.audio.close()
+        shutil.rmtree(self.tmpdir)
+
+    def __expected(self, samples, bucket):
+        return [ (min(samples[i:i+bucket]), max(samples[i:i+bucket])) for i in range(0, len(samples), bucket) ]
+
+    def test_build(self):
+        peaks = AudioPeaks((10, 100, 1000))
+        self.audio.seek(20)
+        peaks.build(self.audio)
+        self.assertEqual(self.audio.tell(), 20)
+        self.assertEqual(len(peaks.levels), 3)
+        for l,bucket in enumerate((10, 100, 1000)):
+            for c in range(2):
+                mins, maxs = peaks.levels[l][c]
+                self.assertEqual(zip(mins, maxs), self.__expected(self.samples[c], bucket))
+
+        with self.assertRaises(ValueError):
+            AudioPeaks((10, 15))
+
+    def test_get_peaks(self):
+        peaks = AudioPeaks((10, 100, 1000))
+        peaks.build(self.audio)
+
+        # the coarsest level with enough buckets
+        data = peaks.get_peaks(0, 10000, 10)
+        self.assertEqual(len(data), 2)
+        self.assertEqual(len(data[0]), 20)
+        data = peaks.get_peaks(0, 10000, 11)
+        self.assertEqual(len(data[0]), 200)
+        data = peaks.get_peaks(150, 450, 20)
+        expected = self.__expected(self.samples[1][150:450], 10)
+        self.assertEqual(data[1], [ v for pair in expected for v in pair ])
+
+        # not enough buckets: samples have to be read
+        self.assertIsNone(peaks.get_peaks(0, 100, 20))
+
+    def test_cache(self):
+        filename = AudioPeaks.get_filename(self.wav)
+        self.assertEqual(filename, self.wav + ".peaks")
+        peaks = AudioPeaks()
+        peaks.load_or_build(self.audio, self.wav)
+        self.assertTrue(os.path.exists(filename))
+
+        loaded = AudioPeaks()
+        self.assertTrue(loaded.load(filename, self.audio))
+        self.assertEqual(loaded.levels, peaks.levels)
+        self.assertEqual(loaded.nframes, 10000)
+
+        # the cache does not match another bucket sizes or another audio
+        self.assertFalse(AudioPeaks((10, 100)).load(filename, self.audio))
+        audio = AudioPCM()
+        audio.append_channel( Channel(16000, 2, "\x00\x00"*10) )
+        self.assertFalse(AudioPeaks().load(filename, audio))
+        self.assertFalse(AudioPeaks().load(os.path.join(self.tmpdir, "nofile"), self.audio))
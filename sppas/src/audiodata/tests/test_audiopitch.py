@@ -0,0 +1,98 @@
+#!/usr/bin/env python2
+# -*- coding: utf8 -*-
+
+import unittest
+import os
+import math
+import struct
+import shutil
+
+import audiodata.aio
+import audiodata.audiopitch
+from audiodata.audio import AudioPCM
+from audiodata.channel import Channel
+from audiodata.audiopitch import WavePitch
+from annotationdata.aio import read as read_trs
+from utils.fileutils import gen_name
+from sp_glob import SAMPLES_PATH
+
+# ---------------------------------------------------------------------------
+
+sample_1 = os.path.join(SAMPLES_PATH, "samples-eng", "ENG_M15_ENG_T02.wav")  # mono; 48000Hz; 16bits
+pitch_1 = os.path.join(SAMPLES_PATH, "samples-eng", "ENG_M15_ENG_T02.PitchTier")
+
+# ---------------------------------------------------------------------------
+
+
+class TestWavePitch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = gen_name()
+        os.mkdir(self.tmpdir)
+        # 0.5 seconds of silence then 1 second of a 200Hz signal then 0.5 seconds of silence
+        samples = [0]*8000
+        samples += [ int(6000*math.sin(2*math.pi*200*t/16000.) + 3000*math.sin(2*math.pi*400*t/16000.)) for t in range(16000) ]
+        samples += [0]*8000
+        self.wav = os.path.join(self.tmpdir, "sine.wav")
+        audio = AudioPCM()
+        audio.append_channel( Channel(16000, 2, struct.pack("<%dh"%len(samples), *samples)) )
+        audiodata.aio.save(self.wav, audio)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_eval_pitch(self):
+        wp = WavePitch()
+        pitch = wp.eval_pitch(self.wav)
+        self.assertEqual(pitch, wp.get_pitch_list())
+        self.assertEqual(wp.get_size(), 201)
+        for i in range(201):
+            if 55 <= i <= 145:
+                self.assertAlmostEqual(pitch[i], 200., delta=1.)
+            elif i < 45 or i > 155:
+                self.assertEqual(pitch[i], 0.)
+
+        pitch = WavePitch().eval_pitch(self.wav, delta=0.02)
+        self.assertEqual(len(pitch), 101)
+        self.assertAlmostEqual(pitch[50], 200., delta=1.)
+
+    def test_chunks(self):
+        pitch = WavePitch().eval_pitch(self.wav)
+        chunksize = audiodata.audiopitch.PITCH_CHUNK_SIZE
+        try:
+            for size in (1000, 333):
+                audiodata.audiopitch.PITCH_CHUNK_SIZE = size
+                self.assertEqual(WavePitch().eval_pitch(self.wav), pitch)
+        finally:
+            audiodata.audiopitch.PITCH_CHUNK_SIZE = chunksize
+
+    def test_silence(self):
+        # a weak 200Hz signal (1% of the peak) then a loud one: the weak
+        # one is silent, even if it is read before the peak.
+        samples  = [ int(60*math.sin(2*math.pi*200*t/16000.)) for t in range(16000) ]
+        samples += [ int(6000*math.sin(2*math.pi*200*t/16000.)) for t in range(16000) ]
+        wav = os.path.join(self.tmpdir, "weak.wav")
+        audio = AudioPCM()
+        audio.append_channel( Channel(16000, 2, struct.pack("<%dh"%len(samples), *samples)) )
+        audiodata.aio.save(wav, audio)
+
+        chunksize = audiodata.audiopitch.PITCH_CHUNK_SIZE
+        try:
+            for size in (chunksize, 1000):
+                audiodata.audiopitch.PITCH_CHUNK_SIZE = size
+                pitch = WavePitch().eval_pitch(wav)
+                self.assertEqual(pitch[10:90], [0.]*80)
+                for p in pitch[110:190]:
+                    self.assertAlmostEqual(p, 200., delta=1.)
+        finally:
+            audiodata.audiopitch.PITCH_CHUNK_SIZE = chunksize
+
+    def test_reference(self):
+        pitch = WavePitch().eval_pitch(sample_1)
+        # values of the reference are shifted of one delta
+        reference = read_trs(pitch_1).get_pitch_list()[:-1]
+        pitch = pitch[1:len(reference)+1]
+        voiced = [ (p,r) for p,r in zip(pitch, reference) if p > 0 and r > 0 ]
+        close = [ (p,r) for p,r in voiced if abs(p-r) < 0.05*r ]
+        self.assertGreater(len(voiced), len([r for r in reference if r > 0])*0.6)
+        self.assertGreater(len(close), len(voiced)*0.9)
@@ -3,9 +3,13 @@
 
 import unittest
 import os
+import struct
 
 import audiodata.aio
 from audiodata.audioutils import samples2frames
+from audiodata.audioutils import frames2samples
+from audiodata.audioutils import samples2block
+from audiodata.audioutils import deinterleave
 
 from sp_glob import SAMPLES_PATH
 sample_1 = os.path.join(SAMPLES_PATH, "samples-eng", "oriana1.wav")
@@ -35,3 +39,29 @@ class TestAudioUtils(unittest.TestCase):
         self.assertItemsEqual(self._sample_2.read_frames(100), s2)
         self.assertItemsEqual(self._sample_3.read_frames(100), s3)
 
+    def test_Frames2Samples(self):
+        frames = "".join( chr(i) for i in range(256) )
+        self.assertEqual( frames2samples(frames, 1).tolist(), [ s-128 for s in range(256) ] )
+        self.assertEqual( frames2samples(frames, 2).tolist(), list(struct.unpack("<128h", frames)) )
+        self.assertEqual( frames2samples(frames, 4).tolist(), list(struct.unpack("<64l", frames)) )
+        with self.assertRaises(ValueError):
+            frames2samples(frames, 3)
+
+    def test_Samples2Block(self):
+        frames = "".join( chr(i) for i in range(256) )
+        for sampwidth in (1, 2, 4):
+            samples = frames2samples(frames, sampwidth)
+            self.assertEqual( samples2block(samples, sampwidth), frames )
+            self.assertEqual( samples2block(samples.tolist(), sampwidth), frames )
+        with self.assertRaises(ValueError):
+            samples2block([0], 3)
+
+    def test_Deinterleave(self):
+        frames = "".join( chr(i%256) for i in range(1200) )
+        for sw in (1, 2, 3, 4):
+            for nc in (1, 2, 3):
+                for index in range(nc):
+                    expected = ""
+                    for i in xrange(index*sw, len(frames), nc*sw):
+                        expected += frames[i:i+sw]
+                    self.assertEqual( deinterleave(frames, sw, nc, index), expected )
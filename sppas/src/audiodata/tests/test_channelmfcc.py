@@ -0,0 +1,130 @@
+#!/usr/bin/env python2
+# -*- coding: utf8 -*-
+
+import unittest
+import os
+import math
+import cmath
+import random
+import struct
+import shutil
+
+from audiodata.channel import Channel
+from audiodata.channelmfcc import ChannelMFCC, _RealFFT
+from audiodata.channelmfcc import get_parmkind, write_htk, read_htk, evaluate_files
+from resources.acm.features import Features
+from utils.fileutils import gen_name
+from utils.type import test_command
+from sp_glob import SAMPLES_PATH
+
+# ---------------------------------------------------------------------------
+
+sample_1 = os.path.join(SAMPLES_PATH, "samples-eng", "oriana1.wav")  # mono; 16000Hz; 16bits
+
+# ---------------------------------------------------------------------------
+
+
+class TestChannelMFCC(unittest.TestCase):
+
+    def setUp(self):
+        samples = [ int(8000*math.sin(2*math.pi*1000*t/16000.)) for t in range(16000) ]
+        self.channel = Channel(16000, 2, struct.pack("<%dh"%len(samples), *samples))
+        self.features = Features()
+        self.tmpdir = gen_name()
+        os.mkdir(self.tmpdir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_fft(self):
+        frame = [ random.uniform(-1., 1.) for i in range(400) ]
+        padded = frame + [0.]*112
+        expected = [ abs(sum( x*cmath.exp(-2j*math.pi*k*t/512) for t,x in enumerate(padded) )) for k in range(1,256) ]
+        for a,b in zip(_RealFFT(512).magnitudes(frame), expected):
+            self.assertAlmostEqual(a, b)
+
+    def test_parmkind(self):
+        self.assertEqual(get_parmkind("MFCC"), 6)
+        self.assertEqual(get_parmkind("MFCC_0_D"), 6 | 0o20000 | 0o400)
+        self.assertEqual(get_parmkind("MFCC_E_D_A_Z"), 6 | 0o100 | 0o400 | 0o1000 | 0o4000)
+        with self.assertRaises(ValueError):
+            get_parmkind("MFCC_X")
+        with self.assertRaises(ValueError):
+            get_parmkind("FOO_D")
+
+    def test_evaluate(self):
+        mfcc = ChannelMFCC(self.channel)
+        # (16000 - 400) / 160 + 1 frames
+        vectors = mfcc.evaluate(self.features)
+        self.assertEqual(len(vectors), 98)
+        self.assertEqual(len(vectors[0]), 26)
+        self.assertEqual(len(mfcc.evaluate(self.features, "MFCC_0_D_N_Z")[0]), self.features.nbmv)
+        self.assertEqual(len(mfcc.evaluate(self.features, "MFCC_0_D_A_Z")[0]), 39)
+
+        # a constant signal has null deltas and, if mean is subtracted, null cepstra
+        for v in mfcc.evaluate(self.features, "MFCC_0_D_Z")[10:-10]:
+            for c in v:
+                self.assertAlmostEqual(c, 0., places=3)
+
+        # the energy of a 1000Hz sine is in the filters centered around 1000 mels
+        fbank = mfcc.evaluate(self.features, "FBANK")[50]
+        self.assertEqual(len(fbank), self.features.num_chans)
+        self.assertIn(fbank.index(max(fbank)), (8, 9))
+
+        with self.assertRaises(ValueError):
+            mfcc.evaluate(self.features, "LPC")
+        # the energy normalisation of HCopy is not reproduced
+        with self.assertRaises(ValueError):
+            mfcc.evaluate(self.features, "MFCC_E_D_A_Z")
+
+    def test_htk(self):
+        mfc = os.path.join(self.tmpdir, "sine.mfc")
+        vectors = ChannelMFCC(self.channel).write_htk(mfc, self.features)
+        self.assertEqual(os.path.getsize(mfc), 12 + 98*26*4)
+        data, sampperiod, parmkind = read_htk(mfc)
+        self.assertEqual(sampperiod, 100000)
+        self.assertEqual(parmkind, get_parmkind("MFCC_0_D"))
+        self.assertEqual(len(data), len(vectors))
+        for v1,v2 in zip(data, vectors):
+            for a,b in zip(v1, v2):
+                self.assertAlmostEqual(a, b, places=3)
+
+        write_htk(mfc, [], 100000, "MFCC")
+        self.assertEqual(read_htk(mfc), ([], 100000, 6))
+
+    def test_evaluate_files(self):
+        filelist = [ (sample_1, os.path.join(self.tmpdir, "oriana%d.mfc"%i)) for i in range(2) ]
+        filelist.append( ("nofile.wav", os.path.join(self.tmpdir, "nofile.mfc")) )
+        self.assertEqual(evaluate_files(self.features, filelist, jobs=2), [True, True, False])
+        data1 = read_htk(filelist[0][1])
+        data2 = read_htk(filelist[1][1])
+        self.assertEqual(data1, data2)
+        self.assertEqual(len(data1[0][0]), 26)
+        self.assertEqual(evaluate_files(self.features, filelist[:1], jobs=1), [True])
+        self.assertEqual(data1, read_htk(filelist[0][1]))
+
+    @unittest.skipIf(test_command("HCopy") is False, "HCopy is not installed")
+    def test_hcopy(self):
+        # the reference is the file created by HCopy with the wav config,
+        # saved without compression (read_htk does not support it)
+        wavconfig = os.path.join(self.tmpdir, "config")
+        self.features.write_wav_config(wavconfig)
+        with open(wavconfig, "r") as fp:
+            config = fp.read().replace("SAVECOMPRESSED = T", "SAVECOMPRESSED = F")
+        with open(wavconfig, "w") as fp:
+            fp.write(config.replace("SAVEWITHCRC = T", "SAVEWITHCRC = F"))
+        scp = os.path.join(self.tmpdir, "hcopy.scp")
+        expected = os.path.join(self.tmpdir, "hcopy.mfc")
+        with open(scp, "w") as fp:
+            fp.write("%s %s\n" % (sample_1, expected))
+        self.assertTrue(ChannelMFCC().hcopy(wavconfig, scp))
+
+        mfc = os.path.join(self.tmpdir, "oriana1.mfc")
+        self.assertEqual(evaluate_files(self.features, [(sample_1, mfc)]), [True])
+        data1, sampperiod1, parmkind1 = read_htk(expected)
+        data2, sampperiod2, parmkind2 = read_htk(mfc)
+        self.assertEqual((sampperiod1, parmkind1), (sampperiod2, parmkind2))
+        self.assertEqual(len(data1), len(data2))
+        for v1,v2 in zip(data1, data2):
+            for a,b in zip(v1, v2):
+                self.assertAlmostEqual(a, b, delta=0.01*max(1., abs(a)))
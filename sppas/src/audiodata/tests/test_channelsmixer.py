@@ -3,8 +3,11 @@
 
 import unittest
 import os.path
+import struct
 
 import audiodata.aio
+import audiodata.channelsmixer
+from audiodata.channel import Channel
 from audiodata.channelformatter import ChannelFormatter
 from audiodata.channelsmixer import ChannelsMixer
 from sp_glob import SAMPLES_PATH
@@ -52,3 +55,27 @@ class TestChannelsMixer(unittest.TestCase):
 
         self.assertEqual(newchannel.get_nframes(), mixer.get_channel(0).get_nframes())
         self.assertEqual(newchannel.get_nframes(), mixer.get_channel(1).get_nframes())
+
+    def test_MixBlocks(self):
+        values1 = [0, 100, -100, 30000, -30000, 20000, 7]
+        values2 = [5, -3, -100, 10000, -10000, -20000, 8]
+        channel1 = Channel(16000, 2, struct.pack("<7h", *values1))
+        channel2 = Channel(16000, 2, struct.pack("<7h", *values2))
+        expected = [2, 98, -150, 32767, -32768, 10000, 11]
+
+        mixer = ChannelsMixer()
+        mixer.append_channel(channel1, 1)
+        mixer.append_channel(channel2, 0.5)
+        self.assertEqual(mixer.get_minmax(), (-32768, 32767))
+        self.assertEqual(mixer.get_max(), 35000.)
+
+        blocksize = audiodata.channelsmixer.MIX_BLOCK_SIZE
+        try:
+            for size in (blocksize, 3, 1):
+                audiodata.channelsmixer.MIX_BLOCK_SIZE = size
+                newchannel = mixer.mix()
+                self.assertEqual(list(struct.unpack("<7h", newchannel.frames)), expected)
+                newchannel = mixer.mix(0.5)
+                self.assertEqual(list(struct.unpack("<7h", newchannel.frames)), [1, 49, -75, 17500, -17500, 5000, 5])
+        finally:
+            audiodata.channelsmixer.MIX_BLOCK_SIZE = blocksize
@@ -6,6 +6,8 @@ import os.path
 
 import audiodata.aio
 from audiodata.channelvolume import ChannelVolume
+from audiodata.channelsilence import ChannelSilence
+from audiodata.audioframes import AudioFrames
 from audiodata.audiovolume import AudioVolume
 from sp_glob import SAMPLES_PATH
 
@@ -34,3 +36,39 @@ class TestVolume(unittest.TestCase):
         self.assertEqual(int(chanvol.mean()), int(audiovol.mean()))
         self.assertEqual(int(chanvol.variance()), int(audiovol.variance()))
         self.assertEqual(int(chanvol.stdev()), int(audiovol.stdev()))
+
+    def test_volumes(self):
+        audio = audiodata.aio.open(sample_1)
+        cidx = audio.extract_channel(0)
+        channel = audio.get_channel(cidx)
+
+        # Same values than one rms estimation for each window
+        nbframes = int(0.02 * channel.get_framerate())
+        volumes = channel.get_volumes(0.02)
+        for i in range(len(volumes)):
+            frames = channel.frames[i*nbframes*2:(i+1)*nbframes*2]
+            self.assertEqual(volumes[i], AudioFrames(frames, 2, 1).rms())
+        self.assertEqual(ChannelVolume(channel, 0.02).volumes, volumes)
+
+        # Values are cached... until the frames are changed
+        self.assertIs(channel.get_volumes(0.02), volumes)
+        channel.set_frames(channel.frames[:nbframes*2*4])
+        self.assertEqual(len(channel.get_volumes(0.02)), 4)
+
+    def test_silences(self):
+        audio = audiodata.aio.open(sample_1)
+        cidx = audio.extract_channel(0)
+        channel = audio.get_channel(cidx)
+
+        chansil = ChannelSilence(channel, 0.02)
+        silences = {}
+        for threshold in (100, 300, 100, 200, 300):
+            chansil.search_silences(threshold)
+            silences.setdefault(threshold, list(chansil))
+            self.assertEqual(list(chansil), silences[threshold])
+            chansil.filter_silences(0.2)
+
+        for threshold in (100, 200, 300):
+            chansil = ChannelSilence(channel, 0.02)
+            chansil.search_silences(threshold)
+            self.assertEqual(list(chansil), silences[threshold])
@@ -62,7 +62,7 @@ import audiodata.aio
 from annotationdata.transcription import Transcription
 from audiodata.audio import AudioPCM
 from audiodata.channelformatter import ChannelFormatter
-from audiodata.channelmfcc import ChannelMFCC
+from audiodata.channelmfcc import ChannelMFCC, evaluate_files, check_targetkind
 
 from resources.dictpron import DictPron
 from resources.vocab import Vocabulary
@@ -415,6 +415,9 @@ class TrainingCorpus(object):
         self.audiofiles = {}  #
         self.mfcfiles   = {}  #
 
+        # Audio files (wav, mfc) of which MFCC are not evaluated yet.
+        self.pendingmfc = []
+
         # The lexicon, the pronunciation dictionary and the phoneset
         self.vocabfile  = None
         self.dictfile   = None
@@ -528,6 +531,8 @@ class TrainingCorpus(object):
                     if ret is True:
                         count = count + 1
 
+        self.create_mfc()
+
         return count
 
     # -----------------------------------------------------------------------
@@ -567,6 +572,47 @@ class TrainingCorpus(object):
     # -----------------------------------------------------------------------
     # -----------------------------------------------------------------------
 
+    def create_mfc(self, jobs=0):
+        """
+        Create the MFCC files of the audio files added since the last call.
+
+        HCopy is called only once, for all the files. If HCopy is not
+        installed, the MFCC are evaluated by SPPAS (see ChannelMFCC.evaluate),
+        and the files are distributed over a pool of processes. SPPAS can't
+        evaluate all the parameter kinds of HCopy (the energy _E is not).
+
+        @param jobs (int) number of processes, 0 for the number of CPUs
+
+        """
+        if len(self.pendingmfc) == 0:
+            return
+
+        features = self.datatrainer.features
+        if test_command("HCopy") is True:
+            scpfile = utils.fileutils.gen_name(root="scp", addtoday=False, addpid=False)
+            with open(scpfile, "w") as fp:
+                for (wav,mfc) in self.pendingmfc:
+                    fp.write('%s %s\n'%(wav,mfc))
+            ret = ChannelMFCC().hcopy(features.wavconfigfile, scpfile)
+            os.remove(scpfile)
+            if ret is False:
+                logging.info('HCopy failed to create the MFCC files.')
+        else:
+            try:
+                check_targetkind(features.targetkindw)
+            except ValueError as e:
+                logging.warning('HCopy is not installed and the MFCC can not be evaluated by SPPAS. %s'%e)
+                results = []
+            else:
+                results = evaluate_files(features, self.pendingmfc, jobs)
+            for (wav,mfc),ret in zip(self.pendingmfc, results):
+                if ret is False:
+                    logging.info('MFCC of %s can not be evaluated.'%wav)
+
+        self.pendingmfc = []
+
+    # -----------------------------------------------------------------------
+
     def get_scp(self, aligned=True, phonetized=False, transcribed=False):
         """
         Fix the scp file by choosing the files to add.
@@ -578,6 +624,8 @@ class TrainingCorpus(object):
         @return filename or None if no data is available.
 
         """
+        self.create_mfc()
+
         files = False
         scpfile = os.path.join(self.datatrainer.workdir, "train.scp")
 
@@ -771,16 +819,10 @@ class TrainingCorpus(object):
         audio_out.append_channel(formatter.channel)
         audiodata.aio.save(os.path.join(self.datatrainer.get_storewav(), outfile + ".wav"), audio_out)
 
-        # Generate MFCC
+        # MFCC are created later, for all the pending files at once
         wav = os.path.join(self.datatrainer.get_storewav(), outfile + ".wav")
         mfc = os.path.join(self.datatrainer.get_storemfc(), outfile + ".mfc")
-        tmpfile = utils.fileutils.gen_name(root="scp", addtoday=False, addpid=False)
-        with open(tmpfile, "w") as fp:
-            fp.write('%s %s\n'%(wav,mfc))
-
-        cmfc = ChannelMFCC(formatter.channel)
-        cmfc.hcopy(self.datatrainer.features.wavconfigfile, tmpfile)
-        os.remove(tmpfile)
+        self.pendingmfc.append( (wav,mfc) )
 
         return True
 
@@ -37,6 +37,7 @@
 import codecs
 import logging
 import rutils
+import mmapdict
 
 from sp_glob import UNKSTAMP
 
@@ -88,8 +89,8 @@ class DictPron(object):
 
         :param dict_filename: (str) The dictionary file name (HTK-ASCII format)
         :param unkstamp: (str) Represent a missing pronunciation
-        :param nodump: (bool) Create or not a dump file (binary version of the
-        dictionary)
+        :param nodump: (bool) Create or not a compiled file (binary version of
+        the dictionary, mapped in memory instead of being loaded)
 
         """
         self._filename = dict_filename
@@ -100,26 +101,27 @@ class DictPron(object):
         # The pronunciation dictionary
         self._dict = {}
 
-        # Either read the dictionary from a dumped file or from the original
-        # ASCII one.
+        # Either map the dictionary from a compiled file or read the
+        # original ASCII one.
         if dict_filename is not None:
 
             data = None
             if nodump is False:
-                # Try first to get the dict from a dump file (at least 2 times faster)
-                data = rutils.load_from_dump(dict_filename)
+                # Try first to get the dict from a compiled file: nothing
+                # is loaded, and the memory is shared between processes.
+                data = mmapdict.load_from_compiled(dict_filename)
 
             # Load from ascii if:
-            # 1st load, or, dump load error, or dump older than ascii
+            # 1st load, or, compiled file error, or compiled older than ascii
             if data is None:
                 self.load_from_ascii(dict_filename)
                 if nodump is False:
-                    rutils.save_as_dump(self._dict, dict_filename)
+                    mmapdict.save_as_compiled(self._dict, dict_filename)
                 logging.info('Get dictionary from ASCII file.')
 
             else:
                 self._dict = data
-                logging.info('Get dictionary from dumped file.')
+                logging.info('Get dictionary from compiled file.')
 
     # -----------------------------------------------------------------------
     # Getters
@@ -144,7 +146,7 @@ class DictPron(object):
         :param entry: (str) A token to find in the dictionary
 
         """
-        return rutils.to_lower(entry) not in self._dict.keys()
+        return rutils.to_lower(entry) not in self._dict
 
     # -----------------------------------------------------------------------
 
@@ -172,7 +174,7 @@ class DictPron(object):
     # -----------------------------------------------------------------------
 
     def get_dict(self):
-        """ Return the pronunciation dictionary. """
+        """ Return the pronunciation dictionary (a dict or a read-only MmapDict). """
 
         return self._dict
 
@@ -201,6 +203,10 @@ class DictPron(object):
         new_pron = rutils.to_strip(pron)
         new_pron = new_pron.replace(" ", DictPron.PHONEMES_SEPARATOR)
 
+        # A compiled dictionary is read-only: load it before changing it
+        if isinstance(self._dict, mmapdict.MmapDict):
+            self._dict = dict(self._dict.iteritems())
+
         # Already a pronunciation for this token?
         cur_pron = ""
         if entry in self._dict:
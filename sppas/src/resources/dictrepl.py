@@ -76,6 +76,12 @@ class DictRepl(object):
         """
         self._dict = {}
 
+        # Reversed index: for each value, the list of its keys
+        self._reversed_dict = {}
+
+        # Number of modifications of the dictionary
+        self._version = 0
+
         if dict_filename is not None:
 
             data = None
@@ -91,6 +97,8 @@ class DictRepl(object):
 
             else:
                 self._dict = data
+                for key, value in self._dict.items():
+                    self.__index_value(key, value)
 
     # ------------------------------------------------------------------------
     # Getters
@@ -106,13 +114,7 @@ class DictRepl(object):
     def is_value(self, entry):
         """ Return True if entry is a value in the dictionary. """
 
-        for v in self._dict.values():
-            values = v.split(DictRepl.REPLACE_SEPARATOR)
-            for val in values:
-                if val == entry:
-                    return True
-
-        return False
+        return entry in self._reversed_dict
 
     # ------------------------------------------------------------------------
 
@@ -150,6 +152,13 @@ class DictRepl(object):
 
     # ------------------------------------------------------------------------
 
+    def get_version(self):
+        """ Return the number of modifications of the dictionary. """
+
+        return self._version
+
+    # ------------------------------------------------------------------------
+
     def get_dict(self):
         """ Return the replacements dictionary. """
 
@@ -186,14 +195,8 @@ class DictRepl(object):
 
         """
         # hum... of course, a value can have more than 1 key!
-        keys = []
-        for k, v in self._dict.items():
-            values = v.split(DictRepl.REPLACE_SEPARATOR)
-            for val in values:
-                if val == value:
-                    keys.append(k)
-
-        if len(keys) == 0:
+        keys = self._reversed_dict.get(value, None)
+        if keys is None:
             return ""
 
         return DictRepl.REPLACE_SEPARATOR.join(keys)
@@ -217,11 +220,16 @@ class DictRepl(object):
 
         # Check key,value in the dict
         if self.is_key(key):
-            if self.is_value_of(key, value) is False:
-                value = u"{0}|{1}".format(self._dict.get(key), value)
+            if self.is_value_of(key, value) is True:
+                return
+            new_value = u"{0}|{1}".format(self._dict.get(key), value)
+        else:
+            new_value = value
 
         # Append
-        self._dict[key] = value
+        self._dict[key] = new_value
+        self.__index_value(key, value)
+        self._version += 1
 
     # ------------------------------------------------------------------------
 
@@ -232,9 +240,36 @@ class DictRepl(object):
         :param entry: (string) unicode string of the entry to remove
 
         """
-        for k in self._dict.keys():
-            if k == entry or self.is_value_of(k, entry):
-                self._dict.pop(k)
+        keys = list(self._reversed_dict.get(entry, []))
+        if entry in self._dict:
+            keys.append(entry)
+
+        for k in set(keys):
+            value = self._dict.pop(k)
+            self.__unindex_value(k, value)
+            self._version += 1
+
+    # ------------------------------------------------------------------------
+    # Private
+    # ------------------------------------------------------------------------
+
+    def __index_value(self, key, value):
+        """ Add key to the keys of each of the values. """
+
+        for val in value.split(DictRepl.REPLACE_SEPARATOR):
+            self._reversed_dict.setdefault(val, []).append(key)
+
+    # ------------------------------------------------------------------------
+
+    def __unindex_value(self, key, value):
+        """ Remove key of the keys of each of the values. """
+
+        for val in value.split(DictRepl.REPLACE_SEPARATOR):
+            keys = self._reversed_dict.get(val, [])
+            if key in keys:
+                keys.remove(key)
+            if len(keys) == 0:
+                self._reversed_dict.pop(val, None)
 
     # ------------------------------------------------------------------------
     # File
@@ -57,6 +57,8 @@ class Mapping(DictRepl):
     A mapping is an extended replacement dictionary.
 
     """
+    MAX_MAPPED = 100000  # max number of mapped strings to memoize
+
     def __init__(self, dict_name=None):
         """
         Create a new Mapping instance.
@@ -70,6 +72,9 @@ class Mapping(DictRepl):
         self._reverse = False   # will replace value by key instead of replacing key by value
         self._miss_symbol = ""  # Symbol to be used if keep_miss is False
 
+        self._patterns = {}     # regexp of each list of delimiters
+        self._mapped = {}       # already mapped strings
+
     # -----------------------------------------------------------------------
 
     def get_reverse(self):
@@ -91,6 +96,7 @@ class Mapping(DictRepl):
 
         """
         self._keep_miss = keep_miss
+        self._mapped = {}
 
     # -----------------------------------------------------------------------
 
@@ -103,6 +109,7 @@ class Mapping(DictRepl):
 
         """
         self._reverse = reverse
+        self._mapped = {}
 
     # -----------------------------------------------------------------------
 
@@ -115,6 +122,35 @@ class Mapping(DictRepl):
 
         """
         self._miss_symbol = str(symbol)
+        self._mapped = {}
+
+    # -----------------------------------------------------------------------
+    # Overrides
+    # -----------------------------------------------------------------------
+
+    def add(self, token, repl):
+        """
+        Add a new key,value into the dict, or append value to the existing
+        one with a "|" used as separator.
+
+        :param token: (string) unicode string of the token to add
+        :param repl: (string) the replacement token
+
+        """
+        DictRepl.add(self, token, repl)
+        self._mapped = {}
+
+    # -----------------------------------------------------------------------
+
+    def remove(self, entry):
+        """
+        Remove an entry, as key or value.
+
+        :param entry: (string) unicode string of the entry to remove
+
+        """
+        DictRepl.remove(self, entry)
+        self._mapped = {}
 
     # -----------------------------------------------------------------------
     # Mapping entries
@@ -159,13 +195,21 @@ class Mapping(DictRepl):
         if self.get_size() == 0:
             return mstr
 
+        delimiters = tuple(delimiters)
+        mapped = self._mapped.get((mstr, delimiters), None)
+        if mapped is not None:
+            return mapped
+
         tab = []
         # suppose that some punctuation are like a separator
         # and we have to replace all strings between them
         if len(delimiters) > 0:
-            pattern = "|".join(map(re.escape, delimiters))
-            pattern = "("+pattern+")\s*"
-            tab = re.split(pattern, mstr)
+            if delimiters not in self._patterns:
+                pattern = "|".join(map(re.escape, delimiters))
+                pattern = "("+pattern+")\s*"
+                self._patterns[delimiters] = pattern
+            # the compiled regexp is cached by the re module
+            tab = re.split(self._patterns[delimiters], mstr)
 
         else:
             s = self._miss_symbol
@@ -193,6 +237,21 @@ class Mapping(DictRepl):
             else:
                 map_tab.append(self.map_entry(v))
 
-        return "".join(map_tab)
+        mapped = "".join(map_tab)
+        if len(self._mapped) >= Mapping.MAX_MAPPED:
+            self._mapped = {}
+        self._mapped[(mstr, delimiters)] = mapped
+
+        return mapped
+
+    # -----------------------------------------------------------------------
+    # Overloads
+    # -----------------------------------------------------------------------
+
+    def __getstate__(self):
+        # the memo of the mapped strings is not copied nor pickled
+        state = self.__dict__.copy()
+        state['_mapped'] = {}
+        return state
 
     # -----------------------------------------------------------------------
@@ -0,0 +1,375 @@
+# -*- coding: UTF-8 -*-
+# ---------------------------------------------------------------------------
+#            ___   __    __    __    ___
+#           /     |  \  |  \  |  \  /              the automatic
+#           \__   |__/  |__/  |___| \__             annotation and
+#              \  |     |     |   |    \             analysis
+#           ___/  |     |     |   | ___/              of speech
+#
+#
+#                           http://www.sppas.org/
+#
+# ---------------------------------------------------------------------------
+#            Laboratoire Parole et Langage, Aix-en-Provence, France
+#                   Copyright (C) 2011-2017  Brigitte Bigi
+#
+#                   This banner notice must not be removed
+# ---------------------------------------------------------------------------
+# Use of this software is governed by the GNU Public License, version 3.
+#
+# SPPAS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SPPAS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+# File: src.resources.mmapdict.py
+# ---------------------------------------------------------------------------
+
+import logging
+import mmap
+import os
+import os.path
+import struct
+
+from utils.fileutils import atomic_write
+
+# ----------------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------------
+
+COMPILED_FILENAME_EXT = ".bdict"
+COMPILED_MAGIC = "SPPASDIC"
+COMPILED_VERSION = 1
+
+# file header: magic, version, number of entries
+HEADER = struct.Struct("<8sII")
+# an entry: offset and length of the key, offset and length of the value
+RECORD = struct.Struct("<IIII")
+# the beginning of an entry: offset and length of the key
+KEYREF = struct.Struct("<II")
+
+# ---------------------------------------------------------------------------
+
+
+class MmapDict(object):
+    """
+    @author:       Brigitte Bigi
+    @organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    @contact:      brigitte.bigi@gmail.com
+    @license:      GPL, v3
+    @copyright:    Copyright (C) 2011-2017  Brigitte Bigi
+    @summary:      Read-only dictionary of unicode strings, in a compiled file.
+
+    A compiled file is made of a header, a table of entries sorted by key,
+    then a blob of UTF-8 encoded keys and values. Each entry of the table
+    stores the offset and the length of its key and of its value.
+
+    The file is not loaded: it is mapped in memory, so that the pages of the
+    file are shared by all the processes using it. An entry is found with a
+    dichotomic search in the table, in O(log n).
+
+        >>> MmapDict.compile({u'a': u'b'}, 'file.bdict')
+        >>> d = MmapDict('file.bdict')
+        >>> d.get(u'a')
+        u'b'
+
+    """
+    def __init__(self, filename):
+        """
+        Open a compiled file.
+
+        :param filename: (str) Name of a compiled file
+        :raises: IOError if the file is not a compiled dictionary
+
+        """
+        self._filename = filename
+        self.__mmap = None
+        self.__size = 0
+        self.__open()
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def compile(dictionary, filename):
+        """
+        Save a dictionary of unicode strings in a compiled file.
+
+        :param dictionary: (dict) keys and values are unicode strings
+        :param filename: (str) Name of the compiled file
+
+        """
+        items = sorted((_to_bytes(key), _to_bytes(value))
+                       for key, value in dictionary.iteritems())
+
+        offset = HEADER.size + len(items) * RECORD.size
+        records = []
+        for key, value in items:
+            records.append(RECORD.pack(offset, len(key),
+                                       offset + len(key), len(value)))
+            offset += len(key) + len(value)
+
+        with atomic_write(filename) as fd:
+            fd.write(HEADER.pack(COMPILED_MAGIC, COMPILED_VERSION, len(items)))
+            fd.write("".join(records))
+            for key, value in items:
+                fd.write(key)
+                fd.write(value)
+
+    # -----------------------------------------------------------------------
+    # Getters
+    # -----------------------------------------------------------------------
+
+    def get(self, key, default=None):
+        """
+        Return the value of a key or default if the key is not in the dict.
+
+        :param key: (str) Unicode string
+        :param default: the value to return if the key is missing
+
+        """
+        i = self.__find(key)
+        if i == -1:
+            return default
+
+        return self.__value(i)
+
+    # -----------------------------------------------------------------------
+
+    def keys(self):
+        return list(self.iterkeys())
+
+    def values(self):
+        return list(self.itervalues())
+
+    def items(self):
+        return list(self.iteritems())
+
+    def iterkeys(self):
+        for i in range(self.__size):
+            yield self.__key(i).decode('utf-8')
+
+    def itervalues(self):
+        for i in range(self.__size):
+            yield self.__value(i)
+
+    def iteritems(self):
+        for i in range(self.__size):
+            yield self.__key(i).decode('utf-8'), self.__value(i)
+
+    # -----------------------------------------------------------------------
+
+    def close(self):
+        """
+        Close the memory map of the file.
+
+        """
+        if self.__mmap is not None:
+            self.__mmap.close()
+            self.__mmap = None
+            self.__size = 0
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    def __open(self):
+        """
+        Map the file in memory and check its header.
+
+        """
+        with open(self._filename, 'rb') as fd:
+            self.__mmap = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, size = HEADER.unpack_from(self.__mmap, 0)
+        except struct.error:
+            magic, version, size = (None, None, 0)
+
+        if magic != COMPILED_MAGIC or version != COMPILED_VERSION:
+            self.close()
+            raise IOError('%s is not a compiled dictionary of version %d.'
+                          % (self._filename, COMPILED_VERSION))
+
+        # a truncated file: the table or the blob of strings is incomplete.
+        length = len(self.__mmap)
+        if HEADER.size + size*RECORD.size > length or \
+                (size > 0 and self.__end(size-1) > length):
+            self.close()
+            raise IOError('%s is a truncated compiled dictionary.'
+                          % self._filename)
+
+        self.__size = size
+
+    # -----------------------------------------------------------------------
+
+    def __end(self, i):
+        """ Return the offset of the end of the value of the i-th entry. """
+
+        koffset, klength, offset, length = RECORD.unpack_from(self.__mmap, HEADER.size + i*RECORD.size)
+        return offset + length
+
+    # -----------------------------------------------------------------------
+
+    def __key(self, i):
+        """ Return the UTF-8 encoded key of the i-th entry. """
+
+        offset, length, voffset, vlength = RECORD.unpack_from(self.__mmap, HEADER.size + i*RECORD.size)
+        return self.__mmap[offset:offset+length]
+
+    # -----------------------------------------------------------------------
+
+    def __value(self, i):
+        """ Return the value of the i-th entry. """
+
+        koffset, klength, offset, length = RECORD.unpack_from(self.__mmap, HEADER.size + i*RECORD.size)
+        return self.__mmap[offset:offset+length].decode('utf-8')
+
+    # -----------------------------------------------------------------------
+
+    def __find(self, key):
+        """
+        Return the index of the entry of a key, or -1.
+
+        """
+        key = _to_bytes(key)
+        mm = self.__mmap
+        unpack = KEYREF.unpack_from
+        lo = 0
+        hi = self.__size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset, length = unpack(mm, HEADER.size + mid*RECORD.size)
+            current = mm[offset:offset+length]
+            if current < key:
+                lo = mid + 1
+            elif current > key:
+                hi = mid
+            else:
+                return mid
+
+        return -1
+
+    # -----------------------------------------------------------------------
+    # Overloads
+    # -----------------------------------------------------------------------
+
+    def __getitem__(self, key):
+        i = self.__find(key)
+        if i == -1:
+            raise KeyError(key)
+        return self.__value(i)
+
+    def __contains__(self, key):
+        return self.__find(key) != -1
+
+    def __iter__(self):
+        return self.iterkeys()
+
+    def __len__(self):
+        return self.__size
+
+    def __getstate__(self):
+        # a memory map can't be pickled: the file is mapped again.
+        return {'filename': self._filename}
+
+    def __setstate__(self, state):
+        self._filename = state['filename']
+        self.__mmap = None
+        self.__size = 0
+        self.__open()
+
+# ----------------------------------------------------------------------------
+
+
+def _to_bytes(entry):
+    """ Return the UTF-8 encoded version of a string. """
+
+    if isinstance(entry, unicode):
+        return entry.encode('utf-8')
+    return entry
+
+# ----------------------------------------------------------------------------
+# Compiled files of text files
+# ----------------------------------------------------------------------------
+
+
+def get_compiled_filename(filename):
+    """
+    Return the file name of the compiled version of filename.
+
+    :param filename: (str)
+    :returns: compiled filename
+
+    """
+    fileName, fileExt = os.path.splitext(filename)
+
+    return fileName + COMPILED_FILENAME_EXT
+
+# ----------------------------------------------------------------------------
+
+
+def has_compiled(filename):
+    """
+    Test if a compiled file exists for filename and if it is up-to-date.
+
+    :param filename: (str)
+    :returns: (bool)
+
+    """
+    compiled_filename = get_compiled_filename(filename)
+    if os.path.isfile(compiled_filename):
+        tascii = os.path.getmtime(filename)
+        tcompiled = os.path.getmtime(compiled_filename)
+        if tascii < tcompiled:
+            return True
+
+    return False
+
+# ----------------------------------------------------------------------------
+
+
+def load_from_compiled(filename):
+    """
+    Open the compiled version of a file.
+
+    :param filename: (str)
+    :returns: MmapDict or None
+
+    """
+    if has_compiled(filename) is False:
+        return None
+
+    try:
+        return MmapDict(get_compiled_filename(filename))
+    except Exception as e:
+        logging.info('Open compiled data failed: %s' % str(e))
+        return None
+
+# ----------------------------------------------------------------------------
+
+
+def save_as_compiled(data, filename):
+    """
+    Save a dictionary as the compiled version of a file.
+
+    :param data: (dict) Unicode keys and values
+    :param filename: File name for the data
+    :returns: (bool)
+
+    """
+    try:
+        MmapDict.compile(data, get_compiled_filename(filename))
+    except Exception as e:
+        logging.info('Save a compiled data failed: %s' % str(e))
+        return False
+
+    return True
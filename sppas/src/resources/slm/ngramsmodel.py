@@ -462,14 +462,14 @@ class NgramCounter(object):
 
         """
         for filename in datafiles:
-            trs = annotationdata.aio.read( filename )
-            if trs.GetSize() == 0:
+            # only the first tier is loaded, one annotation at a time
+            try:
+                for ann in annotationdata.aio.iter_annotations( filename, 0 ):
+                    label = ann.GetLabel()
+                    if label.IsEmpty() is False and label.IsSilence() is False:
+                        self.append_sentence(label.GetValue())
+            except IndexError:
                 continue
-            tier = trs[0]
-            for ann in tier:
-                label = ann.GetLabel()
-                if label.IsEmpty() is False and label.IsSilence() is False:
-                    self.append_sentence(label.GetValue())
 
         if self._n == 1:
             self._datacounts[((self._ss),)] = 0
@@ -3,17 +3,24 @@
 
 import unittest
 import os.path
+import shutil
+import pickle
+import copy
 
 from resources.dictpron import DictPron
+from resources.mmapdict import MmapDict, get_compiled_filename
 from resources.dictrepl import DictRepl
 from resources.mapping import Mapping
 from resources.unigram import Unigram
 
 from sp_glob import RESOURCES_PATH
+import utils.fileutils
 
 # ---------------------------------------------------------------------------
 
 DICT_FRA = os.path.join(RESOURCES_PATH, "dict", "fra.dict")
+DICT_CAT = os.path.join(RESOURCES_PATH, "dict", "cat.dict")
+DICT_NAN = os.path.join(RESOURCES_PATH, "dict", "nan.dict")
 
 # ---------------------------------------------------------------------------
 
@@ -36,6 +43,63 @@ class TestDictPron(unittest.TestCase):
             self.assertEqual(d.get_pron(w), d2.get_pron(w))
         os.remove(DICT_FRA+".copy")
 
+    def test_compiled(self):
+        temp = utils.fileutils.gen_name()
+        os.mkdir(temp)
+        filename = os.path.join(temp, "cat.dict")
+        shutil.copy(DICT_CAT, filename)
+        try:
+            d1 = DictPron(filename, nodump=True)
+            self.assertIsInstance(d1.get_dict(), dict)
+            self.assertFalse(os.path.exists(get_compiled_filename(filename)))
+            d2 = DictPron(filename)
+            self.assertTrue(os.path.exists(get_compiled_filename(filename)))
+            d3 = DictPron(filename)
+            self.assertIsInstance(d3.get_dict(), MmapDict)
+
+            self.assertEqual(d1.get_dictsize(), d3.get_dictsize())
+            self.assertEqual(sorted(d1.get_keys()), sorted(d3.get_keys()))
+            for w in d1.get_keys():
+                self.assertEqual(d1.get_pron(w), d3.get_pron(w))
+                self.assertFalse(d3.is_unk(w))
+                self.assertTrue(d3.is_pron_of(w, d1.get_pron(w).split("|")[0]))
+            self.assertTrue(d3.is_unk(u'azerty'))
+            self.assertEqual(d3.get_pron(u'azerty'), "<UNK>")
+
+            # the mapped dictionary can be pickled (sent to another process)
+            d4 = pickle.loads(pickle.dumps(d3))
+            self.assertEqual(d4.get_dictsize(), d1.get_dictsize())
+
+            # a compiled dictionary is loaded before being changed
+            d3.add_pron(u'azerty', u'a z e r t i')
+            self.assertIsInstance(d3.get_dict(), dict)
+            self.assertEqual(d3.get_pron(u'azerty'), u'a-z-e-r-t-i')
+            self.assertEqual(d3.get_dictsize(), d1.get_dictsize()+1)
+        finally:
+            shutil.rmtree(temp)
+
+    def test_truncated_compiled(self):
+        temp = utils.fileutils.gen_name()
+        os.mkdir(temp)
+        filename = os.path.join(temp, "nan.dict")
+        shutil.copy(DICT_NAN, filename)
+        try:
+            d1 = DictPron(filename)
+            compiled = get_compiled_filename(filename)
+            size = os.path.getsize(compiled)
+            for length in (size - 1, size // 2, 10):
+                with open(compiled, 'r+b') as fd:
+                    fd.truncate(length)
+                self.assertRaises(IOError, MmapDict, compiled)
+                # the ASCII dictionary is read (and compiled again) instead
+                d2 = DictPron(filename)
+                self.assertIsInstance(d2.get_dict(), dict)
+                self.assertEqual(d1.get_dictsize(), d2.get_dictsize())
+                for w in d1.get_keys():
+                    self.assertEqual(d1.get_pron(w), d2.get_pron(w))
+        finally:
+            shutil.rmtree(temp)
+
 # ---------------------------------------------------------------------------
 
 
@@ -79,6 +143,37 @@ class TestDictRepl(unittest.TestCase):
         self.assertTrue(d.is_value_of("key2", "v2"))
         self.assertFalse(d.is_value_of("key2", "v1"))
 
+    def test_version(self):
+        d = DictRepl()
+        d.add("key1", "v1")
+        version = d.get_version()
+        d.add("key1", "v1")
+        self.assertEqual(d.get_version(), version)
+        d.remove("key1")
+        d.add("key2", "v2")
+        self.assertEqual(d.get_size(), 1)
+        self.assertGreater(d.get_version(), version)
+
+    def test_dict_reversed(self):
+        d = DictRepl()
+        d.add("key1", "v1")
+        d.add("key1", "v2")
+        d.add("key1", "v1")
+        d.add("key2", "v2")
+        self.assertEqual(d.get("key1"), "v1|v2")
+        self.assertEqual(d.replace_reversed("v1"), "key1")
+        self.assertEqual(d.replace_reversed("v2"), "key1|key2")
+        self.assertEqual(d.replace_reversed("v3"), "")
+
+        d.remove("key1")
+        self.assertFalse(d.is_value("v1"))
+        self.assertEqual(d.replace_reversed("v2"), "key2")
+        d.add("key3", "v3")
+        d.remove("v2")
+        self.assertEqual(d.get_keys(), ["key3"])
+        self.assertFalse(d.is_value("v2"))
+        self.assertEqual(d.replace_reversed("v3"), "key3")
+
 # ---------------------------------------------------------------------------
 
 
@@ -149,3 +244,30 @@ class TestMapping(unittest.TestCase):
         self.assertEqual("a9@", dict1.map("aoe@", ()))
         self.assertEqual("a-9@", dict1.map("a-oe@", ()))
         self.assertEqual("lleu ko~.bl9", dict1.map("lleu ko~.bloe", ()))
+
+    def test_map_changes(self):
+        # mapped strings are memoized: they must follow the changes
+        dict1 = Mapping()
+        dict1.add("a", "A")
+        self.assertEqual("A-b", dict1.map("a-b"))
+        dict1.add("b", "B")
+        self.assertEqual("A-B", dict1.map("a-b"))
+        dict1.set_reverse(True)
+        self.assertEqual("a-b", dict1.map("A-B"))
+        dict1.set_keep_miss(False)
+        dict1.set_miss_symbol("*")
+        self.assertEqual("a-*", dict1.map("A-C"))
+        dict1.remove("a")
+        self.assertEqual("*-b", dict1.map("A-B"))
+
+    def test_map_copy(self):
+        # a used mapping can be copied (acoustic models are copied to be mixed)
+        dict1 = Mapping(self.replfile)
+        self.assertEqual("a-9+@", dict1.map("a-oe+@"))
+        dict2 = copy.deepcopy(dict1)
+        self.assertEqual("a-9+@", dict2.map("a-oe+@"))
+        dict2.add("zz", "Z")
+        self.assertEqual("a-9-Z", dict2.map("a-oe-zz"))
+        self.assertEqual("a-9-zz", dict1.map("a-oe-zz"))
+        dict3 = pickle.loads(pickle.dumps(dict1))
+        self.assertEqual("a-9+@", dict3.map("a-oe+@"))
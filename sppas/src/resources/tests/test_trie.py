@@ -0,0 +1,43 @@
+#!/usr/bin/env python2
+# -*- coding: utf8 -*-
+
+import unittest
+
+from resources.trie import Trie
+
+# ---------------------------------------------------------------------------
+
+
+class TestTrie(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = Trie([u"a", u"ab", u"abcd", u"b", u"é", u"éé", u"ab"])
+
+    def test_contains(self):
+        self.assertEqual(len(self.trie), 6)
+        self.assertTrue(u"abcd" in self.trie)
+        self.assertFalse(u"abc" in self.trie)
+        self.assertFalse(u"" in self.trie)
+        self.assertEqual(len(Trie()), 0)
+
+    def test_prefixes(self):
+        self.assertEqual(self.trie.prefixes(u"abcde"), [1, 2, 4])
+        self.assertEqual(self.trie.prefixes(u"abcde", 1), [2])
+        self.assertEqual(self.trie.prefixes(u"ééé"), [1, 2])
+        self.assertEqual(self.trie.prefixes("ééé"), [1, 2])
+        self.assertEqual(self.trie.prefixes(u"cab"), [])
+        self.assertEqual(self.trie.prefixes(u""), [])
+        self.assertEqual(Trie().prefixes(u"abc"), [])
+
+    def test_longest_prefix(self):
+        self.assertEqual(self.trie.longest_prefix(u"abcde"), 4)
+        self.assertEqual(self.trie.longest_prefix(u"abc"), 2)
+        self.assertEqual(self.trie.longest_prefix(u"xabcde", 1), 4)
+        self.assertEqual(self.trie.longest_prefix(u"cd"), 0)
+
+    def test_versus_naive(self):
+        words = [u"a", u"ab", u"abc", u"abd", u"b", u"ba", u"bab", u"c", u"ca"]
+        trie = Trie(words)
+        for entry in (u"abcab", u"babab", u"cab", u"dab", u"abdc", u"aaa"):
+            expected = [i for i in range(1, len(entry)+1) if entry[:i] in words]
+            self.assertEqual(trie.prefixes(entry), expected)
@@ -0,0 +1,140 @@
+# -*- coding: UTF-8 -*-
+# ---------------------------------------------------------------------------
+#            ___   __    __    __    ___
+#           /     |  \  |  \  |  \  /              the automatic
+#           \__   |__/  |__/  |___| \__             annotation and
+#              \  |     |     |   |    \             analysis
+#           ___/  |     |     |   | ___/              of speech
+#
+#
+#                           http://www.sppas.org/
+#
+# ---------------------------------------------------------------------------
+#            Laboratoire Parole et Langage, Aix-en-Provence, France
+#                   Copyright (C) 2011-2017  Brigitte Bigi
+#
+#                   This banner notice must not be removed
+# ---------------------------------------------------------------------------
+# Use of this software is governed by the GNU Public License, version 3.
+#
+# SPPAS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SPPAS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+# File: src.resources.trie.py
+# ---------------------------------------------------------------------------
+
+import sys
+from bisect import bisect_left
+
+# ---------------------------------------------------------------------------
+
+
+class Trie(object):
+    """
+    @author:       Brigitte Bigi
+    @organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    @contact:      brigitte.bigi@gmail.com
+    @license:      GPL, v3
+    @copyright:    Copyright (C) 2011-2017  Brigitte Bigi
+    @summary:      Longest-match search of a string in a set of strings.
+
+    The trie is implicit: the strings are stored in a sorted list, and a
+    node of the trie is the range of the strings sharing the same prefix.
+    Going down to a child node narrows the range with a dichotomic search.
+    So, the trie requires no more memory than the list of strings.
+
+    All the strings of the trie starting a given string are found in one
+    pass on the given string, which stops as soon as no string of the trie
+    starts with the current prefix.
+
+        >>> t = Trie([u'a', u'ab', u'abcd', u'b'])
+        >>> t.prefixes(u'abcde')
+        [1, 2, 4]
+        >>> t.longest_prefix(u'abcde')
+        4
+        >>> t.longest_prefix(u'cd')
+        0
+
+    """
+    def __init__(self, entries=None):
+        """
+        Create a Trie instance.
+
+        :param entries: (iterable) The strings of the trie
+
+        """
+        self.__entries = []
+        if entries is not None:
+            self.__entries = sorted(set(entries))
+
+    # -----------------------------------------------------------------------
+
+    def prefixes(self, entry, start=0):
+        """
+        Return the ends of all the strings of the trie starting entry[start:].
+
+        :param entry: (unicode) The string to search
+        :param start: (int) Index of the first character to search
+        :returns: (list) Indexes i such that entry[start:i] is in the trie,
+        in increasing order.
+
+        """
+        if isinstance(entry, unicode) is False:
+            entry = entry.decode('utf-8')
+        entries = self.__entries
+        lo = 0
+        hi = len(entries)
+        result = []
+
+        for i in range(start, len(entry)):
+            prefix = entry[start:i+1]
+            lo = bisect_left(entries, prefix, lo, hi)
+            c = ord(entry[i])
+            if c < sys.maxunicode:
+                # the first string after all the ones starting by prefix
+                hi = bisect_left(entries, entry[start:i] + unichr(c+1), lo, hi)
+            if lo == hi:
+                break
+            if entries[lo] == prefix:
+                result.append(i+1)
+
+        return result
+
+    # -----------------------------------------------------------------------
+
+    def longest_prefix(self, entry, start=0):
+        """
+        Return the length of the longest string of the trie starting entry[start:].
+
+        :param entry: (unicode) The string to search
+        :param start: (int) Index of the first character to search
+        :returns: (int) the length, or 0 if no string of the trie starts entry[start:]
+
+        """
+        ends = self.prefixes(entry, start)
+        if len(ends) == 0:
+            return 0
+
+        return ends[-1] - start
+
+    # -----------------------------------------------------------------------
+    # Overloads
+    # -----------------------------------------------------------------------
+
+    def __contains__(self, entry):
+        i = bisect_left(self.__entries, entry)
+        return i < len(self.__entries) and self.__entries[i] == entry
+
+    def __len__(self):
+        return len(self.__entries)
@@ -38,6 +38,7 @@ import codecs
 import logging
 
 import rutils
+from trie import Trie
 
 # ---------------------------------------------------------------------------
 
@@ -65,6 +66,9 @@ class Vocabulary(object):
         # with a dictionary it is faster to read tokens from a file and is
         # also faster to find a token in it!
 
+        # The trie of the entries, created on demand
+        self._trie = None
+
         # Set the list of word to be case-sensitive or not.
         self.case_sensitive = case_sensitive
 
@@ -103,6 +107,7 @@ class Vocabulary(object):
 
         if entry not in self._stw:
             self._stw[entry] = 0
+            self._trie = None
             return True
 
         return False
@@ -123,6 +128,19 @@ class Vocabulary(object):
 
     # -----------------------------------------------------------------------
 
+    def get_trie(self):
+        """
+        Return the entries in a Trie, to find the longest entries
+        starting a string. The trie is created at the first call.
+
+        """
+        if self._trie is None:
+            self._trie = Trie(self._stw.keys())
+
+        return self._trie
+
+    # -----------------------------------------------------------------------
+
     def is_in(self, entry):
         """
         Return True if entry is in the list.
@@ -0,0 +1,182 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+# ---------------------------------------------------------------------------
+#            ___   __    __    __    ___
+#           /     |  \  |  \  |  \  /              Automatic
+#           \__   |__/  |__/  |___| \__             Annotation
+#              \  |     |     |   |    \             of
+#           ___/  |     |     |   | ___/              Speech
+#
+#
+#                           http://www.sppas.org/
+#
+# ---------------------------------------------------------------------------
+#            Laboratoire Parole et Langage, Aix-en-Provence, France
+#                   Copyright (C) 2011-2016  Brigitte Bigi
+#
+#                   This banner notice must not be removed
+# ---------------------------------------------------------------------------
+# Use of this software is governed by the GNU Public License, version 3.
+#
+# SPPAS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SPPAS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+# File: lrucache.py
+# ----------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+
+PREV, NEXT, KEY, VALUE = 0, 1, 2, 3
+
+# ----------------------------------------------------------------------------
+
+
+class LRUCache(object):
+    """
+    @author:       Brigitte Bigi
+    @organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    @contact:      brigitte.bigi@gmail.com
+    @license:      GPL, v3
+    @copyright:    Copyright (C) 2011-2017  Brigitte Bigi
+    @summary:      A bounded mapping, discarding the least recently used keys.
+
+    Entries are stored in a dictionary and linked in a circular list, from
+    the least recently used to the most recently used one. Getting or
+    setting an entry moves it to the end of the list, and the first one is
+    removed when the cache is full.
+
+    >>> cache = LRUCache(2)
+    >>> cache.set('a', 1)
+    >>> cache.set('b', 2)
+    >>> cache.get('a')
+    >>> 1
+    >>> cache.set('c', 3)
+    >>> 'b' in cache
+    >>> False
+
+    """
+    def __init__(self, maxsize=100000):
+        """
+        Create a new LRUCache instance.
+
+        :param maxsize: (int) The maximum number of entries, or 0 for no limit.
+
+        """
+        if maxsize < 0:
+            raise ValueError('Expected a positive size. Got %d.' % maxsize)
+
+        self._maxsize = maxsize
+        self._map = {}
+        self._root = []
+        self.clear()
+
+    # ------------------------------------------------------------------------
+
+    def get_maxsize(self):
+        """ Return the maximum number of entries, or 0 if unlimited. """
+
+        return self._maxsize
+
+    # ------------------------------------------------------------------------
+
+    def get(self, key, default=None):
+        """
+        Return the value of a key, and mark it as the most recently used.
+
+        :param key: A key of the cache
+        :param default: The value to return if key is missing
+        :returns: the value
+
+        """
+        link = self._map.get(key, None)
+        if link is None:
+            return default
+
+        self.__move_to_end(link)
+        return link[VALUE]
+
+    # ------------------------------------------------------------------------
+
+    def set(self, key, value):
+        """
+        Set the value of a key, and mark it as the most recently used.
+        The least recently used key is removed if the cache is full.
+
+        :param key: A key of the cache
+        :param value: The value of the key
+
+        """
+        link = self._map.get(key, None)
+        if link is not None:
+            link[VALUE] = value
+            self.__move_to_end(link)
+            return
+
+        if self._maxsize > 0 and len(self._map) >= self._maxsize:
+            oldest = self._root[NEXT]
+            oldest[PREV][NEXT] = oldest[NEXT]
+            oldest[NEXT][PREV] = oldest[PREV]
+            del self._map[oldest[KEY]]
+
+        last = self._root[PREV]
+        link = [last, self._root, key, value]
+        last[NEXT] = link
+        self._root[PREV] = link
+        self._map[key] = link
+
+    # ------------------------------------------------------------------------
+
+    def items(self):
+        """ Return the list of (key, value), from the least recently used. """
+
+        result = []
+        link = self._root[NEXT]
+        while link is not self._root:
+            result.append((link[KEY], link[VALUE]))
+            link = link[NEXT]
+
+        return result
+
+    # ------------------------------------------------------------------------
+
+    def clear(self):
+        """ Remove all the entries. """
+
+        self._map.clear()
+        self._root[:] = [self._root, self._root, None, None]
+
+    # ------------------------------------------------------------------------
+    # Private
+    # ------------------------------------------------------------------------
+
+    def __move_to_end(self, link):
+        """ Move a link at the end of the list. """
+
+        link[PREV][NEXT] = link[NEXT]
+        link[NEXT][PREV] = link[PREV]
+        last = self._root[PREV]
+        link[PREV] = last
+        link[NEXT] = self._root
+        last[NEXT] = link
+        self._root[PREV] = link
+
+    # ------------------------------------------------------------------------
+    # Overloads
+    # ------------------------------------------------------------------------
+
+    def __contains__(self, key):
+        return key in self._map
+
+    def __len__(self):
+        return len(self._map)
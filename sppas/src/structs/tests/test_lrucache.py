@@ -0,0 +1,48 @@
+#!/usr/bin/env python2
+# -*- coding:utf-8 -*-
+
+import unittest
+
+# ---------------------------------------------------------------------------
+
+from structs.lrucache import LRUCache
+
+# ---------------------------------------------------------------------------
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_get_set(self):
+        cache = LRUCache(2)
+        self.assertEqual(cache.get_maxsize(), 2)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('a', 0), 0)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertTrue('a' in cache)
+        self.assertFalse('b' in cache)
+        self.assertEqual(cache.items(), [('a', 1), ('c', 3)])
+
+        cache.set('a', 4)
+        self.assertEqual(cache.items(), [('c', 3), ('a', 4)])
+        cache.set('d', 5)
+        self.assertEqual(cache.items(), [('a', 4), ('d', 5)])
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.items(), [])
+        cache.set('e', 6)
+        self.assertEqual(cache.items(), [('e', 6)])
+
+    def test_unlimited(self):
+        cache = LRUCache(0)
+        for i in range(1000):
+            cache.set(i, i)
+        self.assertEqual(len(cache), 1000)
+        self.assertEqual(cache.get(0), 0)
+        self.assertEqual(cache.items()[-1], (0, 0))
+        with self.assertRaises(ValueError):
+            LRUCache(-1)
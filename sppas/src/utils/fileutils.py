@@ -42,12 +42,15 @@ __copyright__ = """Copyright (C) 2011-2015  Brigitte Bigi"""
 # ----------------------------------------------------------------------------
 
 import os
+import sys
 import random
 import shutil
 import codecs
 import re
 import logging
 import tempfile
+import thread
+from contextlib import contextmanager
 from datetime import date
 
 # ----------------------------------------------------------------------------
@@ -174,6 +177,96 @@ def gen_name( root="sppas_tmp", addtoday=True, addpid=True ):
 
 # ----------------------------------------------------------------------------
 
+@contextmanager
+def atomic_write(filename):
+    """
+    Open a temporary file to write in binary mode, then rename it as the
+    given file name: another process never reads a partial file, it reads
+    either the previous file or the new one.
+    If an exception is raised, the temporary file is removed and the file
+    is not modified.
+
+    >>> with atomic_write(filename) as fp:
+    >>>     fp.write(data)
+
+    @param filename (str) the file name to write
+
+    """
+    tmpfilename = "%s.%d.%d.tmp" % (filename, os.getpid(), thread.get_ident())
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    try:
+        with os.fdopen(os.open(tmpfilename, flags, 0o666), "wb") as fp:
+            yield fp
+        replace_file(tmpfilename, filename)
+    except BaseException:
+        if os.path.exists(tmpfilename):
+            os.remove(tmpfilename)
+        raise
+
+# ----------------------------------------------------------------------------
+
+def replace_file(src, dst):
+    """
+    Rename a file, and replace the destination if it exists.
+    Under POSIX systems, the replacement is atomic.
+
+    @param src (str) the file to rename
+    @param dst (str) the new name of the file
+
+    """
+    if sys.platform == "win32":
+        # os.rename() can't replace a file under Windows
+        import ctypes
+        MOVEFILE_REPLACE_EXISTING = 0x1
+        if ctypes.windll.kernel32.MoveFileExW(unicode(src), unicode(dst), MOVEFILE_REPLACE_EXISTING) == 0:
+            raise ctypes.WinError()
+    else:
+        os.rename(src, dst)
+
+# ----------------------------------------------------------------------------
+
+@contextmanager
+def file_lock(filename):
+    """
+    Lock a file against the other processes, for example to read, modify
+    then replace it. The lock is taken on the file filename.lock, created
+    if required; it waits until the other processes release it.
+
+    >>> with file_lock(filename):
+    >>>     data = read(filename)
+    >>>     write(filename, data)
+
+    @param filename (str) the file name to lock
+
+    """
+    fd = os.open(filename + ".lock", os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+            while True:
+                try:
+                    # LK_LOCK gives up after 10 seconds
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except IOError:
+                    pass
+            try:
+                yield
+            finally:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+# ----------------------------------------------------------------------------
+
 def format_filename(entry):
     # Remove multiple spaces
     __str = re.sub(u"[\s]+", ur" ", entry)
@@ -695,7 +695,7 @@ class TrsList(wx.Panel):
             self._transcription = Transcription("Empty")
             return
         try:
-            self._transcription = annotationdata.aio.read( filename )
+            self._transcription = annotationdata.aio.read( filename, use_dump=True, save_dump=True )
             self._dirty = False
             self._boxtitle.SetForegroundColour( FG_FILE_COLOUR )
             self.Refresh()
@@ -317,7 +317,7 @@ class DisplayCtrl( wx.Window ):
                 ShowInformation(self, self._prefsIO,"The following error occurred while loading file "+f+".\n"+str(e), style=wx.ICON_INFORMATION)
                 raise Exception('Display. SetData. Error while loading the sound: %s.'%str(e))
             h = self.FixWaveHeight(wf)
-            dcobj = WaveCtrl( self, -1, pos=wx.Point(0,self._ymax), size=wx.Size(s.width,h), audio=wf )
+            dcobj = WaveCtrl( self, -1, pos=wx.Point(0,self._ymax), size=wx.Size(s.width,h), audio=wf, filename=f )
             dcobj.SetGradientBackground( True ) # Gradient bg
 
         else:
@@ -54,6 +54,8 @@ import wx
 from spControl   import spControl
 from channelctrl import ChannelCtrl, WavePreferences
 
+from audiodata.audiopeaks import AudioPeaks
+
 # ---------------------------------------------------------------------------
 
 
@@ -165,12 +167,14 @@ class WaveCtrl( spControl ):
     def __init__(self, parent, id=-1,
                  pos=wx.DefaultPosition,
                  size=wx.DefaultSize,
-                 audio=None):
+                 audio=None,
+                 filename=None):
         """
         Constructor.
 
         Non-wxPython related parameter:
           - audio (AudioPCM): the audio instance.
+          - filename (str): the name of the audio file, used to cache its peaks.
 
         """
         spControl.__init__(self, parent, id, pos, size)
@@ -186,7 +190,7 @@ class WaveCtrl( spControl ):
         self._m_dragging = False
 
         # Wave
-        self.__set( audio )
+        self.__set( audio, filename )
 
         # Handling mouse moving.
         wx.EVT_MOUSE_EVENTS(self, self.OnMouseEvents)
@@ -195,14 +199,23 @@ class WaveCtrl( spControl ):
     #------------------------------------------------------------------------
 
 
-    def __set(self, audio):
+    def __set(self, audio, filename=None):
 
         self._audio = audio
         self._channels = []
+        self._peaks = None
 
         if audio is None:
             return
 
+        # min/max values of the samples, to draw large periods
+        self._peaks = AudioPeaks()
+        try:
+            self._peaks.load_or_build(audio, filename)
+        except Exception as e:
+            logging.info('Peaks of the audio file not estimated: %s'%str(e))
+            self._peaks = None
+
         # find the maximum amplitude value
         datamax = int(math.pow(2, (8*self._audio.get_sampwidth())) / 2) - 1
 
@@ -239,11 +252,11 @@ class WaveCtrl( spControl ):
     #------------------------------------------------------------------------
 
     # TODO: Rename as SetAudio
-    def SetWave(self, audio):
+    def SetWave(self, audio, filename=None):
         """
         Set a new Wave.
         """
-        self.__set(audio)
+        self.__set(audio, filename)
 
     # End SetWave
     #------------------------------------------------------------------------
@@ -666,12 +679,17 @@ class WaveCtrl( spControl ):
 
         # Position in the audio
         pos = int(self._mintime * self._audio.get_framerate())
-
-        # Read samples
         duration = self._maxtime - self._mintime
-        self._audio.set_pos( pos )
         nframes = int( duration * self._audio.get_framerate() )
-        data = self._audio.read_samples( nframes )
+
+        # Get the min/max values of the period from the peaks, or read
+        # samples if the period is too short
+        data = None
+        if self._peaks is not None:
+            data = self._peaks.get_peaks(pos, pos+nframes, w)
+        if data is None:
+            self._audio.set_pos( pos )
+            data = self._audio.read_samples( nframes )
 
         # draw each channel
         for i,c in enumerate(self._channels):